@@ -4,6 +4,7 @@ Separa responsabilidades en módulos especializados
 """
 
 from .analyzer import AnalizadorAvanzado
+from .timing import SectionTimer
 
-__all__ = ['AnalizadorAvanzado']
+__all__ = ['AnalizadorAvanzado', 'SectionTimer']
 __version__ = '2.0.0'
@@ -3,6 +3,8 @@ Analizador Avanzado - Facade Pattern
 Orquesta todos los módulos de análisis de forma cohesiva
 """
 
+from functools import wraps
+
 import pandas as pd
 import warnings
 warnings.filterwarnings('ignore')
@@ -12,6 +14,17 @@ from .core.insights import InsightsGenerator
 from .ml.clustering import ClusteringAnalyzer
 from .ml.predictive import PredictiveModels
 from .visualizations.data_prep import VisualizationDataPrep
+from .engines import ENGINES, crear_engine
+from .timing import SectionTimer
+
+
+def _seccion(func):
+    """Registra el método en self.timings (tiempo de pared, CPU y memoria)"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self.timings.seccion(func.__name__):
+            return func(self, *args, **kwargs)
+    return wrapper
 
 
 class AnalizadorAvanzado:
@@ -24,15 +37,38 @@ class AnalizadorAvanzado:
     - ClusteringAnalyzer: K-Means clustering y segmentación
     - PredictiveModels: Modelos predictivos y clasificación
     - VisualizationDataPrep: Preparación de datos para gráficos
+    
+    Cada sección queda medida en self.timings (ver SectionTimer.resumen()).
+    Usado como context manager (o con cerrar()) libera el engine alternativo
+    al terminar: la conexión DuckDB no queda abierta hasta el GC.
     """
     
-    def __init__(self, sesiones):
+    def __init__(self, sesiones, backend='pandas', medir_memoria=False):
         """
         Inicializa el analizador con las sesiones de los estudiantes
         
         Args:
             sesiones: Lista de objetos Sesion de SQLAlchemy
+            backend: 'pandas' (default), 'polars' o 'duckdb'. Si la dependencia
+                     no está instalada se usa pandas.
+            medir_memoria: Registrar el pico de memoria por sección (tracemalloc)
         """
+        self.timings = SectionTimer(memoria=medir_memoria)
+        try:
+            with self.timings.seccion('construccion_dataframe'):
+                self._construir_dataframe(sesiones)
+            
+            self._inicializar_modulos()
+            if backend != 'pandas':
+                with self.timings.seccion('construccion_engine'):
+                    self._engine = crear_engine(backend, self.df)
+        except Exception:
+            # El llamador no recibe el analizador: no puede detener tracemalloc
+            self.timings.detener()
+            raise
+    
+    def _construir_dataframe(self, sesiones):
+        """DataFrame de sesiones a partir de los objetos Sesion"""
         if not sesiones:
             self.df = pd.DataFrame()
         else:
@@ -45,8 +81,82 @@ class AnalizadorAvanzado:
                 'fecha': s.fecha,
                 'interacciones_ia': s.interacciones_ia
             } for s in sesiones])
+    
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Crea el analizador a partir de un DataFrame ya construido
+        
+        Args:
+            df: DataFrame con columnas estudiante_id, estudiante_nombre, maqueta,
+                tiempo_segundos, puntaje, fecha, interacciones_ia
+        """
+        analizador = cls.__new__(cls)
+        analizador.df = df if df is not None else pd.DataFrame()
+        analizador._inicializar_modulos()
+        return analizador
+    
+    @classmethod
+    def from_duckdb(cls, engine):
+        """Crea el analizador sobre un DuckDBEngine (ver from_engine)"""
+        return cls.from_engine(engine)
+    
+    @classmethod
+    def from_parquet_bundle(cls, bundle_dir, profesor_id=None, engine='pandas'):
+        """
+        Crea el analizador desde un bundle Parquet (flask export-parquet)
+        
+        Permite correr análisis pesados sin tocar la base de datos principal.
         
-        # Inicializar módulos especializados
+        Args:
+            bundle_dir: Directorio del bundle
+            profesor_id: Limitar a las sesiones de un profesor (opcional)
+            engine: 'pandas' (default), 'polars' o 'duckdb'
+        """
+        if engine in ENGINES:
+            return cls.from_engine(ENGINES[engine].from_parquet_bundle(bundle_dir, profesor_id))
+        
+        from .io import read_sesiones_dataframe
+        return cls.from_dataframe(read_sesiones_dataframe(bundle_dir, profesor_id))
+    
+    @classmethod
+    def from_engine(cls, engine):
+        """
+        Crea el analizador sobre un engine alternativo (DuckDBEngine, PolarsEngine)
+        
+        Las agregaciones que el engine implementa (estadísticas descriptivas,
+        análisis por maqueta, ranking y visualización) se ejecutan en él; el
+        resto de los módulos (correlaciones, insights, ML) usa el DataFrame
+        materializado.
+        
+        Args:
+            engine: Engine ya conectado a su fuente; el analizador lo cierra
+                    en cerrar()
+        """
+        analizador = cls.from_dataframe(engine.dataframe())
+        analizador._engine = engine
+        return analizador
+    
+    def cerrar(self):
+        """Cierra el engine alternativo (conexión DuckDB) y detiene la medición"""
+        engine, self._engine = self._engine, None
+        try:
+            if engine is not None:
+                engine.close()
+        finally:
+            self.timings.detener()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.cerrar()
+    
+    def _inicializar_modulos(self):
+        """Inicializa los módulos especializados sobre self.df"""
+        if not hasattr(self, 'timings'):
+            self.timings = SectionTimer()
+        self._engine = None
         self._estadisticas = EstadisticasAnalyzer(self.df)
         self._insights = InsightsGenerator(self.df)
         self._clustering = ClusteringAnalyzer(self.df)
@@ -57,18 +167,26 @@ class AnalizadorAvanzado:
     # MÉTODOS DE ESTADÍSTICAS DESCRIPTIVAS
     # ============================================
     
+    @_seccion
     def estadisticas_descriptivas(self):
         """Estadísticas descriptivas completas"""
+        if self._engine is not None:
+            return self._engine.estadisticas_descriptivas()
         return self._estadisticas.estadisticas_descriptivas()
     
+    @_seccion
     def analisis_por_maqueta(self):
         """Análisis detallado por tipo de maqueta"""
+        if self._engine is not None:
+            return self._engine.analisis_por_maqueta()
         return self._estadisticas.analisis_por_maqueta()
     
+    @_seccion
     def correlaciones_avanzadas(self):
         """Análisis de correlaciones con interpretaciones"""
         return self._estadisticas.correlaciones_avanzadas()
     
+    @_seccion
     def correlaciones_con_pvalues(self):
         """Análisis de correlaciones profesional con p-values"""
         return self._estadisticas.correlaciones_con_pvalues()
@@ -77,26 +195,33 @@ class AnalizadorAvanzado:
     # MÉTODOS DE INSIGHTS Y RANKINGS
     # ============================================
     
+    @_seccion
     def generar_insights(self):
         """Genera insights automáticos basados en los datos"""
         return self._insights.generar_insights()
     
+    @_seccion
     def estudiantes_en_riesgo(self, threshold_puntaje=4):
         """Identifica estudiantes que necesitan atención"""
         return self._insights.estudiantes_en_riesgo(threshold_puntaje)
     
+    @_seccion
     def ranking_estudiantes(self, top_n=10):
         """Ranking de estudiantes por rendimiento global"""
+        if self._engine is not None:
+            return self._engine.ranking_estudiantes(top_n)
         return self._insights.ranking_estudiantes(top_n)
     
     # ============================================
     # MÉTODOS DE MACHINE LEARNING - CLUSTERING
     # ============================================
     
+    @_seccion
     def clustering_estudiantes(self, n_clusters=3):
         """Agrupa estudiantes por patrones de comportamiento usando K-Means"""
         return self._clustering.clustering_estudiantes(n_clusters)
     
+    @_seccion
     def kmeans_clustering_profesional(self, n_clusters=3):
         """K-Means Clustering profesional con análisis de silueta"""
         return self._clustering.kmeans_clustering_profesional(n_clusters)
@@ -105,10 +230,12 @@ class AnalizadorAvanzado:
     # MÉTODOS DE MACHINE LEARNING - PREDICTIVO
     # ============================================
     
+    @_seccion
     def prediccion_rendimiento(self):
         """Modelo predictivo simple de rendimiento"""
         return self._predictive.prediccion_rendimiento()
     
+    @_seccion
     def clasificacion_binaria_aprobacion(self):
         """Clasificación binaria: Predice si un estudiante aprobará"""
         return self._predictive.clasificacion_binaria_aprobacion()
@@ -117,8 +244,11 @@ class AnalizadorAvanzado:
     # MÉTODOS DE VISUALIZACIÓN
     # ============================================
     
+    @_seccion
     def datos_para_visualizacion(self):
         """Prepara datos optimizados para gráficos"""
+        if self._engine is not None:
+            return self._engine.datos_para_visualizacion()
         return self._visualization.datos_para_visualizacion()
     
     # ============================================
@@ -128,6 +128,18 @@ class InsightsGenerator:
             'interacciones_ia': 'mean'
         }).reset_index()
         
+        return self.formatear_ranking(ranking, top_n)
+    
+    @staticmethod
+    def formatear_ranking(ranking: pd.DataFrame, top_n: int = 10) -> list:
+        """
+        Calcula la puntuación compuesta y el top N desde los promedios por estudiante
+        
+        Args:
+            ranking: DataFrame (ordenado por estudiante_id, estudiante_nombre) con
+                     puntaje, tiempo_segundos e interacciones_ia promedio
+            top_n: Cantidad de estudiantes a retornar
+        """
         # Puntuación compuesta
         # Normalizar tiempo (menor es mejor)
         max_tiempo = ranking['tiempo_segundos'].max()
@@ -3,6 +3,7 @@ Módulo de Estadísticas y Análisis Descriptivo
 Responsable de: estadísticas descriptivas, análisis por maqueta, correlaciones
 """
 
+import numpy as np
 import pandas as pd
 from scipy import stats
 from ..utils.converters import convert_to_native_types
@@ -23,35 +24,65 @@ class EstadisticasAnalyzer:
         if self.df.empty:
             return {}
         
-        tasa_aprob = (self.df['puntaje'] >= 4).sum() / len(self.df) * 100
+        puntaje = self.df['puntaje']
+        tiempo = self.df['tiempo_segundos']
+        return self.formatear_descriptivas({
+            'total': len(self.df),
+            'estudiantes': self.df['estudiante_id'].nunique(),
+            'aprobadas': (puntaje >= 4).sum(),
+            'puntaje_mean': puntaje.mean(),
+            'puntaje_median': puntaje.median(),
+            'puntaje_std': puntaje.std(),
+            'puntaje_var': puntaje.var(),
+            'puntaje_max': puntaje.max(),
+            'puntaje_min': puntaje.min(),
+            'puntaje_q1': puntaje.quantile(0.25),
+            'puntaje_q2': puntaje.quantile(0.50),
+            'puntaje_q3': puntaje.quantile(0.75),
+            'tiempo_mean': tiempo.mean(),
+            'tiempo_median': tiempo.median(),
+            'tiempo_q1': tiempo.quantile(0.25),
+            'tiempo_q3': tiempo.quantile(0.75),
+        })
+    
+    @staticmethod
+    def formatear_descriptivas(agregados: dict) -> dict:
+        """
+        Arma la respuesta de estadisticas_descriptivas desde los agregados crudos
+        
+        Compartido con los engines alternativos (p.ej. DuckDB) para que el JSON
+        resultante sea idéntico sin importar dónde se calcularon los agregados.
+        """
+        a = {k: (v if v is None or pd.isna(v) else np.float64(v)) for k, v in agregados.items()}
+        tasa_aprob = a['aprobadas'] / a['total'] * 100
         
         # Manejar desviación estándar con 1 sola sesión (retorna NaN)
-        std_puntaje = self.df['puntaje'].std()
+        std_puntaje = a['puntaje_std']
         desviacion_puntaje = 0.0 if pd.isna(std_puntaje) else float(round(std_puntaje, 2))
         
-        var_puntaje = self.df['puntaje'].var()
+        var_puntaje = a['puntaje_var']
         varianza_puntaje = 0.0 if pd.isna(var_puntaje) else float(round(var_puntaje, 2))
         
         stats_dict = {
             'general': {
-                'total_sesiones': int(len(self.df)),
-                'total_estudiantes': int(self.df['estudiante_id'].nunique()),
-                'promedio_puntaje': float(round(self.df['puntaje'].mean(), 2)),
-                'mediana_puntaje': float(self.df['puntaje'].median()),
+                'total_sesiones': int(a['total']),
+                'total_estudiantes': int(a['estudiantes']),
+                'promedio_puntaje': float(round(a['puntaje_mean'], 2)),
+                'mediana_puntaje': float(a['puntaje_median']),
                 'desviacion_puntaje': desviacion_puntaje,
                 'varianza_puntaje': varianza_puntaje,
-                'promedio_tiempo_segundos': float(round(self.df['tiempo_segundos'].mean(), 2)),
-                'mediana_tiempo_segundos': float(round(self.df['tiempo_segundos'].median(), 2)),
+                'promedio_tiempo_segundos': float(round(a['tiempo_mean'], 2)),
+                'mediana_tiempo_segundos': float(round(a['tiempo_median'], 2)),
                 'tasa_aprobacion': float(round(tasa_aprob, 2)),
-                'mejor_puntaje': int(self.df['puntaje'].max()),
-                'peor_puntaje': int(self.df['puntaje'].min()),
+                'mejor_puntaje': int(a['puntaje_max']),
+                'peor_puntaje': int(a['puntaje_min']),
             },
             'cuartiles': {
-                'Q1_puntaje': float(self.df['puntaje'].quantile(0.25)),
-                'Q2_puntaje': float(self.df['puntaje'].quantile(0.50)),
-                'Q3_puntaje': float(self.df['puntaje'].quantile(0.75)),
-                'Q1_tiempo': float(round(self.df['tiempo_segundos'].quantile(0.25), 2)),
-                'Q3_tiempo': float(round(self.df['tiempo_segundos'].quantile(0.75), 2)),
+                'Q1_puntaje': float(a['puntaje_q1']),
+                'Q2_puntaje': float(a['puntaje_q2']),
+                'Q3_puntaje': float(a['puntaje_q3']),
+                'Q1_tiempo': float(round(a['tiempo_q1'], 2)),
+                'Q3_tiempo': float(round(a['tiempo_q3'], 2)),
             }
         }
         
@@ -70,31 +101,49 @@ class EstadisticasAnalyzer:
         }
         
         grouped = self.df.groupby('maqueta').agg(agg_dict)
+        aprobadas = (self.df['puntaje'] >= 4).groupby(self.df['maqueta']).sum()
         
+        return self.formatear_maquetas([{
+            'maqueta': maqueta,
+            'total': grouped.loc[maqueta, ('puntaje', 'count')],
+            'aprobadas': aprobadas.loc[maqueta],
+            'puntaje_mean': grouped.loc[maqueta, ('puntaje', 'mean')],
+            'puntaje_median': grouped.loc[maqueta, ('puntaje', 'median')],
+            'puntaje_std': grouped.loc[maqueta, ('puntaje', 'std')],
+            'tiempo_mean': grouped.loc[maqueta, ('tiempo_segundos', 'mean')],
+            'ia_mean': grouped.loc[maqueta, ('interacciones_ia', 'mean')],
+        } for maqueta in grouped.index])
+    
+    @classmethod
+    def formatear_maquetas(cls, filas: list) -> dict:
+        """
+        Arma la respuesta de analisis_por_maqueta desde agregados por maqueta
+        
+        Args:
+            filas: Lista (ordenada por maqueta) de dicts con total, aprobadas,
+                   puntaje_mean/median/std, tiempo_mean e ia_mean
+        """
         maquetas = {}
-        for maqueta in grouped.index:
-            row = grouped.loc[maqueta]
-            
-            total = int(row[('puntaje', 'count')])
-            promedio = float(row[('puntaje', 'mean')])
+        for row in filas:
+            total = int(row['total'])
+            promedio = float(row['puntaje_mean'])
             
             # Manejar desviación estándar con 1 sola sesión (retorna NaN)
-            std_puntaje = row[('puntaje', 'std')]
-            desviacion = 0.0 if pd.isna(std_puntaje) else round(float(std_puntaje), 2)
+            std_puntaje = row['puntaje_std']
+            desviacion = 0.0 if std_puntaje is None or pd.isna(std_puntaje) else round(float(std_puntaje), 2)
             
-            # Calcular tasa de aprobación para esta maqueta
-            mask = self.df['maqueta'] == maqueta
-            tasa_aprobacion = (self.df.loc[mask, 'puntaje'] >= 4).sum() / total * 100
+            # Tasa de aprobación para esta maqueta
+            tasa_aprobacion = np.int64(row['aprobadas']) / total * 100
             
-            maquetas[str(maqueta)] = {
+            maquetas[str(row['maqueta'])] = {
                 'total_intentos': total,
                 'promedio_puntaje': round(promedio, 2),
-                'mediana_puntaje': float(row[('puntaje', 'median')]),
+                'mediana_puntaje': float(row['puntaje_median']),
                 'desviacion_puntaje': desviacion,
-                'promedio_tiempo_segundos': round(float(row[('tiempo_segundos', 'mean')]), 2),
+                'promedio_tiempo_segundos': round(float(row['tiempo_mean']), 2),
                 'tasa_aprobacion': round(tasa_aprobacion, 2),
-                'promedio_interacciones_ia': round(float(row[('interacciones_ia', 'mean')]), 2),
-                'nivel_dificultad': self._calcular_dificultad(promedio, float(row[('tiempo_segundos', 'mean')]))
+                'promedio_interacciones_ia': round(float(row['ia_mean']), 2),
+                'nivel_dificultad': cls._calcular_dificultad(promedio, float(row['tiempo_mean']))
             }
         
         return convert_to_native_types(maquetas)
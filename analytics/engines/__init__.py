@@ -0,0 +1,52 @@
+"""
+Engines alternativos de ejecución para AnalizadorAvanzado
+
+El backend se elige por nombre ('pandas', 'polars', 'duckdb'); si la
+dependencia opcional no está instalada se cae a pandas automáticamente.
+"""
+
+import logging
+
+from .duckdb_engine import DuckDBEngine, EngineError, DUCKDB_AVAILABLE
+from .polars_engine import PolarsEngine, POLARS_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+BACKEND_PANDAS = 'pandas'
+ENGINES = {
+    'duckdb': DuckDBEngine,
+    'polars': PolarsEngine,
+}
+BACKENDS = (BACKEND_PANDAS,) + tuple(ENGINES)
+
+
+def crear_engine(backend, df):
+    """
+    Crea el engine del backend pedido sobre el DataFrame de sesiones
+
+    Args:
+        backend: Nombre del backend (ver BACKENDS)
+        df: DataFrame de sesiones ya construido
+
+    Returns:
+        Engine, o None si el backend es pandas o no está disponible (fallback)
+    """
+    if not backend or backend == BACKEND_PANDAS:
+        return None
+
+    engine_cls = ENGINES.get(backend)
+    if engine_cls is None:
+        logger.warning(f"Backend de analytics desconocido '{backend}', usando pandas")
+        return None
+
+    try:
+        return engine_cls.from_dataframe(df)
+    except EngineError as e:
+        logger.warning(f"Backend '{backend}' no disponible ({e}), usando pandas")
+        return None
+
+
+__all__ = [
+    'DuckDBEngine', 'PolarsEngine', 'EngineError', 'DUCKDB_AVAILABLE', 'POLARS_AVAILABLE',
+    'BACKENDS', 'crear_engine'
+]
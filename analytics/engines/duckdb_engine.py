@@ -0,0 +1,296 @@
+"""
+Engine DuckDB - Agregaciones de AnalizadorAvanzado como SQL vectorizado
+
+Ejecuta en DuckDB embebido (multi-hilo, columnar) las agregaciones más
+costosas del análisis: estadísticas descriptivas, análisis por maqueta,
+ranking y datos de visualización. El formateo final reutiliza los mismos
+helpers que el camino pandas, por lo que el JSON resultante es idéntico.
+
+Fuentes soportadas:
+- Bundle Parquet de `flask export-parquet` (lectura directa, con poda de particiones)
+- Base SQLite de la app (ATTACH vía la extensión sqlite de DuckDB)
+- DataFrame en memoria
+
+duckdb es opcional: sin él, el módulo se importa pero crear el engine lanza EngineError.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    duckdb = None
+    DUCKDB_AVAILABLE = False
+
+from ..core.insights import InsightsGenerator
+from ..core.statistics import EstadisticasAnalyzer
+from ..utils.converters import convert_to_native_types
+from ..visualizations.data_prep import VisualizationDataPrep
+
+
+COLUMNAS_SESIONES = [
+    'estudiante_id', 'estudiante_nombre', 'maqueta', 'tiempo_segundos',
+    'puntaje', 'fecha', 'interacciones_ia'
+]
+
+
+class EngineError(RuntimeError):
+    """Error al crear o consultar un engine de análisis"""
+
+
+def _literal(valor: str) -> str:
+    """Escapa un string como literal SQL (rutas de archivos)"""
+    return "'" + str(valor).replace("'", "''") + "'"
+
+
+class DuckDBEngine:
+    """
+    Agregaciones de sesiones sobre DuckDB
+
+    Todas las consultas se hacen sobre la vista `sesiones`, que expone las
+    columnas de COLUMNAS_SESIONES más `_fila` (orden estable por fecha, id).
+    """
+
+    def __init__(self, conexion, threads: Optional[int] = None):
+        """
+        Args:
+            conexion: Conexión DuckDB con la vista `sesiones` ya creada
+            threads: Hilos de ejecución (None = todos los cores)
+        """
+        self.con = conexion
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+    # ============================================
+    # CONSTRUCTORES POR FUENTE
+    # ============================================
+
+    @staticmethod
+    def _conectar():
+        if not DUCKDB_AVAILABLE:
+            raise EngineError("duckdb no está instalado (pip install duckdb)")
+        return duckdb.connect(database=':memory:')
+
+    @classmethod
+    def from_parquet_bundle(cls, bundle_dir: str, profesor_id: Optional[int] = None,
+                            threads: Optional[int] = None) -> 'DuckDBEngine':
+        """
+        Lee un bundle Parquet sin cargarlo en memoria
+
+        Args:
+            bundle_dir: Directorio del bundle (flask export-parquet)
+            profesor_id: Limitar a un profesor (poda de particiones hive)
+            threads: Hilos de ejecución
+        """
+        from ..io.parquet_bundle import read_manifest
+
+        read_manifest(bundle_dir)
+        con = cls._conectar()
+        sesiones_glob = os.path.join(bundle_dir, 'sesion', '**', '*.parquet')
+        estudiantes = os.path.join(bundle_dir, 'estudiante', 'part-0.parquet')
+        filtro = f"WHERE s.profesor_id = {_literal(int(profesor_id))}" if profesor_id is not None else ''
+
+        if not os.path.isdir(os.path.join(bundle_dir, 'sesion')):
+            con.execute(cls._vista_vacia())
+        else:
+            con.execute(f"""
+                CREATE VIEW sesiones AS
+                SELECT s.estudiante_id, e.nombre AS estudiante_nombre, s.maqueta,
+                       s.tiempo_segundos, s.puntaje, s.fecha, s.interacciones_ia,
+                       row_number() OVER (ORDER BY s.fecha, s.id) AS _fila
+                FROM read_parquet({_literal(sesiones_glob)}, hive_partitioning = true,
+                                  hive_types_autocast = false) s
+                LEFT JOIN read_parquet({_literal(estudiantes)}) e ON e.id = s.estudiante_id
+                {filtro}
+            """)
+        return cls(con, threads)
+
+    @classmethod
+    def from_sqlite(cls, db_path: str, profesor_id: Optional[int] = None,
+                    threads: Optional[int] = None) -> 'DuckDBEngine':
+        """
+        Adjunta la base SQLite de la app en modo solo lectura
+
+        Requiere la extensión sqlite de DuckDB (se instala la primera vez).
+
+        Args:
+            db_path: Ruta al archivo SQLite
+            profesor_id: Limitar a un profesor
+            threads: Hilos de ejecución
+        """
+        con = cls._conectar()
+        try:
+            con.execute("INSTALL sqlite")
+            con.execute("LOAD sqlite")
+            con.execute(f"ATTACH {_literal(db_path)} AS app (TYPE sqlite, READ_ONLY)")
+        except duckdb.Error as e:
+            raise EngineError(f"No se pudo adjuntar la base SQLite: {e}") from e
+
+        filtro = f"WHERE s.profesor_id = {int(profesor_id)}" if profesor_id is not None else ''
+        con.execute(f"""
+            CREATE VIEW sesiones AS
+            SELECT s.estudiante_id, e.nombre AS estudiante_nombre, s.maqueta,
+                   s.tiempo_segundos, s.puntaje, s.fecha, s.interacciones_ia,
+                   row_number() OVER (ORDER BY s.fecha, s.id) AS _fila
+            FROM app.sesion s
+            LEFT JOIN app.estudiante e ON e.id = s.estudiante_id
+            {filtro}
+        """)
+        return cls(con, threads)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, threads: Optional[int] = None) -> 'DuckDBEngine':
+        """Consulta un DataFrame en memoria (sin copiarlo) conservando su orden"""
+        con = cls._conectar()
+        if df is None or df.empty:
+            con.execute(cls._vista_vacia())
+        else:
+            con.register('_sesiones_df', df[COLUMNAS_SESIONES].assign(_fila=range(len(df))))
+            con.execute("CREATE VIEW sesiones AS SELECT * FROM _sesiones_df")
+        return cls(con, threads)
+
+    @staticmethod
+    def _vista_vacia() -> str:
+        return """
+            CREATE VIEW sesiones AS
+            SELECT NULL::BIGINT AS estudiante_id, NULL::VARCHAR AS estudiante_nombre,
+                   NULL::VARCHAR AS maqueta, NULL::BIGINT AS tiempo_segundos,
+                   NULL::DOUBLE AS puntaje, NULL::TIMESTAMP AS fecha,
+                   NULL::BIGINT AS interacciones_ia, NULL::BIGINT AS _fila
+            WHERE false
+        """
+
+    # ============================================
+    # HELPERS
+    # ============================================
+
+    def _filas(self, sql: str) -> List[Dict[str, Any]]:
+        cursor = self.con.execute(sql)
+        columnas = [d[0] for d in cursor.description]
+        return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+    @property
+    def total_sesiones(self) -> int:
+        return self.con.execute("SELECT count(*) FROM sesiones").fetchone()[0]
+
+    def dataframe(self) -> pd.DataFrame:
+        """Materializa las sesiones como DataFrame (para los módulos sin versión SQL)"""
+        df = self.con.execute(
+            f"SELECT {', '.join(COLUMNAS_SESIONES)} FROM sesiones ORDER BY _fila"
+        ).df()
+        return df if not df.empty else pd.DataFrame()
+
+    # ============================================
+    # ANÁLISIS
+    # ============================================
+
+    def estadisticas_descriptivas(self) -> Dict[str, Any]:
+        """Equivalente SQL de EstadisticasAnalyzer.estadisticas_descriptivas"""
+        if self.total_sesiones == 0:
+            return {}
+
+        agregados = self._filas("""
+            SELECT count(*) AS total,
+                   count(DISTINCT estudiante_id) AS estudiantes,
+                   count(*) FILTER (WHERE puntaje >= 4) AS aprobadas,
+                   avg(puntaje) AS puntaje_mean,
+                   quantile_cont(puntaje, 0.5) AS puntaje_median,
+                   stddev_samp(puntaje) AS puntaje_std,
+                   var_samp(puntaje) AS puntaje_var,
+                   max(puntaje) AS puntaje_max,
+                   min(puntaje) AS puntaje_min,
+                   quantile_cont(puntaje, 0.25) AS puntaje_q1,
+                   quantile_cont(puntaje, 0.50) AS puntaje_q2,
+                   quantile_cont(puntaje, 0.75) AS puntaje_q3,
+                   avg(tiempo_segundos) AS tiempo_mean,
+                   quantile_cont(tiempo_segundos, 0.5) AS tiempo_median,
+                   quantile_cont(tiempo_segundos, 0.25) AS tiempo_q1,
+                   quantile_cont(tiempo_segundos, 0.75) AS tiempo_q3
+            FROM sesiones
+        """)[0]
+        return EstadisticasAnalyzer.formatear_descriptivas(agregados)
+
+    def analisis_por_maqueta(self) -> Dict[str, Any]:
+        """Equivalente SQL de EstadisticasAnalyzer.analisis_por_maqueta"""
+        filas = self._filas("""
+            SELECT maqueta,
+                   count(puntaje) AS total,
+                   count(*) FILTER (WHERE puntaje >= 4) AS aprobadas,
+                   avg(puntaje) AS puntaje_mean,
+                   quantile_cont(puntaje, 0.5) AS puntaje_median,
+                   stddev_samp(puntaje) AS puntaje_std,
+                   avg(tiempo_segundos) AS tiempo_mean,
+                   avg(interacciones_ia) AS ia_mean
+            FROM sesiones
+            GROUP BY maqueta
+            ORDER BY maqueta
+        """)
+        return EstadisticasAnalyzer.formatear_maquetas(filas) if filas else {}
+
+    def ranking_estudiantes(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        """Equivalente SQL de InsightsGenerator.ranking_estudiantes"""
+        ranking = self.con.execute("""
+            SELECT estudiante_id, estudiante_nombre,
+                   avg(puntaje) AS puntaje,
+                   avg(tiempo_segundos) AS tiempo_segundos,
+                   avg(interacciones_ia) AS interacciones_ia
+            FROM sesiones
+            GROUP BY estudiante_id, estudiante_nombre
+            ORDER BY estudiante_id, estudiante_nombre
+        """).df()
+        if ranking.empty:
+            return []
+        return InsightsGenerator.formatear_ranking(ranking, top_n)
+
+    def datos_para_visualizacion(self) -> Dict[str, Any]:
+        """Equivalente SQL de VisualizationDataPrep.datos_para_visualizacion"""
+        if self.total_sesiones == 0:
+            return {}
+
+        distribucion = self.con.execute(
+            "SELECT puntaje, count(*) FROM sesiones GROUP BY puntaje ORDER BY puntaje"
+        ).fetchall()
+        por_maqueta = self._filas("""
+            SELECT maqueta, avg(puntaje) AS puntaje, avg(tiempo_segundos) AS tiempo
+            FROM sesiones GROUP BY maqueta ORDER BY maqueta
+        """)
+        tendencia = self.con.execute("""
+            WITH diario AS (
+                SELECT date_trunc('day', fecha) AS dia, avg(puntaje) AS promedio
+                FROM sesiones WHERE fecha IS NOT NULL GROUP BY 1
+            ), dias AS (
+                SELECT unnest(generate_series(min(dia), max(dia), INTERVAL 1 DAY)) AS dia FROM diario
+            )
+            SELECT dias.dia, diario.promedio
+            FROM dias LEFT JOIN diario USING (dia)
+            ORDER BY dias.dia
+        """).fetchall()
+        scatter = self.con.execute("""
+            SELECT list(tiempo_segundos ORDER BY _fila), list(puntaje ORDER BY _fila),
+                   list(maqueta ORDER BY _fila), list(estudiante_nombre ORDER BY _fila)
+            FROM sesiones
+        """).fetchone()
+
+        result = {
+            'distribucion_puntajes': {puntaje: total for puntaje, total in distribucion},
+            'puntajes_por_maqueta': {f['maqueta']: f['puntaje'] for f in por_maqueta},
+            'tiempos_por_maqueta': {f['maqueta']: f['tiempo'] for f in por_maqueta},
+            'tendencia_temporal': VisualizationDataPrep.formatear_tendencia(
+                [dia for dia, _ in tendencia], [promedio for _, promedio in tendencia]
+            ),
+            'scatter_tiempo_puntaje': {
+                'tiempo': scatter[0],
+                'puntaje': scatter[1],
+                'maqueta': scatter[2],
+                'estudiante': scatter[3]
+            }
+        }
+        return convert_to_native_types(result)
+
+    def close(self):
+        """Cierra la conexión DuckDB"""
+        self.con.close()
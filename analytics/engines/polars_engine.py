@@ -0,0 +1,209 @@
+"""
+Engine Polars - Agregaciones de AnalizadorAvanzado sobre LazyFrames
+
+Las consultas se arman como LazyFrames sobre la misma fuente y se ejecutan
+juntas con `pl.collect_all`: el optimizador de Polars comparte el escaneo,
+fusiona filtros/group-bys y paraleliza en todos los cores. El formateo final
+reutiliza los helpers del camino pandas, por lo que el JSON es idéntico.
+
+polars es opcional: sin él, el módulo se importa pero crear el engine lanza EngineError.
+"""
+
+import os
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    pl = None
+    POLARS_AVAILABLE = False
+
+from .duckdb_engine import COLUMNAS_SESIONES, EngineError
+from ..core.insights import InsightsGenerator
+from ..core.statistics import EstadisticasAnalyzer
+from ..utils.converters import convert_to_native_types
+from ..visualizations.data_prep import VisualizationDataPrep
+
+
+class PolarsEngine:
+    """Agregaciones de sesiones sobre un LazyFrame de Polars"""
+
+    def __init__(self, lazy_frame: 'pl.LazyFrame'):
+        """
+        Args:
+            lazy_frame: LazyFrame con las columnas de COLUMNAS_SESIONES
+        """
+        self.lf = lazy_frame
+        self._total = None
+
+    @staticmethod
+    def _requerir_polars():
+        if not POLARS_AVAILABLE:
+            raise EngineError("polars no está instalado (pip install polars)")
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'PolarsEngine':
+        """Crea el engine desde el DataFrame pandas del analizador"""
+        cls._requerir_polars()
+        if df is None or df.empty:
+            return cls(pl.LazyFrame(schema={c: pl.Null for c in COLUMNAS_SESIONES}))
+        return cls(pl.from_pandas(df[COLUMNAS_SESIONES]).lazy())
+
+    @classmethod
+    def from_parquet_bundle(cls, bundle_dir: str, profesor_id: Optional[int] = None) -> 'PolarsEngine':
+        """
+        Escanea un bundle Parquet de forma perezosa (sin cargarlo entero)
+
+        Args:
+            bundle_dir: Directorio del bundle (flask export-parquet)
+            profesor_id: Limitar a un profesor (poda de particiones hive)
+        """
+        from ..io.parquet_bundle import read_manifest
+
+        cls._requerir_polars()
+        if read_manifest(bundle_dir)['filas'].get('sesion', 0) == 0:
+            return cls.from_dataframe(pd.DataFrame())
+
+        sesiones = pl.scan_parquet(
+            os.path.join(bundle_dir, 'sesion', '**', '*.parquet'),
+            hive_partitioning=True, hive_schema={'profesor_id': pl.String, 'mes': pl.String},
+        )
+        if profesor_id is not None:
+            sesiones = sesiones.filter(pl.col('profesor_id') == str(int(profesor_id)))
+
+        estudiantes = pl.scan_parquet(os.path.join(bundle_dir, 'estudiante', 'part-0.parquet')).select(
+            pl.col('id').alias('estudiante_id'), pl.col('nombre').alias('estudiante_nombre')
+        )
+        lf = (
+            sesiones.join(estudiantes, on='estudiante_id', how='left')
+            .sort(['fecha', 'id'])
+            .select(COLUMNAS_SESIONES)
+        )
+        return cls(lf)
+
+    # ============================================
+    # HELPERS
+    # ============================================
+
+    @property
+    def total_sesiones(self) -> int:
+        if self._total is None:
+            self._total = self.lf.select(pl.len()).collect().item()
+        return self._total
+
+    def dataframe(self) -> pd.DataFrame:
+        """Materializa las sesiones como DataFrame pandas (para los módulos sin versión Polars)"""
+        df = self.lf.collect()
+        if df.height == 0:
+            return pd.DataFrame()
+        return pd.DataFrame(df.to_dict(as_series=False))
+
+    @staticmethod
+    def _por_maqueta() -> List['pl.Expr']:
+        return [
+            pl.col('puntaje').count().alias('total'),
+            (pl.col('puntaje') >= 4).sum().alias('aprobadas'),
+            pl.col('puntaje').mean().alias('puntaje_mean'),
+            pl.col('puntaje').median().alias('puntaje_median'),
+            pl.col('puntaje').std().alias('puntaje_std'),
+            pl.col('tiempo_segundos').mean().alias('tiempo_mean'),
+            pl.col('interacciones_ia').mean().alias('ia_mean'),
+        ]
+
+    # ============================================
+    # ANÁLISIS
+    # ============================================
+
+    def estadisticas_descriptivas(self) -> Dict[str, Any]:
+        """Equivalente Polars de EstadisticasAnalyzer.estadisticas_descriptivas"""
+        if self.total_sesiones == 0:
+            return {}
+
+        puntaje, tiempo = pl.col('puntaje'), pl.col('tiempo_segundos')
+        agregados = self.lf.select(
+            pl.len().alias('total'),
+            pl.col('estudiante_id').n_unique().alias('estudiantes'),
+            (puntaje >= 4).sum().alias('aprobadas'),
+            puntaje.mean().alias('puntaje_mean'),
+            puntaje.median().alias('puntaje_median'),
+            puntaje.std().alias('puntaje_std'),
+            puntaje.var().alias('puntaje_var'),
+            puntaje.max().alias('puntaje_max'),
+            puntaje.min().alias('puntaje_min'),
+            puntaje.quantile(0.25, 'linear').alias('puntaje_q1'),
+            puntaje.quantile(0.50, 'linear').alias('puntaje_q2'),
+            puntaje.quantile(0.75, 'linear').alias('puntaje_q3'),
+            tiempo.mean().alias('tiempo_mean'),
+            tiempo.median().alias('tiempo_median'),
+            tiempo.quantile(0.25, 'linear').alias('tiempo_q1'),
+            tiempo.quantile(0.75, 'linear').alias('tiempo_q3'),
+        ).collect().row(0, named=True)
+        return EstadisticasAnalyzer.formatear_descriptivas(agregados)
+
+    def analisis_por_maqueta(self) -> Dict[str, Any]:
+        """Equivalente Polars de EstadisticasAnalyzer.analisis_por_maqueta"""
+        filas = self.lf.group_by('maqueta').agg(self._por_maqueta()).sort('maqueta').collect()
+        return EstadisticasAnalyzer.formatear_maquetas(filas.to_dicts()) if filas.height else {}
+
+    def ranking_estudiantes(self, top_n: int = 10) -> List[Dict[str, Any]]:
+        """Equivalente Polars de InsightsGenerator.ranking_estudiantes"""
+        claves = ['estudiante_id', 'estudiante_nombre']
+        ranking = (
+            self.lf.group_by(claves)
+            .agg(pl.col('puntaje').mean(), pl.col('tiempo_segundos').mean(), pl.col('interacciones_ia').mean())
+            .sort(claves)
+            .collect()
+        )
+        if ranking.height == 0:
+            return []
+        return InsightsGenerator.formatear_ranking(pd.DataFrame(ranking.to_dict(as_series=False)), top_n)
+
+    def datos_para_visualizacion(self) -> Dict[str, Any]:
+        """Equivalente Polars de VisualizationDataPrep.datos_para_visualizacion"""
+        if self.total_sesiones == 0:
+            return {}
+
+        # Se ejecutan juntas: un solo plan con el escaneo de la fuente compartido
+        distribucion, por_maqueta, diario, scatter = pl.collect_all([
+            self.lf.group_by('puntaje').agg(pl.len().alias('total')).sort('puntaje'),
+            self.lf.group_by('maqueta').agg(
+                pl.col('puntaje').mean(), pl.col('tiempo_segundos').mean()
+            ).sort('maqueta'),
+            self.lf.drop_nulls('fecha')
+                .group_by(pl.col('fecha').dt.truncate('1d').alias('dia'))
+                .agg(pl.col('puntaje').mean().alias('promedio'))
+                .sort('dia'),
+            self.lf.select('tiempo_segundos', 'puntaje', 'maqueta', 'estudiante_nombre'),
+        ])
+
+        dias, promedios = [], []
+        if diario.height:
+            por_dia = dict(zip(diario['dia'].to_list(), diario['promedio'].to_list()))
+            dia, ultimo = diario['dia'][0], diario['dia'][-1]
+            while dia <= ultimo:
+                dias.append(dia)
+                promedios.append(por_dia.get(dia))
+                dia += timedelta(days=1)
+
+        result = {
+            'distribucion_puntajes': dict(zip(distribucion['puntaje'].to_list(), distribucion['total'].to_list())),
+            'puntajes_por_maqueta': dict(zip(por_maqueta['maqueta'].to_list(), por_maqueta['puntaje'].to_list())),
+            'tiempos_por_maqueta': dict(
+                zip(por_maqueta['maqueta'].to_list(), por_maqueta['tiempo_segundos'].to_list())
+            ),
+            'tendencia_temporal': VisualizationDataPrep.formatear_tendencia(dias, promedios),
+            'scatter_tiempo_puntaje': {
+                'tiempo': scatter['tiempo_segundos'].to_list(),
+                'puntaje': scatter['puntaje'].to_list(),
+                'maqueta': scatter['maqueta'].to_list(),
+                'estudiante': scatter['estudiante_nombre'].to_list()
+            }
+        }
+        return convert_to_native_types(result)
+
+    def close(self):
+        """Compatibilidad con DuckDBEngine (Polars no mantiene conexiones)"""
@@ -0,0 +1,11 @@
+"""Lectura/escritura de bundles de datos offline (Parquet/Arrow)"""
+
+from .parquet_bundle import (
+    BundleError, PYARROW_AVAILABLE, TABLAS, COLUMNAS,
+    write_bundle, read_manifest, read_sesiones_dataframe
+)
+
+__all__ = [
+    'BundleError', 'PYARROW_AVAILABLE', 'TABLAS', 'COLUMNAS',
+    'write_bundle', 'read_manifest', 'read_sesiones_dataframe'
+]
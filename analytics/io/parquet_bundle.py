@@ -0,0 +1,214 @@
+"""
+Bundle Parquet - Snapshot columnar del dataset para análisis offline
+
+Estructura del bundle:
+
+    <bundle>/
+        manifest.json
+        sesion/profesor_id=<id>/mes=<YYYY-MM>/part-<lote>-0.parquet
+        estudiante/part-0.parquet
+        profesor/part-0.parquet
+        estudiante_profesor/part-0.parquet
+
+La escritura se hace por lotes de Arrow RecordBatch (memoria acotada por el
+tamaño de lote) y la lectura usa memory-map + pushdown de filtros de partición,
+de modo que un análisis por profesor solo toca sus archivos.
+
+pyarrow es opcional: sin él, el módulo se importa pero write/read lanzan BundleError.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - depende del entorno
+    pa = ds = pq = None
+    PYARROW_AVAILABLE = False
+
+
+BUNDLE_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+PARTICION_NULA = '__sin_profesor__'
+
+# Columnas exportadas por tabla. Nunca se exportan password ni reset_token*.
+_TIPOS = {
+    'sesion': [
+        # profesor_id y mes son columnas de partición hive (string; sin profesor → PARTICION_NULA)
+        ('id', 'int64'), ('estudiante_id', 'int64'), ('profesor_id', 'string'),
+        ('maqueta', 'string'), ('tiempo_segundos', 'int64'), ('puntaje', 'float64'),
+        ('fecha', 'timestamp'), ('respuestas_detalle', 'string'), ('interacciones_ia', 'int64'),
+        ('mes', 'string'),
+    ],
+    'estudiante': [
+        ('id', 'int64'), ('nombre', 'string'), ('codigo', 'string'), ('email', 'string'),
+        ('nivel_habilidad', 'int64'), ('fecha_registro', 'timestamp'),
+    ],
+    'profesor': [
+        ('id', 'int64'), ('nombre', 'string'), ('email', 'string'),
+        ('institucion', 'string'), ('fecha_registro', 'timestamp'),
+    ],
+    'estudiante_profesor': [
+        ('estudiante_id', 'int64'), ('profesor_id', 'int64'), ('fecha_inscripcion', 'timestamp'),
+    ],
+}
+
+TABLAS = tuple(_TIPOS)
+COLUMNAS = {tabla: [nombre for nombre, _ in tipos] for tabla, tipos in _TIPOS.items()}
+
+# Columnas que necesita AnalizadorAvanzado
+COLUMNAS_ANALISIS = [
+    'estudiante_id', 'maqueta', 'tiempo_segundos', 'puntaje', 'fecha', 'interacciones_ia'
+]
+
+
+class BundleError(RuntimeError):
+    """Error al escribir o leer un bundle Parquet"""
+
+
+def _requerir_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise BundleError("pyarrow no está instalado (pip install pyarrow)")
+
+
+def _schema(tabla: str) -> 'pa.Schema':
+    arrow = {
+        'int64': pa.int64(), 'float64': pa.float64(),
+        'string': pa.string(), 'timestamp': pa.timestamp('us'),
+    }
+    return pa.schema([(nombre, arrow[tipo]) for nombre, tipo in _TIPOS[tabla]])
+
+
+def _particionado() -> 'ds.Partitioning':
+    return ds.partitioning(
+        pa.schema([('profesor_id', pa.string()), ('mes', pa.string())]), flavor='hive'
+    )
+
+
+def _to_record_batch(tabla: str, filas: List[Dict[str, Any]]) -> 'pa.RecordBatch':
+    schema = _schema(tabla)
+    columnas = {nombre: [fila.get(nombre) for fila in filas] for nombre in schema.names}
+    return pa.RecordBatch.from_pydict(columnas, schema=schema)
+
+
+def _batches_sesion(lotes: Iterable[List[Dict[str, Any]]], conteo: Dict[str, int]):
+    """Calcula las columnas de partición y cuenta filas al vuelo"""
+    for filas in lotes:
+        for fila in filas:
+            fecha = fila.get('fecha')
+            profesor_id = fila.get('profesor_id')
+            fila['mes'] = fecha.strftime('%Y-%m') if fecha else 'sin-fecha'
+            fila['profesor_id'] = PARTICION_NULA if profesor_id is None else str(profesor_id)
+        conteo['sesion'] += len(filas)
+        yield _to_record_batch('sesion', filas)
+
+
+def write_bundle(output_dir: str, lotes_por_tabla: Dict[str, Iterable[List[Dict[str, Any]]]],
+                 batch_size: int = 50000) -> Dict[str, Any]:
+    """
+    Escribe un bundle Parquet a partir de lotes de filas
+
+    Args:
+        output_dir: Directorio destino (se sobreescriben los datos existentes)
+        lotes_por_tabla: {tabla: iterable de listas de dicts} para las tablas de TABLAS
+        batch_size: Filas máximas por row group
+
+    Returns:
+        Manifest del bundle (también se guarda en manifest.json)
+    """
+    _requerir_pyarrow()
+    os.makedirs(output_dir, exist_ok=True)
+    conteo = {tabla: 0 for tabla in TABLAS}
+
+    for tabla in TABLAS:
+        lotes = lotes_por_tabla.get(tabla, [])
+        destino = os.path.join(output_dir, tabla)
+
+        shutil.rmtree(destino, ignore_errors=True)
+
+        if tabla == 'sesion':
+            # Un write_dataset por lote: los lotes se producen en este hilo (el cursor
+            # de la BD necesita el app context), pyarrow solo reparte por partición
+            for n, batch in enumerate(_batches_sesion(lotes, conteo)):
+                ds.write_dataset(
+                    batch, destino, format='parquet', partitioning=_particionado(),
+                    basename_template=f'part-{n}-{{i}}.parquet',
+                    existing_data_behavior='overwrite_or_ignore',
+                    max_rows_per_group=batch_size,
+                )
+            continue
+
+        os.makedirs(destino, exist_ok=True)
+        with pq.ParquetWriter(os.path.join(destino, 'part-0.parquet'), _schema(tabla)) as writer:
+            for filas in lotes:
+                conteo[tabla] += len(filas)
+                if filas:
+                    writer.write_batch(_to_record_batch(tabla, filas), row_group_size=batch_size)
+
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'creado': datetime.utcnow().isoformat(),
+        'particiones': {'sesion': ['profesor_id', 'mes']},
+        'filas': conteo,
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def read_manifest(bundle_dir: str) -> Dict[str, Any]:
+    """Lee y valida el manifest de un bundle"""
+    ruta = os.path.join(bundle_dir, MANIFEST_FILENAME)
+    if not os.path.exists(ruta):
+        raise BundleError(f"No es un bundle válido (falta {MANIFEST_FILENAME}): {bundle_dir}")
+    with open(ruta, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise BundleError(f"Versión de bundle no soportada: {manifest.get('version')}")
+    return manifest
+
+
+def read_sesiones_dataframe(bundle_dir: str, profesor_id: Optional[int] = None) -> pd.DataFrame:
+    """
+    Carga las sesiones de un bundle con el formato que espera AnalizadorAvanzado
+
+    Usa memory-map y filtra por partición: con profesor_id solo se leen los
+    archivos de ese profesor.
+
+    Args:
+        bundle_dir: Directorio del bundle
+        profesor_id: Limitar a las sesiones de un profesor (opcional)
+
+    Returns:
+        DataFrame con estudiante_id, estudiante_nombre, maqueta, tiempo_segundos,
+        puntaje, fecha, interacciones_ia
+    """
+    _requerir_pyarrow()
+    if read_manifest(bundle_dir)['filas'].get('sesion', 0) == 0:
+        return pd.DataFrame()
+
+    filtros = [('profesor_id', '=', str(profesor_id))] if profesor_id is not None else None
+    sesiones = pq.read_table(
+        os.path.join(bundle_dir, 'sesion'), columns=['id'] + COLUMNAS_ANALISIS,
+        partitioning=_particionado(), filters=filtros, memory_map=True,
+    )
+    if sesiones.num_rows == 0:
+        return pd.DataFrame()
+
+    estudiantes = pq.read_table(
+        os.path.join(bundle_dir, 'estudiante', 'part-0.parquet'),
+        columns=['id', 'nombre'], memory_map=True,
+    ).rename_columns(['estudiante_id', 'estudiante_nombre'])
+
+    df = sesiones.join(estudiantes, 'estudiante_id', join_type='left outer').to_pandas()
+    df = df.sort_values(['fecha', 'id'], ignore_index=True)
+    return df[['estudiante_id', 'estudiante_nombre'] + COLUMNAS_ANALISIS[1:]]
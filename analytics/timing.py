@@ -0,0 +1,127 @@
+"""
+Medición por sección de AnalizadorAvanzado
+Tiempo de pared, tiempo de CPU y (opcional) pico de memoria con tracemalloc
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+
+# Fábricas de context managers que envuelven cada sección (p.ej. spans de tracing)
+_observadores = []
+
+# tracemalloc es global al proceso: los timers con memoria lo comparten por conteo
+# de referencias (lo detiene el último, y solo si lo arrancó un timer)
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_timers = 0
+_tracemalloc_propio = False
+_secciones_midiendo = 0
+
+
+def _adquirir_tracemalloc():
+    global _tracemalloc_timers, _tracemalloc_propio
+    with _tracemalloc_lock:
+        if _tracemalloc_timers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_propio = True
+        _tracemalloc_timers += 1
+
+
+def _liberar_tracemalloc():
+    global _tracemalloc_timers, _tracemalloc_propio
+    with _tracemalloc_lock:
+        _tracemalloc_timers -= 1
+        if _tracemalloc_timers == 0 and _tracemalloc_propio:
+            tracemalloc.stop()
+            _tracemalloc_propio = False
+
+
+def agregar_observador(fabrica):
+    """
+    Registra `fabrica(nombre_seccion)` → context manager, que se abre
+    alrededor de cada sección medida
+    """
+    _observadores.append(fabrica)
+
+
+class SectionTimer:
+    """
+    Acumula tiempos por sección de análisis
+
+    Args:
+        memoria: Medir el pico de memoria asignada con tracemalloc. Tiene costo
+                 (ralentiza las asignaciones mientras está activo): solo para diagnóstico.
+                 Hay que llamar a detener() al terminar (también si una sección falla).
+                 Con varios requests midiendo a la vez el pico es una cota superior:
+                 tracemalloc no distingue threads.
+    """
+
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.secciones = {}
+        self._tracemalloc_activo = False
+        if memoria:
+            _adquirir_tracemalloc()
+            self._tracemalloc_activo = True
+
+    @contextmanager
+    def seccion(self, nombre):
+        """Mide el bloque y lo acumula bajo `nombre`"""
+        global _secciones_midiendo
+        memoria_base = None
+        if self._tracemalloc_activo:
+            with _tracemalloc_lock:
+                # No reiniciar el pico debajo de la sección de otro request
+                if _secciones_midiendo == 0:
+                    tracemalloc.reset_peak()
+                _secciones_midiendo += 1
+                memoria_base = tracemalloc.get_traced_memory()[0]
+
+        inicio = time.perf_counter()
+        inicio_cpu = time.thread_time()
+        try:
+            if _observadores:
+                with ExitStack() as stack:
+                    for fabrica in _observadores:
+                        stack.enter_context(fabrica(nombre))
+                    yield
+            else:
+                yield
+        finally:
+            datos = self.secciones.setdefault(nombre, {'llamadas': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0})
+            datos['llamadas'] += 1
+            datos['wall_ms'] += (time.perf_counter() - inicio) * 1000
+            datos['cpu_ms'] += (time.thread_time() - inicio_cpu) * 1000
+            if memoria_base is not None:
+                with _tracemalloc_lock:
+                    _secciones_midiendo -= 1
+                    pico = max(tracemalloc.get_traced_memory()[1] - memoria_base, 0)
+                datos['pico_memoria_kb'] = max(datos.get('pico_memoria_kb', 0), pico / 1024)
+
+    def detener(self):
+        """Libera tracemalloc (se detiene cuando no queda ningún timer midiendo); idempotente"""
+        if self._tracemalloc_activo:
+            self._tracemalloc_activo = False
+            _liberar_tracemalloc()
+
+    def resumen(self):
+        """
+        Tiempos redondeados por sección, en orden de ejecución
+
+        Returns:
+            Dict con 'secciones', 'total_wall_ms', 'total_cpu_ms' y la sección más lenta
+        """
+        secciones = {
+            nombre: {clave: round(valor, 2) if isinstance(valor, float) else valor
+                     for clave, valor in datos.items()}
+            for nombre, datos in self.secciones.items()
+        }
+        mas_lenta = max(secciones, key=lambda s: secciones[s]['wall_ms']) if secciones else None
+        return {
+            'secciones': secciones,
+            'total_wall_ms': round(sum(d['wall_ms'] for d in self.secciones.values()), 2),
+            'total_cpu_ms': round(sum(d['cpu_ms'] for d in self.secciones.values()), 2),
+            'seccion_mas_lenta': mas_lenta,
+            'memoria': self.memoria
+        }
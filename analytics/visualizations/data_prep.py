@@ -41,10 +41,14 @@ class VisualizationDataPrep:
         """Prepara datos de tendencia temporal"""
         self.df['fecha'] = pd.to_datetime(self.df['fecha'])
         tendencia = self.df.set_index('fecha').resample('D')['puntaje'].mean()
-        
+        return self.formatear_tendencia(tendencia.index, tendencia.values)
+    
+    @staticmethod
+    def formatear_tendencia(dias, promedios):
+        """Serializa la serie diaria de promedios (días sin sesiones → 0)"""
         return {
-            'fechas': [str(d.date()) for d in tendencia.index],
-            'puntajes': [float(p) if not pd.isna(p) else 0 for p in tendencia.values]
+            'fechas': [str(pd.Timestamp(d).date()) for d in dias],
+            'puntajes': [float(p) if not pd.isna(p) else 0 for p in promedios]
         }
     
     def _preparar_scatter(self):
@@ -11,14 +11,22 @@ load_dotenv()
 # Importar modelos y configuración de DB
 from models import db, bcrypt, Profesor, Estudiante
 
-# Importar registro de blueprints
+# Importar registro de blueprints y comandos CLI
 from routes import register_blueprints
+from commands import register_commands
 
 # Importar utilidades
 from utils.logger import setup_logging
 from utils.rate_limiter import get_limiter_config, rate_limit_exceeded_handler
 from utils.extensions import init_limiter
 from utils.recaptcha import ReCaptcha
+from utils.compression import init_compression
+from utils.query_monitor import init_query_monitor
+from utils.metrics import init_metrics
+from utils.profiler import init_continuous_profiling, init_request_profiling
+from utils.tracing import init_tracing
+from services.write_buffer import init_write_buffer
+from utils.codigo_cache import init_codigo_cache
 
 # ============================================
 # CONFIGURACIÓN DE FLASK
@@ -71,6 +79,56 @@ app.config['RECAPTCHA_TYPE'] = 'image'
 app.config['RECAPTCHA_SIZE'] = 'normal'
 app.config['RECAPTCHA_RTABINDEX'] = 10
 
+# Configuración de compresión de respuestas (gzip/brotli)
+app.config['COMPRESS_ENABLED'] = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+
+# Monitor de queries por request (N+1, umbrales, Server-Timing)
+app.config['QUERY_MONITOR_ENABLED'] = os.getenv('QUERY_MONITOR_ENABLED', 'True').lower() == 'true'
+app.config['QUERY_WARN_COUNT'] = int(os.getenv('QUERY_WARN_COUNT', 30))
+app.config['QUERY_WARN_DB_MS'] = int(os.getenv('QUERY_WARN_DB_MS', 500))
+app.config['QUERY_N1_THRESHOLD'] = int(os.getenv('QUERY_N1_THRESHOLD', 5))
+app.config['SERVER_TIMING_ENABLED'] = os.getenv('SERVER_TIMING_ENABLED', 'True').lower() == 'true'
+
+# Métricas Prometheus en /metrics (METRICS_MULTIPROC_DIR para agregar workers de gunicorn)
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+app.config['METRICS_MULTIPROC_DIR'] = os.getenv('METRICS_MULTIPROC_DIR', '')
+app.config['METRICS_FLUSH_SECONDS'] = int(os.getenv('METRICS_FLUSH_SECONDS', 5))
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN', '')
+
+# Profiling bajo demanda (header X-Profile con token de `flask profile-token`)
+app.config['PROFILING_ENABLED'] = os.getenv('PROFILING_ENABLED', 'True').lower() == 'true'
+app.config['PROFILES_DIR'] = os.getenv('PROFILES_DIR', os.path.join('logs', 'profiles'))
+app.config['PROFILING_TOKEN_MAX_AGE'] = int(os.getenv('PROFILING_TOKEN_MAX_AGE', 3600))
+
+# Profiling continuo por worker (muestreo de stacks, deshabilitado por defecto)
+app.config['CONTINUOUS_PROFILING_ENABLED'] = os.getenv('CONTINUOUS_PROFILING_ENABLED', 'False').lower() == 'true'
+app.config['CONTINUOUS_PROFILING_HZ'] = float(os.getenv('CONTINUOUS_PROFILING_HZ', 100))
+app.config['CONTINUOUS_PROFILING_WINDOW_SECONDS'] = int(os.getenv('CONTINUOUS_PROFILING_WINDOW_SECONDS', 60))
+
+# Tracing (spans compatibles con OpenTelemetry, export offline a archivo o consola)
+app.config['TRACING_ENABLED'] = os.getenv('TRACING_ENABLED', 'False').lower() == 'true'
+app.config['TRACING_EXPORTER'] = os.getenv('TRACING_EXPORTER', 'file').lower()
+app.config['TRACING_DIR'] = os.getenv('TRACING_DIR', os.path.join('logs', 'traces'))
+app.config['TRACING_SAMPLE_RATE'] = float(os.getenv('TRACING_SAMPLE_RATE', 0.1))
+app.config['TRACING_SLOW_MS'] = int(os.getenv('TRACING_SLOW_MS', 1000))
+
+# Backend de AnalizadorAvanzado: pandas | polars | duckdb (fallback a pandas si falta la librería)
+app.config['ANALYTICS_BACKEND'] = os.getenv('ANALYTICS_BACKEND', 'pandas').lower()
+
+# Group commit de la ingesta Unity: agrupa sesiones concurrentes en una transacción
+app.config['GROUP_COMMIT_ENABLED'] = os.getenv('GROUP_COMMIT_ENABLED', 'False').lower() == 'true'
+app.config['GROUP_COMMIT_MAX_WAIT_MS'] = float(os.getenv('GROUP_COMMIT_MAX_WAIT_MS', 5))
+app.config['GROUP_COMMIT_MAX_BATCH'] = int(os.getenv('GROUP_COMMIT_MAX_BATCH', 64))
+
+# Cache codigo → estudiante de la ingesta Unity (0 entradas lo deshabilita)
+app.config['CODIGO_CACHE_MAX'] = int(os.getenv('CODIGO_CACHE_MAX', 10000))
+app.config['CODIGO_CACHE_TTL_SECONDS'] = int(os.getenv('CODIGO_CACHE_TTL_SECONDS', 300))
+app.config['CODIGO_CACHE_PRELOAD'] = os.getenv('CODIGO_CACHE_PRELOAD', 'False').lower() == 'true'
+
+# Pico de memoria por sección de AnalizadorAvanzado con tracemalloc (diagnóstico, tiene costo)
+app.config['ANALYTICS_TRACEMALLOC'] = os.getenv('ANALYTICS_TRACEMALLOC', 'False').lower() == 'true'
+
 # ============================================
 # INICIALIZAR EXTENSIONES
 # ============================================
@@ -86,13 +144,34 @@ mail = Mail(app)
 # Inicializar reCAPTCHA
 recaptcha = ReCaptcha(app)
 
-# Configurar Rate Limiting
+# Configurar Rate Limiting (RATELIMIT_ENABLED=False solo para pruebas de carga)
+app.config['RATELIMIT_ENABLED'] = os.getenv('RATELIMIT_ENABLED', 'True').lower() == 'true'
 limiter_config = get_limiter_config()
 limiter = init_limiter(app, limiter_config)
 
 # Handler para cuando se excede el límite
 app.errorhandler(429)(rate_limit_exceeded_handler)
 
+# Compresión de respuestas grandes (analytics, listados de sesiones)
+init_compression(app)
+
+# Conteo de queries y Server-Timing (registrado después: corre antes que la compresión)
+init_query_monitor(app)
+
+# Latencias por endpoint, requests en curso, cache y pool de DB
+init_metrics(app)
+
+# Profiling de requests puntuales (sin overhead si no llega el header)
+init_request_profiling(app)
+init_continuous_profiling(app)
+
+# Spans request → servicio → repositorio → SQL / secciones de analytics
+init_tracing(app)
+
+# Group commit de sesiones Unity (deshabilitado por defecto)
+init_write_buffer(app)
+init_codigo_cache(app)
+
 # Configurar logging
 logger = setup_logging(app)
 
@@ -128,6 +207,7 @@ def load_user(user_id):
 # ============================================
 
 register_blueprints(app)
+register_commands(app)
 logger.info("✅ Aplicación Flask inicializada con Blueprints")
 
 # ============================================
@@ -0,0 +1,3 @@
+"""
+Benchmarks de rendimiento (no forman parte de la app ni de la suite de tests)
+"""
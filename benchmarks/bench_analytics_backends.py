@@ -0,0 +1,92 @@
+"""
+Benchmark de backends de AnalizadorAvanzado (pandas / polars / duckdb)
+
+Mide las agregaciones que tienen versión por engine sobre datos sintéticos
+de 10k, 100k y 1M sesiones. No usa la base de datos.
+
+Uso:
+    python benchmarks/bench_analytics_backends.py
+    python benchmarks/bench_analytics_backends.py --sizes 10000 100000 --repeat 5
+    python benchmarks/bench_analytics_backends.py --json resultados.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import AnalizadorAvanzado
+from analytics.engines import BACKENDS, crear_engine
+from benchmarks.synthetic import generar_sesiones
+
+TAMANIOS = [10_000, 100_000, 1_000_000]
+METODOS = [
+    ('estadisticas_descriptivas', ()),
+    ('analisis_por_maqueta', ()),
+    ('ranking_estudiantes', (10,)),
+    ('datos_para_visualizacion', ()),
+]
+
+
+def medir(df: pd.DataFrame, backend: str, repeat: int) -> dict:
+    """Mejor tiempo (s) de cada método para un backend"""
+    if backend == 'pandas':
+        analizador = AnalizadorAvanzado.from_dataframe(df)
+    else:
+        engine = crear_engine(backend, df)
+        if engine is None:
+            return None
+        analizador = AnalizadorAvanzado.from_engine(engine)
+
+    tiempos = {}
+    with analizador:
+        for metodo, args in METODOS:
+            muestras = []
+            for _ in range(repeat):
+                inicio = time.perf_counter()
+                getattr(analizador, metodo)(*args)
+                muestras.append(time.perf_counter() - inicio)
+            tiempos[metodo] = min(muestras)
+    tiempos['total'] = sum(tiempos.values())
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=TAMANIOS)
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', dest='json_path', help='Guardar resultados en JSON')
+    args = parser.parse_args()
+
+    resultados = {'fecha': datetime.utcnow().isoformat(), 'cpu_count': os.cpu_count(), 'resultados': []}
+
+    for n in args.sizes:
+        df = generar_sesiones(n)
+        print(f"\n📊 {n:,} sesiones")
+        base = None
+        for backend in args.backends:
+            tiempos = medir(df, backend, args.repeat)
+            if tiempos is None:
+                print(f"  {backend:<8} no disponible (dependencia no instalada)")
+                continue
+            base = base or tiempos['total']
+            detalle = '  '.join(f"{m[:14]}={t * 1000:8.1f}ms" for m, t in tiempos.items() if m != 'total')
+            print(f"  {backend:<8} total={tiempos['total'] * 1000:9.1f}ms  x{base / tiempos['total']:5.2f}  {detalle}")
+            resultados['resultados'].append({'sesiones': n, 'backend': backend, 'tiempos_s': tiempos})
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\n✅ Resultados guardados en {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Suite de benchmarks de analytics (1k – 1M sesiones)
+
+Mide, sobre datos sintéticos deterministas (benchmarks/synthetic.py):
+- analyzer: cada sección de AnalizadorAvanzado (tiempo y pico de memoria)
+- service:  AnalyticsService (profesor y estudiante, sin cache)
+- routes:   endpoints principales a través del test client de Flask
+
+Los grupos service/routes usan un SQLite temporal (no tocan instance/).
+
+Uso:
+    python benchmarks/bench_suite.py --sizes 1000 10000
+    python benchmarks/bench_suite.py --output resultados.json --save-baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --threshold 0.25
+
+Con --baseline el proceso termina con código 1 si alguna medición supera
+la línea base en más de --threshold (y en más de --min-delta-ms).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generar_sesiones, poblar_db, usar_base_temporal
+
+TAMANIOS = [1_000, 10_000, 100_000, 1_000_000]
+GRUPOS = ('analyzer', 'service', 'routes')
+BASELINE_DEFAULT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SECCIONES = [
+    ('estadisticas_descriptivas', ()),
+    ('datos_para_visualizacion', ()),
+    ('prediccion_rendimiento', ()),
+    ('correlaciones_avanzadas', ()),
+    ('estudiantes_en_riesgo', ()),
+    ('ranking_estudiantes', ()),
+    ('generar_insights', ()),
+    ('analisis_por_maqueta', ()),
+    ('clasificacion_binaria_aprobacion', ()),
+    ('kmeans_clustering_profesional', ()),
+    ('correlaciones_con_pvalues', ()),
+]
+
+
+def medir(func: Callable, repeat: int) -> Dict[str, float]:
+    """Mejor tiempo de `repeat` corridas + pico de memoria (corrida aparte con tracemalloc)"""
+    func()  # Calentamiento: imports diferidos, caches de pandas/sklearn
+    tiempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        func()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        func()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'tiempo_s': round(min(tiempos), 6), 'pico_memoria_kb': round(pico / 1024, 1)}
+
+
+def bench_analyzer(n: int, repeat: int) -> Dict[str, dict]:
+    from analytics import AnalizadorAvanzado
+
+    df = generar_sesiones(n)
+    resultados = {'analyzer.from_dataframe': medir(lambda: AnalizadorAvanzado.from_dataframe(df), repeat)}
+    analizador = AnalizadorAvanzado.from_dataframe(df)
+    for metodo, args in SECCIONES:
+        resultados[f'analyzer.{metodo}'] = medir(lambda: getattr(analizador, metodo)(*args), repeat)
+    return resultados
+
+
+def bench_db(n: int, repeat: int, grupos: List[str]) -> Dict[str, dict]:
+    """Grupos service y routes sobre un SQLite temporal con n sesiones"""
+    from app import app
+    from services import analytics_service
+    from services.analytics_service import AnalyticsService
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        usar_base_temporal(app, os.path.join(directorio, 'bench.db'))
+        app.config.update(TESTING=True, RATELIMIT_ENABLED=False)
+
+        with app.app_context():
+            inicio = time.perf_counter()
+            ids = poblar_db(n)
+            print(f"  (BD poblada en {time.perf_counter() - inicio:.1f}s)")
+        profesor_id, estudiante_id = ids['profesor_id'], ids['estudiante_ids'][0]
+
+        def sin_cache(func):
+            def _ejecutar():
+                analytics_service._analytics_cache.clear()
+                return func()
+            return _ejecutar
+
+        if 'service' in grupos:
+            with app.app_context():
+                servicio = AnalyticsService()
+                resultados['service.get_analytics_profesor'] = medir(
+                    sin_cache(lambda: servicio.get_analytics_profesor(profesor_id)), repeat)
+                resultados['service.get_analytics_estudiante'] = medir(
+                    sin_cache(lambda: servicio.get_analytics_estudiante(estudiante_id)), repeat)
+
+        if 'routes' in grupos:
+            # Sin app context externo: cada request debe cargar su propio usuario (g)
+            client = app.test_client()
+            rutas = {
+                'profesor': ['/api/analytics', '/api/estudiantes', '/api/sesiones-todas?limit=100'],
+                'estudiante': ['/api/estudiante/analytics', '/api/estudiante/sesiones?limit=100'],
+            }
+            for rol, urls in rutas.items():
+                user_id = profesor_id if rol == 'profesor' else estudiante_id
+                with client.session_transaction() as sess:
+                    sess['_user_id'] = f'{rol}_{user_id}'
+                for url in urls:
+                    def _get(url=url):
+                        response = client.get(url)
+                        assert response.status_code == 200, f'{url}: {response.status_code}'
+                    resultados[f'routes.GET {url}'] = medir(sin_cache(_get), repeat)
+    return resultados
+
+
+def comparar(actual: dict, baseline: dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Mediciones que empeoraron más que el umbral respecto de la línea base"""
+    regresiones = []
+    for tamanio, mediciones in actual['resultados'].items():
+        base = baseline.get('resultados', {}).get(tamanio, {})
+        for nombre, valor in mediciones.items():
+            if nombre not in base:
+                continue
+            antes, ahora = base[nombre]['tiempo_s'], valor['tiempo_s']
+            if ahora > antes * (1 + threshold) and (ahora - antes) * 1000 > min_delta_ms:
+                regresiones.append(f"{tamanio} {nombre}: {antes * 1000:.1f}ms → {ahora * 1000:.1f}ms "
+                                   f"(+{(ahora / antes - 1) * 100:.0f}%)")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=TAMANIOS)
+    parser.add_argument('--groups', nargs='+', default=list(GRUPOS), choices=GRUPOS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Guardar resultados en JSON')
+    parser.add_argument('--baseline', help='JSON de línea base para comparar')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Guardar como línea base ({BASELINE_DEFAULT})')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Regresión tolerada (0.25 = +25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help='Ignorar diferencias menores (ruido)')
+    args = parser.parse_args()
+
+    resultados = {
+        'fecha': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'resultados': {},
+    }
+
+    for n in args.sizes:
+        print(f"\n📊 {n:,} sesiones")
+        mediciones = {}
+        if 'analyzer' in args.groups:
+            mediciones.update(bench_analyzer(n, args.repeat))
+        grupos_db = [g for g in args.groups if g != 'analyzer']
+        if grupos_db:
+            mediciones.update(bench_db(n, args.repeat, grupos_db))
+        for nombre, valor in mediciones.items():
+            print(f"  {nombre:<48} {valor['tiempo_s'] * 1000:10.1f}ms  {valor['pico_memoria_kb'] / 1024:8.1f}MB")
+        resultados['resultados'][str(n)] = mediciones
+
+    destinos = [args.output] if args.output else []
+    if args.save_baseline:
+        destinos.append(BASELINE_DEFAULT)
+    for destino in destinos:
+        with open(destino, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\n✅ Resultados guardados en {destino}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regresiones = comparar(resultados, json.load(f), args.threshold, args.min_delta_ms)
+        if regresiones:
+            print(f"\n❌ {len(regresiones)} regresiones (umbral +{args.threshold * 100:.0f}%):")
+            for linea in regresiones:
+                print(f"  {linea}")
+            sys.exit(1)
+        print("\n✅ Sin regresiones respecto de la línea base")
+
+
+if __name__ == '__main__':
+    main()
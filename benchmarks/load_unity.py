@@ -0,0 +1,347 @@
+"""
+Prueba de carga de ingesta Unity (POST /api/unity/session)
+
+Reproduce payloads realistas de sesiones VR con concurrencia y tasa configurables
+y reporta throughput, latencias p50/p95/p99 y tasa de errores.
+
+Modos:
+- threads: hilos contra el test client de Flask sobre un SQLite temporal
+           (no requiere servidor, no toca instance/)
+- http:    asyncio con un cliente HTTP/1.1 mínimo contra un servidor real
+           (--url, o --gunicorn para levantar `gunicorn app:app` localmente
+           con la BD configurada en DATABASE_URL; con --ingesta levanta el
+           proceso dedicado de gunicorn_ingesta.conf.py)
+
+Escenarios:
+- clase-40:   40 estudiantes terminan a la vez (una ráfaga de 40 POST simultáneos)
+- clases-4x40: cuatro clases de 40 terminando juntas (160 simultáneos)
+- sostenido:  carga abierta a --rate req/s durante --duracion segundos
+
+Uso:
+    python benchmarks/load_unity.py --escenario clase-40
+    python benchmarks/load_unity.py --escenario clases-4x40 --rondas 5 --json carga.json
+    python benchmarks/load_unity.py --modo http --gunicorn --workers 4 --escenario sostenido --rate 50
+    python benchmarks/load_unity.py --modo http --gunicorn --ingesta --escenario clases-4x40
+    python benchmarks/load_unity.py --modo http --url http://127.0.0.1:5000 --escenario clase-40
+
+Con --rate la carga es de lazo abierto: cada request tiene una hora de salida
+programada y la latencia se mide desde esa hora (no desde que hubo un worker
+libre), para no ocultar las colas (coordinated omission).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RUTA = '/api/unity/session'
+PREFIJO_CODIGO = 'LOAD'
+MAQUETAS = ['Aire acondicionado', 'Motor']
+
+ESCENARIOS = {
+    'clase-40': {'concurrencia': 40, 'por_ronda': 40, 'rate': None},
+    'clases-4x40': {'concurrencia': 160, 'por_ronda': 160, 'rate': None},
+    'sostenido': {'concurrencia': 32, 'por_ronda': None, 'rate': 20.0},
+}
+
+
+def generar_payloads(codigos: List[str], n: int, seed: int = 42) -> List[dict]:
+    """Payloads con la forma que envía Unity (puntaje 0-7, respuestas por pregunta)"""
+    rng = np.random.default_rng(seed)
+    n_preguntas = rng.integers(5, 16, n)
+    payloads = []
+    for i in range(n):
+        correctas = rng.random(n_preguntas[i]) < 0.65
+        payloads.append({
+            'codigo_estudiante': codigos[i % len(codigos)],
+            'maqueta': MAQUETAS[int(rng.integers(len(MAQUETAS)))],
+            'puntaje': round(float(7 * correctas.mean()), 1),
+            'tiempo_segundos': int(rng.integers(30, 1200)),
+            'interacciones_ia': int(rng.poisson(3)),
+            'respuestas': [
+                {'pregunta': p + 1, 'respuesta': 'ABCD'[int(rng.integers(4))], 'correcta': bool(c)}
+                for p, c in enumerate(correctas)
+            ],
+        })
+    return payloads
+
+
+def preparar_estudiantes(n: int) -> List[str]:
+    """Crea (si faltan) n estudiantes LOAD-xxxxx en la BD actual (requiere app context)"""
+    from sqlalchemy import insert
+    from models import Estudiante, db
+
+    codigos = [f'{PREFIJO_CODIGO}-{i:05d}' for i in range(n)]
+    existentes = {c for (c,) in db.session.query(Estudiante.codigo)
+                  .filter(Estudiante.codigo.like(f'{PREFIJO_CODIGO}-%'))}
+    faltantes = [c for c in codigos if c not in existentes]
+    if faltantes:
+        db.session.execute(insert(Estudiante), [{'nombre': f'Carga {c}', 'codigo': c} for c in faltantes])
+        db.session.commit()
+    return codigos
+
+
+def resumir(latencias_s: List[float], estados: List[int], duracion_s: float) -> Dict:
+    """Throughput, percentiles de latencia (ms) y tasa de errores"""
+    lat = np.array(latencias_s) * 1000 if latencias_s else np.zeros(1)
+    total = len(estados)
+    errores = sum(1 for e in estados if not 200 <= e < 300)
+    return {
+        'requests': total,
+        'duracion_s': round(duracion_s, 3),
+        'throughput_rps': round(total / duracion_s, 1) if duracion_s else 0.0,
+        'p50_ms': round(float(np.percentile(lat, 50)), 1),
+        'p95_ms': round(float(np.percentile(lat, 95)), 1),
+        'p99_ms': round(float(np.percentile(lat, 99)), 1),
+        'max_ms': round(float(lat.max()), 1),
+        'tasa_error': round(errores / total, 4) if total else 0.0,
+        'estados': dict(Counter(str(e) for e in estados)),
+    }
+
+
+def _horarios(n: int, rate: Optional[float]) -> List[float]:
+    """Desfase (s) de salida de cada request; todos en 0 si es una ráfaga"""
+    if not rate:
+        return [0.0] * n
+    return [i / rate for i in range(n)]
+
+
+# ============================================
+# MODO THREADS (test client)
+# ============================================
+
+def ejecutar_threads(app, payloads: List[dict], concurrencia: int,
+                     rate: Optional[float] = None) -> Dict:
+    """Dispara los payloads con un pool de hilos, cada uno con su test client"""
+    local = threading.local()
+    horarios = _horarios(len(payloads), rate)
+    barrera = threading.Barrier(min(concurrencia, len(payloads))) if not rate else None
+
+    def _enviar(i):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        if barrera is not None and i < barrera.parties:
+            barrera.wait()  # Ráfaga: los primeros `concurrencia` salen juntos
+        programado = inicio + horarios[i]
+        espera = programado - time.perf_counter()
+        if espera > 0:
+            time.sleep(espera)
+        desde = programado if rate else time.perf_counter()
+        try:
+            estado = local.client.post(RUTA, json=payloads[i]).status_code
+        except Exception:
+            estado = 599
+        return time.perf_counter() - desde, estado
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        resultados = list(pool.map(_enviar, range(len(payloads))))
+    duracion = time.perf_counter() - inicio
+    return resumir([r[0] for r in resultados], [r[1] for r in resultados], duracion)
+
+
+# ============================================
+# MODO HTTP (asyncio)
+# ============================================
+
+class _ConexionHTTP:
+    """Cliente HTTP/1.1 mínimo sobre asyncio (keep-alive si el servidor lo permite)"""
+
+    def __init__(self, host: str, puerto: int):
+        self.host, self.puerto = host, puerto
+        self.reader = self.writer = None
+
+    async def post_json(self, ruta: str, cuerpo: bytes) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.puerto)
+        self.writer.write(
+            f'POST {ruta} HTTP/1.1\r\nHost: {self.host}:{self.puerto}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n'.encode() + cuerpo
+        )
+        await self.writer.drain()
+
+        estado = int((await self.reader.readline()).split()[1])
+        cabeceras = {}
+        while (linea := await self.reader.readline()) not in (b'\r\n', b''):
+            clave, _, valor = linea.decode('latin-1').partition(':')
+            cabeceras[clave.strip().lower()] = valor.strip()
+        await self.reader.readexactly(int(cabeceras.get('content-length', 0)))
+        if cabeceras.get('connection', '').lower() == 'close':
+            await self.cerrar()
+        return estado
+
+    async def cerrar(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+async def _ejecutar_http(url: str, payloads: List[dict], concurrencia: int,
+                         rate: Optional[float]) -> Dict:
+    partes = urlsplit(url)
+    host, puerto = partes.hostname, partes.port or 80
+    cuerpos = [json.dumps(p).encode() for p in payloads]
+    horarios = _horarios(len(payloads), rate)
+    cola: asyncio.Queue = asyncio.Queue()
+    for i in range(len(payloads)):
+        cola.put_nowait(i)
+    latencias, estados = [], []
+    inicio = time.perf_counter()
+
+    async def _cliente():
+        conexion = _ConexionHTTP(host, puerto)
+        try:
+            while not cola.empty():
+                i = cola.get_nowait()
+                programado = inicio + horarios[i]
+                espera = programado - time.perf_counter()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+                desde = programado if rate else time.perf_counter()
+                try:
+                    estado = await conexion.post_json(RUTA, cuerpos[i])
+                except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    await conexion.cerrar()
+                    estado = 599
+                latencias.append(time.perf_counter() - desde)
+                estados.append(estado)
+        finally:
+            await conexion.cerrar()
+
+    await asyncio.gather(*(_cliente() for _ in range(concurrencia)))
+    return resumir(latencias, estados, time.perf_counter() - inicio)
+
+
+def ejecutar_http(url: str, payloads: List[dict], concurrencia: int,
+                  rate: Optional[float] = None) -> Dict:
+    """Dispara los payloads con `concurrencia` clientes asyncio contra `url`"""
+    return asyncio.run(_ejecutar_http(url, payloads, concurrencia, rate))
+
+
+def levantar_gunicorn(puerto: int, workers: int, ingesta: bool = False) -> subprocess.Popen:
+    """
+    Arranca gunicorn en 127.0.0.1:puerto y espera a /api/unity/verify
+
+    Con ingesta=True usa el proceso dedicado (gunicorn_ingesta.conf.py, workers
+    gthread) en lugar de `gunicorn app:app` con workers sync.
+    """
+    import urllib.request
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    entorno = dict(os.environ, RATELIMIT_ENABLED='False')
+    comando = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{puerto}',
+               '--log-level', 'warning']
+    comando += ['-c', 'gunicorn_ingesta.conf.py'] if ingesta else ['app:app']
+    proceso = subprocess.Popen(comando, cwd=raiz, env=entorno)
+    limite = time.time() + 30
+    while time.time() < limite:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{puerto}/api/unity/verify', timeout=1)
+            return proceso
+        except OSError:
+            if proceso.poll() is not None:
+                raise RuntimeError('gunicorn terminó al arrancar')
+            time.sleep(0.2)
+    proceso.terminate()
+    raise RuntimeError('gunicorn no respondió en 30s')
+
+
+# ============================================
+# CLI
+# ============================================
+
+def _imprimir(nombre: str, r: Dict) -> None:
+    print(f"  {nombre:<12} {r['requests']:>6} req  {r['throughput_rps']:>8.1f} req/s  "
+          f"p50 {r['p50_ms']:>7.1f}ms  p95 {r['p95_ms']:>7.1f}ms  p99 {r['p99_ms']:>7.1f}ms  "
+          f"error {r['tasa_error'] * 100:5.1f}%  {r['estados']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escenario', choices=ESCENARIOS, default='clase-40')
+    parser.add_argument('--modo', choices=('threads', 'http'), default='threads')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Servidor (modo http)')
+    parser.add_argument('--gunicorn', action='store_true', help='Levantar gunicorn en el puerto de --url')
+    parser.add_argument('--workers', type=int, default=2, help='Workers de gunicorn')
+    parser.add_argument('--ingesta', action='store_true',
+                        help='Con --gunicorn: proceso dedicado de ingesta (gthread) en vez de app:app')
+    parser.add_argument('--concurrencia', type=int, help='Sobrescribe la del escenario')
+    parser.add_argument('--rate', type=float, help='req/s (carga abierta); sobrescribe la del escenario')
+    parser.add_argument('--rondas', type=int, default=3, help='Ráfagas consecutivas (escenarios de clase)')
+    parser.add_argument('--duracion', type=float, default=30.0, help='Segundos (escenario sostenido)')
+    parser.add_argument('--estudiantes', type=int, default=40, help='Códigos de estudiante distintos')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Guardar resultados en JSON')
+    args = parser.parse_args()
+
+    escenario = dict(ESCENARIOS[args.escenario])
+    concurrencia = args.concurrencia or escenario['concurrencia']
+    rate = args.rate if args.rate is not None else escenario['rate']
+    if escenario['por_ronda']:
+        rondas = [escenario['por_ronda']] * args.rondas
+    else:
+        rondas = [int(rate * args.duracion)]
+
+    from app import app
+
+    temporal = proceso = None
+    try:
+        if args.modo == 'threads':
+            from benchmarks.synthetic import usar_base_temporal
+
+            temporal = tempfile.TemporaryDirectory()
+            usar_base_temporal(app, os.path.join(temporal.name, 'carga.db'))
+            app.config.update(TESTING=True, RATELIMIT_ENABLED=False)
+        with app.app_context():
+            from models import db
+            db.create_all()
+            codigos = preparar_estudiantes(args.estudiantes)
+
+        if args.modo == 'http' and args.gunicorn:
+            proceso = levantar_gunicorn(urlsplit(args.url).port or 80, args.workers, args.ingesta)
+
+        print(f"\n🎮 {args.escenario} ({args.modo}): concurrencia {concurrencia}, "
+              f"{'rate ' + str(rate) + ' req/s' if rate else 'ráfaga'}, {len(rondas)} ronda(s)")
+        resultados = {'escenario': args.escenario, 'modo': args.modo, 'concurrencia': concurrencia,
+                      'rate': rate, 'rondas': []}
+        for numero, n in enumerate(rondas, 1):
+            payloads = generar_payloads(codigos, n, seed=args.seed + numero)
+            if args.modo == 'threads':
+                r = ejecutar_threads(app, payloads, concurrencia, rate)
+            else:
+                r = ejecutar_http(args.url, payloads, concurrencia, rate)
+            _imprimir(f'ronda {numero}', r)
+            resultados['rondas'].append(r)
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait(timeout=10)
+        if temporal is not None:
+            temporal.cleanup()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\n✅ Resultados guardados en {args.json}")
+
+
+if __name__ == '__main__':
+    main()
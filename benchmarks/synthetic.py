@@ -0,0 +1,109 @@
+"""
+Datos sintéticos deterministas para benchmarks
+
+- generar_sesiones(n, seed): DataFrame con la forma que produce AnalizadorAvanzado
+- poblar_db(n, seed): inserta un profesor, sus estudiantes y n sesiones en la BD actual
+- usar_base_temporal(app, ruta): apunta la app a un SQLite descartable
+"""
+
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MAQUETAS = ['Motor', 'Aire acondicionado', 'Transmisión', 'Frenos', 'Suspensión']
+SESIONES_POR_ESTUDIANTE = 50
+LOTE_INSERT = 50_000
+
+
+def _columnas(n: int, seed: int) -> dict:
+    """Columnas de n sesiones; misma semilla → mismos datos"""
+    rng = np.random.default_rng(seed)
+    n_estudiantes = max(n // SESIONES_POR_ESTUDIANTE, 10)
+    inicio = np.datetime64(datetime(2024, 1, 1))
+    fechas = inicio + rng.integers(0, 365 * 24 * 3600, n).astype('timedelta64[s]')
+    return {
+        'n_estudiantes': n_estudiantes,
+        'estudiante_idx': rng.integers(0, n_estudiantes, n),
+        'maqueta': rng.choice(MAQUETAS, n),
+        'tiempo_segundos': rng.integers(30, 1200, n),
+        'puntaje': rng.integers(0, 8, n),
+        'fecha': np.sort(fechas),
+        'interacciones_ia': rng.poisson(3, n),
+    }
+
+
+def generar_sesiones(n: int, seed: int = 42) -> pd.DataFrame:
+    """DataFrame sintético con la forma que produce AnalizadorAvanzado"""
+    c = _columnas(n, seed)
+    estudiante_id = c['estudiante_idx'] + 1
+    nombres = np.array([f'Estudiante {i}' for i in range(c['n_estudiantes'] + 1)])
+    return pd.DataFrame({
+        'estudiante_id': estudiante_id,
+        'estudiante_nombre': nombres[estudiante_id],
+        'maqueta': c['maqueta'],
+        'tiempo_segundos': c['tiempo_segundos'],
+        'puntaje': c['puntaje'],
+        'fecha': c['fecha'],
+        'interacciones_ia': c['interacciones_ia'],
+    })
+
+
+def usar_base_temporal(app, ruta: str) -> None:
+    """Reemplaza el engine de la app por un SQLite en `ruta` (no toca instance/)"""
+    from sqlalchemy import create_engine
+    from models import db
+
+    url = f'sqlite:///{ruta}'
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    with app.app_context():
+        db.engines[None].dispose()
+        db.engines[None] = create_engine(url)
+        db.create_all()
+
+
+def poblar_db(n: int, seed: int = 42) -> dict:
+    """
+    Inserta un profesor, sus estudiantes inscritos y n sesiones (requiere app context)
+
+    Returns:
+        Dict con profesor_id y estudiante_ids
+    """
+    from sqlalchemy import insert
+    from models import Estudiante, Profesor, Sesion, db, estudiante_profesor
+
+    c = _columnas(n, seed)
+    profesor = Profesor(nombre='Dr. Benchmark', email=f'bench{seed}@test.com', institucion='Bench', password='x')
+    db.session.add(profesor)
+    db.session.flush()
+
+    db.session.execute(insert(Estudiante), [
+        {'nombre': f'Estudiante {i}', 'codigo': f'B{seed}-{i:06d}'} for i in range(c['n_estudiantes'])
+    ])
+    estudiante_ids = [e for (e,) in db.session.query(Estudiante.id)
+                      .filter(Estudiante.codigo.like(f'B{seed}-%')).order_by(Estudiante.codigo)]
+    db.session.execute(insert(estudiante_profesor), [
+        {'estudiante_id': e, 'profesor_id': profesor.id} for e in estudiante_ids
+    ])
+
+    columnas = {
+        'estudiante_id': np.array(estudiante_ids)[c['estudiante_idx']].tolist(),
+        'maqueta': c['maqueta'].tolist(),
+        'tiempo_segundos': c['tiempo_segundos'].tolist(),
+        'puntaje': c['puntaje'].tolist(),
+        'fecha': c['fecha'].astype('datetime64[us]').tolist(),
+        'interacciones_ia': c['interacciones_ia'].tolist(),
+    }
+    for inicio in range(0, n, LOTE_INSERT):
+        fin = min(inicio + LOTE_INSERT, n)
+        filas = [dict(zip(columnas, valores)) for valores in zip(*(v[inicio:fin] for v in columnas.values()))]
+        for fila in filas:
+            fila['profesor_id'] = profesor.id
+        db.session.execute(insert(Sesion), filas)
+    db.session.commit()
+    return {'profesor_id': profesor.id, 'estudiante_ids': estudiante_ids}
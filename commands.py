@@ -0,0 +1,39 @@
+"""
+commands.py - Comandos CLI de la aplicación (flask <comando>)
+"""
+
+import click
+from flask import current_app
+
+from analytics.io import BundleError
+from services.export_service import ExportService
+from utils.profiler import generar_token
+
+
+def register_commands(app):
+    """Registra los comandos CLI en la aplicación"""
+
+    @app.cli.command('export-parquet')
+    @click.option('--output', '-o', default='exports/bundle', show_default=True,
+                  help='Directorio destino del bundle')
+    @click.option('--batch-size', default=50000, show_default=True, type=click.IntRange(min=1),
+                  help='Filas por lote (lectura de BD y row group Parquet)')
+    def export_parquet(output, batch_size):
+        """Exporta el dataset completo a un bundle Parquet particionado"""
+        try:
+            manifest = ExportService().export_parquet_bundle(output, batch_size)
+        except BundleError as e:
+            raise click.ClickException(str(e))
+
+        current_app.logger.info(f"Bundle Parquet exportado en {output}")
+        for tabla, filas in manifest['filas'].items():
+            click.echo(f"  {tabla}: {filas} filas")
+        click.echo(f"✅ Bundle escrito en {output}")
+
+    @app.cli.command('profile-token')
+    def profile_token():
+        """Genera un token firmado para perfilar requests (header X-Profile)"""
+        token = generar_token(current_app)
+        vigencia = current_app.config['PROFILING_TOKEN_MAX_AGE']
+        click.echo(token)
+        click.echo(f"Válido por {vigencia}s. Uso: curl -H 'X-Profile: {token}' <url>", err=True)
@@ -0,0 +1,27 @@
+# gunicorn_ingesta.conf.py - Configuración de gunicorn para el proceso de ingesta Unity
+#
+# Uso: gunicorn -c gunicorn_ingesta.conf.py
+#
+# Workers gthread: cada worker atiende INGESTA_THREADS requests a la vez. La
+# ingesta pasa casi todo el tiempo esperando a la BD, así que hilos (no
+# procesos) son la unidad barata de concurrencia; el GIL no es el cuello.
+
+import os
+
+wsgi_app = 'ingesta:app'
+bind = f"0.0.0.0:{os.getenv('PORT', '8001')}"
+worker_class = 'gthread'
+workers = int(os.getenv('INGESTA_WORKERS', 2))
+threads = int(os.getenv('INGESTA_THREADS', 64))
+# Conexiones HTTP/1.1 persistentes de los visores entre uploads
+keepalive = int(os.getenv('INGESTA_KEEPALIVE_SECONDS', 5))
+timeout = 30
+
+# Con muchos hilos por worker el group commit amortiza los commits concurrentes
+# y libera la conexión del pool mientras el request espera (ver services/write_buffer.py)
+os.environ.setdefault('GROUP_COMMIT_ENABLED', 'True')
+
+# El cache codigo → estudiante se invalida por eventos del ORM, que no cruzan
+# procesos: una baja o cambio de código hecho desde el dashboard solo llega a
+# este proceso cuando vence la entrada. TTL corto por defecto (ver utils/codigo_cache.py)
+os.environ.setdefault('CODIGO_CACHE_TTL_SECONDS', '30')
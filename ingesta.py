@@ -0,0 +1,42 @@
+# ingesta.py - Punto de entrada WSGI del proceso dedicado a la ingesta Unity
+"""
+Proceso de ingesta separado del dashboard
+
+La ingesta Unity es I/O puro (parsear JSON, resolver el código, un INSERT),
+pero si comparte workers con /api/analytics un cómputo en frío deja a los
+visores esperando. Este módulo expone la misma app restringida a las rutas
+de ingesta, para correrla en su propio servicio con muchos hilos baratos:
+
+    gunicorn -c gunicorn_ingesta.conf.py
+
+Los workers gthread atienden INGESTA_THREADS requests concurrentes cada uno;
+mientras un hilo espera a la BD (o al group commit) no ocupa CPU ni conexión
+del pool, así que un proceso chico sostiene cientos de uploads simultáneos
+sin depender de lo que esté calculando el dashboard.
+"""
+
+import json
+
+from app import app as dashboard_app
+
+# Rutas que atiende el proceso de ingesta (el resto responde 404 sin pasar por Flask)
+PREFIJOS_INGESTA = ('/api/unity/', '/metrics')
+
+
+class SoloIngesta:
+    """Middleware WSGI que deja pasar únicamente las rutas de ingesta"""
+
+    def __init__(self, wsgi_app, prefijos=PREFIJOS_INGESTA):
+        self.wsgi_app = wsgi_app
+        self.prefijos = prefijos
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith(self.prefijos):
+            return self.wsgi_app(environ, start_response)
+        cuerpo = json.dumps({'error': 'Ruta no disponible en el proceso de ingesta'}).encode()
+        start_response('404 NOT FOUND', [('Content-Type', 'application/json'),
+                                         ('Content-Length', str(len(cuerpo)))])
+        return [cuerpo]
+
+
+app = SoloIngesta(dashboard_app)
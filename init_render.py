@@ -25,8 +25,20 @@ def init_production_db():
             print(f"✅ Tablas creadas exitosamente: {inspector.get_table_names()}")
         else:
             print(f"✅ Base de datos ya inicializada. Tablas existentes: {existing_tables}")
-        
-        return True
+    
+    # create_all() no altera tablas existentes: migraciones idempotentes en cada build
+    from scripts.add_idempotency_key import add_idempotency_key
+    add_idempotency_key()
+    
+    # Índices de consultas frecuentes y de paginación keyset (idx_sesion_*_fecha_id)
+    from scripts.add_database_indexes import create_indexes
+    create_indexes()
+    
+    # Tabla sesion_respuesta + backfill de las sesiones anteriores (re-ejecutable)
+    from scripts.add_sesion_respuesta import add_sesion_respuesta
+    add_sesion_respuesta()
+    
+    return True
 
 if __name__ == '__main__':
     try:
@@ -10,6 +10,7 @@ from models.base import db, bcrypt, estudiante_profesor
 from models.profesor import Profesor
 from models.estudiante import Estudiante
 from models.sesion import Sesion
+from models.sesion_respuesta import SesionRespuesta
 
 # Exportar todo para compatibilidad con imports existentes
 # Permite hacer: from models import db, Profesor, Estudiante, Sesion
@@ -19,5 +20,6 @@ __all__ = [
     'estudiante_profesor',
     'Profesor',
     'Estudiante',
-    'Sesion'
+    'Sesion',
+    'SesionRespuesta'
 ]
@@ -5,6 +5,7 @@ models/estudiante.py - Modelo de Estudiante
 from flask_login import UserMixin
 from models.base import db, bcrypt
 from datetime import datetime
+from sqlalchemy import func
 
 
 class Estudiante(UserMixin, db.Model):
@@ -39,17 +40,27 @@ class Estudiante(UserMixin, db.Model):
         }
         
         if include_stats:
-            data['total_sesiones'] = len(self.sesiones)
-            data['total_profesores'] = self.profesores.count()
-            
-            if self.sesiones:
-                puntajes = [s.puntaje for s in self.sesiones]
-                data['promedio_puntaje'] = round(sum(puntajes) / len(puntajes), 2)
-            else:
-                data['promedio_puntaje'] = 0
+            data.update(self._stats())
                 
         return data
     
+    def _stats(self) -> dict:
+        """Totales de sesiones/profesores y promedio en UNA query agregada (sin cargar sesiones)"""
+        from models.sesion import Sesion
+        from models.base import estudiante_profesor
+        
+        total_profesores = db.select(func.count()).select_from(estudiante_profesor)\
+            .where(estudiante_profesor.c.estudiante_id == self.id).scalar_subquery()
+        total_sesiones, promedio, profesores = db.session.query(
+            func.count(Sesion.id), func.avg(Sesion.puntaje), total_profesores
+        ).filter(Sesion.estudiante_id == self.id).one()
+        
+        return {
+            'total_sesiones': total_sesiones,
+            'total_profesores': profesores,
+            'promedio_puntaje': round(float(promedio), 2) if total_sesiones else 0
+        }
+    
     def set_password(self, password: str):
         """Establece la contraseña hasheada"""
         self.password = bcrypt.generate_password_hash(password).decode('utf-8')
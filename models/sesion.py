@@ -18,9 +18,13 @@ class Sesion(db.Model):
     fecha = db.Column(db.DateTime, default=datetime.utcnow)
     respuestas_detalle = db.Column(db.Text)  # JSON con respuestas
     interacciones_ia = db.Column(db.Integer, default=0)
+    idempotency_key = db.Column(db.String(64))  # Idempotency-Key / client_session_uuid de Unity (reintentos)
     
     # Relación con profesor (lazy)
     profesor = db.relationship('Profesor', backref=db.backref('sesiones_evaluadas', lazy=True))
+    # Respuestas normalizadas (una fila por pregunta, para analytics en SQL)
+    respuestas = db.relationship('SesionRespuesta', backref='sesion', lazy=True,
+                                 cascade='all, delete-orphan', order_by='SesionRespuesta.orden')
     
     def to_dict(self, include_estudiante=False, include_profesor=False):
         """Serializa la sesión a diccionario"""
@@ -85,7 +89,7 @@ class Sesion(db.Model):
             return "Baja"
     
     def get_respuestas(self) -> list:
-        """Obtiene las respuestas parseadas desde JSON"""
+        """Obtiene las respuestas parseadas desde JSON (tal como las envió Unity)"""
         if not self.respuestas_detalle:
             return []
         try:
@@ -94,8 +98,38 @@ class Sesion(db.Model):
             return []
     
     def set_respuestas(self, respuestas: list):
-        """Establece las respuestas serializándolas a JSON"""
+        """Establece las respuestas serializándolas a JSON y sincroniza sesion_respuesta"""
+        from models.sesion_respuesta import SesionRespuesta
+
         self.respuestas_detalle = json.dumps(respuestas)
+
+        # Se reutilizan las filas por 'orden': reemplazarlas chocaría con el índice único
+        existentes = {r.orden: r for r in self.respuestas}
+        nuevas = []
+        for fila in SesionRespuesta.filas_desde_detalle(self.id, self.respuestas_detalle):
+            fila.pop('sesion_id')
+            respuesta = existentes.get(fila['orden']) or SesionRespuesta()
+            for campo, valor in fila.items():
+                setattr(respuesta, campo, valor)
+            nuevas.append(respuesta)
+        self.respuestas = nuevas
     
     def __repr__(self):
         return f'<Sesion {self.id}: {self.estudiante.nombre if self.estudiante else "N/A"} - {self.maqueta} ({self.puntaje}/7.0)>'
+
+
+# Índices compuestos para paginación keyset sobre (fecha DESC, id DESC)
+# Cubren el listado del profesor/estudiante y los filtros más comunes
+db.Index('idx_sesion_profesor_fecha_id', Sesion.profesor_id, Sesion.fecha.desc(), Sesion.id.desc())
+db.Index('idx_sesion_estudiante_fecha_id', Sesion.estudiante_id, Sesion.fecha.desc(), Sesion.id.desc())
+db.Index(
+    'idx_sesion_profesor_maqueta_fecha_id',
+    Sesion.profesor_id, Sesion.maqueta, Sesion.fecha.desc(), Sesion.id.desc()
+)
+db.Index(
+    'idx_sesion_profesor_estudiante_fecha_id',
+    Sesion.profesor_id, Sesion.estudiante_id, Sesion.fecha.desc(), Sesion.id.desc()
+)
+
+# Deduplicación de reintentos de ingesta (NULL permitido varias veces)
+db.Index('uq_sesion_idempotency_key', Sesion.idempotency_key, unique=True)
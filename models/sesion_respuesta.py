@@ -0,0 +1,87 @@
+"""
+models/sesion_respuesta.py - Respuestas normalizadas de cada sesión (una fila por pregunta)
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from models.base import db
+
+MAX_PREGUNTA_LENGTH = 255
+_VERDADEROS = {'true', '1', 'si', 'sí', 'yes', 'verdadero'}
+_FALSOS = {'false', '0', 'no', 'falso'}
+
+
+def parse_respuestas(raw: Optional[str]) -> List[Any]:
+    """Parsea respuestas_detalle tolerando JSON inválido o formatos legacy"""
+    if not raw:
+        return []
+    try:
+        data = json.loads(raw)
+    except (ValueError, TypeError):
+        return []
+    # Datos de prueba antiguos guardan {"respuestas": [...]}
+    if isinstance(data, dict):
+        data = data.get('respuestas', [])
+    return data if isinstance(data, list) else []
+
+
+def _texto(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    return valor if isinstance(valor, str) else json.dumps(valor, ensure_ascii=False)
+
+
+def _booleano(valor: Any) -> Optional[bool]:
+    """bool, 0/1 o 'true'/'false' (y variantes legacy); None si no se puede interpretar"""
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)) and valor in (0, 1):
+        return bool(valor)
+    if isinstance(valor, str):
+        texto = valor.strip().lower()
+        if texto in _VERDADEROS:
+            return True
+        if texto in _FALSOS:
+            return False
+    return None
+
+
+class SesionRespuesta(db.Model):
+    """Respuesta a una pregunta dentro de una sesión VR (copia normalizada de respuestas_detalle)"""
+    id = db.Column(db.Integer, primary_key=True)
+    sesion_id = db.Column(db.Integer, db.ForeignKey('sesion.id', ondelete='CASCADE'), nullable=False)
+    orden = db.Column(db.Integer, nullable=False)  # Posición en el array de Unity
+    pregunta = db.Column(db.String(MAX_PREGUNTA_LENGTH))  # Número o texto de la pregunta
+    respuesta = db.Column(db.Text)
+    correcta = db.Column(db.Boolean)
+
+    @staticmethod
+    def filas_desde_detalle(sesion_id: int, respuestas_detalle: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Filas para insertar a partir del JSON de respuestas_detalle
+
+        Los ítems que no son objetos se omiten; 'orden' conserva la posición
+        original, así que el array completo se puede reconstruir.
+        """
+        filas = []
+        for orden, r in enumerate(parse_respuestas(respuestas_detalle)):
+            if not isinstance(r, dict):
+                continue
+            pregunta = _texto(r.get('pregunta'))
+            filas.append({
+                'sesion_id': sesion_id,
+                'orden': orden,
+                'pregunta': pregunta[:MAX_PREGUNTA_LENGTH] if pregunta is not None else None,
+                'respuesta': _texto(r.get('respuesta')),
+                'correcta': _booleano(r.get('correcta')),
+            })
+        return filas
+
+    def __repr__(self):
+        return f'<SesionRespuesta {self.sesion_id}#{self.orden}: {self.pregunta} ({self.correcta})>'
+
+
+# Una fila por posición (también hace idempotente el backfill) y agregados por pregunta
+db.Index('uq_sesion_respuesta_sesion_orden', SesionRespuesta.sesion_id, SesionRespuesta.orden, unique=True)
+db.Index('idx_sesion_respuesta_pregunta_correcta', SesionRespuesta.pregunta, SesionRespuesta.correcta)
@@ -3,11 +3,14 @@ Estudiante Repository - Gestión de estudiantes
 Maneja todas las operaciones CRUD de estudiantes
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
 from models import db, Estudiante, Profesor
+from utils.codigo_cache import EstudianteRef, cache_codigos
+from utils.tracing import trazar_clase
 
 
+@trazar_clase
 class EstudianteRepository:
     """Repository para gestionar estudiantes"""
     
@@ -54,6 +57,44 @@ class EstudianteRepository:
         """Obtiene un estudiante por código"""
         return Estudiante.query.filter_by(codigo=codigo).first()
     
+    @staticmethod
+    def resolver_codigo(codigo: str) -> Optional[EstudianteRef]:
+        """
+        Traduce un código a (id, nombre) pasando por el cache de la ingesta
+        
+        Returns:
+            EstudianteRef o None si no existe
+        """
+        ref = cache_codigos.get(codigo)
+        if ref is not None:
+            return ref
+        fila = db.session.query(Estudiante.id, Estudiante.nombre).filter_by(codigo=codigo).first()
+        if fila is None:
+            return None
+        ref = EstudianteRef(*fila)
+        cache_codigos.put(codigo, ref)
+        return ref
+    
+    @staticmethod
+    def get_ids_by_codigos(codigos: Iterable[str]) -> Dict[str, int]:
+        """
+        Resuelve varios códigos a IDs: los cacheados sin query, el resto en
+        una sola query IN (los inexistentes se omiten)
+        """
+        ids, faltantes = {}, []
+        for codigo in set(codigos):
+            ref = cache_codigos.get(codigo)
+            if ref is not None:
+                ids[codigo] = ref.id
+            else:
+                faltantes.append(codigo)
+        if faltantes:
+            filas = db.session.query(Estudiante.codigo, Estudiante.id, Estudiante.nombre)\
+                .filter(Estudiante.codigo.in_(faltantes)).all()
+            cache_codigos.put_many({codigo: EstudianteRef(id_, nombre) for codigo, id_, nombre in filas})
+            ids.update((codigo, id_) for codigo, id_, _ in filas)
+        return ids
+    
     @staticmethod
     def get_all() -> List[Estudiante]:
         """Obtiene todos los estudiantes"""
@@ -3,11 +3,15 @@ Profesor Repository - Gestión de profesores
 Maneja todas las operaciones CRUD de profesores
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, Profesor, Estudiante
+from models import db, Profesor, Estudiante, Sesion, estudiante_profesor
+from utils.tracing import trazar_clase
 
 
+@trazar_clase
 class ProfesorRepository:
     """Repository para gestionar profesores"""
     
@@ -63,6 +67,24 @@ class ProfesorRepository:
         """Obtiene todos los profesores"""
         return Profesor.query.order_by(Profesor.nombre).all()
     
+    @staticmethod
+    def get_all_con_total_estudiantes() -> List[Tuple[Profesor, int]]:
+        """
+        Obtiene todos los profesores con su número de estudiantes (1 query)
+        
+        Returns:
+            Lista de tuplas (profesor, total_estudiantes) ordenada por nombre
+        """
+        totales = db.session.query(
+            estudiante_profesor.c.profesor_id,
+            func.count().label('total')
+        ).group_by(estudiante_profesor.c.profesor_id).subquery()
+        
+        return db.session.query(Profesor, func.coalesce(totales.c.total, 0))\
+                    .outerjoin(totales, totales.c.profesor_id == Profesor.id)\
+                    .order_by(Profesor.nombre)\
+                    .all()
+    
     @staticmethod
     def authenticate(email: str, password: str) -> Optional[Profesor]:
         """
@@ -100,6 +122,41 @@ class ProfesorRepository:
         
         return profesor.estudiantes
     
+    @staticmethod
+    def get_estudiantes_con_stats(profesor_id: int) -> List[Row]:
+        """
+        Estudiantes inscritos con un profesor junto a sus estadísticas con él (1 query)
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Filas (id, nombre, codigo, email, total_sesiones, promedio_puntaje);
+            promedio_puntaje es None si el estudiante no tiene sesiones
+        """
+        stats = db.session.query(
+            Sesion.estudiante_id,
+            func.count(Sesion.id).label('total_sesiones'),
+            func.avg(Sesion.puntaje).label('promedio_puntaje')
+        ).filter(
+            Sesion.profesor_id == profesor_id
+        ).group_by(Sesion.estudiante_id).subquery()
+        
+        return db.session.query(
+            Estudiante.id,
+            Estudiante.nombre,
+            Estudiante.codigo,
+            Estudiante.email,
+            func.coalesce(stats.c.total_sesiones, 0).label('total_sesiones'),
+            stats.c.promedio_puntaje
+        ).join(
+            estudiante_profesor, estudiante_profesor.c.estudiante_id == Estudiante.id
+        ).outerjoin(
+            stats, stats.c.estudiante_id == Estudiante.id
+        ).filter(
+            estudiante_profesor.c.profesor_id == profesor_id
+        ).order_by(Estudiante.id).all()
+    
     @staticmethod
     def update_password(profesor_id: int, new_password: str) -> bool:
         """
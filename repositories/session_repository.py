@@ -3,20 +3,25 @@ Session Repository - Gestión de sesiones VR
 Maneja todas las operaciones CRUD de sesiones
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, and_, or_, insert
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import joinedload
-from models import db, Sesion
+from models import db, Sesion, SesionRespuesta, Estudiante
+from utils.pagination import SesionFiltros
+from utils.tracing import trazar_clase
 
 
+@trazar_clase
 class SessionRepository:
     """Repository para gestionar sesiones VR"""
     
     @staticmethod
     def create(estudiante_id: int, maqueta: str, puntaje: float, 
                tiempo_segundos: int, interacciones_ia: int, 
-               profesor_id: Optional[int] = None) -> Sesion:
+               profesor_id: Optional[int] = None,
+               idempotency_key: Optional[str] = None) -> Sesion:
         """
         Crea una nueva sesión
         
@@ -27,6 +32,7 @@ class SessionRepository:
             tiempo_segundos: Tiempo en segundos
             interacciones_ia: Número de interacciones con IA
             profesor_id: ID del profesor que evalúa (opcional)
+            idempotency_key: Clave de deduplicación de reintentos (opcional)
             
         Returns:
             Sesion: La sesión creada
@@ -34,14 +40,7 @@ class SessionRepository:
         Raises:
             ValueError: Si los datos son inválidos
         """
-        if not 0 <= puntaje <= 7:
-            raise ValueError("El puntaje debe estar entre 0 y 7")
-        
-        if tiempo_segundos < 0:
-            raise ValueError("El tiempo no puede ser negativo")
-        
-        if interacciones_ia < 0:
-            raise ValueError("Las interacciones no pueden ser negativas")
+        SessionRepository.validar_valores(puntaje, tiempo_segundos, interacciones_ia)
         
         sesion = Sesion(
             estudiante_id=estudiante_id,
@@ -50,7 +49,8 @@ class SessionRepository:
             tiempo_segundos=tiempo_segundos,
             interacciones_ia=interacciones_ia,
             profesor_id=profesor_id,
-            fecha=datetime.utcnow()
+            fecha=datetime.utcnow(),
+            idempotency_key=idempotency_key
         )
         
         db.session.add(sesion)
@@ -58,6 +58,58 @@ class SessionRepository:
         
         return sesion
     
+    @staticmethod
+    def validar_valores(puntaje: float, tiempo_segundos: int, interacciones_ia: int) -> None:
+        """
+        Valida los valores numéricos de una sesión
+        
+        Raises:
+            ValueError: Si los datos son inválidos
+        """
+        if not 0 <= puntaje <= 7:
+            raise ValueError("El puntaje debe estar entre 0 y 7")
+        
+        if tiempo_segundos < 0:
+            raise ValueError("El tiempo no puede ser negativo")
+        
+        if interacciones_ia < 0:
+            raise ValueError("Las interacciones no pueden ser negativas")
+    
+    @staticmethod
+    def create_many(filas: List[Dict[str, Any]]) -> List[int]:
+        """
+        Inserta varias sesiones ya validadas en una transacción (bulk insert)
+        
+        Las respuestas de respuestas_detalle se insertan también normalizadas en
+        sesion_respuesta, en la misma transacción (un executemany para todo el lote).
+        
+        Args:
+            filas: Dicts con las columnas de Sesion (estudiante_id, maqueta, puntaje,
+                   tiempo_segundos, interacciones_ia, profesor_id, fecha, respuestas_detalle,
+                   idempotency_key), todas con las mismas claves
+            
+        Returns:
+            IDs de las sesiones creadas, en el mismo orden que `filas`
+        """
+        if not filas:
+            return []
+        try:
+            ids = db.session.scalars(
+                insert(Sesion).returning(Sesion.id, sort_by_parameter_order=True), filas
+            ).all()
+            respuestas = [
+                respuesta
+                for sesion_id, fila in zip(ids, filas)
+                for respuesta in SesionRespuesta.filas_desde_detalle(sesion_id, fila.get('respuestas_detalle'))
+            ]
+            if respuestas:
+                db.session.execute(insert(SesionRespuesta), respuestas)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return list(ids)
+    
     @staticmethod
     def get_by_id(sesion_id: int) -> Optional[Sesion]:
         """
@@ -71,6 +123,19 @@ class SessionRepository:
         """
         return Sesion.query.get(sesion_id)
     
+    @staticmethod
+    def get_by_idempotency_key(clave: str) -> Optional[Sesion]:
+        """Sesión ya registrada con esa clave de idempotencia (índice único)"""
+        return Sesion.query.filter_by(idempotency_key=clave).first()
+    
+    @staticmethod
+    def get_ids_by_idempotency_keys(claves) -> Dict[str, int]:
+        """Resuelve varias claves de idempotencia a IDs en una sola query IN"""
+        claves = list(set(claves))
+        if not claves:
+            return {}
+        return dict(db.session.query(Sesion.idempotency_key, Sesion.id).filter(Sesion.idempotency_key.in_(claves)))
+    
     @staticmethod
     def get_by_estudiante(estudiante_id: int) -> List[Sesion]:
         """
@@ -81,31 +146,167 @@ class SessionRepository:
             estudiante_id: ID del estudiante
             
         Returns:
-            Lista de sesiones con relaciones pre-cargadas
+            Lista de sesiones con estudiante y profesor pre-cargados
         """
         return Sesion.query\
                     .filter_by(estudiante_id=estudiante_id)\
-                    .options(joinedload(Sesion.estudiante))\
+                    .options(joinedload(Sesion.estudiante), joinedload(Sesion.profesor))\
                     .order_by(Sesion.fecha.desc())\
                     .all()
     
     @staticmethod
-    def get_by_profesor(profesor_id: int) -> List[Sesion]:
+    def get_by_profesor(profesor_id: int, filtros: Optional[SesionFiltros] = None) -> List[Sesion]:
         """
         Obtiene todas las sesiones evaluadas por un profesor CON EAGER LOADING
         Optimizado para evitar N+1 queries
         
         Args:
             profesor_id: ID del profesor
+            filtros: Filtros server-side opcionales
             
         Returns:
             Lista de sesiones con estudiante pre-cargado
         """
-        return Sesion.query\
+        query = Sesion.query\
                     .filter_by(profesor_id=profesor_id)\
-                    .options(joinedload(Sesion.estudiante))\
-                    .order_by(Sesion.fecha.desc())\
-                    .all()
+                    .options(joinedload(Sesion.estudiante))
+        query = SessionRepository._aplicar_filtros(query, filtros)
+        return query.order_by(Sesion.fecha.desc()).all()
+    
+    @staticmethod
+    def _aplicar_filtros(query, filtros: Optional[SesionFiltros]):
+        """Aplica filtros server-side (rango de fechas, maqueta, estudiante, puntaje)"""
+        if filtros is None:
+            return query
+        if filtros.desde is not None:
+            query = query.filter(Sesion.fecha >= filtros.desde)
+        if filtros.hasta is not None:
+            query = query.filter(Sesion.fecha < filtros.hasta if filtros.hasta_exclusivo
+                                 else Sesion.fecha <= filtros.hasta)
+        if filtros.maqueta:
+            query = query.filter(Sesion.maqueta == filtros.maqueta)
+        if filtros.estudiante_id is not None:
+            query = query.filter(Sesion.estudiante_id == filtros.estudiante_id)
+        if filtros.puntaje_min is not None:
+            query = query.filter(Sesion.puntaje >= filtros.puntaje_min)
+        if filtros.puntaje_max is not None:
+            query = query.filter(Sesion.puntaje <= filtros.puntaje_max)
+        return query
+    
+    @staticmethod
+    def _keyset_page(query, limit: int,
+                     cursor: Optional[Tuple[datetime, int]]) -> Tuple[List[Sesion], Optional[Tuple[datetime, int]]]:
+        """
+        Ejecuta una página keyset sobre (fecha DESC, id DESC)
+        
+        Pide limit + 1 filas para saber si hay más sin un COUNT extra.
+        
+        Returns:
+            Tupla (sesiones, cursor_siguiente) - cursor_siguiente es None en la última página
+        """
+        if cursor is not None:
+            fecha, sesion_id = cursor
+            query = query.filter(or_(
+                Sesion.fecha < fecha,
+                and_(Sesion.fecha == fecha, Sesion.id < sesion_id)
+            ))
+        
+        filas = query.order_by(Sesion.fecha.desc(), Sesion.id.desc()).limit(limit + 1).all()
+        
+        if len(filas) <= limit:
+            return filas, None
+        
+        filas = filas[:limit]
+        return filas, (filas[-1].fecha, filas[-1].id)
+    
+    @staticmethod
+    def get_page_by_profesor(profesor_id: int, limit: int,
+                             cursor: Optional[Tuple[datetime, int]] = None,
+                             filtros: Optional[SesionFiltros] = None) -> Tuple[List[Sesion], Optional[Tuple[datetime, int]]]:
+        """
+        Obtiene una página de sesiones del profesor (keyset sobre fecha DESC, id DESC)
+        
+        Usa los índices idx_sesion_profesor_*_fecha_id: el costo por página es
+        constante sin importar la profundidad del cursor.
+        
+        Args:
+            profesor_id: ID del profesor
+            limit: Tamaño de página
+            cursor: (fecha, id) de la última fila de la página anterior
+            filtros: Filtros server-side opcionales
+            
+        Returns:
+            Tupla (sesiones con estudiante pre-cargado, cursor_siguiente)
+        """
+        query = Sesion.query\
+                    .filter(Sesion.profesor_id == profesor_id)\
+                    .options(joinedload(Sesion.estudiante))
+        query = SessionRepository._aplicar_filtros(query, filtros)
+        return SessionRepository._keyset_page(query, limit, cursor)
+    
+    @staticmethod
+    def get_page_by_estudiante(estudiante_id: int, limit: int,
+                               cursor: Optional[Tuple[datetime, int]] = None,
+                               filtros: Optional[SesionFiltros] = None) -> Tuple[List[Sesion], Optional[Tuple[datetime, int]]]:
+        """
+        Obtiene una página de sesiones del estudiante (keyset sobre fecha DESC, id DESC)
+        
+        Args:
+            estudiante_id: ID del estudiante
+            limit: Tamaño de página
+            cursor: (fecha, id) de la última fila de la página anterior
+            filtros: Filtros server-side opcionales
+            
+        Returns:
+            Tupla (sesiones con profesor pre-cargado, cursor_siguiente)
+        """
+        query = Sesion.query\
+                    .filter(Sesion.estudiante_id == estudiante_id)\
+                    .options(joinedload(Sesion.profesor))
+        query = SessionRepository._aplicar_filtros(query, filtros)
+        return SessionRepository._keyset_page(query, limit, cursor)
+    
+    @staticmethod
+    def iter_export_by_profesor(profesor_id: int, filtros: Optional[SesionFiltros] = None,
+                                incluir_respuestas: bool = False,
+                                batch_size: int = 1000) -> Iterator[Row]:
+        """
+        Itera las sesiones del profesor para exportación en memoria constante
+        
+        Usa un cursor server-side (stream_results + yield_per): las filas llegan
+        en lotes de batch_size en vez de materializar todo el historial.
+        Devuelve filas planas (no objetos ORM) con los datos del estudiante via JOIN.
+        
+        Args:
+            profesor_id: ID del profesor
+            filtros: Filtros server-side opcionales
+            incluir_respuestas: Incluir la columna respuestas_detalle
+            batch_size: Filas por lote
+            
+        Returns:
+            Iterador de filas (id, fecha, estudiante_codigo, estudiante_nombre, maqueta, ...)
+        """
+        columnas = [
+            Sesion.id,
+            Sesion.fecha,
+            Estudiante.codigo.label('estudiante_codigo'),
+            Estudiante.nombre.label('estudiante_nombre'),
+            Sesion.maqueta,
+            Sesion.puntaje,
+            Sesion.tiempo_segundos,
+            Sesion.interacciones_ia,
+        ]
+        if incluir_respuestas:
+            columnas.append(Sesion.respuestas_detalle)
+        
+        query = db.session.query(*columnas)\
+                    .join(Estudiante, Estudiante.id == Sesion.estudiante_id)\
+                    .filter(Sesion.profesor_id == profesor_id)
+        query = SessionRepository._aplicar_filtros(query, filtros)
+        query = query.order_by(Sesion.fecha.desc(), Sesion.id.desc())\
+                    .execution_options(stream_results=True, yield_per=batch_size)
+        
+        return iter(query)
     
     @staticmethod
     def count_by_profesor(profesor_id: int) -> int:
@@ -215,6 +416,41 @@ class SessionRepository:
         
         return True
     
+    @staticmethod
+    def get_aciertos_por_pregunta(profesor_id: Optional[int] = None,
+                                  maqueta: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Tasa de acierto por pregunta, agregada en SQL sobre sesion_respuesta
+        
+        Args:
+            profesor_id: Filtrar por profesor (opcional)
+            maqueta: Filtrar por maqueta (opcional)
+            
+        Returns:
+            Lista de {'pregunta', 'respuestas', 'correctas', 'tasa_acierto'},
+            de la pregunta más difícil a la más fácil
+        """
+        correctas = func.sum(db.case((SesionRespuesta.correcta.is_(True), 1), else_=0))
+        query = db.session.query(
+            SesionRespuesta.pregunta, func.count(SesionRespuesta.id), correctas
+        ).filter(SesionRespuesta.pregunta.isnot(None))
+        
+        if profesor_id is not None or maqueta is not None:
+            query = query.join(Sesion, Sesion.id == SesionRespuesta.sesion_id)
+            if profesor_id is not None:
+                query = query.filter(Sesion.profesor_id == profesor_id)
+            if maqueta is not None:
+                query = query.filter(Sesion.maqueta == maqueta)
+        
+        filas = query.group_by(SesionRespuesta.pregunta).all()
+        resultado = [{
+            'pregunta': pregunta,
+            'respuestas': total,
+            'correctas': int(aciertos or 0),
+            'tasa_acierto': round((aciertos or 0) / total, 4) if total else 0.0
+        } for pregunta, total, aciertos in filas]
+        return sorted(resultado, key=lambda r: (r['tasa_acierto'], r['pregunta']))
+    
     @staticmethod
     def get_maquetas_unicas(profesor_id: Optional[int] = None) -> List[str]:
         """
@@ -233,6 +469,56 @@ class SessionRepository:
         
         return [m[0] for m in query.all()]
     
+    @staticmethod
+    def get_resumen_estudiante(estudiante_id: int, profesor_id: Optional[int] = None,
+                               ultimas_por_maqueta: int = 10) -> List[Row]:
+        """
+        Resumen del dashboard del estudiante en UNA query con window functions
+        
+        Devuelve solo las últimas `ultimas_por_maqueta` sesiones de cada maqueta
+        (ROW_NUMBER() OVER (PARTITION BY maqueta ORDER BY fecha DESC)), cada fila
+        con los agregados globales y de su maqueta ya calculados. El tamaño del
+        resultado no depende del total de sesiones del estudiante.
+        
+        Args:
+            estudiante_id: ID del estudiante
+            profesor_id: Limitar a las sesiones con un profesor (opcional)
+            ultimas_por_maqueta: Sesiones por maqueta para el progreso temporal
+            
+        Returns:
+            Filas (maqueta, puntaje, fecha, rn_maqueta, rn_global, total, puntaje_avg,
+            puntaje_max, puntaje_min, tiempo_avg, maqueta_total, maqueta_avg, maqueta_max)
+            ordenadas por fecha DESC
+        """
+        orden = (Sesion.fecha.desc(), Sesion.id.desc())
+        por_maqueta = {'partition_by': Sesion.maqueta}
+        
+        condiciones = [Sesion.estudiante_id == estudiante_id]
+        if profesor_id is not None:
+            condiciones.append(Sesion.profesor_id == profesor_id)
+        
+        ventana = db.session.query(
+            Sesion.id,
+            Sesion.maqueta,
+            Sesion.puntaje,
+            Sesion.fecha,
+            func.row_number().over(order_by=orden, **por_maqueta).label('rn_maqueta'),
+            func.row_number().over(order_by=orden).label('rn_global'),
+            func.count().over().label('total'),
+            func.avg(Sesion.puntaje).over().label('puntaje_avg'),
+            func.max(Sesion.puntaje).over().label('puntaje_max'),
+            func.min(Sesion.puntaje).over().label('puntaje_min'),
+            func.avg(Sesion.tiempo_segundos).over().label('tiempo_avg'),
+            func.count().over(**por_maqueta).label('maqueta_total'),
+            func.avg(Sesion.puntaje).over(**por_maqueta).label('maqueta_avg'),
+            func.max(Sesion.puntaje).over(**por_maqueta).label('maqueta_max'),
+        ).filter(*condiciones).subquery()
+        
+        return db.session.query(ventana)\
+                    .filter(ventana.c.rn_maqueta <= ultimas_por_maqueta)\
+                    .order_by(ventana.c.fecha.desc(), ventana.c.id.desc())\
+                    .all()
+    
     @staticmethod
     def get_estadisticas_estudiante(estudiante_id: int, profesor_id: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -12,6 +12,9 @@ Blueprints disponibles:
 - api_bp: API REST endpoints para analytics
 - estudiante_bp: Rutas específicas de estudiantes
 - unity_bp: Endpoints para integración con Unity VR
+- export_bp: Exportación en streaming (CSV / NDJSON)
+- metrics_bp: Métricas en formato Prometheus (/metrics)
+- profiling_bp: Perfiles de requests capturados bajo demanda
 
 Uso:
     from routes import register_blueprints
@@ -41,6 +44,9 @@ def register_blueprints(app: Flask) -> None:
     from routes.api_routes import api_bp
     from routes.estudiante_routes import estudiante_bp
     from routes.unity_routes import unity_bp
+    from routes.export_routes import export_bp
+    from routes.metrics_routes import metrics_bp
+    from routes.profiling_routes import profiling_bp
     
     # Registrar blueprints con sus prefijos
     app.register_blueprint(auth_bp)
@@ -48,10 +54,13 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(api_bp, url_prefix='/api')
     app.register_blueprint(estudiante_bp, url_prefix='/api/estudiante')
     app.register_blueprint(unity_bp, url_prefix='/api/unity')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(profiling_bp, url_prefix='/api/profiles')
     
     # Log de blueprints registrados
     app.logger.info("✅ Blueprints registrados exitosamente")
-    app.logger.debug(f"Total blueprints: 5 (auth, dashboard, api, estudiante, unity)")
+    app.logger.debug(f"Total blueprints: 8 (auth, dashboard, api, estudiante, unity, export, metrics, profiling)")
 
 
 __all__ = ['register_blueprints']
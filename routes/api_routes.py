@@ -14,28 +14,46 @@ Endpoints API para profesores:
 Patrón: RESTful API con Service Layer
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, g, jsonify, request
 from flask_login import login_required, current_user
 import time
 import numpy as np
 
-from models import db, Profesor, Estudiante, Sesion
+from models import Profesor, Estudiante
 from services.analytics_service import AnalyticsService
 from services.session_service import SessionService
 from services.auth_service import AuthService
 from repositories.session_repository import SessionRepository
+from repositories.profesor_repository import ProfesorRepository
 from utils.constants import (
     HTTP_OK, HTTP_CREATED, HTTP_BAD_REQUEST, HTTP_FORBIDDEN
 )
 from utils.logger import get_logger
 from utils.bot_detector import BotDetector
-from sqlalchemy import func
+from utils.columnar import compact_response
+from utils.pagination import PaginationError, parse_filtros, parse_page_args, wants_pagination
+from utils.profiler import token_del_request, token_valido
 
 # Crear blueprint
 api_bp = Blueprint('api', __name__)
 logger = get_logger(__name__)
 
 
+def _con_timings_si_admin(resultado):
+    """
+    Deja '_timings' (tiempos por sección) solo para administradores: ?timings=1
+    con un token de profiling válido. El resultado cacheado no se modifica.
+    """
+    if '_timings' not in resultado:
+        return resultado
+    
+    if request.args.get('timings') == '1' and token_valido(current_app, token_del_request()):
+        # La respuesta difiere de la cacheada: no reutilizar sus bytes comprimidos
+        g.pop('compressed_variants', None)
+        return resultado
+    return {clave: valor for clave, valor in resultado.items() if clave != '_timings'}
+
+
 @api_bp.route('/analytics')
 @login_required
 def get_analytics():
@@ -44,6 +62,11 @@ def get_analytics():
     
     GET /api/analytics
     
+    Headers (opcional):
+        Accept: application/vnd.vranalytics.columnar+json → formato columnar compacto
+        Accept: application/x-msgpack → formato columnar en MessagePack
+        X-Profile: token de `flask profile-token` + ?timings=1 → incluye '_timings'
+    
     Returns:
         200 OK: Objeto JSON con estadísticas, gráficos, ML
         403 Forbidden: Si no es profesor
@@ -60,11 +83,12 @@ def get_analytics():
     try:
         analytics_service = AnalyticsService()
         resultado = analytics_service.get_analytics_profesor(current_user.id)
+        resultado = _con_timings_si_admin(resultado)
         
         duracion = time.time() - inicio
         logger.info(f"Analytics completado en {duracion:.2f}s")
         
-        return jsonify(resultado), HTTP_OK
+        return compact_response(resultado, HTTP_OK)
             
     except Exception as e:
         import traceback
@@ -121,35 +145,17 @@ def estudiantes():
         
         return jsonify(resultado), HTTP_CREATED if resultado['success'] else HTTP_BAD_REQUEST
     
-    # GET: Listar estudiantes OPTIMIZADO
-    stats_query = db.session.query(
-        Sesion.estudiante_id,
-        func.count(Sesion.id).label('total_sesiones'),
-        func.avg(Sesion.puntaje).label('promedio_puntaje')
-    ).filter(
-        Sesion.profesor_id == current_user.id
-    ).group_by(Sesion.estudiante_id).all()
-    
-    stats_dict = {
-        row.estudiante_id: {
-            'total_sesiones': row.total_sesiones,
-            'promedio_puntaje': round(row.promedio_puntaje, 2) if row.promedio_puntaje else 0
-        }
-        for row in stats_query
-    }
+    # GET: Listar estudiantes OPTIMIZADO (estudiantes + stats en una sola query)
+    filas = ProfesorRepository.get_estudiantes_con_stats(current_user.id)
     
-    mis_estudiantes = []
-    for estudiante in current_user.estudiantes:
-        stats = stats_dict.get(estudiante.id, {'total_sesiones': 0, 'promedio_puntaje': 0})
-        
-        mis_estudiantes.append({
-            'id': estudiante.id,
-            'nombre': estudiante.nombre,
-            'codigo': estudiante.codigo,
-            'email': estudiante.email,
-            'total_sesiones': stats['total_sesiones'],
-            'promedio_puntaje': stats['promedio_puntaje']
-        })
+    mis_estudiantes = [{
+        'id': fila.id,
+        'nombre': fila.nombre,
+        'codigo': fila.codigo,
+        'email': fila.email,
+        'total_sesiones': fila.total_sesiones,
+        'promedio_puntaje': round(fila.promedio_puntaje, 2) if fila.promedio_puntaje else 0
+    } for fila in filas]
     
     duracion = time.time() - inicio
     logger.info(f"Estudiantes listados en {duracion:.2f}s ({len(mis_estudiantes)} estudiantes)")
@@ -252,12 +258,29 @@ def listar_profesores():
 @login_required
 def obtener_sesiones_todas():
     """
-    Obtiene todas las sesiones del profesor.
+    Obtiene las sesiones del profesor.
     
     GET /api/sesiones-todas
     
+    Query params (paginación keyset, recomendada):
+        limit: int - Tamaño de página (activa el modo paginado)
+        cursor: str - Valor de next_cursor de la página anterior
+    
+    Query params (filtros, ambos modos):
+        desde, hasta: fecha ISO
+        maqueta: str
+        estudiante_id: int
+        puntaje_min, puntaje_max: float
+    
+    Sin limit/cursor se devuelve el historial completo (DEPRECADO).
+    
+    Headers (opcional):
+        Accept: application/vnd.vranalytics.columnar+json → formato columnar compacto
+        Accept: application/x-msgpack → formato columnar en MessagePack
+    
     Returns:
-        200 OK: Array de sesiones
+        200 OK: {'sesiones': [...], 'next_cursor': str|None, 'has_more': bool}
+        400 Bad Request: Cursor o filtros inválidos
         403 Forbidden: Si no es profesor
     """
     inicio = time.time()
@@ -269,26 +292,36 @@ def obtener_sesiones_todas():
             'message': 'Solo profesores pueden acceder'
         }), HTTP_FORBIDDEN
     
-    session_repo = SessionRepository()
-    sesiones = session_repo.get_by_profesor(current_user.id)
-    
-    sesiones_data = []
-    for s in sesiones:
-        sesiones_data.append({
-            'id': s.id,
-            'estudiante_nombre': s.estudiante.nombre,
-            'estudiante_codigo': s.estudiante.codigo,
-            'maqueta': s.maqueta,
-            'puntaje': s.puntaje,
-            'tiempo_segundos': s.tiempo_segundos,
-            'interacciones_ia': s.interacciones_ia,
-            'fecha': s.fecha.isoformat()
-        })
+    try:
+        filtros = parse_filtros(request.args)
+        paginado = wants_pagination(request.args)
+        if paginado:
+            limit, cursor = parse_page_args(request.args)
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), HTTP_BAD_REQUEST
+    
+    session_service = SessionService()
+    
+    if paginado:
+        resultado = session_service.get_sesiones_profesor_paginadas(current_user.id, limit, cursor, filtros)
+        
+        duracion = time.time() - inicio
+        logger.info(f"Página de sesiones en {duracion:.2f}s ({len(resultado['sesiones'])} sesiones)")
+        
+        return compact_response(resultado, HTTP_OK)
+    
+    sesiones_data = session_service.get_sesiones_profesor(current_user.id, filtros)
     
     duracion = time.time() - inicio
     logger.info(f"Sesiones listadas en {duracion:.2f}s ({len(sesiones_data)} sesiones)")
     
-    return jsonify({'sesiones': sesiones_data}), HTTP_OK
+    response, status = compact_response({'sesiones': sesiones_data}, HTTP_OK)
+    response.headers['Deprecation'] = 'true'
+    response.headers['Link'] = '</api/sesiones-todas?limit=50>; rel="successor-version"'
+    return response, status
 
 
 @api_bp.route('/regresion-simple')
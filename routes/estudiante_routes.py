@@ -5,6 +5,7 @@
 Endpoints API para estudiantes:
 - GET /api/estudiante/analytics - Analytics personales
 - GET /api/estudiante/analytics-profesor/<id> - Analytics filtrados por profesor
+- GET /api/estudiante/sesiones - Historial paginado (keyset)
 - POST /api/estudiante/inscribirse - Inscribirse con un profesor
 - GET /api/estudiante/profesores - Lista de profesores disponibles
 
@@ -23,6 +24,7 @@ from utils.constants import (
     HTTP_OK, HTTP_CREATED, HTTP_BAD_REQUEST, HTTP_FORBIDDEN, HTTP_NOT_FOUND
 )
 from utils.logger import get_logger
+from utils.pagination import PaginationError, parse_filtros, parse_page_args
 
 # Crear blueprint
 estudiante_bp = Blueprint('estudiante', __name__)
@@ -144,6 +146,45 @@ def estudiante_analytics_por_profesor(profesor_id):
         }), HTTP_OK
 
 
+@estudiante_bp.route('/sesiones', methods=['GET'])
+@login_required
+def estudiante_sesiones():
+    """
+    Historial de sesiones del estudiante con paginación keyset.
+    
+    GET /api/estudiante/sesiones?limit=50&cursor=<next_cursor>
+    
+    Query params (filtros opcionales):
+        desde, hasta: fecha ISO
+        maqueta: str
+        puntaje_min, puntaje_max: float
+    
+    Returns:
+        200 OK: {'sesiones': [...], 'next_cursor': str|None, 'has_more': bool}
+        400 Bad Request: Cursor o filtros inválidos
+        403 Forbidden: Si no es estudiante
+    """
+    if not isinstance(current_user, Estudiante):
+        return jsonify({
+            'success': False,
+            'message': 'Solo para estudiantes'
+        }), HTTP_FORBIDDEN
+    
+    try:
+        filtros = parse_filtros(request.args)
+        limit, cursor = parse_page_args(request.args)
+    except PaginationError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), HTTP_BAD_REQUEST
+    
+    analytics_service = AnalyticsService()
+    resultado = analytics_service.get_sesiones_estudiante(current_user.id, limit, cursor, filtros)
+    
+    return jsonify(resultado), HTTP_OK
+
+
 @estudiante_bp.route('/inscribirse', methods=['POST'])
 @login_required
 def estudiante_inscribirse():
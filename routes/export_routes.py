@@ -0,0 +1,123 @@
+"""
+📤 Export Routes - Blueprint de Exportación
+============================================
+
+Endpoints de exportación del historial de sesiones (Profesor):
+- GET /api/export/sesiones.csv - Historial en CSV
+- GET /api/export/sesiones.ndjson - Historial en NDJSON (un JSON por línea)
+
+Las respuestas se generan en streaming desde un cursor server-side:
+memoria constante sin importar el tamaño del historial.
+
+Patrón: Streaming response con Service Layer
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_login import login_required, current_user
+
+from models import Profesor
+from services.export_service import ExportService
+from utils.constants import HTTP_BAD_REQUEST, HTTP_FORBIDDEN
+from utils.logger import get_logger
+from utils.pagination import PaginationError, parse_filtros
+
+# Crear blueprint
+export_bp = Blueprint('export', __name__)
+logger = get_logger(__name__)
+
+
+def _preparar_export():
+    """
+    Validaciones comunes de los endpoints de exportación
+
+    Returns:
+        Tupla (filtros, incluir_respuestas, error_response)
+    """
+    if not isinstance(current_user, Profesor):
+        return None, False, (jsonify({
+            'success': False,
+            'message': 'Solo profesores pueden exportar sesiones'
+        }), HTTP_FORBIDDEN)
+
+    try:
+        filtros = parse_filtros(request.args)
+    except PaginationError as e:
+        return None, False, (jsonify({
+            'success': False,
+            'message': str(e)
+        }), HTTP_BAD_REQUEST)
+
+    incluir_respuestas = request.args.get('respuestas', '').lower() in ('1', 'true', 'si')
+    return filtros, incluir_respuestas, None
+
+
+def _nombre_archivo(extension: str) -> str:
+    return f"sesiones_{current_user.id}_{datetime.utcnow().strftime('%Y%m%d')}.{extension}"
+
+
+@export_bp.route('/sesiones.csv')
+@login_required
+def export_sesiones_csv():
+    """
+    Exporta el historial de sesiones del profesor en CSV.
+
+    GET /api/export/sesiones.csv
+
+    Query params:
+        respuestas: 1 → una fila por respuesta (expande respuestas_detalle)
+        desde, hasta, maqueta, estudiante_id, puntaje_min, puntaje_max: filtros
+
+    Returns:
+        200 OK: text/csv en streaming
+        400 Bad Request: Filtros inválidos
+        403 Forbidden: Si no es profesor
+    """
+    filtros, incluir_respuestas, error = _preparar_export()
+    if error:
+        return error
+
+    logger.info(f"Export CSV - Profesor ID={current_user.id} (respuestas={incluir_respuestas})")
+
+    export_service = ExportService()
+    lineas = export_service.iter_csv(current_user.id, filtros, incluir_respuestas)
+
+    return Response(
+        stream_with_context(lineas),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{_nombre_archivo("csv")}"'}
+    )
+
+
+@export_bp.route('/sesiones.ndjson')
+@login_required
+def export_sesiones_ndjson():
+    """
+    Exporta el historial de sesiones del profesor en NDJSON.
+
+    GET /api/export/sesiones.ndjson
+
+    Query params:
+        respuestas: 1 → incluye la lista 'respuestas' en cada sesión
+        desde, hasta, maqueta, estudiante_id, puntaje_min, puntaje_max: filtros
+
+    Returns:
+        200 OK: application/x-ndjson en streaming
+        400 Bad Request: Filtros inválidos
+        403 Forbidden: Si no es profesor
+    """
+    filtros, incluir_respuestas, error = _preparar_export()
+    if error:
+        return error
+
+    logger.info(f"Export NDJSON - Profesor ID={current_user.id} (respuestas={incluir_respuestas})")
+
+    export_service = ExportService()
+    lineas = export_service.iter_ndjson(current_user.id, filtros, incluir_respuestas)
+
+    return Response(
+        stream_with_context(lineas),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{_nombre_archivo("ndjson")}"'}
+    )
@@ -0,0 +1,59 @@
+"""
+📈 Metrics Routes - Blueprint de Métricas
+=========================================
+
+Endpoint de scraping para Prometheus:
+- GET /metrics - Métricas en formato de texto de Prometheus
+
+Si METRICS_TOKEN está configurado exige "Authorization: Bearer <token>";
+sin token solo responde a conexiones desde loopback (scraper en el mismo host).
+Excluido del rate limiting (lo consulta el scraper cada pocos segundos).
+"""
+
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from utils.constants import HTTP_FORBIDDEN, HTTP_NOT_FOUND, HTTP_UNAUTHORIZED
+from utils.extensions import get_limiter
+from utils import metrics
+
+# Crear blueprint
+metrics_bp = Blueprint('metrics', __name__)
+
+limiter = get_limiter()
+if limiter is not None:
+    limiter.exempt(metrics_bp)
+
+CONTENT_TYPE_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+# remote_addr del socket (no X-Forwarded-For): detrás del proxy de Render nunca es loopback
+DIRECCIONES_LOOPBACK = ('127.0.0.1', '::1')
+
+
+@metrics_bp.route('/metrics')
+def exponer_metricas():
+    """
+    Expone las métricas de la aplicación.
+
+    GET /metrics
+
+    Returns:
+        200 OK: Métricas (text/plain, formato Prometheus)
+        401 Unauthorized: Token inválido (si METRICS_TOKEN está configurado)
+        403 Forbidden: Sin METRICS_TOKEN y el request no viene de loopback
+        404 Not Found: Métricas deshabilitadas
+    """
+    if not current_app.config.get('METRICS_ENABLED'):
+        return jsonify({'success': False, 'message': 'Métricas deshabilitadas'}), HTTP_NOT_FOUND
+
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        recibido = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(recibido, token):
+            return jsonify({'success': False, 'message': 'No autorizado'}), HTTP_UNAUTHORIZED
+    elif request.remote_addr not in DIRECCIONES_LOOPBACK:
+        return jsonify({'success': False, 'message': 'Configurar METRICS_TOKEN para scraping remoto'}), HTTP_FORBIDDEN
+
+    metrics.actualizar_pool()
+    datos = metrics.recolectar(current_app.config.get('METRICS_MULTIPROC_DIR'))
+    return Response(metrics.render(datos), content_type=CONTENT_TYPE_PROMETHEUS)
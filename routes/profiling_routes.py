@@ -0,0 +1,65 @@
+"""
+🔥 Profiling Routes - Blueprint de Perfiles
+===========================================
+
+Endpoints para consultar los perfiles de requests capturados bajo demanda:
+- GET /api/profiles - Perfiles recientes (ruta, usuario, tamaño, duración)
+- GET /api/profiles/<id>.collapsed - Stacks en formato collapsed (flamegraph)
+
+Requieren el token firmado de `flask profile-token` en el header X-Profile.
+"""
+
+import os
+import re
+
+from flask import Blueprint, current_app, jsonify, request, send_file
+
+from utils.constants import HTTP_NOT_FOUND, HTTP_UNAUTHORIZED
+from utils.profiler import directorio_requests, listar_perfiles, token_del_request, token_valido
+
+# Crear blueprint
+profiling_bp = Blueprint('profiling', __name__)
+
+_RE_PERFIL_ID = re.compile(r'^[0-9T]{15}-[0-9a-f]{8}$')
+
+
+@profiling_bp.before_request
+def _verificar_token():
+    if not current_app.config.get('PROFILING_ENABLED'):
+        return jsonify({'success': False, 'message': 'Profiling deshabilitado'}), HTTP_NOT_FOUND
+    if not token_valido(current_app, token_del_request()):
+        return jsonify({'success': False, 'message': 'Token de profiling inválido o vencido'}), HTTP_UNAUTHORIZED
+
+
+@profiling_bp.route('', methods=['GET'])
+def listar():
+    """
+    Lista los perfiles más recientes.
+
+    GET /api/profiles?limit=20
+
+    Returns:
+        200 OK: {"success": true, "perfiles": [...]}
+    """
+    limite = request.args.get('limit', 20, type=int)
+    perfiles = listar_perfiles(directorio_requests(current_app), max(limite, 1))
+    return jsonify({'success': True, 'total': len(perfiles), 'perfiles': perfiles})
+
+
+@profiling_bp.route('/<perfil_id>.collapsed', methods=['GET'])
+def descargar(perfil_id):
+    """
+    Descarga los stacks de un perfil en formato collapsed.
+
+    GET /api/profiles/<id>.collapsed
+
+    Returns:
+        200 OK: text/plain, una línea `frame;frame;... muestras` por stack
+        404 Not Found: Perfil inexistente
+    """
+    ruta = os.path.abspath(os.path.join(directorio_requests(current_app), f'{perfil_id}.collapsed'))
+    if not _RE_PERFIL_ID.match(perfil_id) or not os.path.isfile(ruta):
+        return jsonify({'success': False, 'message': 'Perfil no encontrado'}), HTTP_NOT_FOUND
+
+    return send_file(ruta, mimetype='text/plain', as_attachment=True,
+                     download_name=f'{perfil_id}.collapsed')
@@ -4,8 +4,12 @@
 
 Endpoints API para Unity VR:
 - POST /api/unity/session - Crear sesión desde Unity
+- POST /api/unity/sessions:batch - Crear un lote de sesiones (backlog offline)
 - GET /api/unity/verify - Verificar conectividad
 
+Los POST aceptan JSON o MessagePack (Content-Type: application/x-msgpack),
+opcionalmente con Content-Encoding: gzip (ver utils/request_body.py).
+
 Patrón: RESTful API con validación y Service Layer
 """
 
@@ -13,8 +17,13 @@ from flask import Blueprint, jsonify, request
 import time
 
 from services.session_service import SessionService
-from utils.constants import HTTP_OK, HTTP_CREATED, HTTP_BAD_REQUEST
+from utils.constants import (
+    HTTP_OK, HTTP_CREATED, HTTP_MULTI_STATUS, HTTP_BAD_REQUEST, MAX_BATCH_SESIONES,
+    MAX_CUERPO_LOTE_BYTES, MAX_CUERPO_SESION_BYTES, MAX_IDEMPOTENCY_KEY_LENGTH
+)
 from utils.logger import get_logger
+from utils.metrics import SESIONES_INGESTADAS
+from utils.request_body import CuerpoInvalido, leer_cuerpo
 from utils.validators import validate_puntaje
 
 # Crear blueprint
@@ -35,12 +44,21 @@ def create_unity_session():
             "puntaje": float (0-7),
             "tiempo_segundos": int,
             "interacciones_ia": int (opcional),
-            "respuestas": array (opcional)
+            "respuestas": array (opcional),
+            "client_session_uuid": str (opcional, alternativa al header Idempotency-Key)
         }
     
+    Headers:
+        Idempotency-Key (opcional): los reintentos con la misma clave no crean
+        otra sesión; devuelven el resultado original con "Idempotent-Replayed: true"
+        Content-Type: application/json o application/x-msgpack
+        Content-Encoding (opcional): gzip
+    
     Returns:
-        201 Created: Sesión creada exitosamente
+        201 Created: Sesión creada exitosamente (o reintento ya registrado)
         400 Bad Request: Datos inválidos
+        413 Payload Too Large: Body de más de MAX_CUERPO_SESION_BYTES
+        415 Unsupported Media Type: Content-Type / Content-Encoding no soportado
     
     Example:
         ```json
@@ -59,7 +77,9 @@ def create_unity_session():
     inicio = time.time()
     
     try:
-        data = request.json
+        data = leer_cuerpo(MAX_CUERPO_SESION_BYTES)
+        if not isinstance(data, dict):
+            raise CuerpoInvalido('Se espera un objeto con los datos de la sesión')
         
         # Log de datos recibidos
         logger.info(f"Unity Session - Estudiante: {data.get('codigo_estudiante')}, Maqueta: {data.get('maqueta')}")
@@ -106,6 +126,15 @@ def create_unity_session():
                 'message': 'Tiempo inválido'
             }), HTTP_BAD_REQUEST
         
+        # Clave de idempotencia (reintentos de Unity tras un timeout)
+        idempotency_key = request.headers.get('Idempotency-Key') or data.get('client_session_uuid')
+        if idempotency_key is not None and not (
+                isinstance(idempotency_key, str) and 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH):
+            return jsonify({
+                'success': False,
+                'message': f'Idempotency-Key inválido (texto de hasta {MAX_IDEMPOTENCY_KEY_LENGTH} caracteres)'
+            }), HTTP_BAD_REQUEST
+        
         # Crear sesión usando SessionService
         session_service = SessionService()
         
@@ -116,18 +145,31 @@ def create_unity_session():
             tiempo_segundos=tiempo_int,
             interacciones_ia=int(data.get('interacciones_ia', 0)),
             profesor_id=None,  # Unity no especifica profesor
-            respuestas=data.get('respuestas', [])
+            respuestas=data.get('respuestas', []),
+            idempotency_key=idempotency_key
         )
         
         duracion = time.time() - inicio
         
         if resultado['success']:
+            resultado['session_id'] = resultado['sesion_id']  # Clave documentada para Unity (README)
+            if resultado.get('duplicada'):
+                logger.info(f"Unity Session reintento ya registrado - ID={resultado['session_id']}")
+                return jsonify(resultado), HTTP_CREATED, {'Idempotent-Replayed': 'true'}
+            SESIONES_INGESTADAS.inc('unity')
             logger.info(f"Unity Session creada exitosamente en {duracion:.2f}s - ID={resultado['session_id']}")
             return jsonify(resultado), HTTP_CREATED
         else:
             logger.warning(f"Unity Session falló en {duracion:.2f}s: {resultado['message']}")
             return jsonify(resultado), HTTP_BAD_REQUEST
     
+    except CuerpoInvalido as e:
+        logger.warning(f"Unity Session - Body rechazado: {e}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), e.status
+    
     except Exception as e:
         import traceback
         duracion = time.time() - inicio
@@ -140,6 +182,82 @@ def create_unity_session():
         }), HTTP_BAD_REQUEST
 
 
+@unity_bp.route('/sessions:batch', methods=['POST'])
+def create_unity_sessions_batch():
+    """
+    Crea un lote de sesiones VR en un solo round trip (headsets que estuvieron offline).
+    
+    POST /api/unity/sessions:batch
+    Body:
+        {"sesiones": [<sesión>, ...]}  o directamente [<sesión>, ...]
+        Cada sesión tiene el formato de POST /api/unity/session, más
+        "fecha" (ISO 8601, opcional) con el momento real de la sesión.
+        Con "client_session_uuid" por sesión, volver a subir el lote no
+        duplica las ya registradas (vuelven con "duplicada": true).
+    
+    Returns:
+        201 Created: Todas las sesiones creadas
+        207 Multi-Status: Algunas sesiones fallaron (ver 'resultados')
+        400 Bad Request: Lote inválido o ninguna sesión creada
+        413 / 415: Body demasiado grande o en un formato no soportado
+    
+    Example Response:
+        ```json
+        {
+            "success": true,
+            "creadas": 1,
+            "duplicadas": 0,
+            "fallidas": 1,
+            "resultados": [
+                {"index": 0, "success": true, "sesion_id": 101, "session_id": 101},
+                {"index": 1, "success": false, "message": "Estudiante con código X no encontrado"}
+            ]
+        }
+        ```
+    """
+    inicio = time.time()
+    
+    try:
+        data = leer_cuerpo(MAX_CUERPO_LOTE_BYTES)
+    except CuerpoInvalido as e:
+        logger.warning(f"Unity Batch - Body rechazado: {e}")
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), e.status
+    items = data.get('sesiones') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            'success': False,
+            'message': 'Se espera una lista no vacía de sesiones (o {"sesiones": [...]})'
+        }), HTTP_BAD_REQUEST
+    
+    if len(items) > MAX_BATCH_SESIONES:
+        return jsonify({
+            'success': False,
+            'message': f'Máximo {MAX_BATCH_SESIONES} sesiones por lote (recibidas {len(items)})'
+        }), HTTP_BAD_REQUEST
+    
+    resultado = SessionService().create_sessions_batch(items)
+    duracion = time.time() - inicio
+    
+    if resultado['creadas']:
+        SESIONES_INGESTADAS.inc('unity_batch', cantidad=resultado['creadas'])
+    logger.info(f"Unity Batch - {resultado['creadas']} creadas, {resultado['duplicadas']} duplicadas, "
+                f"{resultado['fallidas']} fallidas en {duracion:.2f}s")
+    
+    exitosas = resultado['creadas'] + resultado['duplicadas']
+    if resultado['fallidas'] == 0:
+        status = HTTP_CREATED
+    elif exitosas:
+        status = HTTP_MULTI_STATUS
+    else:
+        status = HTTP_BAD_REQUEST
+    
+    return jsonify({'success': exitosas > 0, **resultado}), status
+
+
 @unity_bp.route('/verify', methods=['GET'])
 def verify_connection():
     """
@@ -169,6 +287,7 @@ def verify_connection():
         'timestamp': datetime.utcnow().isoformat(),
         'endpoints': {
             'create_session': '/api/unity/session (POST)',
+            'create_sessions_batch': '/api/unity/sessions:batch (POST)',
             'verify': '/api/unity/verify (GET)'
         }
     }), HTTP_OK
@@ -1,6 +1,9 @@
 """
 Script para agregar índices a la base de datos PostgreSQL
 Esto mejorará significativamente la velocidad de las consultas
+
+Es idempotente (IF NOT EXISTS) e init_render.py lo ejecuta en cada build:
+db.create_all() no agrega índices a tablas que ya existen.
 """
 
 import sys
@@ -55,22 +58,37 @@ def create_indexes():
             """))
             print("✅ Índice creado: idx_sesion_maqueta")
             
+            # Índices compuestos para paginación keyset (fecha DESC, id DESC)
+            keyset_indexes = {
+                'idx_sesion_profesor_fecha_id': 'profesor_id, fecha DESC, id DESC',
+                'idx_sesion_estudiante_fecha_id': 'estudiante_id, fecha DESC, id DESC',
+                'idx_sesion_profesor_maqueta_fecha_id': 'profesor_id, maqueta, fecha DESC, id DESC',
+                'idx_sesion_profesor_estudiante_fecha_id': 'profesor_id, estudiante_id, fecha DESC, id DESC',
+            }
+            for nombre, columnas in keyset_indexes.items():
+                db.session.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS {nombre} 
+                    ON sesion({columnas});
+                """))
+                print(f"✅ Índice creado: {nombre}")
+            
             # Commit todos los índices
             db.session.commit()
             print("\n✅ Todos los índices creados exitosamente!")
-            print("\n📊 Verificando índices...")
-            
-            # Listar todos los índices de la tabla sesion
-            result = db.session.execute(text("""
-                SELECT indexname, indexdef 
-                FROM pg_indexes 
-                WHERE tablename = 'sesion'
-                ORDER BY indexname;
-            """))
             
-            print("\n🔍 Índices en tabla 'sesion':")
-            for row in result:
-                print(f"  - {row[0]}")
+            # Listar todos los índices de la tabla sesion (pg_indexes solo existe en PostgreSQL)
+            if db.engine.dialect.name == 'postgresql':
+                print("\n📊 Verificando índices...")
+                result = db.session.execute(text("""
+                    SELECT indexname, indexdef 
+                    FROM pg_indexes 
+                    WHERE tablename = 'sesion'
+                    ORDER BY indexname;
+                """))
+                
+                print("\n🔍 Índices en tabla 'sesion':")
+                for row in result:
+                    print(f"  - {row[0]}")
             
             print("\n🚀 Base de datos optimizada para queries rápidas!")
             
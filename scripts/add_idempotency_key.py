@@ -0,0 +1,49 @@
+"""
+Script para agregar la clave de idempotencia a sesiones existentes
+Columna sesion.idempotency_key + índice único (SQLite y PostgreSQL)
+
+Las bases creadas con db.create_all() después de este cambio ya la tienen.
+"""
+
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from sqlalchemy import inspect, text
+
+
+def add_idempotency_key():
+    """Agrega la columna e índice único si no existen (idempotente)"""
+
+    with app.app_context():
+        print("🔍 Verificando columna sesion.idempotency_key...")
+
+        try:
+            columnas = {c['name'] for c in inspect(db.engine).get_columns('sesion')}
+            if 'idempotency_key' not in columnas:
+                db.session.execute(text("ALTER TABLE sesion ADD COLUMN idempotency_key VARCHAR(64)"))
+                print("✅ Columna creada: sesion.idempotency_key")
+            else:
+                print("ℹ️ La columna ya existe")
+
+            # Único con NULLs permitidos: las sesiones sin clave no chocan entre sí
+            db.session.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_sesion_idempotency_key
+                ON sesion(idempotency_key);
+            """))
+            print("✅ Índice creado: uq_sesion_idempotency_key")
+
+            db.session.commit()
+            print("\n🚀 Reintentos de Unity deduplicados por Idempotency-Key / client_session_uuid")
+
+        except Exception as e:
+            print(f"❌ Error en la migración: {e}")
+            db.session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    add_idempotency_key()
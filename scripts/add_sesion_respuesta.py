@@ -0,0 +1,88 @@
+"""
+Script para normalizar las respuestas de sesiones existentes
+Crea la tabla sesion_respuesta (con sus índices) y la completa desde
+sesion.respuestas_detalle, en lotes por ID (SQLite y PostgreSQL)
+
+Es re-ejecutable: solo procesa las sesiones que todavía no tienen filas en
+sesion_respuesta. Las sesiones nuevas se normalizan al ingresar. Los
+detalles vacíos ('[]', '{"respuestas": []}', ...) no producen filas y se
+excluyen en SQL para no re-escanearlos en cada deploy (init_render.py).
+
+Uso:
+    python scripts/add_sesion_respuesta.py [--lote 1000]
+"""
+
+import argparse
+import sys
+import os
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, db
+from models import Sesion, SesionRespuesta
+from sqlalchemy import insert
+
+# respuestas_detalle sin respuestas (datos de prueba y sesiones sin preguntas)
+DETALLES_VACIOS = ('', '[]', '{}', 'null', '{"respuestas": []}', '{"respuestas":[]}')
+
+
+def backfill(lote: int = 1000) -> int:
+    """
+    Normaliza respuestas_detalle de las sesiones pendientes
+
+    Args:
+        lote: Sesiones por transacción
+
+    Returns:
+        Cantidad de respuestas insertadas
+    """
+    ya_normalizada = db.session.query(SesionRespuesta.id)\
+        .filter(SesionRespuesta.sesion_id == Sesion.id).exists()
+    ultimo_id, insertadas = 0, 0
+
+    while True:
+        # Paginación keyset por ID: cada lote es una query por índice, sin OFFSET
+        sesiones = db.session.query(Sesion.id, Sesion.respuestas_detalle)\
+            .filter(Sesion.id > ultimo_id, Sesion.respuestas_detalle.isnot(None),
+                    Sesion.respuestas_detalle.notin_(DETALLES_VACIOS), ~ya_normalizada)\
+            .order_by(Sesion.id).limit(lote).all()
+        if not sesiones:
+            return insertadas
+
+        filas = [fila for sesion_id, detalle in sesiones
+                 for fila in SesionRespuesta.filas_desde_detalle(sesion_id, detalle)]
+        if filas:
+            db.session.execute(insert(SesionRespuesta), filas)
+        db.session.commit()
+
+        ultimo_id = sesiones[-1].id
+        insertadas += len(filas)
+        print(f"  ... hasta sesión {ultimo_id}: {insertadas} respuestas")
+
+
+def add_sesion_respuesta(lote: int = 1000):
+    """Crea la tabla si no existe y ejecuta el backfill"""
+
+    with app.app_context():
+        print("🔍 Verificando tabla sesion_respuesta...")
+
+        try:
+            # checkfirst: no falla si ya existe (crea también sus índices)
+            SesionRespuesta.__table__.create(db.engine, checkfirst=True)
+            print("✅ Tabla lista: sesion_respuesta")
+
+            insertadas = backfill(lote)
+            print(f"✅ Backfill completo: {insertadas} respuestas normalizadas")
+            print("\n🚀 Analytics por pregunta disponibles en SQL (SessionRepository.get_aciertos_por_pregunta)")
+
+        except Exception as e:
+            print(f"❌ Error en la migración: {e}")
+            db.session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Normaliza sesion.respuestas_detalle en sesion_respuesta')
+    parser.add_argument('--lote', type=int, default=1000, help='Sesiones por transacción')
+    add_sesion_respuesta(parser.parse_args().lote)
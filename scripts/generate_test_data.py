@@ -2,22 +2,47 @@
 """
 Script para generar datos de prueba para el sistema VR Analytics
 Configurado para PostgreSQL con Supabase
+
+Modos:
+    python scripts/generate_test_data.py
+        Demo: 1 profesor, 35 estudiantes y unos cientos de sesiones
+    python scripts/generate_test_data.py --bulk --profesores 100 --estudiantes 5000 --sesiones 2000000 --seed 42
+        Carga masiva para pruebas de carga (SQLite o PostgreSQL): muestreo
+        vectorizado con NumPy, inserción por lotes (COPY en PostgreSQL,
+        executemany en el resto) y un único hash de contraseña compartido
 """
 
+import argparse
+import csv
+import io
 import sys
 import os
+import time
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import app, db
-from models import Profesor, Estudiante, Sesion
+from models import Profesor, Estudiante, Sesion, estudiante_profesor
 from flask_bcrypt import Bcrypt
 import random
 from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import func, insert
 
 bcrypt = Bcrypt()
 
+MAQUETAS = ["Aire acondicionado", "Motor"]
+
+# Rangos (mín, máx) por grupo de rendimiento: puntaje, tiempo_segundos, interacciones_ia
+# Orden de los grupos: bajo (reprueban), medio, alto
+RANGOS_GRUPOS = np.array([
+    [(0.0, 3.9), (90, 120), (8, 15)],
+    [(4.0, 5.5), (60, 90), (3, 8)],
+    [(5.5, 7.0), (30, 60), (0, 3)],
+])
+LOTE_BULK = 50_000
+
 def generar_datos_prueba():
     """Genera datos de prueba para demostración"""
     
@@ -97,7 +122,7 @@ def generar_datos_prueba():
         
         # Crear sesiones de prueba
         print("Creando sesiones de prueba...")
-        maquetas = ["Aire acondicionado", "Motor"]
+        maquetas = MAQUETAS
         
         # Dividir estudiantes en 3 grupos equitativos
         total_estudiantes = len(estudiantes)
@@ -196,5 +221,180 @@ def generar_datos_prueba():
         print(f"   Email: profesor@test.com")
         print(f"   Password: 123456")
 
+def _limpiar_tablas():
+    """Vacía las tablas de datos (TRUNCATE en PostgreSQL, DELETE en el resto)"""
+    tablas = ['sesion_respuesta', 'sesion', 'estudiante_profesor', 'estudiante', 'profesor']
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(db.text(f"TRUNCATE TABLE {', '.join(tablas)} RESTART IDENTITY CASCADE"))
+    else:
+        for tabla in tablas:
+            db.session.execute(db.text(f'DELETE FROM {tabla}'))
+    db.session.commit()
+
+
+def muestrear_sesiones(n_sesiones, n_estudiantes, rng, dias=30, ahora=None):
+    """
+    Muestrea n sesiones vectorizadas sobre n estudiantes
+
+    Los estudiantes se reparten en tercios (bajo, medio, alto rendimiento) igual
+    que el modo demo; cada sesión toma los rangos del grupo de su estudiante.
+
+    Returns:
+        Dict columna → np.ndarray (estudiante_idx es el índice 0..n_estudiantes-1)
+    """
+    ahora = ahora or datetime.utcnow()
+    estudiante_idx = rng.integers(0, n_estudiantes, n_sesiones)
+    grupo = (estudiante_idx * 3) // n_estudiantes
+    rangos = RANGOS_GRUPOS[grupo]  # (n, 3 métricas, 2)
+    base = rng.uniform(rangos[..., 0], rangos[..., 1])
+
+    segundos_atras = rng.integers(0, dias * 24 * 3600, n_sesiones).astype('timedelta64[s]')
+    return {
+        'estudiante_idx': estudiante_idx,
+        'grupo': grupo,
+        'maqueta': rng.choice(MAQUETAS, n_sesiones),
+        'puntaje': np.clip(np.rint(rng.normal(base[:, 0], 0.5)), 0, 7).astype(np.int64),
+        'tiempo_segundos': np.clip(rng.normal(base[:, 1], 10), 30, 120).astype(np.int64),
+        'interacciones_ia': np.maximum(rng.normal(base[:, 2], 2), 0).astype(np.int64),
+        'fecha': np.datetime64(ahora, 's') - segundos_atras,
+    }
+
+
+def _insertar_bulk(tabla, columnas):
+    """
+    Inserta columnas (dict nombre → lista) en la transacción actual
+
+    PostgreSQL: COPY ... FROM STDIN (CSV) por el cursor DBAPI.
+    Resto: executemany de SQLAlchemy Core.
+    """
+    nombres = list(columnas)
+    filas = zip(*columnas.values())
+    if db.engine.dialect.name == 'postgresql':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(filas)
+        buffer.seek(0)
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {tabla.name} ({', '.join(nombres)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+    else:
+        db.session.execute(insert(tabla), [dict(zip(nombres, fila)) for fila in filas])
+
+
+def generar_datos_bulk(n_profesores=10, n_estudiantes=1000, n_sesiones=100_000, seed=42,
+                       password="123456", limpiar=True, lote=LOTE_BULK):
+    """
+    Carga masiva de datos sintéticos (requiere app context)
+
+    Cada estudiante queda inscrito con un profesor (reparto round-robin) y sus
+    sesiones se asignan a ese profesor. El primer profesor es profesor@test.com
+    (si todavía no existe).
+
+    Con limpiar=False los códigos y emails (columnas únicas) se numeran a partir
+    del mayor ID existente, así que se puede cargar sobre datos demo o bulk previos.
+
+    Returns:
+        Dict con los totales insertados y el tiempo empleado
+    """
+    inicio = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    if limpiar:
+        _limpiar_tablas()
+    base_profesor = db.session.query(func.max(Profesor.id)).scalar() or 0
+    base_estudiante = db.session.query(func.max(Estudiante.id)).scalar() or 0
+    demo_existe = db.session.query(Profesor.id).filter_by(email="profesor@test.com").first() is not None
+
+    # Un solo hash para todos: bcrypt por fila domina el tiempo de carga
+    hash_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    ahora = datetime.utcnow()
+
+    emails_profesores = [f"profesor{base_profesor + i}@bulk.test" for i in range(n_profesores)]
+    if not demo_existe:
+        emails_profesores[0] = "profesor@test.com"
+    _insertar_bulk(Profesor.__table__, {
+        'nombre': [f"Profesor {base_profesor + i}" for i in range(n_profesores)],
+        'email': emails_profesores,
+        'password': [hash_password] * n_profesores,
+        'institucion': ["Universidad San Sebastian"] * n_profesores,
+        'fecha_registro': [ahora] * n_profesores,
+    })
+    emails = dict(db.session.query(Profesor.email, Profesor.id).filter(Profesor.email.in_(emails_profesores)))
+    profesor_ids = [emails[email] for email in emails_profesores]
+
+    numeros = range(base_estudiante, base_estudiante + n_estudiantes)
+    codigos_nuevos = [f"EST{i:07d}" for i in numeros]
+    _insertar_bulk(Estudiante.__table__, {
+        'nombre': [f"Estudiante {i}" for i in numeros],
+        'codigo': codigos_nuevos,
+        'email': [f"estudiante{i}@bulk.test" for i in numeros],
+        'password': [hash_password] * n_estudiantes,
+        'nivel_habilidad': rng.integers(2, 6, n_estudiantes).tolist(),
+        'fecha_registro': [ahora] * n_estudiantes,
+    })
+    codigos = dict(db.session.query(Estudiante.codigo, Estudiante.id).filter(Estudiante.id > base_estudiante))
+    estudiante_ids = np.array([codigos[codigo] for codigo in codigos_nuevos])
+    profesor_de = np.array(profesor_ids)[np.arange(n_estudiantes) % n_profesores]
+
+    _insertar_bulk(estudiante_profesor, {
+        'estudiante_id': estudiante_ids.tolist(),
+        'profesor_id': profesor_de.tolist(),
+        'fecha_inscripcion': [ahora] * n_estudiantes,
+    })
+
+    for desde in range(0, n_sesiones, lote):
+        n = min(lote, n_sesiones - desde)
+        c = muestrear_sesiones(n, n_estudiantes, rng, ahora=ahora)
+        _insertar_bulk(Sesion.__table__, {
+            'estudiante_id': estudiante_ids[c['estudiante_idx']].tolist(),
+            'profesor_id': profesor_de[c['estudiante_idx']].tolist(),
+            'maqueta': c['maqueta'].tolist(),
+            'tiempo_segundos': c['tiempo_segundos'].tolist(),
+            'puntaje': c['puntaje'].tolist(),
+            'fecha': c['fecha'].astype('datetime64[us]').tolist(),
+            'interacciones_ia': c['interacciones_ia'].tolist(),
+            'respuestas_detalle': ['{"respuestas": []}'] * n,
+        })
+        print(f"   {desde + n:,}/{n_sesiones:,} sesiones")
+
+    db.session.commit()
+    return {
+        'profesores': n_profesores,
+        'estudiantes': n_estudiantes,
+        'sesiones': n_sesiones,
+        'segundos': round(time.perf_counter() - inicio, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bulk', action='store_true', help='Carga masiva vectorizada')
+    parser.add_argument('--profesores', type=int, default=10)
+    parser.add_argument('--estudiantes', type=int, default=1000)
+    parser.add_argument('--sesiones', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--lote', type=int, default=LOTE_BULK, help='Filas por inserción')
+    parser.add_argument('--sin-limpiar', action='store_true', help='No vaciar las tablas antes de insertar')
+    args = parser.parse_args()
+
+    if not args.bulk:
+        generar_datos_prueba()
+        return
+
+    with app.app_context():
+        db.create_all()
+        print(f"Generando {args.sesiones:,} sesiones ({db.engine.dialect.name}, seed={args.seed})...")
+        totales = generar_datos_bulk(args.profesores, args.estudiantes, args.sesiones, seed=args.seed,
+                                     limpiar=not args.sin_limpiar, lote=args.lote)
+
+    print(f"\n✅ Carga masiva completada en {totales['segundos']}s "
+          f"({totales['sesiones'] / max(totales['segundos'], 1e-9):,.0f} sesiones/s)")
+    print(f"   - {totales['profesores']} Profesores, {totales['estudiantes']:,} Estudiantes, "
+          f"{totales['sesiones']:,} Sesiones")
+    print(f"\nCredenciales de prueba:")
+    print(f"   Email: profesor@test.com")
+    print(f"   Password: 123456")
+
+
 if __name__ == '__main__':
-    generar_datos_prueba()
+    main()
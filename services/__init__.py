@@ -6,9 +6,11 @@ Contiene la lógica de aplicación separada de routes y repositories
 from .analytics_service import AnalyticsService
 from .session_service import SessionService
 from .auth_service import AuthService
+from .export_service import ExportService
 
 __all__ = [
     'AnalyticsService',
     'SessionService',
-    'AuthService'
+    'AuthService',
+    'ExportService'
 ]
@@ -3,7 +3,8 @@ Analytics Service - Servicio de análisis de datos
 Encapsula toda la lógica de análisis y ML
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
 from functools import wraps, lru_cache
 import time
 import sys
@@ -11,6 +12,8 @@ import os
 import pandas as pd
 import hashlib
 import pickle
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy.orm import joinedload
 
 # Agregar el directorio raíz al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,15 +21,48 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from repositories.session_repository import SessionRepository
 # ✅ ARQUITECTURA MODULAR: Nuevo import desde package analytics
 from analytics import AnalizadorAvanzado
+from utils.logger import get_logger
+from utils.query_monitor import seccion
+from utils.metrics import ANALYTICS_CACHE, ANALYTICS_SECCION, ANALYTICS_SECCION_MEMORIA
+from utils.constants import DEFAULT_PAGE_SIZE
+from utils.pagination import SesionFiltros, encode_cursor
+from utils.tracing import trazar_clase
+
+
+logger = get_logger(__name__)
 
 
 # ========== CACHE OPTIMIZADO CON HASH ==========
+# cache_key -> (resultado, timestamp, variantes_comprimidas)
+# variantes_comprimidas: {(mimetype, encoding): bytes} reutilizado por utils/compression.py
 _analytics_cache = {}
 
 def get_cache_key(user_id: int, sesiones_count: int, prefix: str = "analytics") -> str:
     """Genera una clave de cache basada en user_id y número de sesiones"""
     return f"{prefix}_{user_id}_{sesiones_count}"
 
+def _exponer_variantes_comprimidas(variantes: Dict) -> None:
+    """
+    Expone al request actual el dict de bytes comprimidos asociado a la entrada de cache,
+    para que el hook de compresión no recomprima payloads idénticos
+    """
+    if has_request_context():
+        g.compressed_variants = variantes
+
+
+def _marcar_timings_cacheados(result: Dict[str, Any], timestamp: float) -> Dict[str, Any]:
+    """
+    Copia del resultado cacheado con '_timings' marcado como cacheado y su edad
+
+    Los tiempos son los del request que calculó el valor, no los del actual.
+    """
+    if '_timings' not in result:
+        return result
+    timings = {**result['_timings'], 'cached': True,
+               'edad_segundos': round(time.time() - timestamp, 1)}
+    return {**result, '_timings': timings}
+
+
 def cache_analytics(ttl_seconds: int = 300):
     """
     Decorador optimizado para cachear analytics
@@ -50,26 +86,33 @@ def cache_analytics(ttl_seconds: int = 300):
             
             # Verificar cache
             if cache_key in _analytics_cache:
-                result, timestamp = _analytics_cache[cache_key]
+                result, timestamp, variantes = _analytics_cache[cache_key]
                 if time.time() - timestamp < ttl_seconds:
-                    print(f"✅ CACHE HIT para {prefix} {user_id} ({sesiones_count} sesiones)")
-                    return result
+                    logger.debug(f"✅ CACHE HIT para {prefix} {user_id} ({sesiones_count} sesiones)")
+                    ANALYTICS_CACHE.inc('hit', prefix)
+                    _exponer_variantes_comprimidas(variantes)
+                    return _marcar_timings_cacheados(result, timestamp)
             
             # Cache miss o expirado
-            print(f"❌ CACHE MISS - Calculando analytics para {prefix} {user_id}...")
+            logger.debug(f"❌ CACHE MISS - Calculando analytics para {prefix} {user_id}...")
+            ANALYTICS_CACHE.inc('miss', prefix)
             inicio = time.time()
-            result = func(self, user_id, *args, **kwargs)
+            with seccion('analytics'):
+                result = func(self, user_id, *args, **kwargs)
             duracion = time.time() - inicio
             
-            # Guardar en cache
-            _analytics_cache[cache_key] = (result, time.time())
-            print(f"✅ Analytics calculados en {duracion:.2f}s y guardados en cache")
+            # Guardar en cache (+ dict para bytes comprimidos de la respuesta HTTP)
+            variantes = {}
+            _analytics_cache[cache_key] = (result, time.time(), variantes)
+            _exponer_variantes_comprimidas(variantes)
+            logger.info(f"✅ Analytics calculados en {duracion:.2f}s y guardados en cache")
             
             return result
         return wrapper
     return decorator
 
 
+@trazar_clase
 class AnalyticsService:
     """Servicio para análisis de datos y ML"""
     
@@ -77,6 +120,36 @@ class AnalyticsService:
         """Inicializa el servicio de analytics"""
         self.session_repo = SessionRepository()
     
+    @staticmethod
+    def _backend() -> str:
+        """Backend de AnalizadorAvanzado configurado (ANALYTICS_BACKEND, default pandas)"""
+        if has_app_context():
+            return current_app.config.get('ANALYTICS_BACKEND', 'pandas')
+        return 'pandas'
+    
+    @staticmethod
+    def _medir_memoria() -> bool:
+        """Pico de memoria por sección con tracemalloc (ANALYTICS_TRACEMALLOC, default False)"""
+        return has_app_context() and current_app.config.get('ANALYTICS_TRACEMALLOC', False)
+    
+    @staticmethod
+    def _registrar_timings(analizador: AnalizadorAvanzado, contexto: str) -> Dict[str, Any]:
+        """Envía los tiempos por sección del analizador a logs y métricas"""
+        analizador.timings.detener()
+        timings = analizador.timings.resumen()
+        timings['total_sesiones'] = analizador.total_sesiones
+        timings['cached'] = False
+        
+        for seccion, datos in timings['secciones'].items():
+            ANALYTICS_SECCION.observe(datos['wall_ms'] / 1000, seccion)
+            if 'pico_memoria_kb' in datos:
+                ANALYTICS_SECCION_MEMORIA.set(datos['pico_memoria_kb'] * 1024, seccion)
+        
+        detalle = ', '.join(f"{s}={d['wall_ms']:.0f}ms" for s, d in timings['secciones'].items())
+        logger.info(f"⏱️ Analytics {contexto} ({timings['total_sesiones']} sesiones): "
+                    f"{timings['total_wall_ms']:.0f}ms, más lenta={timings['seccion_mas_lenta']} [{detalle}]")
+        return timings
+    
     @cache_analytics(ttl_seconds=300)  # Cache de 5 minutos
     def get_analytics_profesor(self, profesor_id: int) -> Dict[str, Any]:
         """
@@ -94,25 +167,28 @@ class AnalyticsService:
         if not sesiones:
             return self._empty_analytics_response()
         
-        # Crear analizador directamente con objetos Sesion (no convertir a dict)
-        analizador = AnalizadorAvanzado(sesiones)
-        
-        # Generar análisis
-        return {
-            'success': True,
-            'total_sesiones': len(sesiones),
-            'estadisticas': analizador.estadisticas_descriptivas(),
-            'visualizacion': analizador.datos_para_visualizacion(),
-            'prediccion': analizador.prediccion_rendimiento(),
-            'correlaciones': analizador.correlaciones_avanzadas(),
-            'estudiantes_riesgo': analizador.estudiantes_en_riesgo(),
-            'ranking': analizador.ranking_estudiantes(),
-            'insights': analizador.generar_insights(),
-            'por_maqueta': analizador.analisis_por_maqueta(),
-            'ml_clasificacion': analizador.clasificacion_binaria_aprobacion(),
-            'ml_clustering': analizador.kmeans_clustering_profesional(),
-            'ml_correlaciones': analizador.correlaciones_con_pvalues()
-        }
+        # Crear analizador directamente con objetos Sesion (no convertir a dict).
+        # El with cierra el engine (DuckDB) y detiene tracemalloc aunque una sección falle
+        with AnalizadorAvanzado(sesiones, backend=self._backend(),
+                                medir_memoria=self._medir_memoria()) as analizador:
+            resultado = {
+                'success': True,
+                'total_sesiones': len(sesiones),
+                'estadisticas': analizador.estadisticas_descriptivas(),
+                'visualizacion': analizador.datos_para_visualizacion(),
+                'prediccion': analizador.prediccion_rendimiento(),
+                'correlaciones': analizador.correlaciones_avanzadas(),
+                'estudiantes_riesgo': analizador.estudiantes_en_riesgo(),
+                'ranking': analizador.ranking_estudiantes(),
+                'insights': analizador.generar_insights(),
+                'por_maqueta': analizador.analisis_por_maqueta(),
+                'ml_clasificacion': analizador.clasificacion_binaria_aprobacion(),
+                'ml_clustering': analizador.kmeans_clustering_profesional(),
+                'ml_correlaciones': analizador.correlaciones_con_pvalues()
+            }
+        # Solo se expone a administradores (ver routes/api_routes.py)
+        resultado['_timings'] = self._registrar_timings(analizador, f"profesor {profesor_id}")
+        return resultado
     
     @cache_analytics(ttl_seconds=300)  # Cache de 5 minutos
     def get_analytics_estudiante(self, estudiante_id: int) -> Dict[str, Any]:
@@ -127,9 +203,9 @@ class AnalyticsService:
         """
         # Nota: El decorador @cache_analytics ya maneja el cache
         # La key será: analytics_{estudiante_id}_{sesiones_count}
-        sesiones = self.session_repo.get_by_estudiante(estudiante_id)
+        estadisticas_base = self._calcular_estadisticas_base(estudiante_id)
         
-        if not sesiones:
+        if estadisticas_base is None:
             return {
                 'success': True,  # ✅ Cambiar a True para que el frontend no falle
                 'total_sesiones': 0,
@@ -142,11 +218,13 @@ class AnalyticsService:
                 'por_maqueta': [],
                 'progreso_temporal': [],
                 'insights': ['No tienes sesiones registradas aún. ¡Comienza a practicar!'],
-                'sesiones': []
+                'sesiones': [],
+                'next_cursor': None,
+                'has_more': False
             }
         
-        # Calcular estadísticas base (lógica extraída)
-        estadisticas_base = self._calcular_estadisticas_base(sesiones)
+        # Solo la primera página del historial; el resto con next_cursor en /api/estudiante/sesiones
+        pagina = self.get_sesiones_estudiante(estudiante_id, DEFAULT_PAGE_SIZE)
         
         return {
             'success': True,
@@ -154,8 +232,10 @@ class AnalyticsService:
             'estadisticas': estadisticas_base['estadisticas'],
             'por_maqueta': estadisticas_base['por_maqueta'],
             'progreso_temporal': estadisticas_base['progreso_temporal'],
-            'insights': self._generar_insights_estudiante(sesiones),
-            'sesiones': self._serializar_sesiones(sesiones)
+            'insights': estadisticas_base['insights'],
+            'sesiones': pagina['sesiones'],
+            'next_cursor': pagina['next_cursor'],
+            'has_more': pagina['has_more']
         }
     
     def get_analytics_por_maqueta(self, profesor_id: int, maqueta: str) -> Dict[str, Any]:
@@ -178,73 +258,110 @@ class AnalyticsService:
             }
         
         # Pasar sesiones directamente, no como diccionarios
-        analizador = AnalizadorAvanzado(sesiones)
+        with AnalizadorAvanzado(sesiones, backend=self._backend()) as analizador:
+            return {
+                'success': True,
+                'maqueta': maqueta,
+                'total_sesiones': len(sesiones),
+                'estadisticas': analizador.estadisticas_descriptivas(),
+                'estudiantes': len(set(s.estudiante_id for s in sesiones)),
+                'visualizacion': analizador.datos_para_visualizacion()
+            }
+    
+    def get_sesiones_estudiante(self, estudiante_id: int, limit: int,
+                                cursor: Optional[Tuple[datetime, int]] = None,
+                                filtros: Optional[SesionFiltros] = None) -> Dict[str, Any]:
+        """
+        Obtiene una página del historial del estudiante (paginación keyset)
+        
+        get_analytics_estudiante() incluye la primera página; las siguientes
+        se piden con su next_cursor.
+        
+        Args:
+            estudiante_id: ID del estudiante
+            limit: Tamaño de página
+            cursor: Posición decodificada (fecha, id) de la página anterior
+            filtros: Filtros server-side opcionales
+            
+        Returns:
+            Diccionario con sesiones, next_cursor y has_more
+        """
+        sesiones, siguiente = self.session_repo.get_page_by_estudiante(estudiante_id, limit, cursor, filtros)
         
         return {
             'success': True,
-            'maqueta': maqueta,
-            'total_sesiones': len(sesiones),
-            'estadisticas': analizador.estadisticas_descriptivas(),
-            'estudiantes': len(set(s.estudiante_id for s in sesiones)),
-            'visualizacion': analizador.datos_para_visualizacion()
+            'sesiones': self._serializar_sesiones(sesiones),
+            'next_cursor': encode_cursor(*siguiente) if siguiente else None,
+            'has_more': siguiente is not None,
+            'limit': limit
         }
     
     # Métodos privados helpers
     
-    def _calcular_estadisticas_base(self, sesiones: List) -> Dict[str, Any]:
+    def _calcular_estadisticas_base(self, estudiante_id: int,
+                                    profesor_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Calcula estadísticas base comunes para análisis de estudiante.
         
         REFACTORIZACIÓN Issue #3: Extrae lógica duplicada de get_analytics_estudiante()
         y get_analytics_estudiante_por_profesor() para eliminar ~50 líneas de duplicación.
         
+        Los agregados y las últimas 10 sesiones por maqueta salen de una sola
+        query con window functions (SessionRepository.get_resumen_estudiante).
+        
         Args:
-            sesiones: Lista de objetos Sesion
+            estudiante_id: ID del estudiante
+            profesor_id: Limitar a las sesiones con un profesor (opcional)
             
         Returns:
-            Dict con estadísticas base:
+            None si no hay sesiones, o dict con estadísticas base:
                 - total_sesiones
                 - estadisticas (puntaje_promedio, puntaje_maximo, puntaje_minimo, tiempo_promedio_segundos)
                 - por_maqueta (lista con estadísticas por maqueta)
                 - progreso_temporal (dict con progreso por maqueta)
+                - insights (insights del estudiante)
         """
-        # Estadísticas básicas
-        puntajes = [s.puntaje for s in sesiones]
-        tiempos = [s.tiempo_segundos for s in sesiones]  # ✅ Mantener en segundos
-        
-        # Agrupar por maqueta
-        por_maqueta = {}
-        for sesion in sesiones:
-            if sesion.maqueta not in por_maqueta:
-                por_maqueta[sesion.maqueta] = []
-            por_maqueta[sesion.maqueta].append(sesion)
-        
-        # Progreso temporal por maqueta (últimas 10 sesiones por maqueta)
+        filas = self.session_repo.get_resumen_estudiante(estudiante_id, profesor_id)
+        if not filas:
+            return None
+        
+        global_ = filas[0]
+        por_maqueta = []
         progreso_por_maqueta = {}
-        for maqueta, sesiones_maqueta in por_maqueta.items():
-            progreso_por_maqueta[maqueta] = []
-            # Ordenar por fecha descendente y tomar últimas 10
-            sesiones_ordenadas = sorted(sesiones_maqueta, key=lambda s: s.fecha, reverse=True)[:10]
-            # Invertir para mostrar de más antigua a más reciente
-            sesiones_ordenadas = sesiones_ordenadas[::-1]
-            
-            for sesion in sesiones_ordenadas:
-                progreso_por_maqueta[maqueta].append({
-                    'puntaje': sesion.puntaje,
-                    'fecha': sesion.fecha.strftime('%d/%m'),
-                    'fecha_completa': sesion.fecha.strftime('%Y-%m-%d')
+        
+        # Filas en orden fecha DESC: las maquetas quedan ordenadas por su sesión más reciente
+        for fila in filas:
+            if fila.maqueta not in progreso_por_maqueta:
+                progreso_por_maqueta[fila.maqueta] = []
+                por_maqueta.append({
+                    'maqueta': fila.maqueta,
+                    'sesiones': fila.maqueta_total,
+                    'puntaje_promedio': round(float(fila.maqueta_avg), 2),
+                    'mejor': fila.maqueta_max
                 })
+            progreso_por_maqueta[fila.maqueta].append({
+                'puntaje': fila.puntaje,
+                'fecha': fila.fecha.strftime('%d/%m'),
+                'fecha_completa': fila.fecha.strftime('%Y-%m-%d')
+            })
+        
+        # Mostrar de más antigua a más reciente
+        for progreso in progreso_por_maqueta.values():
+            progreso.reverse()
+        
+        ultimas_3 = [f.puntaje for f in filas if f.rn_global <= 3]
         
         return {
-            'total_sesiones': len(sesiones),
+            'total_sesiones': global_.total,
             'estadisticas': {
-                'puntaje_promedio': round(sum(puntajes) / len(puntajes), 2),
-                'puntaje_maximo': max(puntajes),
-                'puntaje_minimo': min(puntajes),
-                'tiempo_promedio_segundos': round(sum(tiempos) / len(tiempos), 2)  # ✅ Cambiar a segundos
+                'puntaje_promedio': round(float(global_.puntaje_avg), 2),
+                'puntaje_maximo': global_.puntaje_max,
+                'puntaje_minimo': global_.puntaje_min,
+                'tiempo_promedio_segundos': round(float(global_.tiempo_avg), 2)
             },
-            'por_maqueta': self._agrupar_por_maqueta(por_maqueta),
-            'progreso_temporal': progreso_por_maqueta
+            'por_maqueta': por_maqueta,
+            'progreso_temporal': progreso_por_maqueta,
+            'insights': self._generar_insights_estudiante(float(global_.puntaje_avg), global_.total, ultimas_3)
         }
     
     def _empty_analytics_response(self) -> Dict[str, Any]:
@@ -275,28 +392,17 @@ class AnalyticsService:
             'fecha': s.fecha
         } for s in sesiones]
     
-    def _agrupar_por_maqueta(self, por_maqueta: Dict) -> List[Dict[str, Any]]:
-        """Agrupa y calcula estadísticas por maqueta"""
-        resultado = []
-        
-        for maqueta, sesiones in por_maqueta.items():
-            puntajes = [s.puntaje for s in sesiones]
-            resultado.append({
-                'maqueta': maqueta,
-                'sesiones': len(sesiones),
-                'puntaje_promedio': round(sum(puntajes) / len(puntajes), 2),  # ✅ Cambiar 'promedio' → 'puntaje_promedio'
-                'mejor': max(puntajes)
-            })
+    def _generar_insights_estudiante(self, promedio: float, total: int, ultimas_3: List[float]) -> List[str]:
+        """
+        Genera insights personalizados para el estudiante
         
-        return resultado
-    
-    def _generar_insights_estudiante(self, sesiones: List) -> List[str]:
-        """Genera insights personalizados para el estudiante"""
+        Args:
+            promedio: Puntaje promedio global
+            total: Total de sesiones
+            ultimas_3: Puntajes de las 3 sesiones más recientes
+        """
         insights = []
         
-        puntajes = [s.puntaje for s in sesiones]
-        promedio = sum(puntajes) / len(puntajes)
-        
         if promedio >= 4:
             insights.append("¡Excelente desempeño! Mantén el buen trabajo.")
         elif promedio >= 3:
@@ -305,8 +411,7 @@ class AnalyticsService:
             insights.append("Hay margen de mejora. Considera repasar el contenido.")
         
         # Tendencia
-        if len(sesiones) >= 3:
-            ultimas_3 = puntajes[:3]
+        if total >= 3:
             promedio_reciente = sum(ultimas_3) / 3
             
             if promedio_reciente > promedio:
@@ -352,13 +457,10 @@ class AnalyticsService:
                 'message': 'Profesor no encontrado'
             }
         
-        # Obtener sesiones filtradas por profesor (objetos Sesion, no IDs)
-        sesiones = Sesion.query.filter_by(
-            estudiante_id=estudiante_id,
-            profesor_id=profesor_id
-        ).order_by(Sesion.fecha.desc()).all()
+        # Calcular estadísticas base (lógica extraída - REFACTORIZADO)
+        estadisticas_base = self._calcular_estadisticas_base(estudiante_id, profesor_id)
         
-        if not sesiones:
+        if estadisticas_base is None:
             return {
                 'success': True,
                 'profesor': {
@@ -379,12 +481,15 @@ class AnalyticsService:
                 'sesiones': []
             }
         
-        # Calcular estadísticas base (lógica extraída - REFACTORIZADO)
-        estadisticas_base = self._calcular_estadisticas_base(sesiones)
+        # Obtener sesiones filtradas por profesor (objetos Sesion, no IDs)
+        sesiones = Sesion.query.filter_by(
+            estudiante_id=estudiante_id,
+            profesor_id=profesor_id
+        ).options(joinedload(Sesion.profesor)).order_by(Sesion.fecha.desc()).all()
         
         # Insights personalizados con nombre del profesor
         insights = [f'📚 Sesiones con {profesor.nombre}']
-        insights.extend(self._generar_insights_estudiante(sesiones))
+        insights.extend(estadisticas_base['insights'])
         
         return {
             'success': True,
@@ -11,8 +11,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from repositories.estudiante_repository import EstudianteRepository
 from repositories.profesor_repository import ProfesorRepository
+from utils.tracing import trazar_clase
 
 
+@trazar_clase
 class AuthService:
     """Servicio de autenticación y autorización"""
     
@@ -245,12 +247,13 @@ class AuthService:
         Returns:
             Lista de profesores serializados
         """
-        profesores = self.profesor_repo.get_all()
+        # Conteo agrupado en la misma query (evita un COUNT por profesor)
+        profesores = self.profesor_repo.get_all_con_total_estudiantes()
         
         return [{
             'id': p.id,
             'nombre': p.nombre,
             'email': p.email,
             'institucion': p.institucion if p.institucion else 'Sin institución',
-            'total_estudiantes': p.estudiantes.count()  # Usar .count() en lugar de len()
-        } for p in profesores]
+            'total_estudiantes': total_estudiantes
+        } for p, total_estudiantes in profesores]
@@ -0,0 +1,148 @@
+"""
+Export Service - Servicio de exportación de sesiones
+Genera CSV / NDJSON en streaming y en memoria constante
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+import csv
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from models import db, Estudiante, Profesor, Sesion, estudiante_profesor
+from models.sesion_respuesta import parse_respuestas as _parse_respuestas
+from repositories.session_repository import SessionRepository
+from utils.pagination import SesionFiltros
+from analytics.io import COLUMNAS, write_bundle
+
+
+CSV_COLUMNAS = [
+    'id', 'fecha', 'estudiante_codigo', 'estudiante_nombre', 'maqueta',
+    'puntaje', 'tiempo_segundos', 'interacciones_ia'
+]
+CSV_COLUMNAS_RESPUESTA = ['pregunta', 'respuesta', 'correcta']
+
+
+class _LineBuffer:
+    """Pseudo-archivo para csv.writer: devuelve la línea en vez de acumularla"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportService:
+    """Servicio para exportar el historial de sesiones"""
+
+    def __init__(self):
+        """Inicializa el servicio de exportación"""
+        self.session_repo = SessionRepository()
+
+    def iter_csv(self, profesor_id: int, filtros: Optional[SesionFiltros] = None,
+                 incluir_respuestas: bool = False) -> Iterator[str]:
+        """
+        Genera el CSV de sesiones línea a línea
+
+        Con incluir_respuestas=True se emite una fila por respuesta (formato largo),
+        repitiendo las columnas de la sesión; sesiones sin respuestas emiten una fila
+        con las columnas de respuesta vacías.
+
+        Args:
+            profesor_id: ID del profesor
+            filtros: Filtros server-side opcionales
+            incluir_respuestas: Expandir respuestas_detalle
+
+        Returns:
+            Iterador de líneas CSV (incluye header)
+        """
+        writer = csv.writer(_LineBuffer())
+        columnas = CSV_COLUMNAS + (CSV_COLUMNAS_RESPUESTA if incluir_respuestas else [])
+        yield writer.writerow(columnas)
+
+        for row in self.session_repo.iter_export_by_profesor(profesor_id, filtros, incluir_respuestas):
+            base = [
+                row.id, row.fecha.isoformat() if row.fecha else '', row.estudiante_codigo,
+                row.estudiante_nombre, row.maqueta, row.puntaje, row.tiempo_segundos, row.interacciones_ia
+            ]
+
+            if not incluir_respuestas:
+                yield writer.writerow(base)
+                continue
+
+            respuestas = _parse_respuestas(row.respuestas_detalle)
+            if not respuestas:
+                yield writer.writerow(base + ['', '', ''])
+            for r in respuestas:
+                if not isinstance(r, dict):
+                    continue
+                yield writer.writerow(base + [r.get('pregunta', ''), r.get('respuesta', ''), r.get('correcta', '')])
+
+    def iter_ndjson(self, profesor_id: int, filtros: Optional[SesionFiltros] = None,
+                    incluir_respuestas: bool = False) -> Iterator[str]:
+        """
+        Genera NDJSON de sesiones (un objeto JSON por línea)
+
+        Args:
+            profesor_id: ID del profesor
+            filtros: Filtros server-side opcionales
+            incluir_respuestas: Incluir la lista 'respuestas' parseada
+
+        Returns:
+            Iterador de líneas NDJSON
+        """
+        for row in self.session_repo.iter_export_by_profesor(profesor_id, filtros, incluir_respuestas):
+            item = {
+                'id': row.id,
+                'fecha': row.fecha.isoformat() if row.fecha else None,
+                'estudiante_codigo': row.estudiante_codigo,
+                'estudiante_nombre': row.estudiante_nombre,
+                'maqueta': row.maqueta,
+                'puntaje': row.puntaje,
+                'tiempo_segundos': row.tiempo_segundos,
+                'interacciones_ia': row.interacciones_ia
+            }
+            if incluir_respuestas:
+                item['respuestas'] = _parse_respuestas(row.respuestas_detalle)
+            yield json.dumps(item, ensure_ascii=False) + '\n'
+
+    # ============================================
+    # BUNDLE PARQUET (análisis offline)
+    # ============================================
+
+    @staticmethod
+    def _iter_lotes(columnas, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Lee una tabla en lotes desde un cursor server-side"""
+        stmt = select(*columnas).execution_options(stream_results=True, yield_per=batch_size)
+        for particion in db.session.execute(stmt).mappings().partitions():
+            yield [dict(fila) for fila in particion]
+
+    def export_parquet_bundle(self, output_dir: str, batch_size: int = 50000) -> Dict[str, Any]:
+        """
+        Exporta sesion, estudiante, profesor y estudiante_profesor a un bundle Parquet
+
+        Las sesiones quedan particionadas por profesor y mes. Credenciales y
+        tokens de recuperación nunca se exportan.
+
+        Args:
+            output_dir: Directorio destino
+            batch_size: Filas por lote leído de la BD / row group escrito
+
+        Returns:
+            Manifest del bundle
+        """
+        modelos = {
+            'sesion': Sesion.__table__,
+            'estudiante': Estudiante.__table__,
+            'profesor': Profesor.__table__,
+            'estudiante_profesor': estudiante_profesor,
+        }
+        lotes = {
+            tabla: self._iter_lotes(
+                [tabla_sql.c[c] for c in COLUMNAS[tabla] if c in tabla_sql.c], batch_size
+            )
+            for tabla, tabla_sql in modelos.items()
+        }
+        return write_bundle(output_dir, lotes, batch_size)
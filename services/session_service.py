@@ -3,17 +3,28 @@ Session Service - Servicio de gestión de sesiones
 Lógica de negocio para sesiones VR
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
+import json
 import sys
 import os
 
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from repositories.session_repository import SessionRepository
 from repositories.estudiante_repository import EstudianteRepository
 from repositories.profesor_repository import ProfesorRepository
+from utils.constants import MIN_PUNTAJE, MAX_PUNTAJE, MAX_IDEMPOTENCY_KEY_LENGTH
+from utils.pagination import SesionFiltros, encode_cursor
+from utils.tracing import trazar_clase
+from services.write_buffer import obtener_buffer
 
 
+@trazar_clase
 class SessionService:
     """Servicio para gestionar sesiones VR"""
     
@@ -28,10 +39,14 @@ class SessionService:
                       interacciones_ia: int, 
                       profesor_email: Optional[str] = None,
                       profesor_id: Optional[int] = None,
-                      respuestas: Optional[List] = None) -> Dict[str, Any]:
+                      respuestas: Optional[List] = None,
+                      idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Crea una nueva sesión VR
         
+        Con `idempotency_key`, un reintento de una sesión ya registrada no
+        inserta nada: devuelve el resultado original con 'duplicada': True.
+        
         Args:
             estudiante_codigo: Código del estudiante
             maqueta: Nombre de la maqueta
@@ -41,12 +56,19 @@ class SessionService:
             profesor_email: Email del profesor (opcional)
             profesor_id: ID del profesor (opcional, alternativa a profesor_email)
             respuestas: Lista de respuestas del estudiante (opcional)
+            idempotency_key: Clave de deduplicación de reintentos (opcional)
             
         Returns:
             Diccionario con resultado de la operación
         """
-        # Validar estudiante
-        estudiante = self.estudiante_repo.get_by_codigo(estudiante_codigo)
+        # Reintento de una sesión ya registrada: lookup por índice único
+        if idempotency_key:
+            previa = self.session_repo.get_by_idempotency_key(idempotency_key)
+            if previa:
+                return self._resultado_repetido(previa)
+        
+        # Validar estudiante (cache codigo → id/nombre: sin query en el caso caliente)
+        estudiante = self.estudiante_repo.resolver_codigo(estudiante_codigo)
         if not estudiante:
             return {
                 'success': False,
@@ -77,30 +99,51 @@ class SessionService:
             final_profesor_id = profesor.id
         
         try:
-            # Crear sesión
-            sesion = self.session_repo.create(
-                estudiante_id=estudiante.id,
-                maqueta=maqueta,
-                puntaje=puntaje,
-                tiempo_segundos=tiempo_segundos,
-                interacciones_ia=interacciones_ia,
-                profesor_id=final_profesor_id
-            )
+            self.session_repo.validar_valores(puntaje, tiempo_segundos, interacciones_ia)
             
-            # Si hay respuestas, guardarlas
-            if respuestas:
-                sesion.set_respuestas(respuestas)
+            # Una sola fila con las respuestas incluidas: un INSERT ... RETURNING id
+            fila = {
+                'estudiante_id': estudiante.id,
+                'profesor_id': final_profesor_id,
+                'maqueta': maqueta,
+                'puntaje': puntaje,
+                'tiempo_segundos': tiempo_segundos,
+                'interacciones_ia': interacciones_ia,
+                'fecha': datetime.utcnow(),
+                'respuestas_detalle': json.dumps(respuestas) if respuestas else None,
+                'idempotency_key': idempotency_key
+            }
+            
+            buffer = obtener_buffer()
+            if buffer is not None:
+                # Group commit: cerrar la transacción de lectura para que la conexión
+                # vuelva al pool mientras se espera (con más requests esperando que
+                # conexiones en el pool, el hilo de commit no conseguiría ninguna)
                 from models import db
-                db.session.commit()
+                db.session.rollback()
+                sesion_id = buffer.enviar(fila)
+            else:
+                sesion_id = self.session_repo.create_many([fila])[0]
             
             return {
                 'success': True,
                 'message': 'Sesión registrada correctamente',
-                'sesion_id': sesion.id,
+                'sesion_id': sesion_id,
                 'estudiante': estudiante.nombre,
-                'puntaje': sesion.puntaje
+                'puntaje': puntaje
             }
             
+        except IntegrityError as e:
+            # Reintento concurrente: otro request insertó la misma clave primero
+            from models import db
+            db.session.rollback()
+            previa = self.session_repo.get_by_idempotency_key(idempotency_key) if idempotency_key else None
+            if previa:
+                return self._resultado_repetido(previa)
+            return {
+                'success': False,
+                'message': f'Error al crear sesión: {str(e)}'
+            }
         except ValueError as e:
             return {
                 'success': False,
@@ -112,19 +155,222 @@ class SessionService:
                 'message': f'Error al crear sesión: {str(e)}'
             }
     
-    def get_sesiones_profesor(self, profesor_id: int) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _resultado_repetido(sesion) -> Dict[str, Any]:
+        """Resultado original de una sesión ya registrada (respuesta a un reintento)"""
+        return {
+            'success': True,
+            'message': 'Sesión registrada correctamente',
+            'sesion_id': sesion.id,
+            'estudiante': sesion.estudiante.nombre,
+            'puntaje': sesion.puntaje,
+            'duplicada': True
+        }
+    
+    def create_sessions_batch(self, items: List[Any]) -> Dict[str, Any]:
+        """
+        Crea un lote de sesiones Unity en una sola transacción
+        
+        Valida todo el lote de forma vectorizada, resuelve los códigos de
+        estudiante con una única query IN e inserta las sesiones válidas con
+        un bulk insert. Los ítems inválidos no impiden crear el resto.
+        
+        Args:
+            items: Sesiones con el mismo formato que POST /api/unity/session
+                   (+ 'fecha' ISO 8601 opcional para sesiones registradas offline
+                   y 'client_session_uuid' opcional para deduplicar reintentos)
+            
+        Returns:
+            Diccionario con 'resultados' por ítem (en el orden recibido),
+            'creadas', 'duplicadas' (reintentos ya registrados) y 'fallidas'
+        """
+        validas, errores = self._validar_lote(items)
+        
+        ids_por_codigo = self.estudiante_repo.get_ids_by_codigos(validas['codigo_estudiante'])
+        encontrado = validas['codigo_estudiante'].isin(list(ids_por_codigo))
+        for indice, codigo in validas.loc[~encontrado, 'codigo_estudiante'].items():
+            errores[indice] = f'Estudiante con código {codigo} no encontrado'
+        validas = validas[encontrado]
+        
+        ahora = datetime.utcnow()
+        for intento in (1, 2):
+            fallo = None
+            repetidas, copias, nuevas = self._clasificar_reintentos(validas)
+            filas = [{
+                'estudiante_id': ids_por_codigo[fila.codigo_estudiante],
+                'profesor_id': None,  # Unity no especifica profesor
+                'maqueta': fila.maqueta,
+                'puntaje': float(fila.puntaje),
+                'tiempo_segundos': int(fila.tiempo_segundos),
+                'interacciones_ia': int(fila.interacciones_ia),
+                'fecha': ahora if pd.isna(fila.fecha) else fila.fecha.to_pydatetime(),
+                'respuestas_detalle': json.dumps(fila.respuestas) if fila.respuestas else None,
+                'idempotency_key': fila.idempotency_key
+            } for fila in validas.loc[nuevas].itertuples()]
+            try:
+                ids = dict(zip(nuevas, self.session_repo.create_many(filas)))
+                break
+            except IntegrityError as e:
+                # Otra subida registró alguna de las claves en paralelo: reclasificar una vez
+                ids, fallo = {}, e
+            except Exception as e:
+                ids, fallo = {}, e
+                break
+        if fallo is not None:
+            for indice in nuevas:
+                errores[indice] = f'Error al crear sesión: {str(fallo)}'
+        
+        resultados = []
+        for indice in range(len(items)):
+            sesion_id = ids.get(indice)
+            if sesion_id is not None:
+                resultados.append({'index': indice, 'success': True,
+                                   'sesion_id': sesion_id, 'session_id': sesion_id})
+                continue
+            sesion_id = repetidas.get(indice) or ids.get(copias.get(indice))
+            if sesion_id is not None:
+                resultados.append({'index': indice, 'success': True, 'sesion_id': sesion_id,
+                                   'session_id': sesion_id, 'duplicada': True})
+            else:
+                mensaje = errores.get(indice) or errores.get(copias.get(indice))
+                resultados.append({'index': indice, 'success': False, 'message': mensaje})
+        
+        duplicadas = sum(1 for r in resultados if r.get('duplicada'))
+        return {
+            'resultados': resultados,
+            'creadas': len(ids),
+            'duplicadas': duplicadas,
+            'fallidas': len(items) - len(ids) - duplicadas
+        }
+    
+    def _clasificar_reintentos(self, validas: pd.DataFrame) -> Tuple[Dict[int, int], Dict[int, int], List[int]]:
+        """
+        Separa los ítems de un lote según su clave de idempotencia
+        
+        Returns:
+            Tupla (índice → ID de la sesión ya registrada con esa clave,
+            índice → índice de la primera aparición de la clave en el lote,
+            índices a insertar)
+        """
+        claves = validas['idempotency_key']
+        previas = self.session_repo.get_ids_by_idempotency_keys(claves.dropna())
+        repetidas, copias, primera, nuevas = {}, {}, {}, []
+        for indice, clave in claves.items():
+            if clave is None:
+                nuevas.append(indice)
+            elif clave in previas:
+                repetidas[indice] = previas[clave]
+            elif clave in primera:
+                copias[indice] = primera[clave]
+            else:
+                primera[clave] = indice
+                nuevas.append(indice)
+        return repetidas, copias, nuevas
+    
+    @staticmethod
+    def _validar_lote(items: List[Any]) -> Tuple[pd.DataFrame, Dict[int, str]]:
+        """
+        Valida un lote de sesiones con operaciones por columna
+        
+        Returns:
+            Tupla (DataFrame de ítems válidos con columnas normalizadas,
+            dict índice → primer error de cada ítem inválido)
+        """
+        columnas = ['codigo_estudiante', 'maqueta', 'puntaje', 'tiempo_segundos',
+                    'interacciones_ia', 'respuestas', 'fecha', 'client_session_uuid']
+        df = pd.DataFrame([item if isinstance(item, dict) else {} for item in items],
+                          columns=columnas, index=range(len(items)), dtype=object)
+        df = df.where(df.notna(), None)  # Campos ausentes → None (no NaN)
+        error = pd.Series(None, index=df.index, dtype=object)
+        
+        def marcar(mascara, mensaje):
+            error[mascara & error.isna()] = mensaje
+        
+        def texto(columna):
+            return df[columna].astype('string').str.strip().fillna('')
+        
+        puntaje = pd.to_numeric(df['puntaje'], errors='coerce').astype('float64')
+        tiempo = pd.to_numeric(df['tiempo_segundos'], errors='coerce').astype('float64')
+        interacciones = pd.to_numeric(df['interacciones_ia'].where(df['interacciones_ia'].notna(), 0),
+                                      errors='coerce').astype('float64')
+        fecha = pd.to_datetime(df['fecha'], errors='coerce', utc=True, format='ISO8601').dt.tz_convert(None)
+        
+        marcar(pd.Series([not isinstance(item, dict) for item in items], index=df.index),
+               'Cada sesión debe ser un objeto JSON')
+        marcar((texto('codigo_estudiante') == '') | (texto('maqueta') == '')
+               | df['puntaje'].isna() | df['tiempo_segundos'].isna(),
+               'Campos requeridos: codigo_estudiante, maqueta, puntaje, tiempo_segundos')
+        marcar(~np.isfinite(puntaje), 'Puntaje inválido')
+        marcar(~puntaje.between(MIN_PUNTAJE, MAX_PUNTAJE), 'El puntaje debe estar entre 0 y 7')
+        marcar(~np.isfinite(tiempo), 'Tiempo inválido')
+        marcar(tiempo < 0, 'El tiempo debe ser mayor a 0')
+        marcar(~np.isfinite(interacciones), 'Interacciones inválidas')
+        marcar(interacciones < 0, 'Las interacciones no pueden ser negativas')
+        marcar(df['fecha'].notna() & fecha.isna(), 'Fecha inválida (se espera ISO 8601)')
+        marcar(~df['respuestas'].map(lambda r: r is None or isinstance(r, list)), 'respuestas debe ser una lista')
+        marcar(~df['client_session_uuid'].map(
+            lambda c: c is None or (isinstance(c, str) and 0 < len(c) <= MAX_IDEMPOTENCY_KEY_LENGTH)),
+            f'client_session_uuid inválido (texto de hasta {MAX_IDEMPOTENCY_KEY_LENGTH} caracteres)')
+        
+        validas = pd.DataFrame({
+            'codigo_estudiante': texto('codigo_estudiante'),
+            'maqueta': texto('maqueta'),
+            'puntaje': puntaje,
+            'tiempo_segundos': tiempo.where(error.isna(), 0).astype('int64'),
+            'interacciones_ia': interacciones.where(error.isna(), 0).astype('int64'),
+            'respuestas': df['respuestas'],
+            'fecha': fecha,
+            'idempotency_key': df['client_session_uuid']
+        })[error.isna()]
+        return validas, error[error.notna()].to_dict()
+    
+    def get_sesiones_profesor(self, profesor_id: int,
+                              filtros: Optional[SesionFiltros] = None) -> List[Dict[str, Any]]:
         """
         Obtiene todas las sesiones de un profesor con información detallada
         
+        DEPRECADO: devuelve el historial completo en una sola respuesta.
+        Usar get_sesiones_profesor_paginadas() para listados.
+        
         Args:
             profesor_id: ID del profesor
+            filtros: Filtros server-side opcionales
             
         Returns:
             Lista de sesiones serializadas
         """
-        sesiones = self.session_repo.get_by_profesor(profesor_id)
+        sesiones = self.session_repo.get_by_profesor(profesor_id, filtros)
         
-        return [{
+        return [self._serializar_sesion_profesor(s) for s in sesiones]
+    
+    def get_sesiones_profesor_paginadas(self, profesor_id: int, limit: int,
+                                        cursor: Optional[Tuple[datetime, int]] = None,
+                                        filtros: Optional[SesionFiltros] = None) -> Dict[str, Any]:
+        """
+        Obtiene una página de sesiones del profesor (paginación keyset)
+        
+        Args:
+            profesor_id: ID del profesor
+            limit: Tamaño de página
+            cursor: Posición decodificada (fecha, id) de la página anterior
+            filtros: Filtros server-side opcionales
+            
+        Returns:
+            Diccionario con sesiones, next_cursor y has_more
+        """
+        sesiones, siguiente = self.session_repo.get_page_by_profesor(profesor_id, limit, cursor, filtros)
+        
+        return {
+            'sesiones': [self._serializar_sesion_profesor(s) for s in sesiones],
+            'next_cursor': encode_cursor(*siguiente) if siguiente else None,
+            'has_more': siguiente is not None,
+            'limit': limit
+        }
+    
+    @staticmethod
+    def _serializar_sesion_profesor(s) -> Dict[str, Any]:
+        """Serializa una sesión para el listado del profesor"""
+        return {
             'id': s.id,
             'estudiante_nombre': s.estudiante.nombre,
             'estudiante_codigo': s.estudiante.codigo,
@@ -133,7 +379,7 @@ class SessionService:
             'tiempo_segundos': s.tiempo_segundos,
             'interacciones_ia': s.interacciones_ia,
             'fecha': s.fecha.isoformat()
-        } for s in sesiones]
+        }
     
     def get_maquetas_disponibles(self, profesor_id: Optional[int] = None) -> List[str]:
         """
@@ -0,0 +1,189 @@
+"""
+Write Buffer - Group commit para la ingesta de sesiones
+Agrupa las sesiones de varios requests concurrentes en una sola transacción
+
+Cada request encola su fila y espera (bloqueado) a que el hilo de commit la
+confirme: la respuesta sigue llevando el ID real y solo se envía después del
+commit, así que el contrato de la API no cambia. Lo que cambia es que N
+requests simultáneos pagan un solo commit (un fsync en SQLite, un round trip
+en Supabase) en lugar de N.
+
+El lote se cierra cuando pasan GROUP_COMMIT_MAX_WAIT_MS desde la primera fila
+o cuando hay GROUP_COMMIT_MAX_BATCH filas pendientes. Si el commit del lote
+falla, las filas se reintentan una por una para que solo falle la inválida.
+
+Cada fila viaja con el contexto de traza de su request; el commit del lote
+queda como hijo de la traza de la primera fila (ver utils/tracing.py).
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+
+from repositories.session_repository import SessionRepository
+from utils.logger import get_logger
+from utils.metrics import INGESTA_LOTE
+from utils.tracing import con_contexto
+
+logger = get_logger(__name__)
+
+
+class GroupCommitBuffer:
+    """
+    Buffer de escritura con group commit (un hilo de commit por proceso)
+
+    Args:
+        app: Instancia de Flask (el hilo de commit abre su propio app context)
+        max_espera_ms: Tiempo máximo que la primera fila espera compañeras de lote
+        max_lote: Filas por transacción como máximo
+        timeout_s: Tiempo máximo que un request espera su confirmación
+    """
+
+    def __init__(self, app: Flask, max_espera_ms: float = 5, max_lote: int = 64, timeout_s: float = 10):
+        self.app = app
+        self.max_espera = max_espera_ms / 1000
+        self.max_lote = max_lote
+        self.timeout_s = timeout_s
+        self.lotes = 0
+        self.filas = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._cola: queue.Queue = queue.Queue()
+        self._detenido = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def _asegurar_hilo(self) -> None:
+        """Arranca el hilo de commit (de nuevo tras un fork: los threads no lo sobreviven)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._cola = queue.Queue()
+            self._detenido = threading.Event()
+            self._hilo = threading.Thread(target=self._bucle, name='group-commit', daemon=True)
+            self._hilo.start()
+            self._pid = os.getpid()
+
+    def enviar(self, fila: Dict[str, Any]) -> int:
+        """
+        Encola una sesión y espera a que quede confirmada
+
+        Args:
+            fila: Columnas de Sesion (como en SessionRepository.create_many)
+
+        Returns:
+            ID de la sesión ya commiteada
+
+        Raises:
+            TimeoutError: Si no se confirmó a tiempo (la fila no se insertó)
+            Exception: El error de la base de datos para esta fila
+        """
+        self._asegurar_hilo()
+        futuro: Future = Future()
+        # con_contexto captura el span del request: el hilo de commit continúa su traza
+        self._cola.put((fila, futuro, con_contexto(self._confirmar)))
+        try:
+            return futuro.result(timeout=self.timeout_s)
+        except FutureTimeoutError:
+            if futuro.cancel():
+                raise TimeoutError(f'La sesión no se confirmó en {self.timeout_s}s')
+            # Ya está en un commit en curso: esperar su resultado
+            return futuro.result()
+
+    def _siguiente_lote(self) -> List[Tuple[Dict[str, Any], Future, Callable]]:
+        """Bloquea hasta la primera fila y junta las que lleguen en la ventana"""
+        try:
+            lote = [self._cola.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        limite = time.monotonic() + self.max_espera
+        while len(lote) < self.max_lote:
+            restante = limite - time.monotonic()
+            try:
+                lote.append(self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait())
+            except queue.Empty:
+                break
+        # Descartar las que el request ya abandonó por timeout
+        return [item for item in lote if item[1].set_running_or_notify_cancel()]
+
+    def _bucle(self) -> None:
+        while not (self._detenido.is_set() and self._cola.empty()):
+            lote = self._siguiente_lote()
+            if lote:
+                confirmar = lote[0][2]
+                confirmar([(fila, futuro) for fila, futuro, _ in lote])
+
+    def _confirmar(self, lote: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """Commitea el lote en una transacción; si falla, fila por fila"""
+        with self.app.app_context():
+            try:
+                ids = SessionRepository.create_many([fila for fila, _ in lote])
+            except Exception as e:
+                logger.warning(f"Group commit de {len(lote)} sesiones falló, reintentando una por una: {e}")
+                for fila, futuro in lote:
+                    try:
+                        futuro.set_result(SessionRepository.create_many([fila])[0])
+                    except Exception as error:
+                        futuro.set_exception(error)
+                return
+
+        self.lotes += 1
+        self.filas += len(lote)
+        INGESTA_LOTE.observe(len(lote))
+        for (_, futuro), sesion_id in zip(lote, ids):
+            futuro.set_result(sesion_id)
+
+    def detener(self, timeout: float = 5) -> None:
+        """Confirma lo pendiente y detiene el hilo de commit del proceso actual"""
+        if self._hilo is None or self._pid != os.getpid():
+            return
+        self._detenido.set()
+        self._hilo.join(timeout)
+        self._hilo, self._pid = None, None
+
+
+def obtener_buffer() -> Optional[GroupCommitBuffer]:
+    """Buffer de la app actual, o None si el group commit está deshabilitado"""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('group_commit')
+
+
+def init_write_buffer(app: Flask) -> None:
+    """
+    Configura el group commit de la ingesta de sesiones (deshabilitado por defecto)
+
+    Config (con valores por defecto):
+        GROUP_COMMIT_ENABLED: False
+        GROUP_COMMIT_MAX_WAIT_MS: 5
+        GROUP_COMMIT_MAX_BATCH: 64
+        GROUP_COMMIT_TIMEOUT_SECONDS: 10
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('GROUP_COMMIT_ENABLED', False)
+    app.config.setdefault('GROUP_COMMIT_MAX_WAIT_MS', 5)
+    app.config.setdefault('GROUP_COMMIT_MAX_BATCH', 64)
+    app.config.setdefault('GROUP_COMMIT_TIMEOUT_SECONDS', 10)
+
+    if not app.config['GROUP_COMMIT_ENABLED']:
+        return
+
+    buffer = GroupCommitBuffer(
+        app,
+        max_espera_ms=app.config['GROUP_COMMIT_MAX_WAIT_MS'],
+        max_lote=app.config['GROUP_COMMIT_MAX_BATCH'],
+        timeout_s=app.config['GROUP_COMMIT_TIMEOUT_SECONDS'],
+    )
+    app.extensions['group_commit'] = buffer
+    atexit.register(buffer.detener)
+    logger.info(f"✅ Group commit de sesiones habilitado "
+                f"(ventana {app.config['GROUP_COMMIT_MAX_WAIT_MS']}ms, lote máx. {buffer.max_lote})")
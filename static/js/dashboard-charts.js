@@ -551,8 +551,8 @@ function updateRankingTable(ranking) {
 const verResultadosPorMaqueta = debounce(async function() {
     showLoading('Cargando maquetas...');
     try {
-        const response = await fetch('/api/analytics');
-        const data = await response.json();
+        const response = await fetchCompact('/api/analytics');
+        const data = await readCompact(response);
         
         if (!data.estadisticas || !data.estadisticas.general || data.estadisticas.general.total_sesiones === 0) {
             hideLoading();
@@ -560,8 +560,8 @@ const verResultadosPorMaqueta = debounce(async function() {
             return;
         }
 
-        const sesionesResponse = await fetch('/api/sesiones-todas');
-        const sesionesData = await sesionesResponse.json();
+        const sesionesResponse = await fetchCompact('/api/sesiones-todas');
+        const sesionesData = await readCompact(sesionesResponse);
         todasSesiones = sesionesData.sesiones || [];
 
         maquetasDisponibles = [...new Set(todasSesiones.map(s => s.maqueta))];
@@ -636,7 +636,14 @@ async function verMisMaquetas() {
             return;
         }
 
+        // El analytics trae solo la primera página: el resto del historial por cursor
         misSesiones = data.sesiones;
+        let cursor = data.next_cursor;
+        while (cursor) {
+            const pagina = await (await fetch(`/api/estudiante/sesiones?limit=500&cursor=${encodeURIComponent(cursor)}`)).json();
+            misSesiones = misSesiones.concat(pagina.sesiones);
+            cursor = pagina.next_cursor;
+        }
 
         // Obtener profesores únicos de las sesiones
         const profesoresMap = new Map();
@@ -8,9 +8,12 @@
 const CONFIG = {
     CACHE_DURATION: 5 * 60 * 1000, // 5 minutos
     TOAST_DURATION: 4000,
-    DEBOUNCE_DELAY: 300
+    DEBOUNCE_DELAY: 300,
+    COMPACT_FORMAT: true // Pedir /api/analytics y /api/sesiones-todas en formato columnar
 };
 
+const MIMETYPE_COLUMNAR = 'application/vnd.vranalytics.columnar+json';
+
 let scoresChart, maquetasChart, scatterChart, trendChart;
 let dataCache = {
     analytics: null,
@@ -53,6 +56,63 @@ function debounce(func, wait) {
     };
 }
 
+/**
+ * Decodifica el formato columnar compacto al formato fila-a-fila original
+ * @param {Object} envelope - Sobre {formato, version, strings, data}
+ * @returns {*} Payload reconstruido
+ */
+function decodeColumnar(envelope) {
+    const strings = envelope.strings || [];
+    const decode = (obj) => {
+        if (Array.isArray(obj)) return obj.map(decode);
+        if (obj === null || typeof obj !== 'object') return obj;
+        if ('$dict' in obj && Object.keys(obj).length === 1) {
+            return obj.$dict.map(i => (i >= 0 ? strings[i] : null));
+        }
+        if ('$columnar' in obj && 'columnas' in obj) {
+            const columnas = {};
+            for (const [clave, col] of Object.entries(obj.columnas)) {
+                columnas[clave] = decode(col);
+            }
+            const filas = [];
+            for (let i = 0; i < obj.$columnar; i++) {
+                const fila = {};
+                for (const clave in columnas) fila[clave] = columnas[clave][i];
+                filas.push(fila);
+            }
+            return filas;
+        }
+        // Claves de datos que empiezan con "$" llegan escapadas con un "$" extra
+        const resultado = {};
+        for (const [clave, valor] of Object.entries(obj)) {
+            resultado[clave.startsWith('$$') ? clave.slice(1) : clave] = decode(valor);
+        }
+        return resultado;
+    };
+    return decode(envelope.data);
+}
+
+/**
+ * fetch() que pide el formato columnar compacto si está habilitado
+ * @param {string} url - Endpoint de la API
+ * @returns {Promise<Response>}
+ */
+function fetchCompact(url) {
+    const options = CONFIG.COMPACT_FORMAT ? { headers: { 'Accept': `${MIMETYPE_COLUMNAR}, application/json;q=0.9` } } : {};
+    return fetch(url, options);
+}
+
+/**
+ * Lee el cuerpo JSON, decodificando el formato columnar si el servidor lo usó
+ * @param {Response} response - Respuesta de fetchCompact()
+ * @returns {Promise<*>} Payload en formato fila-a-fila
+ */
+async function readCompact(response) {
+    const data = await response.json();
+    const contentType = response.headers.get('Content-Type') || '';
+    return contentType.startsWith(MIMETYPE_COLUMNAR) ? decodeColumnar(data) : data;
+}
+
 /**
  * Verifica si el caché es válido
  */
@@ -205,8 +265,8 @@ async function refreshData(forceRefresh = false) {
     document.getElementById('content').style.display = 'none';
 
     try {
-        const response = await fetch('/api/analytics');
-        const data = await response.json();
+        const response = await fetchCompact('/api/analytics');
+        const data = await readCompact(response);
 
         if (response.ok) {
             if (data.message && data.message.includes('No hay datos')) {
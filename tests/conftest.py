@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import app as flask_app
 from models import db
+from utils.codigo_cache import cache_codigos
 
 
 @pytest.fixture
@@ -26,6 +27,9 @@ def app():
         'SECRET_KEY': 'test-secret-key'
     })
     
+    # Los IDs se repiten entre BDs temporales: el cache no debe sobrevivir al test
+    cache_codigos.clear()
+
     # Crear tablas
     with flask_app.app_context():
         db.create_all()
@@ -48,3 +52,51 @@ def client(app):
 def runner(app):
     """CLI runner para comandos de Flask"""
     return app.test_cli_runner()
+
+
+@pytest.fixture
+def sin_rate_limit(app):
+    """Desactiva el rate limiting durante el test y restaura el valor previo"""
+    previo = app.config.get('RATELIMIT_ENABLED')
+    app.config['RATELIMIT_ENABLED'] = False
+    yield
+    app.config['RATELIMIT_ENABLED'] = previo
+
+
+@pytest.fixture
+def estudiantes_unity(app, sin_rate_limit):
+    """
+    Estudiantes para los tests de ingesta Unity (códigos UNITY0, UNITY1, UNITY2)
+
+    Sin rate limiting: los tests de ingesta hacen muchos POST seguidos.
+    """
+    from models import Estudiante
+
+    estudiantes = [Estudiante(nombre=f'Unity {i}', codigo=f'UNITY{i}') for i in range(3)]
+    db.session.add_all(estudiantes)
+    db.session.commit()
+    return estudiantes
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Falla si el bloque ejecuta más queries que las permitidas
+
+    Uso:
+        with query_budget(3) as stats:
+            client.get('/api/estudiantes')
+    """
+    from contextlib import contextmanager
+    from utils.query_monitor import contar_queries
+
+    @contextmanager
+    def _budget(max_queries):
+        with contar_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"{stats.count} queries (presupuesto {max_queries}):\n"
+            + '\n'.join(f"  {n}x {forma}" for forma, n in stats.formas.most_common())
+        )
+
+    return _budget
@@ -0,0 +1,133 @@
+"""
+Tests de la medición por sección de AnalizadorAvanzado (analytics/timing.py)
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import pytest
+
+from analytics import AnalizadorAvanzado
+from analytics.timing import SectionTimer
+from models import Estudiante, Profesor, Sesion, db
+from services.analytics_service import _analytics_cache
+from utils.profiler import generar_token
+
+
+def _df(n=60):
+    return pd.DataFrame({
+        'estudiante_id': [i % 6 for i in range(n)],
+        'estudiante_nombre': [f'Est {i % 6}' for i in range(n)],
+        'maqueta': [['Motor', 'Frenos'][i % 2] for i in range(n)],
+        'tiempo_segundos': [100 + i for i in range(n)],
+        'puntaje': [i % 8 for i in range(n)],
+        'fecha': [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(n)],
+        'interacciones_ia': [i % 3 for i in range(n)],
+    })
+
+
+def test_cada_seccion_queda_medida():
+    """Tiempo de pared y CPU por método llamado, en orden de ejecución"""
+    analizador = AnalizadorAvanzado.from_dataframe(_df())
+    analizador.estadisticas_descriptivas()
+    analizador.ranking_estudiantes()
+    analizador.ranking_estudiantes(5)
+
+    resumen = analizador.timings.resumen()
+
+    assert list(resumen['secciones']) == ['estadisticas_descriptivas', 'ranking_estudiantes']
+    assert resumen['secciones']['ranking_estudiantes']['llamadas'] == 2
+    assert all(d['wall_ms'] >= 0 and d['cpu_ms'] >= 0 for d in resumen['secciones'].values())
+    assert resumen['seccion_mas_lenta'] in resumen['secciones']
+    assert 'pico_memoria_kb' not in resumen['secciones']['ranking_estudiantes']
+
+
+def test_memoria_con_tracemalloc(app):
+    """Con medir_memoria se registra el pico por sección y tracemalloc se detiene al final"""
+    profesor = Profesor(nombre="Dr. Timing", email="timing@test.com", institucion="U", password="x")
+    estudiante = Estudiante(nombre="Est Timing", codigo="TIM001")
+    db.session.add_all([profesor, estudiante])
+    db.session.commit()
+    db.session.add_all([Sesion(estudiante_id=estudiante.id, profesor_id=profesor.id, maqueta='Motor',
+                               puntaje=i % 8, tiempo_segundos=100, interacciones_ia=1,
+                               fecha=datetime(2024, 1, 1) + timedelta(days=i)) for i in range(5)])
+    db.session.commit()
+
+    analizador = AnalizadorAvanzado(Sesion.query.all(), medir_memoria=True)
+    analizador.datos_para_visualizacion()
+    analizador.timings.detener()
+
+    secciones = analizador.timings.resumen()['secciones']
+    assert list(secciones) == ['construccion_dataframe', 'datos_para_visualizacion']
+    assert secciones['construccion_dataframe']['pico_memoria_kb'] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_compartido_entre_timers():
+    """El primer timer que termina no detiene tracemalloc bajo otro que sigue midiendo"""
+    primero, segundo = SectionTimer(memoria=True), SectionTimer(memoria=True)
+    with primero.seccion('a'):
+        with segundo.seccion('b'):
+            bytearray(64 * 1024)
+    primero.detener()
+    primero.detener()
+    assert tracemalloc.is_tracing()
+
+    segundo.detener()
+    assert not tracemalloc.is_tracing()
+
+
+def test_seccion_fallida_detiene_tracemalloc(app, monkeypatch):
+    """Si una sección lanza, el servicio igual libera tracemalloc"""
+    from services.analytics_service import AnalyticsService
+
+    monkeypatch.setitem(app.config, 'ANALYTICS_TRACEMALLOC', True)
+    profesor = Profesor(nombre="Dr. Falla", email="falla@test.com", institucion="U", password="x")
+    estudiante = Estudiante(nombre="Est Falla", codigo="TIM003")
+    db.session.add_all([profesor, estudiante])
+    db.session.commit()
+    db.session.add(Sesion(estudiante_id=estudiante.id, profesor_id=profesor.id, maqueta='Motor',
+                          puntaje=5, tiempo_segundos=100, interacciones_ia=1, fecha=datetime(2024, 1, 1)))
+    db.session.commit()
+
+    def _falla(self):
+        raise RuntimeError('sección rota')
+
+    monkeypatch.setattr(AnalizadorAvanzado, 'generar_insights', _falla)
+    with pytest.raises(RuntimeError):
+        AnalyticsService().get_analytics_profesor.__wrapped__(AnalyticsService(), profesor.id)
+
+    assert not tracemalloc.is_tracing()
+
+
+def test_timings_solo_para_admin(app, client, monkeypatch, tmp_path):
+    """/api/analytics incluye _timings solo con ?timings=1 y token de profiling"""
+    monkeypatch.setitem(app.config, 'PROFILES_DIR', str(tmp_path))
+    profesor = Profesor(nombre="Dr. Admin", email="admin.timing@test.com", institucion="U", password="x")
+    estudiante = Estudiante(nombre="Est Admin", codigo="TIM002")
+    db.session.add_all([profesor, estudiante])
+    db.session.commit()
+    db.session.add_all([Sesion(estudiante_id=estudiante.id, profesor_id=profesor.id, maqueta='Motor',
+                               puntaje=i % 8, tiempo_segundos=100, interacciones_ia=1,
+                               fecha=datetime(2024, 1, 1) + timedelta(days=i)) for i in range(8)])
+    db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = f"profesor_{profesor.id}"
+
+    normal = client.get('/api/analytics?timings=1').get_json()
+    admin = client.get('/api/analytics?timings=1', headers={'X-Profile': generar_token(app)}).get_json()
+
+    assert normal['success'] and '_timings' not in normal
+    assert admin['_timings']['total_sesiones'] == 8
+    assert 'kmeans_clustering_profesional' in admin['_timings']['secciones']
+
+    # Un cache hit no presenta los tiempos de otro request como actuales
+    assert admin['_timings']['cached'] is True
+    assert admin['_timings']['edad_segundos'] >= 0
+
+    _analytics_cache.clear()
+    recalculado = client.get('/api/analytics?timings=1', headers={'X-Profile': generar_token(app)}).get_json()
+    assert recalculado['_timings']['cached'] is False
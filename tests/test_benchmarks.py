@@ -0,0 +1,36 @@
+"""
+Tests de los helpers de benchmarks (generador sintético y comparación con línea base)
+"""
+
+from benchmarks.bench_suite import comparar
+from benchmarks.synthetic import generar_sesiones, poblar_db
+from models import Sesion
+
+
+def test_generador_determinista():
+    """Misma semilla → mismos datos; otra semilla → datos distintos"""
+    a, b = generar_sesiones(500, seed=7), generar_sesiones(500, seed=7)
+
+    assert a.equals(b)
+    assert not a.equals(generar_sesiones(500, seed=8))
+    assert a['fecha'].is_monotonic_increasing
+    assert a['puntaje'].between(0, 7).all()
+
+
+def test_poblar_db(app):
+    """poblar_db inserta las n sesiones del profesor con estudiantes inscritos"""
+    ids = poblar_db(300, seed=3)
+
+    assert Sesion.query.filter_by(profesor_id=ids['profesor_id']).count() == 300
+    assert len(ids['estudiante_ids']) == 10
+
+
+def test_comparar_detecta_regresiones():
+    """Solo cuenta como regresión si supera el umbral relativo y el absoluto"""
+    base = {'resultados': {'1000': {'a': {'tiempo_s': 0.100}, 'b': {'tiempo_s': 0.001}}}}
+    actual = {'resultados': {'1000': {'a': {'tiempo_s': 0.150}, 'b': {'tiempo_s': 0.003},
+                                      'nuevo': {'tiempo_s': 1.0}}}}
+
+    regresiones = comparar(actual, base, threshold=0.25, min_delta_ms=5)
+
+    assert len(regresiones) == 1 and regresiones[0].startswith('1000 a:')
@@ -0,0 +1,95 @@
+"""
+Tests del cache codigo → estudiante de la ingesta (utils/codigo_cache.py)
+"""
+
+import time
+
+import pytest
+
+from models import Sesion, db
+from repositories.estudiante_repository import EstudianteRepository
+from utils.codigo_cache import CodigoCache, EstudianteRef, cache_codigos, precargar
+
+SESION = {'codigo_estudiante': 'UNITY0', 'maqueta': 'Motor', 'puntaje': 5, 'tiempo_segundos': 60}
+
+
+@pytest.fixture
+def estudiante(estudiantes_unity):
+    return estudiantes_unity[0]
+
+
+def test_ingesta_con_hit_es_un_solo_insert(client, estudiante, query_budget):
+    """Con el código cacheado, la sesión se crea sin SELECT del estudiante"""
+    client.post('/api/unity/session', json=SESION)
+
+    with query_budget(1) as stats:
+        response = client.post('/api/unity/session', json=SESION)
+
+    assert response.status_code == 201
+    assert response.get_json()['estudiante'] == 'Unity 0'
+    assert all(forma.startswith('INSERT') for forma in stats.formas)
+    assert Sesion.query.count() == 2
+
+
+def test_cambio_de_codigo_y_baja_invalidan(client, estudiante):
+    assert EstudianteRepository.resolver_codigo('UNITY0').id == estudiante.id
+
+    estudiante.codigo = 'UNITY9'
+    db.session.commit()
+    assert EstudianteRepository.resolver_codigo('UNITY0') is None
+    assert client.post('/api/unity/session', json=SESION).status_code == 400
+
+    assert EstudianteRepository.get_ids_by_codigos(['UNITY9']) == {'UNITY9': estudiante.id}
+    db.session.delete(estudiante)
+    db.session.commit()
+    assert EstudianteRepository.get_ids_by_codigos(['UNITY9']) == {}
+
+
+def test_cambio_de_nombre_invalida(estudiante):
+    EstudianteRepository.resolver_codigo('UNITY0')
+    estudiante.nombre = 'Renombrado'
+    db.session.commit()
+
+    assert EstudianteRepository.resolver_codigo('UNITY0').nombre == 'Renombrado'
+
+
+def test_ttl_y_limite_lru():
+    cache = CodigoCache(max_entradas=2, ttl_s=0.05)
+    cache.put('A', EstudianteRef(1, 'a'))
+    cache.put('B', EstudianteRef(2, 'b'))
+    cache.get('A')  # A pasa a ser la más reciente
+    cache.put('C', EstudianteRef(3, 'c'))
+
+    assert cache.get('B') is None
+    assert cache.get('A') == EstudianteRef(1, 'a')
+    assert len(cache) == 2
+
+    time.sleep(0.06)
+    assert cache.get('A') is None and cache.get('C') is None
+
+
+def test_precarga(app, estudiante):
+    assert precargar(app) == 3
+    assert cache_codigos.get('UNITY0') == EstudianteRef(estudiante.id, 'Unity 0')
+
+
+def test_invalidacion_recien_en_el_commit(estudiante):
+    """Un miss entre flush y commit re-cachea la fila vieja: el commit la invalida igual"""
+    estudiante.codigo = 'UNITY9'
+    db.session.flush()
+    # Ingesta concurrente que todavía ve la fila confirmada
+    cache_codigos.put('UNITY0', EstudianteRef(estudiante.id, 'Unity 0'))
+
+    db.session.commit()
+    assert cache_codigos.get('UNITY0') is None
+
+
+def test_rollback_no_invalida(estudiante):
+    EstudianteRepository.resolver_codigo('UNITY0')
+    estudiante.codigo = 'UNITY9'
+    db.session.flush()
+    db.session.rollback()
+
+    assert cache_codigos.get('UNITY0') == EstudianteRef(estudiante.id, 'Unity 0')
+    db.session.commit()
+    assert cache_codigos.get('UNITY0') is not None
@@ -0,0 +1,76 @@
+"""
+Tests para el formato columnar compacto (utils/columnar.py)
+"""
+
+import json
+
+from utils.columnar import compact_response, decode_columnar, encode_columnar
+from utils.constants import MIMETYPE_COLUMNAR
+
+
+SESIONES = [
+    {'id': 1, 'estudiante_nombre': 'Ana', 'maqueta': 'Motor', 'puntaje': 5.123456, 'fecha': '2024-01-01'},
+    {'id': 2, 'estudiante_nombre': 'Luis', 'maqueta': 'Motor', 'puntaje': 3.5, 'fecha': '2024-01-02'},
+    {'id': 3, 'estudiante_nombre': 'Ana', 'maqueta': 'Aire acondicionado', 'puntaje': 6.0, 'fecha': '2024-01-03'},
+]
+
+
+def test_lista_de_objetos_se_codifica_en_columnas():
+    """Las filas se convierten a columnas con strings repetidos en diccionario"""
+    envelope = encode_columnar({'sesiones': SESIONES})
+
+    sesiones = envelope['data']['sesiones']
+    assert sesiones['$columnar'] == 3
+    assert sesiones['columnas']['id'] == [1, 2, 3]
+    assert set(envelope['strings']) >= {'Ana', 'Luis', 'Motor'}
+    assert 'Ana' == envelope['strings'][sesiones['columnas']['estudiante_nombre']['$dict'][0]]
+    # Fechas únicas: no vale la pena codificarlas como diccionario
+    assert sesiones['columnas']['fecha'] == ['2024-01-01', '2024-01-02', '2024-01-03']
+
+
+def test_roundtrip_conserva_payload_con_floats_redondeados():
+    """decode_columnar(encode_columnar(x)) == x salvo por la precisión de floats"""
+    payload = {
+        'success': True,
+        'sesiones': SESIONES,
+        'scatter': {'maqueta': ['Motor', 'Motor', 'Motor'], 'tiempo': [10, 20, 30]},
+        'vacio': [],
+    }
+
+    resultado = decode_columnar(encode_columnar(payload, precision=2))
+
+    assert resultado['sesiones'][0]['puntaje'] == 5.12
+    assert resultado['sesiones'][1] == SESIONES[1]
+    assert resultado['scatter'] == payload['scatter']
+    assert resultado['vacio'] == []
+    assert resultado['success'] is True
+
+
+def test_roundtrip_exacto_con_claves_faltantes_y_reservadas():
+    """Objetos con claves distintas y claves '$dict'/'$columnar' del usuario vuelven intactos"""
+    payload = {
+        'heterogeneas': [{'a': 1, 'b': 'x'}, {'a': 2}, {'c': None}],
+        'marcadores': [{'$dict': [0, 1]}, {'$columnar': 2, 'columnas': {'a': [1, 2]}}],
+        '$dict': [0],
+        'anidado': {'$$ya_escapada': 'Motor', 'filas': [{'$columnar': 'a'}, {'$columnar': 'b'}]},
+    }
+
+    envelope = json.loads(json.dumps(encode_columnar(payload)))
+
+    assert decode_columnar(envelope) == payload
+
+
+def test_compact_response_negocia_por_header_accept(app):
+    """Sin Accept explícito se mantiene el JSON fila-a-fila"""
+    with app.test_request_context('/', headers={'Accept': '*/*'}):
+        response, status = compact_response({'sesiones': SESIONES}, 200)
+        assert status == 200
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {'sesiones': SESIONES}
+
+    with app.test_request_context('/', headers={'Accept': MIMETYPE_COLUMNAR}):
+        response, _ = compact_response({'sesiones': SESIONES}, 200)
+        assert response.mimetype == MIMETYPE_COLUMNAR
+        assert 'Accept' in response.headers['Vary']
+        envelope = json.loads(response.get_data(as_text=True))
+        assert decode_columnar(envelope)['sesiones'][2]['maqueta'] == 'Aire acondicionado'
@@ -0,0 +1,103 @@
+"""
+Tests para la compresión de respuestas (utils/compression.py)
+"""
+
+import gzip
+import zlib
+
+import pytest
+from flask import Flask, Response, g, jsonify
+
+from utils.compression import _comprimir_stream, init_compression
+
+
+@pytest.fixture
+def compress_app():
+    """App mínima con compresión habilitada y rutas de prueba"""
+    app = Flask(__name__)
+    init_compression(app)
+    variantes = {}
+
+    @app.route('/grande')
+    def grande():
+        return jsonify({'sesiones': [{'maqueta': 'Motor', 'puntaje': i} for i in range(200)]})
+
+    @app.route('/pequena')
+    def pequena():
+        return jsonify({'ok': True})
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'{i},Motor\n' for i in range(1000)), mimetype='text/csv')
+
+    @app.route('/cacheada')
+    def cacheada():
+        g.compressed_variants = variantes
+        return jsonify({'datos': ['x' * 10] * 200})
+
+    app.variantes = variantes
+    return app
+
+
+def test_respuesta_grande_se_comprime_con_gzip(compress_app):
+    """JSON sobre el umbral se comprime y sigue siendo decodificable"""
+    client = compress_app.test_client()
+    response = client.get('/grande', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'"maqueta":"Motor"' in gzip.decompress(response.data).replace(b' ', b'')
+
+
+def test_respuesta_pequena_o_sin_accept_encoding_no_se_comprime(compress_app):
+    """Bajo el umbral, o si el cliente no acepta gzip, el body va plano"""
+    client = compress_app.test_client()
+
+    assert 'Content-Encoding' not in client.get('/pequena', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in client.get('/grande').headers
+
+
+def test_streaming_se_comprime_chunk_a_chunk(compress_app):
+    """Las respuestas en streaming se comprimen sin bufferizar el body completo"""
+    client = compress_app.test_client()
+    response = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    lineas = zlib.decompress(response.data, 31).decode().splitlines()
+    assert len(lineas) == 1000
+    assert lineas[-1] == '999,Motor'
+
+
+def test_streaming_de_filas_chicas_comprime_como_el_body_completo():
+    """Una fila por chunk no paga un flush por fila: tamaño cercano al buffered"""
+    filas = [f'{i},Estudiante {i % 97},Motor,{i % 8},{60 + i % 300}\n' for i in range(20000)]
+    buffered = gzip.compress(''.join(filas).encode(), compresslevel=6)
+
+    stream = b''.join(_comprimir_stream(iter(filas), 'gzip', 6, 5))
+
+    assert zlib.decompress(stream, 31).decode() == ''.join(filas)
+    assert len(stream) <= len(buffered) * 1.1
+
+
+def test_streaming_vacia_el_compresor_por_tamano():
+    """Con un umbral chico el cliente recibe datos antes del final del stream"""
+    filas = (f'{i},Motor\n'.encode() for i in range(1000))
+    partes = list(_comprimir_stream(filas, 'gzip', 6, 5, flush_bytes=1024, flush_segundos=60))
+
+    assert len(partes) > 2
+    assert zlib.decompress(b''.join(partes), 31).count(b'\n') == 1000
+
+
+def test_bytes_comprimidos_se_reutilizan_para_respuestas_cacheadas(compress_app):
+    """La segunda respuesta idéntica reutiliza los bytes guardados junto al resultado"""
+    client = compress_app.test_client()
+
+    primera = client.get('/cacheada', headers={'Accept-Encoding': 'gzip'})
+    assert ('application/json', 'gzip') in compress_app.variantes
+
+    compress_app.variantes[('application/json', 'gzip')] = gzip.compress(b'{"reutilizado": true}')
+    segunda = client.get('/cacheada', headers={'Accept-Encoding': 'gzip'})
+
+    assert primera.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(segunda.data) == b'{"reutilizado": true}'
@@ -0,0 +1,156 @@
+"""
+Tests de paridad pandas vs DuckDB (analytics/engines/duckdb_engine.py)
+
+Ambos engines deben producir exactamente el mismo JSON.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip('duckdb')
+
+from analytics import AnalizadorAvanzado
+from analytics.engines import DuckDBEngine, EngineError
+from models import Estudiante, Profesor, Sesion, db
+
+METODOS = [
+    ('estadisticas_descriptivas', ()),
+    ('analisis_por_maqueta', ()),
+    ('ranking_estudiantes', (5,)),
+    ('datos_para_visualizacion', ()),
+]
+
+
+def _json(valor):
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False)
+
+
+def _assert_paridad(pandas_analizador, duckdb_analizador):
+    for metodo, args in METODOS:
+        esperado = getattr(pandas_analizador, metodo)(*args)
+        obtenido = getattr(duckdb_analizador, metodo)(*args)
+        assert _json(obtenido) == _json(esperado), metodo
+
+
+@pytest.fixture
+def df_sesiones():
+    """600 sesiones sintéticas con días sin actividad y una maqueta con 1 sola sesión"""
+    rng = np.random.default_rng(7)
+    n = 600
+    base = datetime(2024, 3, 1, 8, 0)
+    df = pd.DataFrame({
+        'estudiante_id': rng.integers(1, 40, n),
+        'maqueta': rng.choice(['Motor', 'Aire acondicionado', 'Transmisión'], n),
+        'tiempo_segundos': rng.integers(30, 900, n),
+        'puntaje': rng.integers(0, 8, n),
+        'fecha': [base + timedelta(days=int(d), minutes=int(m))
+                  for d, m in zip(rng.choice(np.arange(0, 60, 2), n), rng.integers(0, 600, n))],
+        'interacciones_ia': rng.integers(0, 10, n),
+    })
+    df['estudiante_nombre'] = 'Estudiante ' + df['estudiante_id'].astype(str)
+    df.loc[n - 1, 'maqueta'] = 'Frenos'
+    return df.sort_values('fecha', ignore_index=True)
+
+
+def test_paridad_desde_dataframe(df_sesiones):
+    """Mismo DataFrame → mismo JSON en ambos engines"""
+    engine = DuckDBEngine.from_dataframe(df_sesiones, threads=4)
+
+    _assert_paridad(
+        AnalizadorAvanzado.from_dataframe(df_sesiones.copy()),
+        AnalizadorAvanzado.from_duckdb(engine)
+    )
+
+
+def test_paridad_casos_borde():
+    """Una sola sesión (std NaN) y sin sesiones"""
+    una = pd.DataFrame([{
+        'estudiante_id': 1, 'estudiante_nombre': 'Solo', 'maqueta': 'Motor',
+        'tiempo_segundos': 120, 'puntaje': 5, 'fecha': datetime(2024, 1, 1), 'interacciones_ia': 2
+    }])
+    _assert_paridad(
+        AnalizadorAvanzado.from_dataframe(una.copy()),
+        AnalizadorAvanzado.from_duckdb(DuckDBEngine.from_dataframe(una))
+    )
+
+    vacio = AnalizadorAvanzado.from_duckdb(DuckDBEngine.from_dataframe(pd.DataFrame()))
+    assert not vacio.tiene_datos
+    _assert_paridad(AnalizadorAvanzado([]), vacio)
+
+
+@pytest.fixture
+def sesiones_bd(app):
+    """Profesor con 40 sesiones en la BD de prueba"""
+    profesor = Profesor(nombre="Dr. Duck", email="duck@test.com", institucion="U Test", password="x")
+    estudiantes = [Estudiante(nombre=f"Pato {i}", codigo=f"DUCK{i}") for i in range(5)]
+    db.session.add_all([profesor] + estudiantes)
+    db.session.commit()
+    base = datetime(2024, 4, 28, 9, 0)
+    for i in range(40):
+        db.session.add(Sesion(
+            estudiante_id=estudiantes[i % 5].id, profesor_id=profesor.id,
+            maqueta=['Motor', 'Frenos'][i % 2], puntaje=(i * 3) % 8,
+            tiempo_segundos=60 + 11 * i, interacciones_ia=i % 6, fecha=base + timedelta(hours=7 * i)
+        ))
+    db.session.commit()
+    return profesor.id
+
+
+def test_paridad_desde_bundle_parquet(runner, sesiones_bd, tmp_path):
+    """Un bundle exportado da el mismo resultado con pandas y con DuckDB"""
+    pytest.importorskip('pyarrow')
+
+    destino = str(tmp_path / 'bundle')
+    assert runner.invoke(args=['export-parquet', '--output', destino]).exit_code == 0
+
+    _assert_paridad(
+        AnalizadorAvanzado.from_parquet_bundle(destino, profesor_id=sesiones_bd),
+        AnalizadorAvanzado.from_parquet_bundle(destino, profesor_id=sesiones_bd, engine='duckdb')
+    )
+
+
+def test_paridad_sqlite_adjunta(app, sesiones_bd):
+    """ATTACH de la BD SQLite viva (requiere la extensión sqlite de DuckDB)"""
+    db_path = app.config['SQLALCHEMY_DATABASE_URI'].replace('sqlite:///', '')
+    try:
+        engine = DuckDBEngine.from_sqlite(db_path, profesor_id=sesiones_bd)
+    except EngineError as e:
+        pytest.skip(str(e))
+
+    sesiones = Sesion.query.filter_by(profesor_id=sesiones_bd).order_by(Sesion.fecha, Sesion.id).all()
+    _assert_paridad(AnalizadorAvanzado(sesiones), AnalizadorAvanzado.from_duckdb(engine))
+
+
+def test_cerrar_libera_la_conexion(df_sesiones):
+    """El context manager cierra la conexión DuckDB, también si una sección falla"""
+    engine = DuckDBEngine.from_dataframe(df_sesiones)
+    with AnalizadorAvanzado.from_duckdb(engine) as analizador:
+        assert analizador.estadisticas_descriptivas()
+    with pytest.raises(duckdb.ConnectionException):
+        engine.con.execute('SELECT 1')
+
+    engine = DuckDBEngine.from_dataframe(df_sesiones)
+    with pytest.raises(RuntimeError):
+        with AnalizadorAvanzado.from_duckdb(engine):
+            raise RuntimeError('sección fallida')
+    with pytest.raises(duckdb.ConnectionException):
+        engine.con.execute('SELECT 1')
+
+
+def test_servicio_cierra_engine_duckdb(app, sesiones_bd, monkeypatch):
+    """AnalyticsService cierra el engine al terminar cada análisis"""
+    from services.analytics_service import AnalyticsService
+
+    cerrados = []
+    close_original = DuckDBEngine.close
+    monkeypatch.setattr(DuckDBEngine, 'close', lambda self: (cerrados.append(self), close_original(self)))
+    app.config['ANALYTICS_BACKEND'] = 'duckdb'
+
+    servicio = AnalyticsService()
+    assert servicio.get_analytics_profesor.__wrapped__(servicio, sesiones_bd)['success']
+    assert servicio.get_analytics_por_maqueta(sesiones_bd, 'Motor')['success']
+    assert len(cerrados) == 2
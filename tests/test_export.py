@@ -0,0 +1,82 @@
+"""
+Tests para la exportación en streaming (routes/export_routes.py)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Estudiante, Profesor, Sesion, db
+
+
+@pytest.fixture
+def profesor_con_sesiones(app):
+    """Profesor con 3 sesiones, una de ellas con respuestas"""
+    profesor = Profesor(nombre="Dr. Export", email="export@test.com", institucion="U Test", password="x")
+    estudiante = Estudiante(nombre="Ana Export", codigo="EXP001")
+    db.session.add_all([profesor, estudiante])
+    db.session.commit()
+
+    base = datetime(2024, 5, 1, 9, 0)
+    for i in range(3):
+        sesion = Sesion(
+            estudiante_id=estudiante.id, profesor_id=profesor.id, maqueta='Motor',
+            puntaje=4 + i, tiempo_segundos=100, interacciones_ia=1, fecha=base + timedelta(hours=i)
+        )
+        if i == 2:
+            sesion.set_respuestas([
+                {'pregunta': 'P1', 'respuesta': 'A', 'correcta': True},
+                {'pregunta': 'P2', 'respuesta': 'B', 'correcta': False},
+            ])
+        db.session.add(sesion)
+    db.session.commit()
+    return profesor.id
+
+
+@pytest.fixture
+def profesor_client(client, profesor_con_sesiones):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = f"profesor_{profesor_con_sesiones}"
+    return client
+
+
+def test_export_csv_streaming(profesor_client):
+    """El CSV se entrega en streaming con header y una fila por sesión"""
+    response = profesor_client.get('/api/export/sesiones.csv')
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+
+    filas = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(filas) == 3
+    assert filas[0]['estudiante_codigo'] == 'EXP001'
+    assert filas[0]['puntaje'] == '6'  # fecha DESC
+
+
+def test_export_csv_expande_respuestas(profesor_client):
+    """Con respuestas=1 se emite una fila por respuesta"""
+    response = profesor_client.get('/api/export/sesiones.csv?respuestas=1')
+
+    filas = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [f['pregunta'] for f in filas] == ['P1', 'P2', '', '']
+
+
+def test_export_ndjson_con_filtros(profesor_client):
+    """NDJSON: un objeto por línea, filtros aplicados en SQL"""
+    response = profesor_client.get('/api/export/sesiones.ndjson?respuestas=1&puntaje_min=5')
+
+    assert response.mimetype == 'application/x-ndjson'
+    items = [json.loads(linea) for linea in response.get_data(as_text=True).splitlines()]
+    assert [i['puntaje'] for i in items] == [6, 5]
+    assert items[0]['respuestas'][0]['pregunta'] == 'P1'
+    assert items[1]['respuestas'] == []
+
+
+def test_export_requiere_profesor(client):
+    """Sin login redirige / rechaza"""
+    assert client.get('/api/export/sesiones.csv').status_code in (302, 401)
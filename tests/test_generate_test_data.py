@@ -0,0 +1,50 @@
+"""
+Tests del generador masivo de datos (scripts/generate_test_data.py --bulk)
+"""
+
+import numpy as np
+
+from models import Estudiante, Profesor, Sesion, estudiante_profesor, db
+from scripts.generate_test_data import generar_datos_bulk, muestrear_sesiones
+
+
+def test_muestreo_vectorizado_respeta_grupos():
+    """Cada grupo de rendimiento queda en sus rangos; misma semilla → mismos datos"""
+    a = muestrear_sesiones(20_000, 90, np.random.default_rng(5))
+    b = muestrear_sesiones(20_000, 90, np.random.default_rng(5))
+
+    assert np.array_equal(a['puntaje'], b['puntaje'])
+    assert set(np.unique(a['grupo'])) == {0, 1, 2}
+    medias = [a['puntaje'][a['grupo'] == g].mean() for g in range(3)]
+    assert medias[0] < 4 < medias[1] < medias[2]
+    assert a['puntaje'].min() >= 0 and a['puntaje'].max() <= 7
+    assert a['tiempo_segundos'].min() >= 30 and a['tiempo_segundos'].max() <= 120
+
+
+def test_generar_datos_bulk(app):
+    """Inserta profesores, estudiantes inscritos y sesiones con un solo hash compartido"""
+    totales = generar_datos_bulk(n_profesores=3, n_estudiantes=30, n_sesiones=1_000, seed=1, lote=300)
+
+    assert totales['sesiones'] == 1_000
+    assert Sesion.query.count() == 1_000
+    assert Profesor.query.filter_by(email='profesor@test.com').one().check_password('123456')
+    assert len({e.password for e in Estudiante.query}) == 1
+    inscripciones = db.session.execute(db.select(db.func.count()).select_from(estudiante_profesor)).scalar()
+    assert inscripciones == 30
+    # Cada sesión pertenece al profesor con el que está inscrito su estudiante
+    huerfanas = db.session.query(Sesion).outerjoin(
+        estudiante_profesor,
+        (estudiante_profesor.c.estudiante_id == Sesion.estudiante_id)
+        & (estudiante_profesor.c.profesor_id == Sesion.profesor_id)
+    ).filter(estudiante_profesor.c.estudiante_id.is_(None)).count()
+    assert huerfanas == 0
+
+
+def test_generar_datos_bulk_sin_limpiar(app):
+    """Cargar de nuevo sin limpiar no choca con códigos ni emails existentes"""
+    generar_datos_bulk(n_profesores=2, n_estudiantes=10, n_sesiones=50, seed=1)
+    generar_datos_bulk(n_profesores=2, n_estudiantes=10, n_sesiones=50, seed=2, limpiar=False)
+
+    assert Profesor.query.count() == 4 and Estudiante.query.count() == 20
+    assert Profesor.query.filter_by(email='profesor@test.com').count() == 1
+    assert Sesion.query.count() == 100
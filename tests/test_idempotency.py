@@ -0,0 +1,69 @@
+"""
+Tests de idempotencia de POST /api/unity/session (Idempotency-Key / client_session_uuid)
+"""
+
+from models import Sesion
+
+SESION = {'codigo_estudiante': 'UNITY0', 'maqueta': 'Motor', 'puntaje': 5, 'tiempo_segundos': 60}
+
+
+def test_reintento_con_header_devuelve_resultado_original(client, estudiantes_unity, query_budget):
+    """El reintento no inserta: lookup por índice único y mismo resultado"""
+    primera = client.post('/api/unity/session', json=SESION, headers={'Idempotency-Key': 'abc-123'})
+
+    with query_budget(2):
+        reintento = client.post('/api/unity/session', json=SESION, headers={'Idempotency-Key': 'abc-123'})
+
+    assert primera.status_code == reintento.status_code == 201
+    assert reintento.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in primera.headers
+    assert reintento.get_json()['sesion_id'] == primera.get_json()['sesion_id']
+    assert Sesion.query.count() == 1
+
+
+def test_client_session_uuid_y_sin_clave(client, estudiantes_unity):
+    """client_session_uuid en el body equivale al header; sin clave cada POST crea una sesión"""
+    con_uuid = dict(SESION, client_session_uuid='8f14e45f-ceea-467f-a1b2-000000000001')
+    ids = {client.post('/api/unity/session', json=con_uuid).get_json()['sesion_id'] for _ in range(2)}
+    client.post('/api/unity/session', json=SESION)
+    client.post('/api/unity/session', json=SESION)
+
+    assert len(ids) == 1
+    assert Sesion.query.count() == 3
+
+
+def test_clave_invalida(client, estudiantes_unity):
+    response = client.post('/api/unity/session', json=SESION, headers={'Idempotency-Key': 'x' * 65})
+
+    assert response.status_code == 400
+    assert Sesion.query.count() == 0
+
+
+def test_reintentos_concurrentes_con_group_commit(app, client, estudiantes_unity):
+    """Dos reintentos simultáneos que pasan el lookup: el índice único deja uno solo"""
+    import threading
+    from services.write_buffer import GroupCommitBuffer
+
+    buffer = GroupCommitBuffer(app, max_espera_ms=100)
+    app.extensions['group_commit'] = buffer
+    ids, barrera = [], threading.Barrier(2)
+
+    def _post():
+        cliente = app.test_client()
+        barrera.wait()
+        response = cliente.post('/api/unity/session', json=SESION, headers={'Idempotency-Key': 'race-1'})
+        ids.append((response.status_code, response.get_json().get('sesion_id')))
+
+    try:
+        hilos = [threading.Thread(target=_post) for _ in range(2)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+    finally:
+        buffer.detener()
+        app.extensions.pop('group_commit', None)
+
+    assert [status for status, _ in ids] == [201, 201]
+    assert len({sesion_id for _, sesion_id in ids}) == 1
+    assert Sesion.query.count() == 1
@@ -0,0 +1,31 @@
+"""
+Tests del proceso dedicado de ingesta (ingesta.py)
+"""
+
+import pytest
+from werkzeug.test import Client
+
+from models import Sesion
+
+
+@pytest.fixture
+def cliente_ingesta(estudiantes_unity):
+    from ingesta import app as ingesta_app
+
+    return Client(ingesta_app)
+
+
+def test_atiende_rutas_de_ingesta(cliente_ingesta):
+    sesion = {'codigo_estudiante': 'UNITY0', 'maqueta': 'Motor', 'puntaje': 5, 'tiempo_segundos': 60}
+
+    assert cliente_ingesta.get('/api/unity/verify').status_code == 200
+    assert cliente_ingesta.post('/api/unity/session', json=sesion).status_code == 201
+    assert Sesion.query.count() == 1
+
+
+@pytest.mark.parametrize('ruta', ['/api/analytics', '/dashboard', '/api/export/sesiones.csv', '/'])
+def test_rechaza_rutas_del_dashboard(cliente_ingesta, ruta):
+    response = cliente_ingesta.get(ruta)
+
+    assert response.status_code == 404
+    assert response.get_json()['error']
@@ -0,0 +1,32 @@
+"""
+Tests del harness de carga de ingesta Unity (benchmarks/load_unity.py)
+"""
+
+from benchmarks.load_unity import ejecutar_threads, generar_payloads, preparar_estudiantes, resumir
+from models import Sesion
+
+
+def test_resumir_percentiles_y_errores():
+    """Percentiles en ms, throughput y tasa de errores (no-2xx)"""
+    latencias = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    estados = [201] * 98 + [400, 599]
+
+    r = resumir(latencias, estados, duracion_s=2.0)
+
+    assert r['throughput_rps'] == 50.0
+    assert 49 <= r['p50_ms'] <= 51 and 98 <= r['p99_ms'] <= 100
+    assert r['tasa_error'] == 0.02
+    assert r['estados'] == {'201': 98, '400': 1, '599': 1}
+
+
+def test_rafaga_de_clase_en_threads(app, sin_rate_limit):
+    """Una clase pequeña terminando a la vez: todas las sesiones quedan registradas"""
+    codigos = preparar_estudiantes(8)
+    payloads = generar_payloads(codigos, 8, seed=1)
+    assert all(0 <= p['puntaje'] <= 7 and p['respuestas'] for p in payloads)
+
+    r = ejecutar_threads(app, payloads, concurrencia=8)
+
+    assert r['requests'] == 8
+    assert r['tasa_error'] == 0.0, r['estados']
+    assert Sesion.query.count() == 8
@@ -0,0 +1,109 @@
+"""
+Tests de métricas Prometheus (utils/metrics.py y GET /metrics)
+"""
+
+import glob
+import json
+import os
+
+from utils import metrics
+
+
+def test_metrics_expone_latencia_por_endpoint(client):
+    """Después de un request, /metrics trae su histograma y contador"""
+    client.get('/api/unity/verify')
+
+    response = client.get('/metrics')
+    texto = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert '# TYPE vr_http_request_duration_seconds histogram' in texto
+    assert 'vr_http_request_duration_seconds_bucket{endpoint="/api/unity/verify",method="GET",le="+Inf"}' in texto
+    assert 'vr_http_requests_total{endpoint="/api/unity/verify",method="GET",status="200"}' in texto
+
+
+def test_metrics_con_token(app, client):
+    """Con METRICS_TOKEN configurado se exige el bearer token"""
+    app.config['METRICS_TOKEN'] = 'secreto'
+    try:
+        assert client.get('/metrics').status_code == 401
+        autorizado = client.get('/metrics', headers={'Authorization': 'Bearer secreto'})
+        assert autorizado.status_code == 200
+    finally:
+        app.config['METRICS_TOKEN'] = ''
+
+
+def test_metrics_sin_token_solo_loopback(client):
+    """Sin METRICS_TOKEN, /metrics no se expone a conexiones remotas"""
+    remoto = client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'})
+
+    assert remoto.status_code == 403
+    assert client.get('/metrics').status_code == 200
+
+
+def test_metrics_en_proceso_de_ingesta(app):
+    """El proceso de ingesta deja pasar /metrics pero con la misma protección"""
+    from werkzeug.test import Client
+    from ingesta import app as ingesta_app
+
+    remoto = Client(ingesta_app).get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.9'})
+
+    assert remoto.status_code == 403
+
+
+def test_histograma_render_acumulado():
+    """Los buckets se exponen acumulados y _count coincide con +Inf"""
+    histograma = metrics.Histogram('test_latencia', 'Prueba', ('ruta',), buckets=(0.1, 1.0))
+    for valor in (0.05, 0.5, 0.7, 3.0):
+        histograma.observe(valor, '/x')
+
+    datos = {}
+    metrics._fusionar(datos, {'test_latencia': histograma.snapshot()}, incluir_gauges=True)
+    texto = metrics.render(datos)
+
+    assert 'test_latencia_bucket{ruta="/x",le="0.1"} 1' in texto
+    assert 'test_latencia_bucket{ruta="/x",le="1.0"} 3' in texto
+    assert 'test_latencia_bucket{ruta="/x",le="+Inf"} 4' in texto
+    assert 'test_latencia_count{ruta="/x"} 4' in texto
+
+
+def test_agregacion_multiworker(tmp_path):
+    """Se suman contadores de otros workers; los gauges de workers muertos se descartan"""
+    metrics.volcar(str(tmp_path))
+    propio = metrics.recolectar(str(tmp_path))
+    base = propio['vr_sesiones_ingestadas_total']['valores'].get(('unity',), 0)
+
+    pid_muerto = 2 ** 22 + 12345
+    otro_worker = {
+        'vr_sesiones_ingestadas_total': {'tipo': 'counter', 'ayuda': 'x', 'etiquetas': ['origen'],
+                                         'valores': [[['unity'], 7]]},
+        'vr_http_requests_in_flight': {'tipo': 'gauge', 'ayuda': 'x', 'etiquetas': [],
+                                       'valores': [[[], 50]]},
+    }
+    with open(os.path.join(tmp_path, f'metrics_{pid_muerto}.json'), 'w') as f:
+        json.dump(otro_worker, f)
+
+    agregado = metrics.recolectar(str(tmp_path))
+
+    assert agregado['vr_sesiones_ingestadas_total']['valores'][('unity',)] == base + 7
+    assert agregado['vr_http_requests_in_flight']['valores'].get((), 0) < 50
+
+
+def test_workers_muertos_se_pliegan_y_se_borran(tmp_path):
+    """Los archivos de PIDs muertos se suman en uno solo y se eliminan"""
+    directorio = str(tmp_path)
+    base = metrics.recolectar(directorio)['vr_sesiones_ingestadas_total']['valores'].get(('unity',), 0)
+
+    for i, cantidad in enumerate((3, 4)):
+        with open(os.path.join(directorio, f'metrics_{2 ** 22 + 20000 + i}.json'), 'w') as f:
+            json.dump({'vr_sesiones_ingestadas_total': {
+                'tipo': 'counter', 'ayuda': 'x', 'etiquetas': ['origen'], 'valores': [[['unity'], cantidad]]
+            }}, f)
+
+    for _ in range(2):
+        agregado = metrics.recolectar(directorio)
+        assert agregado['vr_sesiones_ingestadas_total']['valores'][('unity',)] == base + 7
+
+    archivos = sorted(os.path.basename(r) for r in glob.glob(os.path.join(directorio, 'metrics_*.json')))
+    assert archivos == [metrics.ARCHIVO_MUERTOS]
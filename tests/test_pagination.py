@@ -0,0 +1,139 @@
+"""
+Tests para la paginación keyset de sesiones (utils/pagination.py + SessionRepository)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Estudiante, Profesor, Sesion, db
+from repositories.session_repository import SessionRepository
+from utils.constants import DEFAULT_PAGE_SIZE
+from utils.pagination import (PaginationError, SesionFiltros, decode_cursor, encode_cursor,
+                              parse_filtros, parse_page_args)
+
+
+@pytest.fixture
+def sesiones_profesor(app):
+    """Profesor con 25 sesiones (varias con la misma fecha para probar el desempate por id)"""
+    profesor = Profesor(nombre="Dr. Keyset", email="keyset@test.com", institucion="U Test", password="x")
+    estudiantes = [Estudiante(nombre=f"Est {i}", codigo=f"KEY{i:03d}") for i in range(3)]
+    db.session.add(profesor)
+    db.session.add_all(estudiantes)
+    db.session.commit()
+
+    base = datetime(2024, 3, 1, 10, 0, 0)
+    for i in range(25):
+        db.session.add(Sesion(
+            estudiante_id=estudiantes[i % 3].id,
+            profesor_id=profesor.id,
+            maqueta='Motor' if i % 2 else 'Aire acondicionado',
+            puntaje=i % 8,
+            tiempo_segundos=60 + i,
+            interacciones_ia=i % 4,
+            fecha=base + timedelta(days=i // 3)  # 3 sesiones por día
+        ))
+    db.session.commit()
+
+    return {'profesor_id': profesor.id, 'estudiante_ids': [e.id for e in estudiantes]}
+
+
+def _recorrer(profesor_id, limit, filtros=None):
+    """Recorre todas las páginas y devuelve los ids en orden"""
+    ids, cursor, paginas = [], None, 0
+    while True:
+        sesiones, cursor = SessionRepository.get_page_by_profesor(profesor_id, limit, cursor, filtros)
+        ids.extend(s.id for s in sesiones)
+        paginas += 1
+        if cursor is None:
+            return ids, paginas
+
+
+def test_paginas_cubren_todo_sin_duplicados_en_orden(sesiones_profesor):
+    """Las páginas concatenadas equivalen al listado completo ordenado por (fecha DESC, id DESC)"""
+    profesor_id = sesiones_profesor['profesor_id']
+    esperado = [s.id for s in Sesion.query.filter_by(profesor_id=profesor_id)
+                .order_by(Sesion.fecha.desc(), Sesion.id.desc()).all()]
+
+    ids, paginas = _recorrer(profesor_id, limit=7)
+
+    assert ids == esperado
+    assert paginas == 4
+
+
+def test_filtros_server_side(sesiones_profesor):
+    """Filtros de maqueta, estudiante y rango de puntaje se aplican en SQL"""
+    profesor_id = sesiones_profesor['profesor_id']
+    estudiante_id = sesiones_profesor['estudiante_ids'][0]
+    filtros = SesionFiltros(maqueta='Motor', estudiante_id=estudiante_id, puntaje_min=2, puntaje_max=6)
+
+    ids, _ = _recorrer(profesor_id, limit=2, filtros=filtros)
+
+    for sesion in Sesion.query.filter(Sesion.id.in_(ids)).all():
+        assert sesion.maqueta == 'Motor'
+        assert sesion.estudiante_id == estudiante_id
+        assert 2 <= sesion.puntaje <= 6
+    assert len(ids) == Sesion.query.filter(
+        Sesion.profesor_id == profesor_id, Sesion.maqueta == 'Motor',
+        Sesion.estudiante_id == estudiante_id, Sesion.puntaje.between(2, 6)
+    ).count()
+
+
+def test_cursor_roundtrip_y_cursor_invalido():
+    """El cursor es opaco pero reversible; basura produce PaginationError"""
+    fecha = datetime(2024, 3, 1, 10, 30)
+    assert decode_cursor(encode_cursor(fecha, 42)) == (fecha, 42)
+
+    with pytest.raises(PaginationError):
+        decode_cursor('no-es-un-cursor')
+
+
+def test_endpoint_sesiones_todas_paginado(client, sesiones_profesor):
+    """GET /api/sesiones-todas?limit=N devuelve next_cursor hasta la última página"""
+    with client.session_transaction() as sess:
+        sess['_user_id'] = f"profesor_{sesiones_profesor['profesor_id']}"
+
+    primera = client.get('/api/sesiones-todas?limit=20').get_json()
+    assert len(primera['sesiones']) == 20
+    assert primera['has_more'] is True
+
+    segunda = client.get(f"/api/sesiones-todas?limit=20&cursor={primera['next_cursor']}").get_json()
+    assert len(segunda['sesiones']) == 5
+    assert segunda['next_cursor'] is None
+
+    legacy = client.get('/api/sesiones-todas')
+    assert legacy.headers['Deprecation'] == 'true'
+    assert len(legacy.get_json()['sesiones']) == 25
+
+    assert client.get('/api/sesiones-todas?limit=5&cursor=xx').status_code == 400
+    assert client.get('/api/sesiones-todas?limit=0').status_code == 400
+
+
+@pytest.mark.parametrize('limit', ['0', '-3'])
+def test_limit_no_positivo_es_invalido(limit):
+    """limit=0 no cae al default: es un error del cliente"""
+    with pytest.raises(PaginationError):
+        parse_page_args({'limit': limit})
+
+
+def test_limit_ausente_usa_default():
+    assert parse_page_args({}) == (DEFAULT_PAGE_SIZE, None)
+    assert parse_page_args({'limit': ''}) == (DEFAULT_PAGE_SIZE, None)
+
+
+def test_hasta_sin_hora_incluye_todo_el_dia(client, sesiones_profesor):
+    """hasta=YYYY-MM-DD incluye las sesiones de ese día posteriores a las 00:00"""
+    profesor_id = sesiones_profesor['profesor_id']
+
+    # 3 sesiones por día a las 10:00 desde el 2024-03-01
+    ids, _ = _recorrer(profesor_id, limit=10, filtros=parse_filtros({'hasta': '2024-03-02'}))
+    assert len(ids) == 6
+    ids, _ = _recorrer(profesor_id, limit=10, filtros=parse_filtros({'hasta': '2024-03-02T09:59:59'}))
+    assert len(ids) == 3
+    ids, _ = _recorrer(profesor_id, limit=10, filtros=parse_filtros({'hasta': '2024-03-02T10:00:00'}))
+    assert len(ids) == 6
+
+    with client.session_transaction() as sess:
+        sess['_user_id'] = f"profesor_{profesor_id}"
+    respuesta = client.get('/api/sesiones-todas?limit=50&desde=2024-03-02&hasta=2024-03-02').get_json()
+    assert len(respuesta['sesiones']) == 3
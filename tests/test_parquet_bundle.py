@@ -0,0 +1,76 @@
+"""
+Tests para el bundle Parquet (flask export-parquet + AnalizadorAvanzado.from_parquet_bundle)
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from analytics import AnalizadorAvanzado
+from analytics.io import read_manifest
+from models import Estudiante, Profesor, Sesion, db
+
+
+@pytest.fixture
+def dataset(app):
+    """Dos profesores, sesiones repartidas en dos meses y una sesión sin profesor"""
+    profesores = [
+        Profesor(nombre=f"Dr. Bundle {i}", email=f"bundle{i}@test.com", institucion="U Test", password="secreto")
+        for i in range(2)
+    ]
+    estudiantes = [Estudiante(nombre=f"Est Bundle {i}", codigo=f"BUN{i:03d}") for i in range(4)]
+    db.session.add_all(profesores + estudiantes)
+    db.session.commit()
+    profesores[0].estudiantes.append(estudiantes[0])
+    db.session.commit()
+
+    base = datetime(2024, 1, 20, 10, 0)
+    for i in range(24):
+        db.session.add(Sesion(
+            estudiante_id=estudiantes[i % 4].id,
+            profesor_id=profesores[i % 2].id if i != 23 else None,
+            maqueta='Motor' if i % 3 else 'Aire acondicionado',
+            puntaje=i % 8, tiempo_segundos=90 + 7 * i, interacciones_ia=i % 5,
+            fecha=base + timedelta(days=i)
+        ))
+    db.session.commit()
+    return profesores[0].id
+
+
+def test_export_parquet_cli_particiona_por_profesor_y_mes(runner, dataset, tmp_path):
+    """El comando escribe las 4 tablas, particiona sesiones y omite credenciales"""
+    import pyarrow.parquet as pq
+
+    destino = str(tmp_path / 'bundle')
+    result = runner.invoke(args=['export-parquet', '--output', destino, '--batch-size', '5'])
+
+    assert result.exit_code == 0, result.output
+    manifest = read_manifest(destino)
+    assert manifest['filas'] == {'sesion': 24, 'estudiante': 4, 'profesor': 2, 'estudiante_profesor': 1}
+
+    particiones = os.listdir(os.path.join(destino, 'sesion', f'profesor_id={dataset}'))
+    assert sorted(particiones) == ['mes=2024-01', 'mes=2024-02']
+    assert os.path.isdir(os.path.join(destino, 'sesion', 'profesor_id=__sin_profesor__'))
+
+    columnas = pq.read_schema(os.path.join(destino, 'profesor', 'part-0.parquet')).names
+    assert 'password' not in columnas and 'reset_token' not in columnas
+
+
+def test_analizador_desde_bundle_equivale_al_de_bd(runner, dataset, tmp_path):
+    """Los resultados del análisis sobre el bundle coinciden con los de la BD"""
+    destino = str(tmp_path / 'bundle')
+    runner.invoke(args=['export-parquet', '--output', destino])
+
+    sesiones = Sesion.query.filter_by(profesor_id=dataset).order_by(Sesion.fecha).all()
+    desde_bd = AnalizadorAvanzado(sesiones)
+    desde_bundle = AnalizadorAvanzado.from_parquet_bundle(destino, profesor_id=dataset)
+
+    assert desde_bundle.total_sesiones == desde_bd.total_sesiones == 12
+    assert desde_bundle.estadisticas_descriptivas() == desde_bd.estadisticas_descriptivas()
+    assert desde_bundle.analisis_por_maqueta() == desde_bd.analisis_por_maqueta()
+    assert desde_bundle.ranking_estudiantes() == desde_bd.ranking_estudiantes()
+
+    assert AnalizadorAvanzado.from_parquet_bundle(destino).total_sesiones == 24
@@ -0,0 +1,74 @@
+"""
+Tests del backend Polars y de la selección de backend (analytics/engines)
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import AnalizadorAvanzado
+from analytics.engines import crear_engine
+
+METODOS = [
+    ('estadisticas_descriptivas', ()),
+    ('analisis_por_maqueta', ()),
+    ('ranking_estudiantes', (5,)),
+    ('datos_para_visualizacion', ()),
+]
+
+
+def _json(valor):
+    return json.dumps(valor, sort_keys=True, ensure_ascii=False)
+
+
+@pytest.fixture
+def df_sesiones():
+    """400 sesiones sintéticas con días sin actividad"""
+    rng = np.random.default_rng(11)
+    n = 400
+    base = datetime(2024, 6, 1, 8, 0)
+    df = pd.DataFrame({
+        'estudiante_id': rng.integers(1, 30, n),
+        'maqueta': rng.choice(['Motor', 'Aire acondicionado', 'Frenos'], n),
+        'tiempo_segundos': rng.integers(30, 900, n),
+        'puntaje': rng.integers(0, 8, n),
+        'fecha': [base + timedelta(days=int(d), minutes=int(m))
+                  for d, m in zip(rng.choice(np.arange(0, 45, 3), n), rng.integers(0, 600, n))],
+        'interacciones_ia': rng.integers(0, 10, n),
+    })
+    df['estudiante_nombre'] = 'Estudiante ' + df['estudiante_id'].astype(str)
+    return df.sort_values('fecha', ignore_index=True)
+
+
+def test_paridad_polars_pandas(df_sesiones):
+    """El backend Polars produce exactamente el mismo JSON que pandas"""
+    pytest.importorskip('polars')
+    from analytics.engines import PolarsEngine
+
+    pandas_analizador = AnalizadorAvanzado.from_dataframe(df_sesiones.copy())
+    polars_analizador = AnalizadorAvanzado.from_engine(PolarsEngine.from_dataframe(df_sesiones))
+
+    for metodo, args in METODOS:
+        assert _json(getattr(polars_analizador, metodo)(*args)) == \
+            _json(getattr(pandas_analizador, metodo)(*args)), metodo
+
+
+def test_backend_desconocido_cae_a_pandas(df_sesiones, monkeypatch):
+    """Un backend inválido o no instalado no rompe el análisis: se usa pandas"""
+    assert crear_engine('pandas', df_sesiones) is None
+    assert crear_engine('spark', df_sesiones) is None
+
+    import analytics.engines.polars_engine as polars_engine
+    monkeypatch.setattr(polars_engine, 'POLARS_AVAILABLE', False)
+    assert crear_engine('polars', df_sesiones) is None
+
+
+def test_servicio_usa_backend_configurado(app, monkeypatch):
+    """AnalyticsService pasa ANALYTICS_BACKEND al analizador"""
+    from services.analytics_service import AnalyticsService
+
+    monkeypatch.setitem(app.config, 'ANALYTICS_BACKEND', 'polars')
+    assert AnalyticsService._backend() == 'polars'
@@ -0,0 +1,92 @@
+"""
+Tests del profiling bajo demanda (utils/profiler.py y /api/profiles)
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from utils.profiler import ContinuousProfiler, StackSampler, formato_collapsed, generar_token
+
+
+@pytest.fixture
+def perfiles_dir(app, tmp_path):
+    anterior = app.config['PROFILES_DIR']
+    app.config['PROFILES_DIR'] = str(tmp_path)
+    yield tmp_path
+    app.config['PROFILES_DIR'] = anterior
+
+
+def test_request_perfilado_con_token(app, client, perfiles_dir):
+    """Con el token firmado se guarda el perfil y se puede listar y descargar"""
+    token = generar_token(app)
+
+    response = client.get('/api/unity/verify', headers={'X-Profile': token})
+    perfil_id = response.headers.get('X-Profile-Id')
+    assert response.status_code == 200 and perfil_id
+
+    listado = client.get('/api/profiles', headers={'X-Profile': token}).get_json()
+    assert listado['perfiles'][0]['id'] == perfil_id
+    assert listado['perfiles'][0]['ruta'] == '/api/unity/verify'
+    assert listado['perfiles'][0]['bytes_response'] > 0
+
+    descarga = client.get(f'/api/profiles/{perfil_id}.collapsed', headers={'X-Profile': token})
+    assert descarga.status_code == 200
+    assert descarga.mimetype == 'text/plain'
+
+
+def test_sin_token_valido_no_perfila(client, perfiles_dir):
+    """Un token inválido no activa el profiling ni da acceso al listado"""
+    response = client.get('/api/unity/verify', headers={'X-Profile': 'falso'})
+
+    assert 'X-Profile-Id' not in response.headers
+    assert not any(perfiles_dir.rglob('*.json'))
+    assert client.get('/api/profiles', headers={'X-Profile': 'falso'}).status_code == 401
+
+
+def test_stack_sampler_formato_collapsed():
+    """El sampler acumula stacks del thread observado en formato collapsed"""
+    def ocupado(hasta):
+        while time.perf_counter() < hasta:
+            sum(range(1000))
+
+    sampler = StackSampler(intervalo=0.001, thread_ids=[threading.get_ident()]).start()
+    ocupado(time.perf_counter() + 0.1)
+    stacks = sampler.stop()
+
+    assert sum(stacks.values()) > 0
+    assert any('test_profiler:ocupado' in stack for stack in stacks)
+    assert formato_collapsed(Counter({'a;b': 3})) == 'a;b 3\n'
+
+
+def test_profiler_continuo_vuelca_ventanas(tmp_path):
+    """Cada ventana se escribe como .collapsed + .json con el costo del muestreo"""
+    profiler = ContinuousProfiler(str(tmp_path), hz=500, ventana=0.05, max_archivos=2).start()
+    assert profiler.hz == 100
+
+    hasta = time.perf_counter() + 0.3
+    while time.perf_counter() < hasta:
+        sum(range(1000))
+    profiler.stop()
+
+    collapsed = sorted(tmp_path.glob('ventana-*.collapsed'))
+    assert len(collapsed) == 2
+    metadata = json.loads(collapsed[-1].with_suffix('.json').read_text())
+    assert metadata['muestras'] > 0 and metadata['overhead_pct'] >= 0
+
+
+def test_profiler_continuo_deshabilitado_por_defecto(app):
+    assert app.config['CONTINUOUS_PROFILING_ENABLED'] is False
+
+
+def test_comando_profile_token(app, runner):
+    """flask profile-token emite un token aceptado por el hook"""
+    from utils.profiler import token_valido
+
+    resultado = runner.invoke(args=['profile-token'])
+
+    assert resultado.exit_code == 0
+    assert token_valido(app, resultado.stdout.splitlines()[0])
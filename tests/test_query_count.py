@@ -0,0 +1,87 @@
+"""
+Tests de regresión N+1: el número de queries por endpoint no depende de la cantidad de filas
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Estudiante, Profesor, Sesion, db
+from services.analytics_service import AnalyticsService
+from utils.query_monitor import contar_queries
+
+
+def _crear_escenario(n_estudiantes, n_profesores=2, prefijo='nq'):
+    """Profesores con n estudiantes inscritos y 2 sesiones por estudiante"""
+    profesores = [
+        Profesor(nombre=f"Dr. {prefijo} {i}", email=f"{prefijo}{i}@test.com", institucion="U", password="x")
+        for i in range(n_profesores)
+    ]
+    estudiantes = [Estudiante(nombre=f"Est {prefijo} {i}", codigo=f"{prefijo.upper()}{i:03d}")
+                   for i in range(n_estudiantes)]
+    db.session.add_all(profesores + estudiantes)
+    db.session.commit()
+
+    base = datetime(2024, 2, 1)
+    for i, estudiante in enumerate(estudiantes):
+        for profesor in profesores:
+            profesor.estudiantes.append(estudiante)
+        for j in range(2):
+            db.session.add(Sesion(
+                estudiante_id=estudiante.id, profesor_id=profesores[(i + j) % n_profesores].id,
+                maqueta='Motor', puntaje=5, tiempo_segundos=100, interacciones_ia=1,
+                fecha=base + timedelta(days=i, hours=j)
+            ))
+    db.session.commit()
+    db.session.expire_all()
+    return profesores, estudiantes
+
+
+def _queries_endpoint(client, url, user_id):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = user_id
+    db.session.expire_all()
+    with contar_queries() as stats:
+        assert client.get(url).status_code == 200
+    return stats.count
+
+
+@pytest.mark.parametrize('url', ['/api/estudiantes', '/api/profesores'])
+def test_listados_queries_constantes(app, client, url):
+    """Con 3 o 15 estudiantes se ejecuta la misma cantidad de queries"""
+    profesores, _ = _crear_escenario(3, prefijo='a')
+    pocos = _queries_endpoint(client, url, f"profesor_{profesores[0].id}")
+
+    # Los 12 nuevos también quedan inscritos con el profesor logueado (3 → 15 en su listado)
+    _, nuevos = _crear_escenario(12, n_profesores=4, prefijo='b')
+    profesores[0].estudiantes.extend(nuevos)
+    db.session.commit()
+    muchos = _queries_endpoint(client, url, f"profesor_{profesores[0].id}")
+
+    assert muchos == pocos
+    assert pocos <= 2  # load_user + listado
+
+
+def test_serializar_sesiones_no_carga_profesor_por_fila(app, query_budget):
+    """Las sesiones del estudiante traen su profesor en la misma query"""
+    _, estudiantes = _crear_escenario(1, n_profesores=6, prefijo='c')
+    servicio = AnalyticsService()
+
+    sesiones = servicio.session_repo.get_by_estudiante(estudiantes[0].id)
+    with query_budget(0):
+        serializadas = servicio._serializar_sesiones(sesiones)
+
+    assert len(serializadas) == 2 and all(s['profesor'] for s in serializadas)
+
+
+def test_to_dict_con_stats_en_una_query(app, query_budget):
+    """Estudiante.to_dict(include_stats=True) no carga las sesiones"""
+    _, estudiantes = _crear_escenario(1, n_profesores=3, prefijo='d')
+    estudiante = db.session.get(Estudiante, estudiantes[0].id)
+
+    with query_budget(1):
+        data = estudiante.to_dict(include_stats=True)
+
+    assert data['total_sesiones'] == 2
+    assert data['total_profesores'] == 3
+    assert data['promedio_puntaje'] == 5
@@ -0,0 +1,81 @@
+"""
+Tests del monitor de queries por request (utils/query_monitor.py)
+"""
+
+import logging
+
+import pytest
+
+from models import Estudiante, db
+from utils.query_monitor import contar_queries, normalizar_sentencia
+
+
+def test_normalizar_sentencia_ignora_literales_y_listas():
+    """Sentencias que solo difieren en parámetros tienen la misma forma"""
+    a = normalizar_sentencia("SELECT * FROM sesion\n  WHERE id IN (?, ?, ?) AND puntaje > 5")
+    b = normalizar_sentencia("SELECT * FROM sesion WHERE id IN (?) AND puntaje > 7")
+    c = normalizar_sentencia("SELECT * FROM estudiante WHERE codigo = 'EST001'")
+
+    assert a == b
+    assert c == "SELECT * FROM estudiante WHERE codigo = ?"
+
+
+def test_server_timing_en_respuesta(client):
+    """Cada respuesta lleva Server-Timing con db y app"""
+    response = client.get('/auth/login')
+
+    timing = response.headers.get('Server-Timing')
+    assert timing is not None
+    assert 'db;dur=' in timing and 'app;dur=' in timing
+
+
+def test_n_mas_1_genera_warning(app, caplog):
+    """La misma sentencia repetida en un request se reporta como posible N+1"""
+    db.session.add_all([Estudiante(nombre=f"N1 {i}", codigo=f"N1{i:02d}") for i in range(6)])
+    db.session.commit()
+    ids = [e.id for e in Estudiante.query.all()]
+
+    db.session.expire_all()
+
+    with app.test_request_context('/api/estudiantes'), \
+            caplog.at_level(logging.WARNING, logger='utils.query_monitor'):
+        app.preprocess_request()
+        for estudiante_id in ids:
+            db.session.get(Estudiante, estudiante_id)
+        response = app.process_response(app.make_response('ok'))
+
+    assert 'desc="6 queries"' in response.headers['Server-Timing']
+    assert any('Posible N+1' in r.getMessage() for r in caplog.records)
+
+
+def test_query_budget_falla_si_se_excede(app, query_budget):
+    """El fixture corta el test cuando se supera el presupuesto"""
+    with query_budget(1) as stats:
+        Estudiante.query.count()
+    assert stats.count == 1
+
+    with pytest.raises(AssertionError, match='presupuesto 1'):
+        with query_budget(1):
+            Estudiante.query.count()
+            Estudiante.query.count()
+
+
+def test_contar_queries_fuera_de_request(app):
+    """contar_queries mide bloques sin contexto de request"""
+    with contar_queries() as stats:
+        Estudiante.query.all()
+    assert stats.count == 1 and stats.db_time >= 0
+
+
+def test_sentencia_fallida_no_deja_inicios_en_la_conexion(app):
+    """handle_error descarta el inicio: la conexión del pool no acumula entradas"""
+    from sqlalchemy.exc import OperationalError
+    from utils.query_monitor import _INFO_INICIOS
+
+    conexion = db.session.connection()
+    for _ in range(3):
+        with pytest.raises(OperationalError):
+            conexion.exec_driver_sql('SELECT * FROM tabla_inexistente')
+
+    assert not conexion.info.get(_INFO_INICIOS)
+    db.session.rollback()
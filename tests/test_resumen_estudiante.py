@@ -0,0 +1,114 @@
+"""
+Tests del resumen del estudiante calculado en SQL (SessionRepository.get_resumen_estudiante)
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Estudiante, Profesor, Sesion, db
+from repositories.session_repository import SessionRepository
+from services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def estudiante_con_historial(app):
+    """Estudiante con 60 sesiones en 3 maquetas, 2 profesores"""
+    profesores = [
+        Profesor(nombre=f"Dr. Resumen {i}", email=f"resumen{i}@test.com", institucion="U Test", password="x")
+        for i in range(2)
+    ]
+    estudiante = Estudiante(nombre="Ana Resumen", codigo="RES001")
+    db.session.add_all(profesores + [estudiante])
+    db.session.commit()
+
+    base = datetime(2024, 1, 1, 9, 0)
+    for i in range(60):
+        db.session.add(Sesion(
+            estudiante_id=estudiante.id, profesor_id=profesores[i % 2].id,
+            maqueta=['Motor', 'Frenos', 'Aire acondicionado'][i % 3],
+            puntaje=(i * 5) % 8, tiempo_segundos=100 + i, interacciones_ia=i % 4,
+            fecha=base + timedelta(hours=13 * i)
+        ))
+    db.session.commit()
+    return {'estudiante_id': estudiante.id, 'profesor_id': profesores[0].id}
+
+
+def _referencia(sesiones):
+    """Implementación en Python (la anterior) para comparar"""
+    sesiones = sorted(sesiones, key=lambda s: s.fecha, reverse=True)
+    puntajes = [s.puntaje for s in sesiones]
+    por_maqueta = {}
+    for s in sesiones:
+        por_maqueta.setdefault(s.maqueta, []).append(s)
+    return {
+        'total_sesiones': len(sesiones),
+        'estadisticas': {
+            'puntaje_promedio': round(sum(puntajes) / len(puntajes), 2),
+            'puntaje_maximo': max(puntajes),
+            'puntaje_minimo': min(puntajes),
+            'tiempo_promedio_segundos': round(sum(s.tiempo_segundos for s in sesiones) / len(sesiones), 2)
+        },
+        'por_maqueta': [{
+            'maqueta': m,
+            'sesiones': len(ss),
+            'puntaje_promedio': round(sum(s.puntaje for s in ss) / len(ss), 2),
+            'mejor': max(s.puntaje for s in ss)
+        } for m, ss in por_maqueta.items()],
+        'progreso_temporal': {
+            m: [{'puntaje': s.puntaje, 'fecha': s.fecha.strftime('%d/%m'),
+                 'fecha_completa': s.fecha.strftime('%Y-%m-%d')} for s in ss[:10][::-1]]
+            for m, ss in por_maqueta.items()
+        }
+    }
+
+
+def test_resumen_sql_equivale_al_calculo_en_python(estudiante_con_historial):
+    """Agregados, orden de maquetas y progreso temporal idénticos a la versión anterior"""
+    estudiante_id = estudiante_con_historial['estudiante_id']
+    esperado = _referencia(Sesion.query.filter_by(estudiante_id=estudiante_id).all())
+
+    resultado = AnalyticsService()._calcular_estadisticas_base(estudiante_id)
+
+    for clave in ('total_sesiones', 'estadisticas', 'por_maqueta', 'progreso_temporal'):
+        assert resultado[clave] == esperado[clave], clave
+    assert resultado['insights']
+
+
+def test_resumen_solo_trae_las_filas_necesarias(estudiante_con_historial):
+    """A lo sumo 10 filas por maqueta, sin importar el historial"""
+    filas = SessionRepository.get_resumen_estudiante(estudiante_con_historial['estudiante_id'])
+
+    assert len(filas) == 30
+    assert filas[0].total == 60
+
+
+def test_resumen_filtrado_por_profesor(estudiante_con_historial):
+    """Con profesor_id solo se consideran las sesiones con ese profesor"""
+    ids = estudiante_con_historial
+    esperado = _referencia(Sesion.query.filter_by(
+        estudiante_id=ids['estudiante_id'], profesor_id=ids['profesor_id']).all())
+
+    resultado = AnalyticsService()._calcular_estadisticas_base(ids['estudiante_id'], ids['profesor_id'])
+
+    assert resultado['estadisticas'] == esperado['estadisticas']
+    assert resultado['progreso_temporal'] == esperado['progreso_temporal']
+    assert AnalyticsService()._calcular_estadisticas_base(999) is None
+
+
+def test_analytics_estudiante_trae_solo_la_primera_pagina(estudiante_con_historial):
+    """El historial completo no se carga: primera página + next_cursor"""
+    from utils.constants import DEFAULT_PAGE_SIZE
+    from utils.pagination import decode_cursor
+
+    estudiante_id = estudiante_con_historial['estudiante_id']
+    servicio = AnalyticsService()
+
+    resultado = servicio.get_analytics_estudiante.__wrapped__(servicio, estudiante_id)
+    assert resultado['total_sesiones'] == 60
+    assert len(resultado['sesiones']) == DEFAULT_PAGE_SIZE
+    assert resultado['has_more'] is True
+
+    resto = servicio.get_sesiones_estudiante(estudiante_id, 100, decode_cursor(resultado['next_cursor']))
+    ids = [s['id'] for s in resultado['sesiones'] + resto['sesiones']]
+    assert len(set(ids)) == 60 and resto['next_cursor'] is None
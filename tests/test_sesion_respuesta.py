@@ -0,0 +1,105 @@
+"""
+Tests de respuestas normalizadas (models/sesion_respuesta.py)
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from models import Sesion, SesionRespuesta, db
+from repositories.session_repository import SessionRepository
+
+RESPUESTAS = [
+    {'pregunta': 1, 'respuesta': 'A', 'correcta': True},
+    {'pregunta': '¿Qué es un átomo?', 'respuesta': 'Una partícula', 'correcta': False},
+    'legacy sin formato',
+    {'pregunta': 1, 'respuesta': 'B', 'correcta': False},
+]
+
+
+def _sesion(**extra):
+    return {'codigo_estudiante': 'UNITY0', 'maqueta': 'Motor', 'puntaje': 5, 'tiempo_segundos': 60,
+            'respuestas': RESPUESTAS, **extra}
+
+
+def test_ingesta_normaliza_respuestas(client, estudiantes_unity):
+    sesion_id = client.post('/api/unity/session', json=_sesion()).get_json()['sesion_id']
+    sesion = db.session.get(Sesion, sesion_id)
+
+    assert sesion.get_respuestas() == RESPUESTAS
+    assert [(r.orden, r.pregunta, r.respuesta, r.correcta) for r in sesion.respuestas] == [
+        (0, '1', 'A', True), (1, '¿Qué es un átomo?', 'Una partícula', False), (3, '1', 'B', False)
+    ]
+
+
+def test_lote_normaliza_y_aciertos_por_pregunta_en_sql(client, estudiantes_unity, query_budget):
+    client.post('/api/unity/sessions:batch', json=[_sesion(), _sesion(maqueta='Aire acondicionado')])
+
+    assert SesionRespuesta.query.count() == 6
+    with query_budget(1):
+        aciertos = SessionRepository.get_aciertos_por_pregunta(maqueta='Motor')
+
+    assert aciertos == [
+        {'pregunta': '¿Qué es un átomo?', 'respuestas': 1, 'correctas': 0, 'tasa_acierto': 0.0},
+        {'pregunta': '1', 'respuestas': 2, 'correctas': 1, 'tasa_acierto': 0.5},
+    ]
+
+
+def test_borrar_sesion_borra_respuestas(client, estudiantes_unity):
+    sesion_id = client.post('/api/unity/session', json=_sesion()).get_json()['sesion_id']
+
+    assert SessionRepository.delete(sesion_id)
+    assert SesionRespuesta.query.count() == 0
+
+
+@pytest.mark.parametrize('valor, esperado', [
+    (True, True), (False, False), (1, True), (0, False), ('true', True), ('False', False),
+    ('0', False), ('no', False), ('1', True), ('quizás', None), (2, None), (None, None),
+])
+def test_correcta_legacy(valor, esperado):
+    detalle = json.dumps([{'pregunta': 1, 'correcta': valor}])
+
+    assert SesionRespuesta.filas_desde_detalle(1, detalle)[0]['correcta'] is esperado
+
+
+def test_backfill_idempotente(app, estudiantes_unity):
+    from scripts.add_sesion_respuesta import backfill
+
+    estudiante_id = estudiantes_unity[0].id
+    for detalle in (json.dumps(RESPUESTAS), '{"respuestas": [{"pregunta": 2, "correcta": true}]}', 'no-json', None):
+        db.session.add(Sesion(estudiante_id=estudiante_id, maqueta='Motor', puntaje=5, tiempo_segundos=60,
+                              fecha=datetime.utcnow(), respuestas_detalle=detalle))
+    db.session.commit()
+
+    assert backfill(lote=2) == 4
+    assert backfill(lote=2) == 0
+    assert SesionRespuesta.query.filter_by(pregunta='2', correcta=True).count() == 1
+
+
+def test_set_respuestas_sincroniza_filas(app, estudiantes_unity):
+    sesion = Sesion(estudiante_id=estudiantes_unity[0].id, maqueta='Motor', puntaje=5, tiempo_segundos=60)
+    sesion.set_respuestas(RESPUESTAS)
+    db.session.add(sesion)
+    db.session.commit()
+    assert [(r.orden, r.pregunta) for r in sesion.respuestas] == [(0, '1'), (1, '¿Qué es un átomo?'), (3, '1')]
+
+    sesion.set_respuestas([{'pregunta': 7, 'respuesta': 'C', 'correcta': 'true'}])
+    db.session.commit()
+
+    assert [(r.orden, r.pregunta, r.respuesta, r.correcta) for r in
+            SesionRespuesta.query.filter_by(sesion_id=sesion.id).all()] == [(0, '7', 'C', True)]
+
+
+def test_backfill_omite_detalles_vacios(app, estudiantes_unity, query_budget):
+    from scripts.add_sesion_respuesta import backfill
+
+    for detalle in ('{"respuestas": []}', '[]'):
+        db.session.add(Sesion(estudiante_id=estudiantes_unity[0].id, maqueta='Motor', puntaje=5,
+                              tiempo_segundos=60, fecha=datetime.utcnow(), respuestas_detalle=detalle))
+    db.session.commit()
+
+    # Una sola query (sin lotes pendientes), también en la segunda corrida
+    for _ in range(2):
+        with query_budget(1):
+            assert backfill() == 0
@@ -0,0 +1,144 @@
+"""
+Tests de tracing (utils/tracing.py)
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Estudiante, Profesor, Sesion, db
+from services import analytics_service
+from utils import tracing
+
+
+class _ExporterMemoria:
+    def __init__(self):
+        self.trazas = []
+
+    def exportar(self, spans):
+        self.trazas.append(list(spans))
+
+
+@pytest.fixture
+def trazas():
+    exporter = _ExporterMemoria()
+    tracing.configurar(True, tasa_muestreo=1.0, lento_ms=0, exporter=exporter)
+    yield exporter.trazas
+    tracing.configurar(False)
+
+
+def _profesor_con_sesiones(client, n=9):
+    profesor = Profesor(nombre="Dr. Traza", email="traza@test.com", institucion="U", password="x")
+    estudiante = Estudiante(nombre="Est Traza", codigo="TRZ001")
+    db.session.add_all([profesor, estudiante])
+    db.session.commit()
+    db.session.add_all([Sesion(estudiante_id=estudiante.id, profesor_id=profesor.id, maqueta='Motor',
+                               puntaje=i % 8, tiempo_segundos=100, interacciones_ia=1,
+                               fecha=datetime(2024, 1, 1) + timedelta(days=i)) for i in range(n)])
+    db.session.commit()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = f"profesor_{profesor.id}"
+
+
+def test_request_genera_arbol_de_spans(app, client, trazas):
+    """request → servicio → repositorio → SQL y secciones de analytics en una traza"""
+    _profesor_con_sesiones(client)
+    analytics_service._analytics_cache.clear()
+
+    response = client.get('/api/analytics')
+
+    raiz = trazas[-1][-1]
+    por_nombre = {s.nombre: s for s in trazas[-1]}
+    servicio = por_nombre['AnalyticsService.get_analytics_profesor']
+    repositorio = por_nombre['SessionRepository.get_by_profesor']
+
+    assert raiz.nombre == 'GET /api/analytics' and raiz.parent_id is None
+    assert response.headers['X-Trace-Id'] == raiz.contexto.trace_id
+    assert servicio.parent_id == raiz.contexto.span_id
+    assert repositorio.parent_id == servicio.contexto.span_id
+    assert any(s.nombre == 'db.query' and s.parent_id == repositorio.contexto.span_id for s in trazas[-1])
+    assert por_nombre['analytics.estadisticas_descriptivas'].parent_id == servicio.contexto.span_id
+
+
+def test_traceparent_entrante_decide_muestreo(client, trazas):
+    """Se continúa la traza del header y se respeta su flag de muestreo"""
+    trace_id, span_id = 'ab' * 16, 'cd' * 8
+
+    client.get('/api/unity/verify', headers={'traceparent': f'00-{trace_id}-{span_id}-00'})
+    assert trazas == []
+
+    client.get('/api/unity/verify', headers={'traceparent': f'00-{trace_id}-{span_id}-01'})
+    raiz = trazas[-1][-1]
+    assert raiz.contexto.trace_id == trace_id and raiz.parent_id == span_id
+
+
+def test_trazas_lentas_se_exportan_sin_muestreo():
+    """Con tasa 0 solo se exportan las trazas que superan TRACING_SLOW_MS"""
+    exporter = _ExporterMemoria()
+    tracing.configurar(True, tasa_muestreo=0.0, lento_ms=5, exporter=exporter)
+    try:
+        with tracing.span('rapida'):
+            pass
+        with tracing.span('lenta'):
+            threading.Event().wait(0.01)
+    finally:
+        tracing.configurar(False)
+
+    assert [t[-1].nombre for t in exporter.trazas] == ['lenta']
+
+
+def test_contexto_propagado_a_thread(trazas):
+    """Un worker en otro thread continúa la traza del que lo lanzó"""
+    def recalcular():
+        with tracing.span('recalcular'):
+            pass
+
+    with tracing.span('encolar') as padre:
+        hilo = threading.Thread(target=tracing.con_contexto(recalcular))
+        hilo.start()
+        hilo.join()
+
+    worker = next(t[-1] for t in trazas if t[-1].nombre == 'recalcular')
+    assert worker.contexto.trace_id == padre.contexto.trace_id
+    assert worker.parent_id == padre.contexto.span_id
+
+
+def test_file_exporter_otlp(tmp_path):
+    """El exporter de archivo escribe una línea OTLP/JSON por span"""
+    tracing.configurar(True, 1.0, 0, tracing.FileExporter(str(tmp_path)))
+    try:
+        with tracing.span('padre', **{'vr.profesor_id': 3}):
+            with tracing.span('hijo'):
+                pass
+    finally:
+        tracing.configurar(False)
+
+    lineas = [json.loads(l) for f in tmp_path.glob('spans-*.jsonl') for l in f.read_text().splitlines()]
+    assert [l['name'] for l in lineas] == ['hijo', 'padre']
+    assert lineas[0]['parentSpanId'] == lineas[1]['spanId']
+    assert lineas[1]['attributes'] == [{'key': 'vr.profesor_id', 'value': {'intValue': '3'}}]
+    assert tracing.SpanContext.desde_traceparent('00-xyz-1-01') is None
+
+
+def test_group_commit_continua_la_traza_del_request(app, trazas):
+    """El create_many del hilo de group commit es hijo del span del request"""
+    from services.write_buffer import GroupCommitBuffer
+
+    estudiante = Estudiante(nombre="Est Lote", codigo="TRZ002")
+    db.session.add(estudiante)
+    db.session.commit()
+    buffer = GroupCommitBuffer(app, max_espera_ms=1)
+    fila = {'estudiante_id': estudiante.id, 'profesor_id': None, 'maqueta': 'Motor', 'puntaje': 5,
+            'tiempo_segundos': 60, 'interacciones_ia': 0, 'fecha': datetime.utcnow(),
+            'respuestas_detalle': None}
+    try:
+        with tracing.span('request') as padre:
+            buffer.enviar(fila)
+    finally:
+        buffer.detener()
+
+    commit = next(s for t in trazas for s in t if s.nombre == 'SessionRepository.create_many')
+    assert commit.contexto.trace_id == padre.contexto.trace_id
+    assert commit.parent_id == padre.contexto.span_id
@@ -0,0 +1,86 @@
+"""
+Tests de POST /api/unity/sessions:batch
+"""
+
+from models import Sesion, db
+from utils.constants import MAX_BATCH_SESIONES
+
+
+def _sesion(codigo='UNITY0', **extra):
+    return {'codigo_estudiante': codigo, 'maqueta': 'Motor', 'puntaje': 5,
+            'tiempo_segundos': 120, **extra}
+
+
+def test_lote_completo(client, estudiantes_unity, query_budget):
+    """Todas válidas: 201, un solo IN para los códigos y una única transacción"""
+    lote = [_sesion(f'UNITY{i % 3}', respuestas=[{'pregunta': 1, 'correcta': True}]) for i in range(30)]
+    lote[0]['fecha'] = '2024-03-01T10:00:00Z'
+
+    # SQLite no garantiza el orden de RETURNING en inserts multi-fila: SQLAlchemy
+    # ejecuta un INSERT por fila (dentro de la misma transacción); PostgreSQL usa uno solo.
+    # +1: las respuestas normalizadas de todo el lote van en un solo executemany
+    with query_budget(len(lote) + 2) as stats:
+        response = client.post('/api/unity/sessions:batch', json={'sesiones': lote})
+
+    assert response.status_code == 201
+    assert sum(n for forma, n in stats.formas.items() if forma.startswith('SELECT')) == 1
+    assert sum(n for forma, n in stats.formas.items() if 'sesion_respuesta' in forma) == 1
+    datos = response.get_json()
+    assert datos['creadas'] == 30 and datos['fallidas'] == 0
+    ids = [r['sesion_id'] for r in datos['resultados']]
+    assert ids == sorted(ids) and len(set(ids)) == 30
+    primera = db.session.get(Sesion, ids[0])
+    assert primera.fecha.isoformat() == '2024-03-01T10:00:00'
+    assert primera.get_respuestas() == [{'pregunta': 1, 'correcta': True}]
+
+
+def test_lote_con_errores_por_item(client, estudiantes_unity):
+    """Los ítems inválidos se reportan por índice sin impedir crear el resto"""
+    lote = [
+        _sesion(),
+        _sesion(puntaje=9),
+        _sesion('NOEXISTE'),
+        _sesion(tiempo_segundos='abc'),
+        {'maqueta': 'Motor'},
+        'no-es-objeto',
+        _sesion(fecha='ayer'),
+        _sesion('UNITY2', puntaje='6.5', interacciones_ia=2),
+    ]
+
+    response = client.post('/api/unity/sessions:batch', json=lote)
+
+    assert response.status_code == 207
+    resultados = response.get_json()['resultados']
+    assert [r['success'] for r in resultados] == [True, False, False, False, False, False, False, True]
+    assert resultados[1]['message'] == 'El puntaje debe estar entre 0 y 7'
+    assert 'NOEXISTE' in resultados[2]['message']
+    assert resultados[3]['message'] == 'Tiempo inválido'
+    assert resultados[4]['message'].startswith('Campos requeridos')
+    assert resultados[6]['message'].startswith('Fecha inválida')
+    assert Sesion.query.count() == 2
+
+
+def test_lote_invalido(client, estudiantes_unity):
+    """Cuerpo que no es lista, lote vacío o demasiado grande → 400 sin insertar"""
+    assert client.post('/api/unity/sessions:batch', json={'sesiones': {}}).status_code == 400
+    assert client.post('/api/unity/sessions:batch', json=[]).status_code == 400
+    demasiadas = [_sesion()] * (MAX_BATCH_SESIONES + 1)
+    assert client.post('/api/unity/sessions:batch', json=demasiadas).status_code == 400
+    assert client.post('/api/unity/sessions:batch', json=[_sesion('NOEXISTE')]).status_code == 400
+    assert Sesion.query.count() == 0
+
+
+def test_lote_reintentado_no_duplica(client, estudiantes_unity):
+    """Con client_session_uuid, re-subir el lote devuelve los IDs originales sin insertar"""
+    lote = [_sesion(client_session_uuid=f'uuid-{i}') for i in range(3)] + [_sesion(client_session_uuid='uuid-0')]
+
+    primera = client.post('/api/unity/sessions:batch', json=lote).get_json()
+    segunda = client.post('/api/unity/sessions:batch', json=lote)
+
+    assert primera['creadas'] == 3 and primera['duplicadas'] == 1
+    assert primera['resultados'][3]['sesion_id'] == primera['resultados'][0]['sesion_id']
+    assert segunda.status_code == 201
+    datos = segunda.get_json()
+    assert datos['creadas'] == 0 and datos['duplicadas'] == 4
+    assert [r['sesion_id'] for r in datos['resultados']] == [r['sesion_id'] for r in primera['resultados']]
+    assert Sesion.query.count() == 3
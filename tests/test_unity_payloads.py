@@ -0,0 +1,100 @@
+"""
+Tests de bodies comprimidos / MessagePack en la ingesta Unity (utils/request_body.py)
+"""
+
+import gzip
+import json
+
+import pytest
+
+from models import Sesion
+from utils import request_body
+from utils.constants import MAX_CUERPO_SESION_BYTES
+
+SESION = {
+    'codigo_estudiante': 'UNITY0', 'maqueta': 'Motor', 'puntaje': 5, 'tiempo_segundos': 60,
+    'respuestas': [{'pregunta': i, 'respuesta': 'A', 'correcta': i % 2 == 0} for i in range(50)],
+}
+
+
+def _post_gzip(client, ruta, cuerpo: bytes, **headers):
+    return client.post(ruta, data=gzip.compress(cuerpo), content_type='application/json',
+                       headers={'Content-Encoding': 'gzip', **headers})
+
+
+def test_sesion_gzip(client, estudiantes_unity):
+    crudo = json.dumps(SESION).encode()
+    response = _post_gzip(client, '/api/unity/session', crudo)
+
+    assert response.status_code == 201
+    assert len(gzip.compress(crudo)) < len(crudo) / 4
+    assert len(Sesion.query.one().get_respuestas()) == 50
+
+
+def test_lote_gzip(client, estudiantes_unity):
+    response = _post_gzip(client, '/api/unity/sessions:batch', json.dumps({'sesiones': [SESION] * 3}).encode())
+
+    assert response.status_code == 201
+    assert response.get_json()['creadas'] == 3
+
+
+def test_json_plano_sigue_funcionando(client, estudiantes_unity):
+    assert client.post('/api/unity/session', json=SESION).status_code == 201
+
+
+def test_zip_bomb_se_corta_al_descomprimir(client, estudiantes_unity):
+    """Unos KB comprimidos que se expanden por encima del límite: 413 sin inflar todo"""
+    bomba = b'{"relleno": "' + b'0' * (MAX_CUERPO_SESION_BYTES * 4) + b'"}'
+    assert len(gzip.compress(bomba)) < 10_000
+
+    response = _post_gzip(client, '/api/unity/session', bomba)
+
+    assert response.status_code == 413
+    assert Sesion.query.count() == 0
+
+
+@pytest.mark.parametrize('cuerpo, headers, status', [
+    (gzip.compress(b'{"codigo_estudiante": "UNITY0"}')[:-12], {'Content-Encoding': 'gzip'}, 400),
+    (b'no es gzip', {'Content-Encoding': 'gzip'}, 400),
+    (b'{}', {'Content-Encoding': 'zstd'}, 415),
+    (b'{"a": ', {}, 400),
+    (b'[1, 2]', {}, 400),
+])
+def test_bodies_invalidos(client, estudiantes_unity, cuerpo, headers, status):
+    response = client.post('/api/unity/session', data=cuerpo, content_type='application/json', headers=headers)
+
+    assert response.status_code == status
+    assert response.get_json()['success'] is False
+
+
+def test_content_type_no_soportado(client, estudiantes_unity):
+    response = client.post('/api/unity/sessions:batch', data=json.dumps([SESION]), content_type='text/plain')
+
+    assert response.status_code == 415
+
+
+def test_body_demasiado_grande(client, estudiantes_unity):
+    response = client.post('/api/unity/session', data=b' ' * (MAX_CUERPO_SESION_BYTES + 1),
+                           content_type='application/json')
+
+    assert response.status_code == 413
+
+
+@pytest.mark.skipif(request_body.msgpack is None, reason='msgpack no instalado')
+def test_sesion_y_lote_msgpack(client, estudiantes_unity):
+    msgpack = request_body.msgpack
+
+    sesion = client.post('/api/unity/session', data=msgpack.packb(SESION),
+                         content_type='application/x-msgpack')
+    lote = client.post('/api/unity/sessions:batch', data=gzip.compress(msgpack.packb([SESION] * 2)),
+                       content_type='application/x-msgpack', headers={'Content-Encoding': 'gzip'})
+
+    assert sesion.status_code == lote.status_code == 201
+    assert Sesion.query.count() == 3
+
+
+@pytest.mark.skipif(request_body.msgpack is not None, reason='msgpack instalado')
+def test_msgpack_sin_paquete(client, estudiantes_unity):
+    response = client.post('/api/unity/session', data=b'\x80', content_type='application/x-msgpack')
+
+    assert response.status_code == 415
@@ -0,0 +1,90 @@
+"""
+Tests del group commit de ingesta (services/write_buffer.py)
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from models import Estudiante, Sesion, db
+from services.write_buffer import GroupCommitBuffer
+
+
+@pytest.fixture
+def buffer(app):
+    buffer = GroupCommitBuffer(app, max_espera_ms=50, max_lote=64, timeout_s=10)
+    yield buffer
+    buffer.detener()
+    app.extensions.pop('group_commit', None)
+
+
+@pytest.fixture
+def estudiante_id(app):
+    estudiante = Estudiante(nombre='Buffer', codigo='BUF001')
+    db.session.add(estudiante)
+    db.session.commit()
+    return estudiante.id
+
+
+def _fila(estudiante_id, **extra):
+    return {'estudiante_id': estudiante_id, 'profesor_id': None, 'maqueta': 'Motor', 'puntaje': 5,
+            'tiempo_segundos': 60, 'interacciones_ia': 0, 'fecha': datetime.utcnow(),
+            'respuestas_detalle': None, **extra}
+
+
+def test_requests_concurrentes_comparten_commit(buffer, estudiante_id):
+    """20 envíos simultáneos: cada uno recibe su ID, en menos transacciones que requests"""
+    ids, barrera = [], threading.Barrier(20)
+
+    def _enviar():
+        barrera.wait()
+        ids.append(buffer.enviar(_fila(estudiante_id)))
+
+    hilos = [threading.Thread(target=_enviar) for _ in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(set(ids)) == 20
+    assert Sesion.query.filter(Sesion.id.in_(ids)).count() == 20
+    assert buffer.lotes < 20 and buffer.filas == 20
+
+
+def test_fila_invalida_no_arrastra_al_lote(buffer, estudiante_id):
+    """Si el commit del lote falla, solo falla la fila inválida"""
+    resultados, barrera = {}, threading.Barrier(3)
+
+    def _enviar(nombre, fila):
+        barrera.wait()
+        try:
+            resultados[nombre] = buffer.enviar(fila)
+        except Exception as e:
+            resultados[nombre] = e
+
+    filas = {'a': _fila(estudiante_id), 'mala': _fila(estudiante_id, maqueta=None), 'b': _fila(estudiante_id)}
+    hilos = [threading.Thread(target=_enviar, args=item) for item in filas.items()]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert isinstance(resultados['mala'], Exception)
+    assert isinstance(resultados['a'], int) and isinstance(resultados['b'], int)
+    assert Sesion.query.count() == 2
+
+
+def test_endpoint_unity_con_group_commit(app, client, buffer, estudiante_id, sin_rate_limit):
+    """El contrato de POST /api/unity/session no cambia con el buffer activo"""
+    app.extensions['group_commit'] = buffer
+    response = client.post('/api/unity/session', json={
+        'codigo_estudiante': 'BUF001', 'maqueta': 'Motor', 'puntaje': 6, 'tiempo_segundos': 90,
+        'respuestas': [{'pregunta': 1, 'correcta': True}]
+    })
+
+    assert response.status_code == 201
+    datos = response.get_json()
+    assert datos['success'] and datos['session_id'] == datos['sesion_id']
+    assert db.session.get(Sesion, datos['sesion_id']).get_respuestas() == [{'pregunta': 1, 'correcta': True}]
+    assert buffer.filas == 1
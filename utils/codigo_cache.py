@@ -0,0 +1,185 @@
+"""
+Cache codigo → estudiante para la ingesta Unity
+
+Cada sesión Unity llega con `codigo_estudiante` y solo necesita traducirlo a
+(id, nombre). Este cache en memoria (por proceso) evita la query por código
+en el camino caliente: con un hit, crear la sesión es un único INSERT.
+
+- Acotado (LRU, CODIGO_CACHE_MAX entradas) y con TTL (CODIGO_CACHE_TTL_SECONDS)
+- Invalidado por eventos del modelo Estudiante (alta, baja, cambio de código
+  o nombre). Los códigos afectados se juntan en el flush y se invalidan
+  recién en el COMMIT (se descartan con el ROLLBACK): un miss concurrente
+  entre flush y commit todavía lee la fila vieja, y si se invalidara en el
+  flush volvería a cachearla por todo el TTL.
+- Los eventos no cruzan procesos: las operaciones bulk de Core (insert()/
+  delete() sin ORM), los otros workers de gunicorn y las ediciones hechas
+  desde el dashboard cuando la ingesta corre aparte (ingesta.py) solo se
+  ven al vencer el TTL (ver gunicorn_ingesta.conf.py).
+- Opcionalmente precargado con todo el padrón al arrancar (CODIGO_CACHE_PRELOAD)
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterable, Optional
+
+from flask import Flask
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from utils.logger import get_logger
+from utils.metrics import CODIGO_CACHE
+
+logger = get_logger(__name__)
+
+EstudianteRef = namedtuple('EstudianteRef', ['id', 'nombre'])
+
+# Clave en session.info con los códigos a invalidar cuando la transacción confirme
+_INFO_PENDIENTES = 'codigo_cache_invalidar'
+
+
+class CodigoCache:
+    """
+    LRU con TTL de codigo → EstudianteRef (thread-safe)
+
+    Args:
+        max_entradas: Tamaño máximo (0 deshabilita el cache)
+        ttl_s: Segundos de vida de cada entrada
+    """
+
+    def __init__(self, max_entradas: int = 10_000, ttl_s: float = 300):
+        self.max_entradas = max_entradas
+        self.ttl_s = ttl_s
+        self._datos: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, codigo: str) -> Optional[EstudianteRef]:
+        with self._lock:
+            entrada = self._datos.get(codigo)
+            if entrada is None:
+                CODIGO_CACHE.inc('miss')
+                return None
+            ref, expira = entrada
+            if time.monotonic() >= expira:
+                del self._datos[codigo]
+                CODIGO_CACHE.inc('miss')
+                return None
+            self._datos.move_to_end(codigo)
+        CODIGO_CACHE.inc('hit')
+        return ref
+
+    def put(self, codigo: str, ref: EstudianteRef) -> None:
+        if self.max_entradas <= 0:
+            return
+        with self._lock:
+            self._datos[codigo] = (ref, time.monotonic() + self.ttl_s)
+            self._datos.move_to_end(codigo)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+
+    def put_many(self, refs: Dict[str, EstudianteRef]) -> None:
+        for codigo, ref in refs.items():
+            self.put(codigo, ref)
+
+    def invalidar(self, codigos: Iterable[Optional[str]]) -> None:
+        with self._lock:
+            for codigo in codigos:
+                self._datos.pop(codigo, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+
+# Instancia del proceso (configurada por init_codigo_cache)
+cache_codigos = CodigoCache()
+
+
+def _invalidar_estudiante(mapper, connection, target) -> None:
+    """after_insert / after_update / after_delete de Estudiante (en el flush)"""
+    estado = inspect(target)
+    codigos = {target.codigo}
+    # Código anterior (cambio de código) o nombre cacheado desactualizado
+    for atributo in ('codigo', 'nombre'):
+        historial = estado.attrs[atributo].history
+        codigos.update(historial.deleted or ())
+
+    sesion = object_session(target)
+    if sesion is None:
+        cache_codigos.invalidar(codigos)
+        return
+    sesion.info.setdefault(_INFO_PENDIENTES, set()).update(codigos)
+
+
+def _valor_anterior(target, valor, anterior, iniciador) -> None:
+    """Listener 'set' con active_history: el historial guarda el valor viejo aunque la instancia esté expirada"""
+
+
+def _invalidar_confirmados(sesion) -> None:
+    """after_commit: la fila nueva ya es visible para las otras conexiones"""
+    codigos = sesion.info.pop(_INFO_PENDIENTES, None)
+    if codigos:
+        cache_codigos.invalidar(codigos)
+
+
+def _descartar_pendientes(sesion) -> None:
+    """after_rollback: el cache sigue reflejando lo confirmado"""
+    sesion.info.pop(_INFO_PENDIENTES, None)
+
+
+def _registrar_eventos() -> None:
+    from models import Estudiante
+
+    for evento in ('after_insert', 'after_update', 'after_delete'):
+        if not event.contains(Estudiante, evento, _invalidar_estudiante):
+            event.listen(Estudiante, evento, _invalidar_estudiante)
+    for atributo in (Estudiante.codigo, Estudiante.nombre):
+        if not event.contains(atributo, 'set', _valor_anterior):
+            event.listen(atributo, 'set', _valor_anterior, active_history=True)
+    for evento, listener in (('after_commit', _invalidar_confirmados),
+                             ('after_rollback', _descartar_pendientes)):
+        if not event.contains(Session, evento, listener):
+            event.listen(Session, evento, listener)
+
+
+def precargar(app: Flask) -> int:
+    """Carga todo el padrón (hasta max_entradas) en una query; retorna cuántos"""
+    from models import Estudiante, db
+
+    with app.app_context():
+        filas = db.session.query(Estudiante.codigo, Estudiante.id, Estudiante.nombre)\
+            .limit(cache_codigos.max_entradas).all()
+        db.session.remove()
+    cache_codigos.put_many({codigo: EstudianteRef(id_, nombre) for codigo, id_, nombre in filas})
+    return len(filas)
+
+
+def init_codigo_cache(app: Flask) -> None:
+    """
+    Configura el cache codigo → estudiante de la ingesta
+
+    Config (con valores por defecto):
+        CODIGO_CACHE_MAX: 10000 (0 deshabilita)
+        CODIGO_CACHE_TTL_SECONDS: 300
+        CODIGO_CACHE_PRELOAD: False
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('CODIGO_CACHE_MAX', 10_000)
+    app.config.setdefault('CODIGO_CACHE_TTL_SECONDS', 300)
+    app.config.setdefault('CODIGO_CACHE_PRELOAD', False)
+
+    cache_codigos.max_entradas = app.config['CODIGO_CACHE_MAX']
+    cache_codigos.ttl_s = app.config['CODIGO_CACHE_TTL_SECONDS']
+    cache_codigos.clear()
+    _registrar_eventos()
+
+    if app.config['CODIGO_CACHE_PRELOAD'] and cache_codigos.max_entradas > 0:
+        try:
+            logger.info(f"✅ Cache de códigos precargado con {precargar(app)} estudiantes")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo precargar el cache de códigos: {e}")
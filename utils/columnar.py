@@ -0,0 +1,219 @@
+"""
+📦 Formato Columnar Compacto
+============================
+
+Codificación compacta (columnar + diccionario) para payloads grandes de analytics.
+
+El formato fila-a-fila de /api/analytics y /api/sesiones-todas repite las
+mismas claves y los mismos strings (maqueta, nombre de estudiante) miles de
+veces. Este módulo los transforma en:
+
+- Listas de objetos → columnas (una lista por clave)
+- Columnas de strings repetidos → índices a una tabla única de strings
+- Floats → redondeados a la precisión que realmente muestra el dashboard
+
+Formato negociado por header Accept:
+- application/vnd.vranalytics.columnar+json → JSON columnar
+- application/x-msgpack → mismo payload columnar serializado en MessagePack
+  (requiere el paquete opcional `msgpack`)
+
+Sin header Accept, las rutas siguen devolviendo el JSON fila-a-fila de siempre.
+
+Estructura:
+    {
+        "formato": "columnar",
+        "version": 1,
+        "strings": ["Motor", "Ana", ...],
+        "data": <árbol codificado>
+    }
+
+    Lista de objetos  → {"$columnar": n, "columnas": {clave: columna}}
+                        (solo si todos los objetos tienen las mismas claves)
+    Columna de strings → {"$dict": [índice, ...]}   (-1 = null)
+
+    Las claves de los objetos que empiezan con "$" se escapan con un "$" extra
+    ("$dict" → "$$dict"), así un dato del usuario nunca se lee como marcador.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from flask import Response, jsonify, request
+
+from .constants import (
+    COLUMNAR_FLOAT_PRECISION,
+    MIMETYPE_COLUMNAR,
+    MIMETYPE_MSGPACK,
+)
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+
+FORMATO_COLUMNAR = 'columnar'
+VERSION_COLUMNAR = 1
+
+
+class _StringTable:
+    """Tabla de strings deduplicada (string → índice)"""
+
+    def __init__(self):
+        self.valores: List[str] = []
+        self._indices: Dict[str, int] = {}
+
+    def index(self, valor: Optional[str]) -> int:
+        if valor is None:
+            return -1
+        idx = self._indices.get(valor)
+        if idx is None:
+            idx = len(self.valores)
+            self._indices[valor] = idx
+            self.valores.append(valor)
+        return idx
+
+
+def _es_columna_strings(valores: List[Any]) -> bool:
+    """True si la lista solo tiene strings (o None) y al menos un valor repetido"""
+    no_nulos = [v for v in valores if v is not None]
+    if not no_nulos or not all(isinstance(v, str) for v in no_nulos):
+        return False
+    return len(set(no_nulos)) < len(no_nulos)
+
+
+def _escapar_clave(clave: str) -> str:
+    return '$' + clave if clave.startswith('$') else clave
+
+
+def _desescapar_clave(clave: str) -> str:
+    return clave[1:] if clave.startswith('$$') else clave
+
+
+def _encode(obj: Any, strings: _StringTable, precision: int) -> Any:
+    """Codifica recursivamente un objeto al formato columnar"""
+    if isinstance(obj, bool) or obj is None or isinstance(obj, (int, str)):
+        return obj
+    if isinstance(obj, float):
+        return round(obj, precision)
+    if isinstance(obj, dict):
+        return {_escapar_clave(str(k)): _encode(v, strings, precision) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return _encode_lista(list(obj), strings, precision)
+    return obj
+
+
+def _encode_columna(valores: List[Any], strings: _StringTable, precision: int) -> Any:
+    """Codifica una columna: diccionario si son strings repetidos, lista si no"""
+    if _es_columna_strings(valores):
+        return {'$dict': [strings.index(v) for v in valores]}
+    return [_encode(v, strings, precision) for v in valores]
+
+
+def _encode_lista(valores: List[Any], strings: _StringTable, precision: int) -> Any:
+    """Codifica una lista: a columnas si son objetos con las mismas claves"""
+    if valores and all(isinstance(v, dict) for v in valores):
+        claves = list(valores[0])
+        # Con claves faltantes el decode las devolvería como None: quedan fila a fila
+        if all(fila.keys() == valores[0].keys() for fila in valores):
+            return {
+                '$columnar': len(valores),
+                'columnas': {
+                    str(clave): _encode_columna([fila[clave] for fila in valores], strings, precision)
+                    for clave in claves
+                }
+            }
+    return _encode_columna(valores, strings, precision)
+
+
+def encode_columnar(payload: Any, precision: int = COLUMNAR_FLOAT_PRECISION) -> Dict[str, Any]:
+    """
+    Convierte un payload fila-a-fila al formato columnar compacto
+
+    Args:
+        payload: Objeto JSON-serializable (dict/list)
+        precision: Decimales a conservar en los floats
+
+    Returns:
+        Sobre columnar con tabla de strings y datos codificados
+    """
+    strings = _StringTable()
+    data = _encode(payload, strings, precision)
+    return {
+        'formato': FORMATO_COLUMNAR,
+        'version': VERSION_COLUMNAR,
+        'strings': strings.valores,
+        'data': data
+    }
+
+
+def _decode(obj: Any, strings: List[str]) -> Any:
+    """Decodifica recursivamente el árbol columnar"""
+    if isinstance(obj, list):
+        return [_decode(v, strings) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if '$dict' in obj and len(obj) == 1:
+        return [strings[i] if i >= 0 else None for i in obj['$dict']]
+    if '$columnar' in obj and 'columnas' in obj:
+        n = obj['$columnar']
+        columnas = {clave: _decode(col, strings) for clave, col in obj['columnas'].items()}
+        return [{clave: col[i] for clave, col in columnas.items()} for i in range(n)]
+    return {_desescapar_clave(k): _decode(v, strings) for k, v in obj.items()}
+
+
+def decode_columnar(envelope: Dict[str, Any]) -> Any:
+    """
+    Reconstruye el payload fila-a-fila a partir del formato columnar
+
+    Args:
+        envelope: Sobre generado por encode_columnar()
+
+    Returns:
+        Payload original (con floats redondeados)
+    """
+    return _decode(envelope['data'], envelope.get('strings', []))
+
+
+def negotiated_format() -> Optional[str]:
+    """
+    Determina el formato compacto pedido por el cliente vía header Accept
+
+    Returns:
+        MIMETYPE_COLUMNAR, MIMETYPE_MSGPACK o None (formato por defecto)
+    """
+    # Solo coincidencias explícitas: */* del navegador no activa el formato compacto
+    pedidos = {valor for valor, calidad in request.accept_mimetypes if calidad > 0}
+    if msgpack is not None and MIMETYPE_MSGPACK in pedidos:
+        return MIMETYPE_MSGPACK
+    if MIMETYPE_COLUMNAR in pedidos:
+        return MIMETYPE_COLUMNAR
+    return None
+
+
+def compact_response(payload: Any, status: int):
+    """
+    Serializa el payload en el formato negociado
+
+    Mantiene jsonify() fila-a-fila como formato por defecto.
+
+    Args:
+        payload: Objeto a serializar
+        status: Código HTTP
+
+    Returns:
+        Tupla (Response, status) lista para retornar desde una vista
+    """
+    formato = negotiated_format()
+
+    if formato is None:
+        response = jsonify(payload)
+    elif formato == MIMETYPE_MSGPACK:
+        response = Response(msgpack.packb(encode_columnar(payload), use_bin_type=True), mimetype=formato)
+    else:
+        body = json.dumps(encode_columnar(payload), ensure_ascii=False, separators=(',', ':'))
+        response = Response(body, mimetype=formato)
+
+    # La misma URL responde distinto según Accept (importante para caches intermedios)
+    response.vary.add('Accept')
+    return response, status
@@ -0,0 +1,196 @@
+"""
+🗜️ Response Compression
+========================
+
+Compresión gzip/brotli de respuestas HTTP sin dependencias externas obligatorias.
+
+Los JSON de analytics y del listado de sesiones son muy compresibles; en el
+plan de Render y en el Wi-Fi de los colegios el tamaño de la respuesta es la
+latencia dominante para los profesores.
+
+Características:
+- Negociación por Accept-Encoding (br si está el paquete `brotli`, si no gzip)
+- Umbral de tamaño mínimo (COMPRESS_MIN_SIZE)
+- Allowlist de content-types (COMPRESS_MIMETYPES)
+- Respuestas en streaming comprimidas de forma incremental, con un flush
+  cada COMPRESS_STREAM_FLUSH_BYTES (o COMPRESS_STREAM_FLUSH_SECONDS)
+- Reutiliza bytes ya comprimidos de respuestas cacheables de analytics
+  (ver `g.compressed_variants` en services/analytics_service.py)
+"""
+
+import gzip
+import time
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, current_app, g, request
+
+from .logger import get_logger
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+logger = get_logger(__name__)
+
+DEFAULT_COMPRESS_MIMETYPES = [
+    'application/json',
+    'application/vnd.vranalytics.columnar+json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'application/javascript',
+]
+
+
+def _elegir_encoding(app: Flask) -> Optional[str]:
+    """Elige el mejor Content-Encoding soportado por cliente y servidor"""
+    aceptados = request.accept_encodings
+    if brotli is not None and app.config['COMPRESS_BROTLI'] and aceptados.quality('br') > 0:
+        return 'br'
+    if aceptados.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def _comprimir(data: bytes, encoding: str, app: Flask) -> bytes:
+    """Comprime un body completo"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(data, compresslevel=app.config['COMPRESS_LEVEL'])
+
+
+def _comprimir_stream(chunks: Iterable, encoding: str, level: int, br_level: int,
+                      flush_bytes: int = 32 * 1024, flush_segundos: float = 1.0) -> Iterator[bytes]:
+    """
+    Comprime un iterable de chunks manteniendo el streaming
+
+    El compresor se vacía (sync flush) recién cuando acumuló flush_bytes de
+    entrada o pasaron flush_segundos desde el último flush: el cliente sigue
+    recibiendo filas de forma progresiva, pero los exports que emiten una
+    fila por chunk no pagan un bloque deflate por fila (~4x más grande).
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=br_level)
+        comprimir, vaciar = compressor.process, compressor.flush
+    else:
+        # wbits=31 → formato gzip (header + trailer CRC32)
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        comprimir, vaciar = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    pendientes, ultimo_flush = 0, time.monotonic()
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        salida = comprimir(chunk)
+        pendientes += len(chunk)
+        if pendientes >= flush_bytes or time.monotonic() - ultimo_flush >= flush_segundos:
+            salida += vaciar()
+            pendientes, ultimo_flush = 0, time.monotonic()
+        if salida:
+            yield salida
+    yield compressor.finish() if encoding == 'br' else compressor.flush(zlib.Z_FINISH)
+
+
+def _debe_comprimir(response, app: Flask) -> bool:
+    """Filtros previos a la compresión"""
+    if response.status_code != 200:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in (response.headers.get('Cache-Control') or ''):
+        return False
+    if response.mimetype not in app.config['COMPRESS_MIMETYPES']:
+        return False
+    return True
+
+
+def compress_response(response):
+    """
+    Hook after_request: comprime la respuesta si corresponde
+
+    Args:
+        response: Respuesta de Flask
+
+    Returns:
+        La misma respuesta, comprimida si aplica
+    """
+    app = current_app
+
+    if not app.config['COMPRESS_ENABLED'] or not _debe_comprimir(response, app):
+        return response
+
+    encoding = _elegir_encoding(app)
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        # Streaming: no conocemos el tamaño final, siempre comprimir
+        chunks = response.response
+        response.direct_passthrough = False
+        response.response = _comprimir_stream(
+            chunks, encoding, app.config['COMPRESS_LEVEL'], app.config['COMPRESS_BR_LEVEL'],
+            app.config['COMPRESS_STREAM_FLUSH_BYTES'], app.config['COMPRESS_STREAM_FLUSH_SECONDS']
+        )
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    data = response.get_data()
+    if len(data) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+
+    # Respuestas cacheadas de analytics: reutilizar los bytes ya comprimidos
+    variantes = g.get('compressed_variants')
+    clave = (response.mimetype, encoding)
+    comprimido = variantes.get(clave) if variantes is not None else None
+
+    if comprimido is None:
+        comprimido = _comprimir(data, encoding, app)
+        if variantes is not None:
+            variantes[clave] = comprimido
+
+    response.set_data(comprimido)
+    response.headers['Content-Encoding'] = encoding
+    if response.headers.get('ETag'):
+        # El body cambió: la ETag fuerte ya no corresponde byte a byte
+        etag, _ = response.get_etag()
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Configura la compresión de respuestas
+
+    Config (con valores por defecto):
+        COMPRESS_ENABLED: True
+        COMPRESS_MIN_SIZE: 500 bytes
+        COMPRESS_LEVEL: 6 (gzip)
+        COMPRESS_BR_LEVEL: 5 (brotli)
+        COMPRESS_BROTLI: True (si el paquete brotli está instalado)
+        COMPRESS_MIMETYPES: DEFAULT_COMPRESS_MIMETYPES
+        COMPRESS_STREAM_FLUSH_BYTES: 32 KB (entrada acumulada entre flushes)
+        COMPRESS_STREAM_FLUSH_SECONDS: 1.0 (flush aunque no se llegue al tamaño)
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BR_LEVEL', 5)
+    app.config.setdefault('COMPRESS_BROTLI', True)
+    app.config.setdefault('COMPRESS_MIMETYPES', list(DEFAULT_COMPRESS_MIMETYPES))
+    app.config.setdefault('COMPRESS_STREAM_FLUSH_BYTES', 32 * 1024)
+    app.config.setdefault('COMPRESS_STREAM_FLUSH_SECONDS', 1.0)
+
+    app.after_request(compress_response)
+
+    encodings = 'br, gzip' if brotli is not None and app.config['COMPRESS_BROTLI'] else 'gzip'
+    logger.info(f"✅ Compresión de respuestas habilitada ({encodings})")
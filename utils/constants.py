@@ -15,12 +15,20 @@ MAX_PUNTAJE = 7.0
 PUNTAJE_APROBACION = 4.0  # Puntaje mínimo para aprobar
 MAX_TIEMPO_SEGUNDOS = 7200  # 2 horas
 MAX_INTERACCIONES_IA = 1000
+MAX_BATCH_SESIONES = 500  # POST /api/unity/sessions:batch (backlog de headsets sin conexión)
+MAX_IDEMPOTENCY_KEY_LENGTH = 64  # Idempotency-Key / client_session_uuid
+MAX_CUERPO_SESION_BYTES = 1024 * 1024  # Body de POST /api/unity/session (recibido y descomprimido)
+MAX_CUERPO_LOTE_BYTES = 32 * 1024 * 1024  # Body de POST /api/unity/sessions:batch
 
 # ML Constants
 MIN_SESIONES_ML = 10
 MIN_SESIONES_CLUSTERING = 5
 MIN_SESIONES_CORRELACION = 3
 
+# Paginación (keyset) de listados de sesiones
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
 # Mensajes
 MSG_LOGIN_EXITOSO = "Inicio de sesión exitoso"
 MSG_REGISTRO_EXITOSO = "Registro completado correctamente"
@@ -33,10 +41,13 @@ MSG_PASSWORD_NO_COINCIDE = "Las contraseñas no coinciden"
 # Status Codes
 HTTP_OK = 200
 HTTP_CREATED = 201
+HTTP_MULTI_STATUS = 207  # Lotes con resultados mixtos por ítem
 HTTP_BAD_REQUEST = 400
 HTTP_UNAUTHORIZED = 401
 HTTP_FORBIDDEN = 403
 HTTP_NOT_FOUND = 404
+HTTP_PAYLOAD_TOO_LARGE = 413
+HTTP_UNSUPPORTED_MEDIA_TYPE = 415
 HTTP_SERVER_ERROR = 500
 HTTP_INTERNAL_SERVER_ERROR = 500  # Alias para HTTP_SERVER_ERROR
 
@@ -47,3 +58,8 @@ ROLE_PROFESOR = 'profesor'
 # Configuración de Flask
 SECRET_KEY_DEFAULT = 'dev-secret-key-change-in-production'
 DATABASE_URI_DEFAULT = 'sqlite:///instance/vr_analytics.db'
+
+# Formatos de respuesta compactos (negociados por header Accept)
+MIMETYPE_COLUMNAR = 'application/vnd.vranalytics.columnar+json'
+MIMETYPE_MSGPACK = 'application/x-msgpack'
+COLUMNAR_FLOAT_PRECISION = 4  # El dashboard muestra como máximo 3 decimales (o % con 1 decimal)
@@ -0,0 +1,421 @@
+"""
+📈 Métricas (formato Prometheus)
+================================
+
+Contadores, gauges e histogramas en memoria, expuestos en `/metrics`
+con el formato de texto de Prometheus. Sin dependencias externas.
+
+Métricas registradas:
+- vr_http_request_duration_seconds: latencia por endpoint (histograma)
+- vr_http_requests_total: requests por endpoint / método / status
+- vr_http_requests_in_flight: requests en curso
+- vr_analytics_cache_total: hits / misses del cache de analytics
+- vr_analytics_section_*: duración y memoria por sección de AnalizadorAvanzado
+- vr_db_pool_*: estado del pool de conexiones de SQLAlchemy
+- vr_sesiones_ingestadas_total: sesiones VR recibidas (throughput de ingesta)
+- vr_ingesta_group_commit_size: sesiones por commit del group commit
+- vr_codigo_cache_total: hits / misses del cache codigo → estudiante
+
+Multi-worker (gunicorn):
+    Con METRICS_MULTIPROC_DIR configurado, cada worker vuelca su snapshot a
+    `<dir>/metrics_<pid>.json` cada METRICS_FLUSH_SECONDS y `/metrics` suma
+    los archivos de todos los workers. Los contadores e histogramas de
+    workers muertos se pliegan en `<dir>/metrics_muertos.json` y su archivo
+    se borra (el directorio no crece con cada reinicio); sus gauges se
+    descartan.
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, g, request
+
+from .logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (sin gunicorn multi-worker)
+    fcntl = None
+
+logger = get_logger(__name__)
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ============================================
+# TIPOS DE MÉTRICA
+# ============================================
+
+class _Metrica:
+    """Base: nombre, ayuda, etiquetas y valores por combinación de etiquetas"""
+    tipo = 'untyped'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.valores: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            valores = [[list(k), list(v) if isinstance(v, list) else v] for k, v in self.valores.items()]
+        return {'tipo': self.tipo, 'ayuda': self.ayuda, 'etiquetas': list(self.etiquetas), 'valores': valores}
+
+
+class Counter(_Metrica):
+    """Contador monótono"""
+    tipo = 'counter'
+
+    def inc(self, *etiquetas: str, cantidad: float = 1) -> None:
+        with self._lock:
+            self.valores[etiquetas] = self.valores.get(etiquetas, 0) + cantidad
+
+
+class Gauge(_Metrica):
+    """Valor instantáneo (entre workers se suman los de procesos vivos)"""
+    tipo = 'gauge'
+
+    def set(self, valor: float, *etiquetas: str) -> None:
+        with self._lock:
+            self.valores[etiquetas] = valor
+
+    def inc(self, *etiquetas: str, cantidad: float = 1) -> None:
+        with self._lock:
+            self.valores[etiquetas] = self.valores.get(etiquetas, 0) + cantidad
+
+    def dec(self, *etiquetas: str, cantidad: float = 1) -> None:
+        self.inc(*etiquetas, cantidad=-cantidad)
+
+
+class Histogram(_Metrica):
+    """Histograma con buckets fijos: [conteos por bucket..., +Inf, suma]"""
+    tipo = 'histogram'
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = BUCKETS_LATENCIA):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(buckets)
+
+    def observe(self, valor: float, *etiquetas: str) -> None:
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            datos = self.valores.get(etiquetas)
+            if datos is None:
+                datos = self.valores[etiquetas] = [0] * (len(self.buckets) + 2)
+            datos[indice] += 1
+            datos[-1] += valor
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data['buckets'] = list(self.buckets)
+        return data
+
+
+# ============================================
+# REGISTRO
+# ============================================
+
+_registro: Dict[str, _Metrica] = {}
+
+
+def _registrar(metrica: _Metrica) -> _Metrica:
+    _registro[metrica.nombre] = metrica
+    return metrica
+
+
+REQUEST_LATENCIA = _registrar(Histogram(
+    'vr_http_request_duration_seconds', 'Latencia de requests HTTP', ('endpoint', 'method')))
+REQUESTS_TOTAL = _registrar(Counter(
+    'vr_http_requests_total', 'Requests HTTP atendidos', ('endpoint', 'method', 'status')))
+REQUESTS_EN_CURSO = _registrar(Gauge(
+    'vr_http_requests_in_flight', 'Requests HTTP en curso'))
+ANALYTICS_CACHE = _registrar(Counter(
+    'vr_analytics_cache_total', 'Consultas al cache de analytics', ('resultado', 'tipo')))
+ANALYTICS_SECCION = _registrar(Histogram(
+    'vr_analytics_section_duration_seconds', 'Duración de cada sección de AnalizadorAvanzado', ('seccion',)))
+ANALYTICS_SECCION_MEMORIA = _registrar(Gauge(
+    'vr_analytics_section_peak_bytes', 'Pico de memoria de la última ejecución de cada sección', ('seccion',)))
+SESIONES_INGESTADAS = _registrar(Counter(
+    'vr_sesiones_ingestadas_total', 'Sesiones VR ingestadas', ('origen',)))
+INGESTA_LOTE = _registrar(Histogram(
+    'vr_ingesta_group_commit_size', 'Sesiones confirmadas por commit del group commit',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+CODIGO_CACHE = _registrar(Counter(
+    'vr_codigo_cache_total', 'Consultas al cache codigo → estudiante de la ingesta', ('resultado',)))
+DB_POOL_SIZE = _registrar(Gauge('vr_db_pool_size', 'Tamaño del pool de conexiones'))
+DB_POOL_EN_USO = _registrar(Gauge('vr_db_pool_checked_out', 'Conexiones del pool en uso'))
+DB_POOL_OVERFLOW = _registrar(Gauge('vr_db_pool_overflow', 'Conexiones en overflow del pool'))
+
+
+def actualizar_pool() -> None:
+    """Lee el estado del pool de SQLAlchemy (solo pools con tamaño, p.ej. QueuePool)"""
+    from models import db
+
+    try:
+        pool = db.engine.pool
+    except Exception:
+        return
+    if not hasattr(pool, 'checkedout'):
+        return
+    DB_POOL_SIZE.set(pool.size())
+    DB_POOL_EN_USO.set(pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+def snapshot() -> Dict[str, dict]:
+    """Estado actual de todas las métricas de este proceso"""
+    return {nombre: metrica.snapshot() for nombre, metrica in _registro.items()}
+
+
+# ============================================
+# AGREGACIÓN MULTI-WORKER (ARCHIVOS)
+# ============================================
+
+_ultimo_volcado = 0.0
+
+# Contadores e histogramas acumulados de workers que ya no existen
+ARCHIVO_MUERTOS = 'metrics_muertos.json'
+
+
+def _archivo_worker(directorio: str, pid: int) -> str:
+    return os.path.join(directorio, f'metrics_{pid}.json')
+
+
+def volcar(directorio: str) -> None:
+    """Escribe el snapshot del worker de forma atómica (tmp + rename)"""
+    global _ultimo_volcado
+    destino = _archivo_worker(directorio, os.getpid())
+    temporal = f'{destino}.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f)
+    os.replace(temporal, destino)
+    _ultimo_volcado = time.monotonic()
+
+
+def _volcar_al_salir(directorio: str) -> None:
+    try:
+        volcar(directorio)
+    except OSError:
+        pass
+
+
+def _proceso_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _fusionar(acumulado: Dict[str, dict], datos: Dict[str, dict], incluir_gauges: bool) -> None:
+    """Suma los valores de `datos` sobre `acumulado`"""
+    for nombre, metrica in datos.items():
+        if metrica['tipo'] == 'gauge' and not incluir_gauges:
+            continue
+        destino = acumulado.setdefault(nombre, {**metrica, 'valores': {}})
+        for etiquetas, valor in metrica['valores']:
+            clave = tuple(etiquetas)
+            previo = destino['valores'].get(clave)
+            if previo is None:
+                destino['valores'][clave] = list(valor) if isinstance(valor, list) else valor
+            elif isinstance(valor, list):
+                destino['valores'][clave] = [a + b for a, b in zip(previo, valor)]
+            else:
+                destino['valores'][clave] = previo + valor
+
+
+def _leer_snapshot(ruta: str) -> Optional[Dict[str, dict]]:
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, OSError):
+        return None
+
+
+def _como_snapshot(acumulado: Dict[str, dict]) -> Dict[str, dict]:
+    """Inverso de _fusionar: valores {etiquetas: valor} → lista serializable"""
+    return {nombre: {**metrica, 'valores': [[list(k), v] for k, v in metrica['valores'].items()]}
+            for nombre, metrica in acumulado.items()}
+
+
+def _plegar_muertos(directorio: str) -> None:
+    """
+    Suma los archivos de workers muertos en ARCHIVO_MUERTOS y los borra
+
+    Con lock de archivo: dos workers sirviendo /metrics a la vez no pliegan
+    el mismo archivo dos veces.
+    """
+    if fcntl is None:
+        return
+    with open(os.path.join(directorio, 'metrics.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        muertos = []
+        for ruta in glob.glob(os.path.join(directorio, 'metrics_*.json')):
+            try:
+                pid = int(os.path.basename(ruta)[len('metrics_'):-len('.json')])
+            except ValueError:
+                continue
+            if pid != os.getpid() and not _proceso_vivo(pid):
+                muertos.append(ruta)
+        if not muertos:
+            return
+
+        destino = os.path.join(directorio, ARCHIVO_MUERTOS)
+        plegado: Dict[str, dict] = {}
+        _fusionar(plegado, _leer_snapshot(destino) or {}, incluir_gauges=False)
+        for ruta in muertos:
+            _fusionar(plegado, _leer_snapshot(ruta) or {}, incluir_gauges=False)
+
+        temporal = f'{destino}.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(_como_snapshot(plegado), f)
+        os.replace(temporal, destino)
+        for ruta in muertos:
+            os.remove(ruta)
+
+
+def recolectar(directorio: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Métricas a exponer: las de este proceso más (si hay directorio
+    multiproceso) las de los demás workers y el acumulado de los muertos
+    """
+    acumulado: Dict[str, dict] = {}
+    _fusionar(acumulado, snapshot(), incluir_gauges=True)
+    if not directorio:
+        return acumulado
+
+    try:
+        _plegar_muertos(directorio)
+    except OSError as e:
+        logger.warning(f"⚠️ No se pudieron plegar métricas de workers muertos: {e}")
+
+    propio = _archivo_worker(directorio, os.getpid())
+    for ruta in glob.glob(os.path.join(directorio, 'metrics_*.json')):
+        if ruta == propio:
+            continue
+        datos = _leer_snapshot(ruta)
+        if datos is None:
+            continue
+        if os.path.basename(ruta) == ARCHIVO_MUERTOS:
+            _fusionar(acumulado, datos, incluir_gauges=False)
+            continue
+        try:
+            pid = int(os.path.basename(ruta)[len('metrics_'):-len('.json')])
+        except ValueError:
+            continue
+        _fusionar(acumulado, datos, incluir_gauges=_proceso_vivo(pid))
+    return acumulado
+
+
+# ============================================
+# FORMATO DE TEXTO PROMETHEUS
+# ============================================
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas(nombres: List[str], valores, extra: str = '') -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return '{' + ','.join(partes) + '}' if partes else ''
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+
+def render(metricas: Dict[str, dict]) -> str:
+    """Serializa las métricas al formato de exposición de Prometheus"""
+    lineas = []
+    for nombre in sorted(metricas):
+        metrica = metricas[nombre]
+        lineas.append(f"# HELP {nombre} {metrica['ayuda']}")
+        lineas.append(f"# TYPE {nombre} {metrica['tipo']}")
+        nombres = metrica['etiquetas']
+
+        for etiquetas, valor in sorted(metrica['valores'].items()):
+            if metrica['tipo'] != 'histogram':
+                lineas.append(f"{nombre}{_etiquetas(nombres, etiquetas)} {_numero(valor)}")
+                continue
+
+            acumulado = 0
+            limites = [str(b) for b in metrica['buckets']] + ['+Inf']
+            for limite, conteo in zip(limites, valor[:-1]):
+                acumulado += conteo
+                le = f'le="{limite}"'
+                lineas.append(f"{nombre}_bucket{_etiquetas(nombres, etiquetas, le)} {acumulado}")
+            lineas.append(f"{nombre}_sum{_etiquetas(nombres, etiquetas)} {_numero(valor[-1])}")
+            lineas.append(f"{nombre}_count{_etiquetas(nombres, etiquetas)} {acumulado}")
+    return '\n'.join(lineas) + '\n'
+
+
+# ============================================
+# HOOKS DE REQUEST
+# ============================================
+
+def _iniciar_request():
+    g._metrics_inicio = time.perf_counter()
+    REQUESTS_EN_CURSO.inc()
+
+
+def _finalizar_request(response):
+    inicio = g.pop('_metrics_inicio', None)
+    if inicio is None:
+        return response
+
+    duracion = time.perf_counter() - inicio
+    endpoint = request.url_rule.rule if request.url_rule is not None else '<sin_ruta>'
+    REQUEST_LATENCIA.observe(duracion, endpoint, request.method)
+    REQUESTS_TOTAL.inc(endpoint, request.method, str(response.status_code))
+    REQUESTS_EN_CURSO.dec()
+
+    directorio = current_app.config['METRICS_MULTIPROC_DIR']
+    if directorio and time.monotonic() - _ultimo_volcado >= current_app.config['METRICS_FLUSH_SECONDS']:
+        try:
+            actualizar_pool()
+            volcar(directorio)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudieron volcar métricas a {directorio}: {e}")
+    return response
+
+
+def init_metrics(app: Flask) -> None:
+    """
+    Configura la recolección de métricas por request
+
+    Config (con valores por defecto):
+        METRICS_ENABLED: True
+        METRICS_MULTIPROC_DIR: '' (sin agregación entre workers)
+        METRICS_FLUSH_SECONDS: 5
+        METRICS_TOKEN: '' (si se define, /metrics exige "Authorization: Bearer <token>")
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_MULTIPROC_DIR', '')
+    app.config.setdefault('METRICS_FLUSH_SECONDS', 5)
+    app.config.setdefault('METRICS_TOKEN', '')
+
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    directorio = app.config['METRICS_MULTIPROC_DIR']
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+        atexit.register(_volcar_al_salir, directorio)
+
+    app.before_request(_iniciar_request)
+    app.after_request(_finalizar_request)
+    logger.info("✅ Métricas Prometheus habilitadas en /metrics")
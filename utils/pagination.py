@@ -0,0 +1,133 @@
+"""
+📄 Keyset Pagination
+=====================
+
+Paginación por cursor (keyset) sobre (fecha DESC, id DESC) y filtros de sesiones.
+
+A diferencia de OFFSET, el costo de cada página es constante sin importar
+cuán atrás navegue el profesor: la query siempre arranca desde la última
+fila vista usando el índice compuesto (profesor_id, fecha, id).
+
+El cursor es opaco para el cliente (base64url de {"f": fecha, "i": id}).
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class PaginationError(ValueError):
+    """Parámetros de paginación o filtros inválidos"""
+
+
+@dataclass
+class SesionFiltros:
+    """Filtros server-side para listados de sesiones"""
+    desde: Optional[datetime] = None
+    hasta: Optional[datetime] = None
+    hasta_exclusivo: bool = False  # True: fecha < hasta (hasta sin hora cubre el día completo)
+    maqueta: Optional[str] = None
+    estudiante_id: Optional[int] = None
+    puntaje_min: Optional[float] = None
+    puntaje_max: Optional[float] = None
+
+
+def encode_cursor(fecha: datetime, sesion_id: int) -> str:
+    """Codifica la posición (fecha, id) de la última fila entregada"""
+    raw = json.dumps({'f': fecha.isoformat(), 'i': sesion_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica un cursor generado por encode_cursor()
+
+    Raises:
+        PaginationError: Si el cursor está malformado
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(data['f']), int(data['i'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise PaginationError('Cursor inválido') from e
+
+
+def _es_solo_fecha(valor: Optional[str]) -> bool:
+    """True si el valor es una fecha ISO sin hora (YYYY-MM-DD)"""
+    try:
+        date.fromisoformat(valor)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_fecha(valor: Optional[str], nombre: str) -> Optional[datetime]:
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError as e:
+        raise PaginationError(f"'{nombre}' debe ser una fecha ISO (YYYY-MM-DD)") from e
+
+
+def _parse_numero(valor: Optional[str], nombre: str, tipo=float):
+    if valor is None or valor == '':
+        return None
+    try:
+        return tipo(valor)
+    except ValueError as e:
+        raise PaginationError(f"'{nombre}' debe ser numérico") from e
+
+
+def parse_filtros(args: Dict[str, Any]) -> SesionFiltros:
+    """
+    Construye los filtros desde los query params del request
+
+    Query params soportados: desde, hasta, maqueta, estudiante_id,
+    puntaje_min, puntaje_max
+
+    Un 'hasta' sin hora (YYYY-MM-DD) incluye todo ese día: se filtra con
+    fecha < día siguiente a las 00:00.
+
+    Raises:
+        PaginationError: Si algún parámetro es inválido
+    """
+    hasta = _parse_fecha(args.get('hasta'), 'hasta')
+    hasta_exclusivo = hasta is not None and _es_solo_fecha(args.get('hasta'))
+    return SesionFiltros(
+        desde=_parse_fecha(args.get('desde'), 'desde'),
+        hasta=hasta + timedelta(days=1) if hasta_exclusivo else hasta,
+        hasta_exclusivo=hasta_exclusivo,
+        maqueta=args.get('maqueta') or None,
+        estudiante_id=_parse_numero(args.get('estudiante_id'), 'estudiante_id', int),
+        puntaje_min=_parse_numero(args.get('puntaje_min'), 'puntaje_min'),
+        puntaje_max=_parse_numero(args.get('puntaje_max'), 'puntaje_max'),
+    )
+
+
+def parse_page_args(args: Dict[str, Any]) -> Tuple[int, Optional[Tuple[datetime, int]]]:
+    """
+    Obtiene (limit, cursor) desde los query params
+
+    Raises:
+        PaginationError: Si limit o cursor son inválidos
+    """
+    limit = _parse_numero(args.get('limit'), 'limit', int)
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    elif limit < 1:
+        raise PaginationError("'limit' debe ser mayor a 0")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = args.get('cursor')
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def wants_pagination(args: Dict[str, Any]) -> bool:
+    """True si el cliente pidió explícitamente el modo paginado"""
+    return 'limit' in args or 'cursor' in args
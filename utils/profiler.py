@@ -0,0 +1,418 @@
+"""
+🔥 Profiling
+============
+
+Muestreo de stacks en formato "collapsed" (compatible con flamegraph.pl,
+speedscope e inferno): una línea por stack, `frame;frame;frame <muestras>`.
+
+Profiling bajo demanda de un request puntual:
+    1. Generar un token firmado:   flask profile-token
+    2. Repetir el request con el header `X-Profile: <token>`
+       (o el query param `?_profile=<token>`)
+    3. Listar / descargar:         GET /api/profiles  (mismo header)
+
+Sin el header el hook solo hace una búsqueda en los headers: overhead nulo.
+
+Profiling continuo (CONTINUOUS_PROFILING_ENABLED, deshabilitado por defecto):
+    Un thread por worker muestrea todos los threads a CONTINUOUS_PROFILING_HZ
+    (máx. 100 Hz) y vuelca una ventana cada CONTINUOUS_PROFILING_WINDOW_SECONDS
+    a `PROFILES_DIR/ventana-<fecha>-<pid>.collapsed` (+ `.json` con el costo).
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask, current_app, g, request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADER_PROFILE = 'X-Profile'
+PARAM_PROFILE = '_profile'
+_SALT_TOKEN = 'vr-analytics-profiling'
+MAX_HZ_CONTINUO = 100
+
+# Hojas de stack de threads esperando (no consumen CPU)
+_FUNCIONES_IDLE = frozenset({'wait', 'select', 'poll', 'accept', 'sleep', 'serve_forever',
+                             '_wait_for_tstate_lock'})
+
+
+# ============================================
+# MUESTREO DE STACKS
+# ============================================
+
+def colapsar_stack(frame, max_profundidad: int = 128) -> str:
+    """Stack de un frame como `modulo:funcion;...` (de la raíz hacia la hoja)"""
+    partes = []
+    while frame is not None and len(partes) < max_profundidad:
+        codigo = frame.f_code
+        partes.append(f"{frame.f_globals.get('__name__', '?')}:{codigo.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(partes))
+
+
+class StackSampler:
+    """
+    Thread que muestrea los stacks de otros threads cada `intervalo` segundos
+
+    Args:
+        intervalo: Segundos entre muestras
+        thread_ids: Threads a muestrear (None = todos salvo el propio sampler)
+    """
+
+    def __init__(self, intervalo: float = 0.001, thread_ids: Optional[Iterable[int]] = None,
+                 omitir_idle: bool = False):
+        self.intervalo = intervalo
+        self.thread_ids = set(thread_ids) if thread_ids is not None else None
+        self.omitir_idle = omitir_idle
+        self.stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'StackSampler':
+        self._thread = threading.Thread(target=self._muestrear, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._detener.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def extraer(self) -> Counter:
+        """Devuelve las muestras acumuladas y reinicia el acumulador"""
+        with self._lock:
+            stacks, self.stacks = self.stacks, Counter()
+        return stacks
+
+    def _muestrear(self) -> None:
+        while not self._detener.wait(self.intervalo):
+            self._tomar_muestra()
+
+    def _tomar_muestra(self) -> None:
+        propio = threading.get_ident()
+        frames = sys._current_frames()
+        with self._lock:
+            for thread_id, frame in frames.items():
+                if thread_id == propio:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                if self.omitir_idle and frame.f_code.co_name in _FUNCIONES_IDLE:
+                    continue
+                self.stacks[colapsar_stack(frame)] += 1
+
+
+class ContinuousProfiler(StackSampler):
+    """
+    Sampler permanente de un worker que vuelca ventanas periódicas a disco
+
+    Args:
+        directorio: Destino de las ventanas (.collapsed + .json)
+        hz: Muestras por segundo (se limita a MAX_HZ_CONTINUO)
+        ventana: Segundos por archivo
+        max_archivos: Ventanas conservadas (las más antiguas se borran)
+    """
+
+    def __init__(self, directorio: str, hz: float = 100, ventana: float = 60, max_archivos: int = 200):
+        hz = min(max(hz, 1), MAX_HZ_CONTINUO)
+        super().__init__(intervalo=1 / hz, omitir_idle=True)
+        self.directorio = directorio
+        self.hz = hz
+        self.ventana = ventana
+        self.max_archivos = max_archivos
+        self._costo = 0.0
+        self._inicio_ventana = time.time()
+
+    def stop(self) -> Counter:
+        stacks = super().stop()
+        self.volcar()
+        return stacks
+
+    def _muestrear(self) -> None:
+        fin_ventana = time.monotonic() + self.ventana
+        while not self._detener.wait(self.intervalo):
+            inicio = time.perf_counter()
+            self._tomar_muestra()
+            self._costo += time.perf_counter() - inicio
+            if time.monotonic() >= fin_ventana:
+                self.volcar()
+                fin_ventana = time.monotonic() + self.ventana
+
+    def volcar(self) -> Optional[str]:
+        """Escribe la ventana actual y reinicia el acumulador"""
+        stacks = self.extraer()
+        inicio, fin = self._inicio_ventana, time.time()
+        costo, self._costo, self._inicio_ventana = self._costo, 0.0, fin
+        if not stacks:
+            return None
+
+        nombre = f"ventana-{datetime.utcfromtimestamp(inicio).strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}"
+        metadata = {
+            'pid': os.getpid(),
+            'inicio': datetime.utcfromtimestamp(inicio).isoformat(),
+            'fin': datetime.utcfromtimestamp(fin).isoformat(),
+            'hz': self.hz,
+            'muestras': sum(stacks.values()),
+            'costo_muestreo_ms': round(costo * 1000, 2),
+            'overhead_pct': round(100 * costo / max(fin - inicio, 1e-9), 3),
+        }
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            with open(os.path.join(self.directorio, f'{nombre}.collapsed'), 'w', encoding='utf-8') as f:
+                f.write(formato_collapsed(stacks))
+            with open(os.path.join(self.directorio, f'{nombre}.json'), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2)
+            self._rotar()
+        except OSError as e:
+            logger.error(f"❌ No se pudo volcar la ventana de profiling: {e}")
+            return None
+        return nombre
+
+    def _rotar(self) -> None:
+        ventanas = sorted(n[:-len('.collapsed')] for n in os.listdir(self.directorio)
+                          if n.startswith('ventana-') and n.endswith('.collapsed'))
+        for nombre in ventanas[:-self.max_archivos]:
+            for extension in ('collapsed', 'json'):
+                try:
+                    os.remove(os.path.join(self.directorio, f'{nombre}.{extension}'))
+                except OSError:
+                    pass
+
+
+def formato_collapsed(stacks: Counter) -> str:
+    """Serializa las muestras en formato collapsed (una línea por stack)"""
+    return ''.join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+
+
+# ============================================
+# TOKENS FIRMADOS
+# ============================================
+
+def _serializer(app: Flask) -> URLSafeTimedSerializer:
+    return URLSafeTimedSerializer(app.config['SECRET_KEY'], salt=_SALT_TOKEN)
+
+
+def generar_token(app: Flask) -> str:
+    """Token firmado con SECRET_KEY que habilita el profiling de requests"""
+    return _serializer(app).dumps({'profiling': True})
+
+
+def token_valido(app: Flask, token: Optional[str]) -> bool:
+    """Verifica firma y vigencia (PROFILING_TOKEN_MAX_AGE segundos)"""
+    if not token:
+        return False
+    try:
+        _serializer(app).loads(token, max_age=app.config['PROFILING_TOKEN_MAX_AGE'])
+    except BadSignature:
+        return False
+    return True
+
+
+def token_del_request() -> Optional[str]:
+    """Token recibido en el header X-Profile o en ?_profile="""
+    token = request.headers.get(HEADER_PROFILE)
+    if token is None and PARAM_PROFILE.encode() in request.query_string:
+        token = request.args.get(PARAM_PROFILE)
+    return token
+
+
+# ============================================
+# ALMACENAMIENTO DE PERFILES
+# ============================================
+
+def directorio_requests(app: Flask) -> str:
+    return os.path.join(app.config['PROFILES_DIR'], 'requests')
+
+
+def guardar_perfil(directorio: str, stacks: Counter, metadata: Dict, max_guardados: int) -> str:
+    """Escribe `<id>.collapsed` + `<id>.json` y descarta los perfiles más antiguos"""
+    os.makedirs(directorio, exist_ok=True)
+    perfil_id = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    with open(os.path.join(directorio, f'{perfil_id}.collapsed'), 'w', encoding='utf-8') as f:
+        f.write(formato_collapsed(stacks))
+    with open(os.path.join(directorio, f'{perfil_id}.json'), 'w', encoding='utf-8') as f:
+        json.dump({'id': perfil_id, **metadata}, f, indent=2)
+
+    for antiguo in listar_perfiles(directorio)[max_guardados:]:
+        for extension in ('collapsed', 'json'):
+            try:
+                os.remove(os.path.join(directorio, f"{antiguo['id']}.{extension}"))
+            except OSError:
+                pass
+    return perfil_id
+
+
+def listar_perfiles(directorio: str, limite: Optional[int] = None) -> List[Dict]:
+    """Metadata de los perfiles guardados, del más reciente al más antiguo"""
+    if not os.path.isdir(directorio):
+        return []
+    nombres = sorted((n for n in os.listdir(directorio) if n.endswith('.json')), reverse=True)
+    perfiles = []
+    for nombre in nombres[:limite]:
+        try:
+            with open(os.path.join(directorio, nombre), encoding='utf-8') as f:
+                perfiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return perfiles
+
+
+# ============================================
+# HOOKS DE REQUEST
+# ============================================
+
+def _iniciar_profiling():
+    if HEADER_PROFILE not in request.headers and PARAM_PROFILE.encode() not in request.query_string:
+        return
+    if request.blueprint == 'profiling' or not token_valido(current_app, token_del_request()):
+        return
+
+    g._profiling = (StackSampler(
+        intervalo=current_app.config['PROFILING_INTERVAL_MS'] / 1000,
+        thread_ids=[threading.get_ident()]
+    ).start(), time.perf_counter())
+
+
+def _finalizar_profiling(response):
+    datos = g.pop('_profiling', None)
+    if datos is None:
+        return response
+
+    sampler, inicio = datos
+    duracion = time.perf_counter() - inicio
+    stacks = sampler.stop()
+
+    from flask_login import current_user
+    usuario = current_user.get_id() if current_user and current_user.is_authenticated else None
+    stats = g.get('_query_stats')
+
+    metadata = {
+        'fecha': datetime.utcnow().isoformat(),
+        'ruta': request.url_rule.rule if request.url_rule is not None else request.path,
+        'path': request.full_path.rstrip('?'),
+        'method': request.method,
+        'status': response.status_code,
+        'usuario': usuario,
+        'duracion_ms': round(duracion * 1000, 2),
+        'muestras': sum(stacks.values()),
+        'bytes_request': request.content_length or 0,
+        'bytes_response': response.calculate_content_length(),
+        'queries': stats.count if stats is not None else None,
+    }
+    try:
+        perfil_id = guardar_perfil(directorio_requests(current_app), stacks, metadata,
+                                   current_app.config['PROFILES_MAX_KEEP'])
+    except OSError as e:
+        logger.error(f"❌ No se pudo guardar el perfil de {metadata['path']}: {e}")
+        return response
+
+    response.headers['X-Profile-Id'] = perfil_id
+    logger.info(f"🔥 Perfil {perfil_id}: {metadata['method']} {metadata['path']} "
+                f"({metadata['duracion_ms']}ms, {metadata['muestras']} muestras, usuario={usuario})")
+    return response
+
+
+_profiler_continuo: Optional[ContinuousProfiler] = None
+_pid_profiler = None
+_lock_continuo = threading.Lock()
+
+
+def _asegurar_profiler_continuo():
+    """
+    Arranca el sampler en el primer request de cada worker: los threads no
+    sobreviven al fork de gunicorn, así que no se puede iniciar al importar la app
+    """
+    global _profiler_continuo, _pid_profiler
+    if _pid_profiler == os.getpid():
+        return
+    with _lock_continuo:
+        if _pid_profiler == os.getpid():
+            return
+        config = current_app.config
+        _profiler_continuo = ContinuousProfiler(
+            directorio=config['PROFILES_DIR'],
+            hz=config['CONTINUOUS_PROFILING_HZ'],
+            ventana=config['CONTINUOUS_PROFILING_WINDOW_SECONDS'],
+            max_archivos=config['CONTINUOUS_PROFILING_MAX_FILES'],
+        ).start()
+        _pid_profiler = os.getpid()
+    logger.info(f"🔥 Profiling continuo iniciado en worker {_pid_profiler} "
+                f"({_profiler_continuo.hz:.0f} Hz, ventanas de {_profiler_continuo.ventana}s)")
+
+
+def detener_profiler_continuo() -> None:
+    """Detiene el sampler del worker actual y vuelca la ventana en curso"""
+    global _profiler_continuo, _pid_profiler
+    with _lock_continuo:
+        if _profiler_continuo is not None and _pid_profiler == os.getpid():
+            _profiler_continuo.stop()
+        _profiler_continuo, _pid_profiler = None, None
+
+
+def init_continuous_profiling(app: Flask) -> None:
+    """
+    Configura el profiling continuo por worker (deshabilitado por defecto)
+
+    Config (con valores por defecto):
+        CONTINUOUS_PROFILING_ENABLED: False
+        CONTINUOUS_PROFILING_HZ: 100 (máximo 100)
+        CONTINUOUS_PROFILING_WINDOW_SECONDS: 60
+        CONTINUOUS_PROFILING_MAX_FILES: 200
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('PROFILES_DIR', os.path.join('logs', 'profiles'))
+    app.config.setdefault('CONTINUOUS_PROFILING_ENABLED', False)
+    app.config.setdefault('CONTINUOUS_PROFILING_HZ', MAX_HZ_CONTINUO)
+    app.config.setdefault('CONTINUOUS_PROFILING_WINDOW_SECONDS', 60)
+    app.config.setdefault('CONTINUOUS_PROFILING_MAX_FILES', 200)
+
+    if not app.config['CONTINUOUS_PROFILING_ENABLED']:
+        return
+
+    app.before_request(_asegurar_profiler_continuo)
+    atexit.register(detener_profiler_continuo)
+    logger.info("✅ Profiling continuo habilitado")
+
+
+def init_request_profiling(app: Flask) -> None:
+    """
+    Configura el profiling bajo demanda de requests
+
+    Config (con valores por defecto):
+        PROFILING_ENABLED: True
+        PROFILES_DIR: 'logs/profiles'
+        PROFILING_INTERVAL_MS: 1 (intervalo de muestreo)
+        PROFILING_TOKEN_MAX_AGE: 3600 (vigencia del token en segundos)
+        PROFILES_MAX_KEEP: 50 (perfiles de requests conservados)
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('PROFILING_ENABLED', True)
+    app.config.setdefault('PROFILES_DIR', os.path.join('logs', 'profiles'))
+    app.config.setdefault('PROFILING_INTERVAL_MS', 1)
+    app.config.setdefault('PROFILING_TOKEN_MAX_AGE', 3600)
+    app.config.setdefault('PROFILES_MAX_KEEP', 50)
+
+    if not app.config['PROFILING_ENABLED']:
+        return
+
+    app.before_request(_iniciar_profiling)
+    app.after_request(_finalizar_profiling)
+    logger.info("✅ Profiling bajo demanda habilitado (header X-Profile)")
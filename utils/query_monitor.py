@@ -0,0 +1,228 @@
+"""
+🔎 Query Monitor
+================
+
+Instrumentación de SQL por request sobre los eventos de SQLAlchemy
+(`before_cursor_execute` / `after_cursor_execute`).
+
+Por cada request:
+- Cuenta queries y tiempo en base de datos
+- Detecta N+1: la misma forma de sentencia repetida muchas veces en un request
+- Loguea un warning si se superan los umbrales configurados
+- Emite `Server-Timing` con los tramos db / analytics / app
+
+Fuera de un request, `contar_queries()` permite medir un bloque de código
+(lo usa el fixture `query_budget` de los tests).
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+from flask import Flask, current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_G_STATS = '_query_stats'
+_INFO_INICIOS = '_query_monitor_inicios'
+
+# Valores literales y listas de parámetros que no cambian la "forma" de la sentencia
+_RE_ESPACIOS = re.compile(r'\s+')
+_RE_LISTA_PARAMS = re.compile(r'\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)\s*,?)+\)')
+_RE_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+@dataclass
+class QueryStats:
+    """Acumulador de queries de un request (o de un bloque medido)"""
+    count: int = 0
+    db_time: float = 0.0
+    formas: Counter = field(default_factory=Counter)
+    secciones: Dict[str, float] = field(default_factory=dict)
+    inicio: float = field(default_factory=time.perf_counter)
+
+    def registrar(self, statement: str, duracion: float) -> None:
+        self.count += 1
+        self.db_time += duracion
+        self.formas[normalizar_sentencia(statement)] += 1
+
+    def sospechosas_n_mas_1(self, umbral: int) -> List[tuple]:
+        """Formas de sentencia repetidas al menos `umbral` veces"""
+        return [(forma, n) for forma, n in self.formas.most_common() if n >= umbral]
+
+
+def normalizar_sentencia(statement: str) -> str:
+    """Reduce una sentencia SQL a su forma (sin literales ni listas de parámetros)"""
+    forma = _RE_ESPACIOS.sub(' ', statement).strip()
+    forma = _RE_LITERALES.sub('?', forma)
+    return _RE_LISTA_PARAMS.sub('(?)', forma)
+
+
+# ============================================
+# COLECTORES ACTIVOS
+# ============================================
+
+# Bloques medidos con contar_queries() (además del request actual)
+_colectores: List[QueryStats] = []
+
+
+def _colectores_activos() -> List[QueryStats]:
+    activos = list(_colectores)
+    if has_request_context():
+        stats = g.get(_G_STATS)
+        if stats is not None:
+            activos.append(stats)
+    return activos
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_INFO_INICIOS, []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get(_INFO_INICIOS)
+    if not inicios:
+        return
+    duracion = time.perf_counter() - inicios.pop()
+    for stats in _colectores_activos():
+        stats.registrar(statement, duracion)
+
+
+def _error_de_ejecucion(contexto_error):
+    """Descarta el inicio de la sentencia fallida (after_cursor_execute no se dispara)"""
+    conexion = contexto_error.connection
+    inicios = conexion.info.get(_INFO_INICIOS) if conexion is not None else None
+    if inicios:
+        inicios.pop()
+
+
+@contextmanager
+def contar_queries() -> Iterator[QueryStats]:
+    """
+    Cuenta las queries ejecutadas dentro del bloque
+
+    Uso:
+        with contar_queries() as stats:
+            ...
+        assert stats.count <= 3
+    """
+    stats = QueryStats()
+    _colectores.append(stats)
+    try:
+        yield stats
+    finally:
+        _colectores.remove(stats)
+
+
+@contextmanager
+def seccion(nombre: str) -> Iterator[None]:
+    """
+    Mide un tramo del request para Server-Timing (p.ej. 'analytics')
+
+    Fuera de un request no hace nada.
+    """
+    stats = g.get(_G_STATS) if has_request_context() else None
+    if stats is None:
+        yield
+        return
+
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.secciones[nombre] = stats.secciones.get(nombre, 0.0) + time.perf_counter() - inicio
+
+
+# ============================================
+# HOOKS DE REQUEST
+# ============================================
+
+def _iniciar_request():
+    g.setdefault(_G_STATS, QueryStats())
+
+
+def _server_timing(stats: QueryStats, total: float) -> str:
+    partes = [f'db;dur={stats.db_time * 1000:.1f};desc="{stats.count} queries"']
+    for nombre, duracion in stats.secciones.items():
+        partes.append(f'{nombre};dur={duracion * 1000:.1f}')
+    partes.append(f'app;dur={max(total - stats.db_time, 0) * 1000:.1f}')
+    return ', '.join(partes)
+
+
+def _finalizar_request(response):
+    """Hook after_request: Server-Timing y warnings de umbrales / N+1"""
+    stats = g.get(_G_STATS)
+    if stats is None:
+        return response
+
+    app = current_app
+    total = time.perf_counter() - stats.inicio
+
+    if app.config['SERVER_TIMING_ENABLED']:
+        response.headers.add('Server-Timing', _server_timing(stats, total))
+
+    from flask import request
+    endpoint = request.endpoint or request.path
+
+    sospechosas = stats.sospechosas_n_mas_1(app.config['QUERY_N1_THRESHOLD'])
+    for forma, repeticiones in sospechosas:
+        logger.warning(f"⚠️ Posible N+1 en {endpoint}: {repeticiones}x {forma[:200]}")
+
+    if stats.count > app.config['QUERY_WARN_COUNT'] or stats.db_time * 1000 > app.config['QUERY_WARN_DB_MS']:
+        logger.warning(
+            f"⚠️ {endpoint}: {stats.count} queries, {stats.db_time * 1000:.0f}ms en DB "
+            f"(umbral {app.config['QUERY_WARN_COUNT']} queries / {app.config['QUERY_WARN_DB_MS']}ms)"
+        )
+
+    return response
+
+
+_eventos_registrados = False
+
+
+def _registrar_eventos() -> None:
+    """Escucha todos los Engine (una sola vez por proceso)"""
+    global _eventos_registrados
+    if _eventos_registrados:
+        return
+    event.listen(Engine, 'before_cursor_execute', _antes_de_ejecutar)
+    event.listen(Engine, 'after_cursor_execute', _despues_de_ejecutar)
+    event.listen(Engine, 'handle_error', _error_de_ejecucion)
+    _eventos_registrados = True
+
+
+def init_query_monitor(app: Flask) -> None:
+    """
+    Configura la instrumentación de queries por request
+
+    Config (con valores por defecto):
+        QUERY_MONITOR_ENABLED: True
+        QUERY_WARN_COUNT: 30 queries por request
+        QUERY_WARN_DB_MS: 500 ms en DB por request
+        QUERY_N1_THRESHOLD: 5 repeticiones de la misma sentencia
+        SERVER_TIMING_ENABLED: True
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('QUERY_MONITOR_ENABLED', True)
+    app.config.setdefault('QUERY_WARN_COUNT', 30)
+    app.config.setdefault('QUERY_WARN_DB_MS', 500)
+    app.config.setdefault('QUERY_N1_THRESHOLD', 5)
+    app.config.setdefault('SERVER_TIMING_ENABLED', True)
+
+    _registrar_eventos()
+
+    if not app.config['QUERY_MONITOR_ENABLED']:
+        return
+
+    app.before_request(_iniciar_request)
+    app.after_request(_finalizar_request)
+    logger.info("✅ Monitor de queries por request habilitado")
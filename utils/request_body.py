@@ -0,0 +1,153 @@
+"""
+📥 Cuerpos de Request Compactos
+===============================
+
+Decodificación de los uploads de Unity: JSON de siempre, comprimido o en MessagePack.
+
+Las sesiones con arrays largos de `respuestas` viajan desde visores en Wi-Fi
+congestionado; el JSON sin comprimir repite las mismas claves en cada
+respuesta. Este módulo acepta además:
+
+- Content-Encoding: gzip (o deflate) → descompresión incremental por chunks
+- Content-Type: application/x-msgpack → MessagePack (requiere el paquete
+  opcional `msgpack`; sin él responde 415)
+
+Los límites se aplican a lo recibido y a lo descomprimido mientras se lee
+el stream, así que ni un body enorme ni un "zip bomb" llegan a memoria.
+Un cliente que manda JSON plano no nota ningún cambio.
+"""
+
+import json
+import zlib
+from typing import Any, Iterator
+
+from flask import request
+
+from .constants import (
+    HTTP_BAD_REQUEST,
+    HTTP_PAYLOAD_TOO_LARGE,
+    HTTP_UNSUPPORTED_MEDIA_TYPE,
+    MIMETYPE_MSGPACK,
+)
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+CHUNK_BYTES = 64 * 1024
+MIMETYPES_MSGPACK = (MIMETYPE_MSGPACK, 'application/msgpack', 'application/vnd.msgpack')
+
+# zlib: +16 → solo gzip, +32 → detecta zlib o gzip por el header
+_WBITS = {'gzip': 16 + zlib.MAX_WBITS, 'x-gzip': 16 + zlib.MAX_WBITS, 'deflate': 32 + zlib.MAX_WBITS}
+
+
+class CuerpoInvalido(ValueError):
+    """Body de request ilegible, demasiado grande o en un formato no soportado"""
+
+    def __init__(self, mensaje: str, status: int = HTTP_BAD_REQUEST):
+        super().__init__(mensaje)
+        self.status = status
+
+
+def _leer_stream(max_bytes: int) -> Iterator[bytes]:
+    """Chunks crudos del body, cortando si superan max_bytes"""
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise CuerpoInvalido(f'Body de {request.content_length} bytes (máximo {max_bytes})',
+                             HTTP_PAYLOAD_TOO_LARGE)
+    leidos = 0
+    while True:
+        chunk = request.stream.read(CHUNK_BYTES)
+        if not chunk:
+            return
+        leidos += len(chunk)
+        if leidos > max_bytes:
+            raise CuerpoInvalido(f'Body de más de {max_bytes} bytes', HTTP_PAYLOAD_TOO_LARGE)
+        yield chunk
+
+
+def _descomprimir(chunks: Iterator[bytes], encoding: str, max_bytes: int) -> Iterator[bytes]:
+    """Descomprime por chunks sin producir más de max_bytes en total"""
+    descompresor = zlib.decompressobj(_WBITS[encoding])
+    producidos = 0
+
+    def _emitir(salida: bytes) -> bytes:
+        nonlocal producidos
+        producidos += len(salida)
+        if producidos > max_bytes:
+            raise CuerpoInvalido(f'Body descomprimido de más de {max_bytes} bytes', HTTP_PAYLOAD_TOO_LARGE)
+        return salida
+
+    try:
+        for chunk in chunks:
+            # max_length acota cada paso: un chunk muy comprimible no se expande entero
+            while chunk:
+                salida = descompresor.decompress(chunk, max_bytes - producidos + 1)
+                yield _emitir(salida)
+                chunk = descompresor.unconsumed_tail
+        yield _emitir(descompresor.flush())
+    except zlib.error as e:
+        raise CuerpoInvalido(f'Body {encoding} corrupto: {e}')
+    if not descompresor.eof:
+        raise CuerpoInvalido(f'Body {encoding} truncado')
+
+
+def _decodificar_json(chunks: Iterator[bytes]) -> Any:
+    try:
+        # json.loads acepta bytes (UTF-8/16/32) sin decodificar a str antes
+        return json.loads(b''.join(chunks))
+    except CuerpoInvalido:
+        raise
+    except ValueError as e:
+        raise CuerpoInvalido(f'JSON inválido: {e}')
+
+
+def _decodificar_msgpack(chunks: Iterator[bytes], max_bytes: int) -> Any:
+    if msgpack is None:
+        raise CuerpoInvalido('MessagePack no disponible en el servidor (enviar JSON)',
+                             HTTP_UNSUPPORTED_MEDIA_TYPE)
+    unpacker = msgpack.Unpacker(raw=False, max_buffer_size=max_bytes)
+    objetos = []
+    try:
+        for chunk in chunks:
+            unpacker.feed(chunk)
+            objetos.extend(unpacker)
+    except CuerpoInvalido:
+        raise
+    except (ValueError, msgpack.UnpackException) as e:
+        raise CuerpoInvalido(f'MessagePack inválido: {e}')
+    if len(objetos) != 1:
+        raise CuerpoInvalido('MessagePack inválido: se espera exactamente un objeto')
+    return objetos[0]
+
+
+def leer_cuerpo(max_bytes: int) -> Any:
+    """
+    Decodifica el body del request según Content-Encoding y Content-Type
+
+    Args:
+        max_bytes: Tamaño máximo, tanto recibido como descomprimido
+
+    Returns:
+        El objeto decodificado (dict, list, ...)
+
+    Raises:
+        CuerpoInvalido: Con status 400 (ilegible), 413 (demasiado grande)
+            o 415 (encoding / content-type no soportado)
+    """
+    es_msgpack = request.mimetype in MIMETYPES_MSGPACK
+    if not (es_msgpack or request.is_json):
+        raise CuerpoInvalido(f'Content-Type no soportado: {request.mimetype or "(vacío)"}',
+                             HTTP_UNSUPPORTED_MEDIA_TYPE)
+
+    encoding = (request.headers.get('Content-Encoding') or 'identity').strip().lower()
+    if encoding not in _WBITS and encoding != 'identity':
+        raise CuerpoInvalido(f'Content-Encoding no soportado: {encoding}', HTTP_UNSUPPORTED_MEDIA_TYPE)
+
+    chunks = _leer_stream(max_bytes)
+    if encoding != 'identity':
+        chunks = _descomprimir(chunks, encoding, max_bytes)
+
+    if es_msgpack:
+        return _decodificar_msgpack(chunks, max_bytes)
+    return _decodificar_json(chunks)
@@ -0,0 +1,459 @@
+"""
+🧵 Tracing
+==========
+
+Spans compatibles con OpenTelemetry (trace_id / span_id W3C, atributos,
+estado, export en formato OTLP/JSON) sin depender del SDK:
+
+    request Flask → AnalyticsService / SessionService → repositorio → query SQL
+                  → secciones de AnalizadorAvanzado
+
+Muestreo:
+    - TRACING_SAMPLE_RATE: fracción de trazas exportadas (decisión en la raíz,
+      o heredada del header `traceparent` entrante)
+    - TRACING_SLOW_MS: las trazas más lentas que esto se exportan siempre,
+      para ver el desglose de latencia de los requests lentos
+
+Exporters (sin red):
+    - file: una línea OTLP/JSON por span en TRACING_DIR/spans-<pid>.jsonl
+    - console: árbol de spans con duraciones en el log
+
+Threads en segundo plano: `con_contexto(func)` propaga la traza actual.
+"""
+
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADER_TRACEPARENT = 'traceparent'
+_MAX_STATEMENT = 500
+
+
+# ============================================
+# MODELO
+# ============================================
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identidad propagable de un span (equivalente a W3C traceparent)"""
+    trace_id: str
+    span_id: str
+    muestreado: bool
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.muestreado else '00'}"
+
+    @classmethod
+    def desde_traceparent(cls, valor: Optional[str]) -> Optional['SpanContext']:
+        """Parsea `00-<trace_id 32 hex>-<span_id 16 hex>-<flags>`; None si es inválido"""
+        partes = (valor or '').strip().split('-')
+        if len(partes) != 4 or len(partes[1]) != 32 or len(partes[2]) != 16:
+            return None
+        try:
+            int(partes[1], 16), int(partes[2], 16)
+            flags = int(partes[3], 16)
+        except ValueError:
+            return None
+        if partes[1] == '0' * 32 or partes[2] == '0' * 16:
+            return None
+        return cls(partes[1], partes[2], bool(flags & 1))
+
+
+@dataclass
+class _Traza:
+    """Spans de una traza dentro de este proceso / thread raíz"""
+    trace_id: str
+    muestreado: bool
+    spans: List['Span'] = field(default_factory=list)
+
+
+@dataclass
+class Span:
+    nombre: str
+    contexto: SpanContext
+    parent_id: Optional[str]
+    traza: _Traza
+    inicio_ns: int = field(default_factory=time.time_ns)
+    fin_ns: Optional[int] = None
+    atributos: Dict[str, Any] = field(default_factory=dict)
+    estado: str = 'UNSET'
+
+    def set_attribute(self, clave: str, valor: Any) -> None:
+        self.atributos[clave] = valor
+
+    def registrar_error(self, error: BaseException) -> None:
+        self.estado = 'ERROR'
+        self.atributos['exception.type'] = type(error).__name__
+        self.atributos['exception.message'] = str(error)[:_MAX_STATEMENT]
+
+    @property
+    def duracion_ms(self) -> float:
+        return ((self.fin_ns or time.time_ns()) - self.inicio_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span en el formato JSON de OTLP (elemento de scopeSpans[].spans)"""
+        return {
+            'traceId': self.contexto.trace_id,
+            'spanId': self.contexto.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.nombre,
+            'startTimeUnixNano': str(self.inicio_ns),
+            'endTimeUnixNano': str(self.fin_ns),
+            'attributes': [{'key': k, 'value': _valor_otlp(v)} for k, v in self.atributos.items()],
+            'status': {'code': {'UNSET': 0, 'OK': 1, 'ERROR': 2}[self.estado]},
+        }
+
+
+def _valor_otlp(valor: Any) -> Dict[str, Any]:
+    if isinstance(valor, bool):
+        return {'boolValue': valor}
+    if isinstance(valor, int):
+        return {'intValue': str(valor)}
+    if isinstance(valor, float):
+        return {'doubleValue': valor}
+    return {'stringValue': str(valor)}
+
+
+# Span activo (o contexto remoto heredado) en el contexto de ejecución actual
+_span_actual: ContextVar[Optional[Union[Span, SpanContext]]] = ContextVar('span_actual', default=None)
+
+
+# ============================================
+# EXPORTERS
+# ============================================
+
+class FileExporter:
+    """Una línea OTLP/JSON por span en `<directorio>/spans-<pid>.jsonl`"""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self._lock = threading.Lock()
+
+    def exportar(self, spans: List[Span]) -> None:
+        os.makedirs(self.directorio, exist_ok=True)
+        lineas = ''.join(json.dumps(s.to_otlp(), ensure_ascii=False) + '\n' for s in spans)
+        with self._lock, open(os.path.join(self.directorio, f'spans-{os.getpid()}.jsonl'), 'a',
+                              encoding='utf-8') as f:
+            f.write(lineas)
+
+
+class ConsoleExporter:
+    """Árbol de spans con duraciones, al log"""
+
+    def exportar(self, spans: List[Span]) -> None:
+        hijos: Dict[Optional[str], List[Span]] = {}
+        ids = {s.contexto.span_id for s in spans}
+        for s in sorted(spans, key=lambda s: s.inicio_ns):
+            padre = s.parent_id if s.parent_id in ids else None
+            hijos.setdefault(padre, []).append(s)
+
+        lineas = []
+
+        def _agregar(span: Span, nivel: int) -> None:
+            marca = ' ❌' if span.estado == 'ERROR' else ''
+            lineas.append(f"{'  ' * nivel}{span.nombre} {span.duracion_ms:.1f}ms{marca}")
+            for hijo in hijos.get(span.contexto.span_id, []):
+                _agregar(hijo, nivel + 1)
+
+        for raiz in hijos.get(None, []):
+            _agregar(raiz, 0)
+        logger.info(f"🧵 Traza {spans[0].contexto.trace_id}\n" + '\n'.join(lineas))
+
+
+EXPORTERS = {
+    'file': lambda config: FileExporter(config['TRACING_DIR']),
+    'console': lambda config: ConsoleExporter(),
+}
+
+
+# ============================================
+# CONFIGURACIÓN Y API
+# ============================================
+
+@dataclass
+class _Config:
+    habilitado: bool = False
+    tasa_muestreo: float = 1.0
+    lento_ms: float = 0
+    exporter: Any = None
+
+
+_config = _Config()
+
+
+def configurar(habilitado: bool, tasa_muestreo: float = 1.0, lento_ms: float = 0, exporter: Any = None) -> None:
+    """Configura el tracer del proceso (lo llama init_tracing)"""
+    _config.habilitado = habilitado
+    _config.tasa_muestreo = tasa_muestreo
+    _config.lento_ms = lento_ms
+    _config.exporter = exporter
+
+
+def habilitado() -> bool:
+    return _config.habilitado
+
+
+def span_actual() -> Optional[Span]:
+    actual = _span_actual.get()
+    return actual if isinstance(actual, Span) else None
+
+
+def abrir_span(nombre: str, padre: Optional[Union[Span, SpanContext]] = None, **atributos) -> tuple:
+    """
+    Abre un span hijo de `padre` (o del span actual) y lo deja activo
+
+    Returns:
+        Tupla (span, token) para cerrar_span()
+    """
+    padre = padre if padre is not None else _span_actual.get()
+    if isinstance(padre, Span):
+        traza, parent_id = padre.traza, padre.contexto.span_id
+    elif isinstance(padre, SpanContext):
+        traza, parent_id = _Traza(padre.trace_id, padre.muestreado), padre.span_id
+    else:
+        traza = _Traza(os.urandom(16).hex(), random.random() < _config.tasa_muestreo)
+        parent_id = None
+
+    span = Span(nombre, SpanContext(traza.trace_id, os.urandom(8).hex(), traza.muestreado),
+                parent_id, traza, atributos=dict(atributos))
+    return span, _span_actual.set(span)
+
+
+def cerrar_span(span: Span, token, error: Optional[BaseException] = None) -> None:
+    """Cierra el span; al cerrar la raíz local decide si exportar la traza"""
+    if error is not None:
+        span.registrar_error(error)
+    span.fin_ns = time.time_ns()
+    _span_actual.reset(token)
+    span.traza.spans.append(span)
+
+    es_raiz_local = not isinstance(_span_actual.get(), Span) or _span_actual.get().traza is not span.traza
+    if not es_raiz_local:
+        return
+
+    lento = _config.lento_ms and span.duracion_ms >= _config.lento_ms
+    if (span.traza.muestreado or lento) and _config.exporter is not None:
+        try:
+            _config.exporter.exportar(span.traza.spans)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo exportar la traza {span.traza.trace_id}: {e}")
+
+
+@contextmanager
+def span(nombre: str, solo_con_padre: bool = False, **atributos):
+    """
+    Span como context manager
+
+    Args:
+        nombre: Nombre del span
+        solo_con_padre: No crear trazas nuevas (solo spans dentro de una existente)
+        **atributos: Atributos iniciales
+    """
+    if not _config.habilitado or (solo_con_padre and _span_actual.get() is None):
+        yield None
+        return
+
+    actual, token = abrir_span(nombre, **atributos)
+    try:
+        yield actual
+    except BaseException as e:
+        cerrar_span(actual, token, e)
+        raise
+    cerrar_span(actual, token)
+
+
+def con_contexto(func: Callable) -> Callable:
+    """
+    Envuelve `func` para que, ejecutada en otro thread, continúe la traza actual
+
+    Uso:
+        threading.Thread(target=con_contexto(recalcular), args=(...)).start()
+    """
+    actual = _span_actual.get()
+    contexto = actual.contexto if isinstance(actual, Span) else actual
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _span_actual.set(contexto)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _span_actual.reset(token)
+    return wrapper
+
+
+def trazar_clase(cls):
+    """
+    Decorador de clase: un span por llamada a cada método público
+    (`Clase.metodo`), solo dentro de una traza activa
+    """
+    for nombre, atributo in list(vars(cls).items()):
+        if nombre.startswith('_'):
+            continue
+        if isinstance(atributo, staticmethod):
+            setattr(cls, nombre, staticmethod(_trazar_funcion(atributo.__func__, f'{cls.__name__}.{nombre}')))
+        elif isinstance(atributo, classmethod):
+            setattr(cls, nombre, classmethod(_trazar_funcion(atributo.__func__, f'{cls.__name__}.{nombre}')))
+        elif inspect.isfunction(atributo):
+            setattr(cls, nombre, _trazar_funcion(atributo, f'{cls.__name__}.{nombre}'))
+    return cls
+
+
+def _trazar_funcion(func: Callable, nombre: str) -> Callable:
+    # Un generador se ejecuta después de retornar: el span no mediría nada útil
+    if inspect.isgeneratorfunction(func):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _config.habilitado or _span_actual.get() is None:
+            return func(*args, **kwargs)
+        with span(nombre, **{'code.function': nombre}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# ============================================
+# SPANS DE QUERIES SQL
+# ============================================
+
+_INFO_SPANS = '_tracing_spans'
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    if not _config.habilitado or _span_actual.get() is None:
+        return
+    abierto = abrir_span('db.query', **{
+        'db.system': conn.dialect.name,
+        'db.statement': statement[:_MAX_STATEMENT],
+        'db.executemany': executemany,
+    })
+    conn.info.setdefault(_INFO_SPANS, []).append(abierto)
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    abiertos = conn.info.get(_INFO_SPANS)
+    if abiertos:
+        db_span, token = abiertos.pop()
+        if cursor is not None and cursor.rowcount is not None and cursor.rowcount >= 0:
+            db_span.set_attribute('db.rowcount', cursor.rowcount)
+        cerrar_span(db_span, token)
+
+
+def _error_de_ejecucion(contexto_error):
+    conexion = contexto_error.connection
+    abiertos = conexion.info.get(_INFO_SPANS) if conexion is not None else None
+    if abiertos:
+        db_span, token = abiertos.pop()
+        cerrar_span(db_span, token, contexto_error.original_exception)
+
+
+_eventos_registrados = False
+
+
+def _seccion_analytics(seccion: str):
+    return span(f'analytics.{seccion}', solo_con_padre=True)
+
+
+def _registrar_eventos() -> None:
+    """Queries SQL y secciones de AnalizadorAvanzado (una sola vez por proceso)"""
+    global _eventos_registrados
+    if _eventos_registrados:
+        return
+    event.listen(Engine, 'before_cursor_execute', _antes_de_ejecutar)
+    event.listen(Engine, 'after_cursor_execute', _despues_de_ejecutar)
+    event.listen(Engine, 'handle_error', _error_de_ejecucion)
+
+    from analytics.timing import agregar_observador
+    agregar_observador(_seccion_analytics)
+    _eventos_registrados = True
+
+
+# ============================================
+# HOOKS DE REQUEST
+# ============================================
+
+def _iniciar_request():
+    if not _config.habilitado:
+        return
+    padre = SpanContext.desde_traceparent(request.headers.get(HEADER_TRACEPARENT))
+    ruta = request.url_rule.rule if request.url_rule is not None else request.path
+    g._tracing = abrir_span(f'{request.method} {ruta}', padre=padre, **{
+        'http.method': request.method,
+        'http.route': ruta,
+        'http.target': request.full_path.rstrip('?'),
+    })
+
+
+def _finalizar_request(response):
+    abierto = g.get('_tracing')
+    if abierto is not None:
+        request_span = abierto[0]
+        request_span.set_attribute('http.status_code', response.status_code)
+        if response.status_code >= 500:
+            request_span.estado = 'ERROR'
+        response.headers['X-Trace-Id'] = request_span.contexto.trace_id
+    return response
+
+
+def _cerrar_request(error=None):
+    abierto = g.pop('_tracing', None)
+    if abierto is not None:
+        cerrar_span(*abierto, error)
+
+
+def init_tracing(app: Flask) -> None:
+    """
+    Configura el tracing de requests, servicios, repositorios y analytics
+
+    Config (con valores por defecto):
+        TRACING_ENABLED: False
+        TRACING_EXPORTER: 'file' (file | console)
+        TRACING_DIR: 'logs/traces'
+        TRACING_SAMPLE_RATE: 0.1
+        TRACING_SLOW_MS: 1000 (0 = sin export forzado de requests lentos)
+
+    Args:
+        app: Instancia de Flask
+    """
+    app.config.setdefault('TRACING_ENABLED', False)
+    app.config.setdefault('TRACING_EXPORTER', 'file')
+    app.config.setdefault('TRACING_DIR', os.path.join('logs', 'traces'))
+    app.config.setdefault('TRACING_SAMPLE_RATE', 0.1)
+    app.config.setdefault('TRACING_SLOW_MS', 1000)
+
+    # Los hooks se registran siempre (con tracing apagado solo chequean un flag),
+    # así configurar() puede activarlo en caliente
+    _registrar_eventos()
+    app.before_request(_iniciar_request)
+    app.after_request(_finalizar_request)
+    app.teardown_request(_cerrar_request)
+
+    if not app.config['TRACING_ENABLED']:
+        configurar(False)
+        return
+
+    fabrica = EXPORTERS.get(app.config['TRACING_EXPORTER'])
+    if fabrica is None:
+        logger.warning(f"⚠️ TRACING_EXPORTER desconocido: {app.config['TRACING_EXPORTER']}, usando 'file'")
+        fabrica = EXPORTERS['file']
+
+    configurar(True, app.config['TRACING_SAMPLE_RATE'], app.config['TRACING_SLOW_MS'], fabrica(app.config))
+    logger.info(f"✅ Tracing habilitado (exporter={app.config['TRACING_EXPORTER']}, "
+                f"muestreo={app.config['TRACING_SAMPLE_RATE']})")